@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+benchmark_suite.py - Benchmarks for the workflow processing code paths
+
+This module times the hot paths against local stand-ins, so it runs on any
+machine with Python 3:
+- LISTCAT parsing of synthetic catalogs (1k to 1M entries)
+- Dataset listing and lookups through the TSO session pool, backed by
+  fake_tso.py with configurable startup delay and per-command latency
+- Record analysis of synthetic FB and VB dataset images
+- Streaming report generation (JSON, NDJSON + gzip)
+- zOSMF REST flows (login, info, workflow lifecycle, async fan-out) against
+  zosmf_standin.py
+- Results written as JSON with the git commit, Python version and platform;
+  --compare reports the change against a baseline file and exits non-zero
+  on regressions beyond --threshold
+
+Usage:
+    python3 benchmark_suite.py [--quick | --full] [--output results.json]
+    python3 benchmark_suite.py --compare baseline.json [--results current.json] [--threshold 0.1]
+    python3 benchmark_suite.py --only listcat_parse,rest
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import platform
+import datetime
+import tempfile
+import statistics
+import subprocess
+import concurrent.futures
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+FAKE_TSO = SCRIPT_DIR / 'fake_tso.py'
+
+RESULTS_VERSION = 1
+
+# Parameters per suite size
+PROFILES = {
+    'quick': {
+        'repeat': 3, 'listcat_entries': [1000, 10000], 'listing_entries': 1000, 'lookups': 50,
+        'analysis_mb': 8, 'report_datasets': 5000, 'rest_requests': 200, 'rest_workflows': 20
+    },
+    'default': {
+        'repeat': 5, 'listcat_entries': [1000, 10000, 100000], 'listing_entries': 10000, 'lookups': 200,
+        'analysis_mb': 64, 'report_datasets': 50000, 'rest_requests': 1000, 'rest_workflows': 100
+    },
+    'full': {
+        'repeat': 5, 'listcat_entries': [1000, 10000, 100000, 1000000], 'listing_entries': 100000,
+        'lookups': 500, 'analysis_mb': 256, 'report_datasets': 200000, 'rest_requests': 5000,
+        'rest_workflows': 500
+    }
+}
+
+
+def measure(function: Callable, repeat: int, setup: Optional[Callable] = None):
+    """Run a function `repeat` times; return (durations, last result)"""
+    durations = []
+    result = None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        result = function()
+        durations.append(time.perf_counter() - start)
+    return durations, result
+
+
+def make_result(name: str, durations: List[float], params: Optional[Dict] = None,
+                **metrics) -> Dict:
+    """One benchmark result; `seconds` (median) is the value compared between runs"""
+    return {
+        'name': name,
+        'params': params or {},
+        'seconds': round(statistics.median(durations), 6),
+        'min_seconds': round(min(durations), 6),
+        'max_seconds': round(max(durations), 6),
+        'runs': len(durations),
+        'metrics': metrics
+    }
+
+
+def rate(amount: float, seconds: float) -> Optional[float]:
+    return round(amount / seconds, 1) if seconds else None
+
+
+def latency_percentiles(latencies: List[float]) -> Dict:
+    ordered = sorted(latencies)
+    pick = lambda q: round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3)
+    return {'p50_ms': pick(0.5), 'p90_ms': pick(0.9), 'p99_ms': pick(0.99)}
+
+
+# Benchmarks
+
+def bench_listcat_parse(profile: Dict, work_dir: Path) -> List[Dict]:
+    """Parse synthetic LISTCAT output streamed from a file"""
+    from listcat_parser import generate_synthetic_listcat, parse_listcat, unique_names
+
+    results = []
+    for entries in profile['listcat_entries']:
+        listing = work_dir / f"listcat_{entries}.txt"
+        with open(listing, 'w') as f:
+            f.writelines(generate_synthetic_listcat(0, 'USER', entry_count=entries))
+        size = listing.stat().st_size
+
+        def parse():
+            with open(listing) as f:
+                return sum(1 for _ in parse_listcat(f))
+
+        def names():
+            with open(listing) as f:
+                return len(unique_names(parse_listcat(f), types={'NONVSAM', 'CLUSTER'}))
+
+        # The 1M entry catalog takes long enough that a single run is representative
+        repeat = profile['repeat'] if entries < 1000000 else 1
+        durations, parsed = measure(parse, repeat)
+        results.append(make_result('listcat_parse', durations, {'entries': entries},
+                                   bytes=size, parsed_entries=parsed,
+                                   entries_per_second=rate(parsed, statistics.median(durations)),
+                                   mb_per_second=rate(size / 1048576, statistics.median(durations))))
+        durations, unique = measure(names, repeat)
+        results.append(make_result('listcat_unique_names', durations, {'entries': entries},
+                                   datasets=unique))
+        listing.unlink()
+    return results
+
+
+def fake_tso_argv(latency: float, startup: float, entries: int) -> List[str]:
+    return [sys.executable, str(FAKE_TSO), '--latency', str(latency),
+            '--startup', str(startup), '--entries', str(entries)]
+
+
+def bench_listing(profile: Dict, work_dir: Path, latency: float, startup: float) -> List[Dict]:
+    """Catalog listing and lookups through the TSO session pool"""
+    from tso_session import TSOSessionPool
+    import catalog_cache
+    import tso_session
+    from workflow_utilities import DatasetUtilities
+
+    argv = fake_tso_argv(latency, startup, profile['listing_entries'])
+    lookups = profile['lookups']
+    params = {'tso_latency': latency, 'tso_startup': startup}
+    results = []
+
+    # One-shot address spaces (pool size 0) versus pooled sessions
+    oneshot_lookups = max(1, lookups // 10)
+    for size, count in ((0, oneshot_lookups), (2, lookups)):
+        pool = TSOSessionPool(size=size, argv=argv)
+        try:
+            pool.run("TIME")  # start the sessions outside the measurement
+
+            def lookup():
+                for index in range(count):
+                    pool.run(f"LISTCAT ENT('USER.DATA.D{index:07d}') ALL")
+            durations, _ = measure(lookup, profile['repeat'])
+        finally:
+            pool.close()
+        results.append(make_result('tso_lookup', durations, {**params, 'pool_size': size, 'lookups': count},
+                                   lookups_per_second=rate(count, statistics.median(durations)),
+                                   ms_per_lookup=round(statistics.median(durations) / count * 1000, 3)))
+
+    # DatasetUtilities with the process-wide pool and catalog cache
+    tso_session._default_pool = TSOSessionPool(size=2, argv=argv)
+    catalog_cache._default_cache = catalog_cache.CatalogCache()
+    try:
+        tso_session._default_pool.run("TIME")
+        cache = catalog_cache._default_cache
+        durations, names = measure(lambda: DatasetUtilities.list_datasets_by_pattern('USER'),
+                                   profile['repeat'], setup=cache.clear)
+        results.append(make_result('list_datasets', durations,
+                                   {**params, 'entries': profile['listing_entries']},
+                                   datasets=len(names),
+                                   datasets_per_second=rate(len(names), statistics.median(durations))))
+        durations, _ = measure(lambda: DatasetUtilities.list_datasets_by_pattern('USER'), profile['repeat'])
+        results.append(make_result('list_datasets_cached', durations,
+                                   {**params, 'entries': profile['listing_entries']}))
+    finally:
+        tso_session._default_pool.close()
+        tso_session._default_pool = None
+        catalog_cache._default_cache = None
+    return results
+
+
+def bench_analysis(profile: Dict, work_dir: Path) -> List[Dict]:
+    """Single-pass record analysis of FB and VB dataset images"""
+    from record_analysis import analyze_file, generate_test_file
+
+    results = []
+    for recfm, layout in (('FB', 'fixed'), ('VB', 'variable')):
+        path = work_dir / f"analysis_{recfm}.dat"
+        generate_test_file(path, profile['analysis_mb'], layout, 80)
+        size = path.stat().st_size
+        durations, analysis = measure(lambda: analyze_file(path, recfm, 80), profile['repeat'])
+        median = statistics.median(durations)
+        results.append(make_result('record_analysis', durations, {'recfm': recfm, 'mb': profile['analysis_mb']},
+                                   records=analysis['record_count'],
+                                   mb_per_second=rate(size / 1048576, median),
+                                   records_per_second=rate(analysis['record_count'], median)))
+        path.unlink()
+    return results
+
+
+def bench_reports(profile: Dict, work_dir: Path) -> List[Dict]:
+    """Streaming processing report output"""
+    from record_analysis import analyze_file, generate_test_file
+    from report_writer import ReportWriter
+
+    sample_file = work_dir / 'report_sample.dat'
+    generate_test_file(sample_file, 1, 'fixed', 80)
+    template = {'analysis_time': datetime.datetime.now().isoformat(),
+                **analyze_file(sample_file, 'FB', 80)}
+    sample_file.unlink()
+
+    count = profile['report_datasets']
+    workflow_info = {'environment': 'BENCH', 'work_directory': str(work_dir), 'version': '1.0',
+                     'processing_date': datetime.datetime.now().isoformat()}
+    processing_result = {'environment': 'BENCH', 'steps_completed': ['reports'], 'results': {'success': True}}
+
+    results = []
+    for variant, options in (('json', {}), ('ndjson_gzip', {'ndjson': True, 'compress': True})):
+        output_dir = work_dir / f"reports_{variant}"
+        output_dir.mkdir(exist_ok=True)
+
+        def write():
+            writer = ReportWriter(output_dir, 'bench', workflow_info, **options)
+            for index in range(count):
+                writer.add_dataset({'dataset_name': f"USER.DATA.D{index:07d}", **template})
+            writer.finish(processing_result, {'environment': 'BENCH'})
+            return sum(path.stat().st_size for path in output_dir.iterdir())
+        durations, size = measure(write, profile['repeat'])
+        results.append(make_result('report_writer', durations, {'variant': variant, 'datasets': count},
+                                   bytes=size,
+                                   datasets_per_second=rate(count, statistics.median(durations))))
+    return results
+
+
+def bench_rest(profile: Dict, work_dir: Path, latency: float) -> List[Dict]:
+    """zOSMF REST flows against the local stand-in"""
+    from zosmf_client import ZosmfClient, AsyncZosmfClient
+    from zosmf_standin import ZosmfStandin
+
+    requests = profile['rest_requests']
+    workflows = profile['rest_workflows']
+    params = {'server_latency': latency}
+    results = []
+
+    with ZosmfStandin(latency=latency) as standin:
+        def connect(pool_size=4):
+            return ZosmfClient(standin.host, standin.port, 'BENCH', 'BENCH', scheme='http',
+                               pool_size=pool_size)
+
+        def login():
+            with connect() as client:
+                client.login()
+        durations, _ = measure(login, profile['repeat'])
+        results.append(make_result('rest_login', durations, params))
+
+        with connect(pool_size=1) as client:
+            client.login()
+            latencies = []
+
+            def sequential():
+                latencies.clear()
+                for _ in range(requests):
+                    start = time.perf_counter()
+                    client.info()
+                    latencies.append(time.perf_counter() - start)
+            durations, _ = measure(sequential, profile['repeat'])
+            results.append(make_result('rest_info_sequential', durations, {**params, 'requests': requests},
+                                       requests_per_second=rate(requests, statistics.median(durations)),
+                                       connections_opened=client.stats['connections_opened'],
+                                       **latency_percentiles(latencies)))
+
+        with connect(pool_size=8) as client:
+            client.login()
+
+            def lifecycle(index):
+                name = f"BENCH_WORKFLOW_{os.getpid()}_{index}"
+                created = client.create_workflow({'workflowName': name, 'owner': 'BENCH', 'system': 'SYS1'})
+                key = created['workflowKey']
+                client.set_workflow_properties(key, {'workflowDescription': 'benchmark'})
+                client.start_workflow(key)
+                client.get_workflow(key, return_data='steps')
+                client.delete_workflow(key)
+
+            def concurrent_lifecycles():
+                with concurrent.futures.ThreadPoolExecutor(max_workers=client.pool_size) as executor:
+                    list(executor.map(lifecycle, range(workflows)))
+            durations, _ = measure(concurrent_lifecycles, profile['repeat'])
+            results.append(make_result('rest_workflow_lifecycle', durations,
+                                       {**params, 'workflows': workflows, 'pool_size': client.pool_size},
+                                       workflows_per_second=rate(workflows, statistics.median(durations))))
+
+        async def fan_out():
+            async with AsyncZosmfClient(standin.host, standin.port, 'BENCH', 'BENCH', scheme='http',
+                                        pool_size=8) as client:
+                await client.login()
+                await asyncio.gather(*(client.info() for _ in range(requests)))
+        durations, _ = measure(lambda: asyncio.run(fan_out()), profile['repeat'])
+        results.append(make_result('rest_info_async', durations, {**params, 'requests': requests, 'pool_size': 8},
+                                   requests_per_second=rate(requests, statistics.median(durations))))
+    return results
+
+
+# Results
+
+def git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SCRIPT_DIR,
+                                capture_output=True, text=True, timeout=10)
+        if result.returncode != 0:
+            return None
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=SCRIPT_DIR,
+                               capture_output=True, text=True, timeout=30).stdout.strip()
+        return result.stdout.strip() + ('-dirty' if dirty else '')
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def result_key(result: Dict) -> str:
+    """Stable identifier of a benchmark case across runs"""
+    params = ','.join(f"{key}={value}" for key, value in sorted(result['params'].items()))
+    return f"{result['name']}[{params}]"
+
+
+def compare_results(baseline: Dict, current: Dict, threshold: float) -> List[Dict]:
+    """Relative change of the median time of every case present in both runs"""
+    previous = {result_key(result): result for result in baseline.get('results', [])}
+    rows = []
+    for result in current.get('results', []):
+        key = result_key(result)
+        if key not in previous:
+            continue
+        before = previous[key]['seconds']
+        after = result['seconds']
+        change = (after - before) / before if before else 0.0
+        rows.append({
+            'case': key,
+            'baseline_seconds': before,
+            'current_seconds': after,
+            'change': round(change, 4),
+            'regression': change > threshold
+        })
+    return rows
+
+
+def format_comparison(rows: List[Dict], baseline: Dict, current: Dict) -> str:
+    lines = [f"Baseline: {baseline.get('git_commit')} ({baseline.get('created')})",
+             f"Current:  {current.get('git_commit')} ({current.get('created')})",
+             f"{'CASE':<70} {'BASELINE':>10} {'CURRENT':>10} {'CHANGE':>8}"]
+    for row in rows:
+        flag = '  REGRESSION' if row['regression'] else ''
+        lines.append(f"{row['case'][:70]:<70} {row['baseline_seconds']:>10.4f} "
+                     f"{row['current_seconds']:>10.4f} {row['change']:>+8.1%}{flag}")
+    return '\n'.join(lines)
+
+
+BENCHMARKS = ('listcat_parse', 'listing', 'analysis', 'reports', 'rest')
+
+
+def run_suite(profile_name: str, only: Optional[List[str]], tso_latency: float, tso_startup: float,
+              rest_latency: float) -> Dict:
+    """Run the selected benchmarks and return the results document"""
+    profile = PROFILES[profile_name]
+    selected = only or list(BENCHMARKS)
+    results = []
+    with tempfile.TemporaryDirectory(prefix='workflow_bench_') as temp_dir:
+        work_dir = Path(temp_dir)
+        for name in selected:
+            logging.info(f"Running benchmark: {name}")
+            start = time.perf_counter()
+            if name == 'listcat_parse':
+                results.extend(bench_listcat_parse(profile, work_dir))
+            elif name == 'listing':
+                results.extend(bench_listing(profile, work_dir, tso_latency, tso_startup))
+            elif name == 'analysis':
+                results.extend(bench_analysis(profile, work_dir))
+            elif name == 'reports':
+                results.extend(bench_reports(profile, work_dir))
+            elif name == 'rest':
+                results.extend(bench_rest(profile, work_dir, rest_latency))
+            logging.info(f"Benchmark {name} finished in {time.perf_counter() - start:.1f}s")
+
+    return {
+        'version': RESULTS_VERSION,
+        'created': datetime.datetime.now().isoformat(),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'profile': profile_name,
+        'options': {'tso_latency': tso_latency, 'tso_startup': tso_startup, 'rest_latency': rest_latency},
+        'results': results
+    }
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='zOS workflow benchmark suite')
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument('--quick', action='store_true', help='Small inputs (CI / smoke test)')
+    size.add_argument('--full', action='store_true', help='Large inputs, including a 1M entry catalog')
+    parser.add_argument('--only', help=f"Comma separated benchmarks ({', '.join(BENCHMARKS)})")
+    parser.add_argument('--tso-latency', type=float, default=0.002, help='Fake TSO seconds per command')
+    parser.add_argument('--tso-startup', type=float, default=0.2, help='Fake TSO session startup seconds')
+    parser.add_argument('--rest-latency', type=float, default=0.0, help='zOSMF stand-in seconds per request')
+    parser.add_argument('--output', help='Results file (default: benchmark_results_<commit>_<time>.json)')
+    parser.add_argument('--results', help='Compare this results file instead of running the suite')
+    parser.add_argument('--compare', metavar='BASELINE', help='Baseline results file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Relative slowdown reported as a regression (default: 0.10)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s',
+                        datefmt='%Y-%m-%d %H:%M:%S')
+    # Benchmarks must not read or update a shared catalog snapshot
+    os.environ['WORKFLOW_CATALOG_CACHE'] = ''
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+    if args.results:
+        with open(args.results) as f:
+            current = json.load(f)
+    else:
+        only = [name.strip() for name in args.only.split(',')] if args.only else None
+        unknown = set(only or []) - set(BENCHMARKS)
+        if unknown:
+            parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+        profile = 'quick' if args.quick else 'full' if args.full else 'default'
+        current = run_suite(profile, only, args.tso_latency, args.tso_startup, args.rest_latency)
+
+        output = args.output or (f"benchmark_results_{current['git_commit'] or 'nogit'}_"
+                                 f"{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        with open(output, 'w') as f:
+            json.dump(current, f, indent=2)
+        logging.info(f"Results written to {output}")
+        for result in current['results']:
+            print(f"{result_key(result):<70} {result['seconds']:>10.4f}s  "
+                  + ' '.join(f"{key}={value}" for key, value in result['metrics'].items()))
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare_results(baseline, current, args.threshold)
+        print(format_comparison(rows, baseline, current))
+        if any(row['regression'] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
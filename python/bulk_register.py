@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+bulk_register.py - Non-interactive bulk workflow instance registration
+
+This script creates, configures and starts many workflow instances from a
+manifest of system/variable combinations:
+- asyncio driver over AsyncZosmfClient, one pooled client per zOSMF host
+- Per-host concurrency limit and request rate limit (token bucket)
+- Existing instances are kept or replaced without prompting
+- Per-instance result table with create/properties/start latencies and
+  p50/p90/p99 percentiles per step
+
+Manifest formats:
+    JSON: [{"host": "SYS1.example.com", "system": "SYS1",
+            "name": "BASELINE_WORKFLOW_TEST_SYS1",
+            "variables": {"HLQ": "TEST1", "JOB_PREFIX": "TST"}}, ...]
+    CSV:  host,port,system,name,HLQ,JOB_PREFIX
+          (columns other than host/port/system/name/properties are variables)
+
+Usage:
+    python3 bulk_register.py manifest.json --user USER --work-dir /u/user/workflow \\
+        --per-host 4 --rate 10 [--replace] [--no-start] [--output results.json]
+
+The password is read from ZOSMF_PASSWORD.
+"""
+
+import os
+import sys
+import re
+import csv
+import json
+import time
+import asyncio
+import logging
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from zosmf_client import AsyncZosmfClient, ZosmfError
+from workflow_registration import (WORKFLOW_NAME, WORKFLOW_VERSION, WORKFLOW_DESCRIPTION,
+                                   load_properties)
+
+MANIFEST_FIELDS = ('host', 'port', 'system', 'name', 'properties')
+STEPS = ('create', 'properties', 'start')
+
+
+class RateLimiter:
+    """Token bucket limiting requests per second"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def load_manifest(manifest_file: Path, default_port: int = 443) -> List[Dict]:
+    """Read instance definitions from a JSON or CSV manifest"""
+    manifest_file = Path(manifest_file)
+    if manifest_file.suffix.lower() == '.csv':
+        with open(manifest_file, 'r', newline='') as f:
+            rows = list(csv.DictReader(f))
+        entries = []
+        for row in rows:
+            entry = {field: row[field] for field in MANIFEST_FIELDS if row.get(field)}
+            entry['variables'] = {key: value for key, value in row.items()
+                                  if key not in MANIFEST_FIELDS and value not in (None, '')}
+            entries.append(entry)
+    else:
+        with open(manifest_file, 'r') as f:
+            entries = json.load(f)
+        if isinstance(entries, dict):
+            entries = entries.get('instances', [])
+
+    instances = []
+    for number, entry in enumerate(entries, 1):
+        if not entry.get('host'):
+            raise ValueError(f"Manifest entry {number} has no host")
+        system = entry.get('system') or entry['host'].split('.')[0].upper()
+        instances.append({
+            'host': entry['host'],
+            'port': int(entry.get('port') or default_port),
+            'system': system,
+            'name': entry.get('name') or f"{WORKFLOW_NAME}_{system}_{number}",
+            'variables': dict(entry.get('variables') or {}),
+            'properties': entry.get('properties')
+        })
+    return instances
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Linear interpolated percentile of a list of values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class BulkRegistration:
+    """Concurrent create/properties/start over many hosts"""
+
+    def __init__(self, instances: List[Dict], user: str, password: str, work_dir: Path,
+                 per_host: int = 4, rate: float = 10.0, replace: bool = False,
+                 start: bool = True, scheme: str = 'https', verify: bool = True):
+        self.instances = instances
+        self.user = user
+        self.password = password
+        self.work_dir = Path(work_dir)
+        self.per_host = per_host
+        self.rate = rate
+        self.replace = replace
+        self.start = start
+        self.scheme = scheme
+        self.verify = verify
+
+        self.definition_file = self.work_dir / 'workflow-definition.xml'
+        default_properties = self.work_dir / 'config' / 'workflow.properties'
+        self.default_properties = load_properties(default_properties) if default_properties.exists() else {}
+
+        self.clients = {}
+        self.limits = {}
+        self.limiters = {}
+        self.logins = {}
+
+    async def _client(self, host: str, port: int) -> AsyncZosmfClient:
+        """Return the logged in client for a host, creating it on first use"""
+        key = (host, port)
+        if key not in self.clients:
+            self.clients[key] = AsyncZosmfClient(host, port, self.user, self.password,
+                                                 scheme=self.scheme, verify=self.verify,
+                                                 pool_size=self.per_host)
+            self.limits[key] = asyncio.Semaphore(self.per_host)
+            self.limiters[key] = RateLimiter(self.rate)
+            self.logins[key] = asyncio.ensure_future(self.clients[key].login())
+        # Every instance on the host waits for the same single login
+        await self.logins[key]
+        return self.clients[key]
+
+    async def _call(self, key, function, *args, **kwargs):
+        """Issue one rate limited request"""
+        await self.limiters[key].acquire()
+        return await function(*args, **kwargs)
+
+    def _payload(self, instance: Dict) -> Dict:
+        payload = {
+            'workflowName': instance['name'],
+            'workflowDefinitionFile': str(self.definition_file),
+            'workflowDescription': WORKFLOW_DESCRIPTION,
+            'workflowVersion': WORKFLOW_VERSION,
+            'vendor': 'Custom Development',
+            'category': 'Testing',
+            'owner': self.user,
+            'system': instance['system']
+        }
+        if instance['variables']:
+            payload['variables'] = [{'name': name, 'value': str(value)}
+                                    for name, value in instance['variables'].items()]
+        return payload
+
+    def _properties(self, instance: Dict) -> Dict:
+        properties = dict(self.default_properties)
+        if instance.get('properties'):
+            properties.update(load_properties(Path(instance['properties'])))
+        return properties
+
+    async def register(self, instance: Dict) -> Dict:
+        """Create, configure and start one instance"""
+        key = (instance['host'], instance['port'])
+        result = {
+            'name': instance['name'],
+            'host': instance['host'],
+            'system': instance['system'],
+            'workflow_key': None,
+            'status': 'FAILED',
+            'error': None,
+            'latency': {}
+        }
+        started = time.perf_counter()
+        try:
+            client = await self._client(*key)
+            async with self.limits[key]:
+                existing = await self._call(key, client.list_workflows,
+                                            workflowName=f"^{re.escape(instance['name'])}$",
+                                            owner=self.user)
+                if existing:
+                    if not self.replace:
+                        result['status'] = 'EXISTS'
+                        result['workflow_key'] = existing[0].get('workflowKey')
+                        return result
+                    for workflow in existing:
+                        await self._call(key, client.delete_workflow, workflow['workflowKey'])
+
+                step_start = time.perf_counter()
+                response = await self._call(key, client.create_workflow, self._payload(instance))
+                result['latency']['create'] = time.perf_counter() - step_start
+                if not isinstance(response, dict) or not response.get('workflowKey'):
+                    raise ZosmfError(f"Unexpected create response: {response}")
+                result['workflow_key'] = response['workflowKey']
+
+                properties = self._properties(instance)
+                if properties:
+                    step_start = time.perf_counter()
+                    await self._call(key, client.set_workflow_properties, result['workflow_key'], properties)
+                    result['latency']['properties'] = time.perf_counter() - step_start
+
+                if self.start:
+                    step_start = time.perf_counter()
+                    await self._call(key, client.start_workflow, result['workflow_key'])
+                    result['latency']['start'] = time.perf_counter() - step_start
+                    result['status'] = 'STARTED'
+                else:
+                    result['status'] = 'CREATED'
+        except Exception as e:
+            result['error'] = str(e)
+            logging.error(f"Instance {instance['name']} on {instance['host']} failed: {e}")
+        finally:
+            result['latency']['total'] = time.perf_counter() - started
+        return result
+
+    async def run(self) -> List[Dict]:
+        """Register all instances, returning results in manifest order"""
+        try:
+            return await asyncio.gather(*(self.register(instance) for instance in self.instances))
+        finally:
+            for client in self.clients.values():
+                await client.close()
+
+
+def summarize(results: List[Dict]) -> Dict:
+    """Status counts and latency percentiles (milliseconds) per step"""
+    summary = {'instances': len(results), 'status': {}, 'latency_ms': {}}
+    for result in results:
+        summary['status'][result['status']] = summary['status'].get(result['status'], 0) + 1
+    for step in STEPS + ('total',):
+        values = [result['latency'][step] * 1000 for result in results if step in result['latency']]
+        if values:
+            summary['latency_ms'][step] = {
+                'count': len(values),
+                'p50': round(percentile(values, 50), 1),
+                'p90': round(percentile(values, 90), 1),
+                'p99': round(percentile(values, 99), 1),
+                'max': round(max(values), 1)
+            }
+    return summary
+
+
+def format_table(results: List[Dict], summary: Dict) -> str:
+    """Render the per-instance result table and percentile summary"""
+    def ms(result, step):
+        value = result['latency'].get(step)
+        return f"{value * 1000:.0f}" if value is not None else '-'
+
+    lines = [f"{'NAME':<40} {'SYSTEM':<8} {'STATUS':<8} {'CREATE':>7} {'PROPS':>7} {'START':>7} {'TOTAL':>7}  WORKFLOW KEY"]
+    for result in results:
+        lines.append(f"{result['name'][:40]:<40} {result['system'][:8]:<8} {result['status']:<8} "
+                     f"{ms(result, 'create'):>7} {ms(result, 'properties'):>7} {ms(result, 'start'):>7} "
+                     f"{ms(result, 'total'):>7}  {result['workflow_key'] or result['error'] or ''}")
+
+    lines.append('')
+    lines.append(f"{'STEP (ms)':<12} {'COUNT':>6} {'P50':>8} {'P90':>8} {'P99':>8} {'MAX':>8}")
+    for step, values in summary['latency_ms'].items():
+        lines.append(f"{step:<12} {values['count']:>6} {values['p50']:>8} {values['p90']:>8} "
+                     f"{values['p99']:>8} {values['max']:>8}")
+    lines.append('')
+    lines.append('Status: ' + ', '.join(f"{status}={count}" for status, count in sorted(summary['status'].items())))
+    return '\n'.join(lines)
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Bulk zOSMF workflow registration')
+    parser.add_argument('manifest', help='JSON or CSV manifest of instances')
+    parser.add_argument('--user', default=os.getenv('USER'), help='User ID for authentication')
+    parser.add_argument('--work-dir', required=True, help='Workflow working directory')
+    parser.add_argument('--port', type=int, default=443, help='Default zOSMF port')
+    parser.add_argument('--scheme', choices=['https', 'http'], default='https')
+    parser.add_argument('--insecure', action='store_true', help='Do not verify the TLS certificate')
+    parser.add_argument('--per-host', type=int, default=4, help='Concurrent requests per host')
+    parser.add_argument('--rate', type=float, default=10.0, help='Requests per second per host (0 = unlimited)')
+    parser.add_argument('--replace', action='store_true', help='Delete existing instances with the same name')
+    parser.add_argument('--no-start', action='store_true', help='Create and configure without starting')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s',
+                        datefmt='%Y-%m-%d %H:%M:%S')
+
+    password = os.getenv('ZOSMF_PASSWORD')
+    if password is None:
+        logging.error("ERROR: ZOSMF_PASSWORD must be set for bulk registration")
+        return 1
+
+    instances = load_manifest(args.manifest, args.port)
+    logging.info(f"Registering {len(instances)} workflow instances on "
+                 f"{len({instance['host'] for instance in instances})} hosts")
+
+    bulk = BulkRegistration(instances, args.user, password, args.work_dir,
+                            per_host=args.per_host, rate=args.rate, replace=args.replace,
+                            start=not args.no_start, scheme=args.scheme, verify=not args.insecure)
+    results = asyncio.run(bulk.run())
+    summary = summarize(results)
+    print(format_table(results, summary))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'summary': summary, 'results': results}, f, indent=2)
+
+    failed = sum(1 for result in results if result['status'] == 'FAILED')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
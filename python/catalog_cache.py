@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+catalog_cache.py - In-process LISTCAT result cache for zOS workflow utilities
+
+This module caches catalog lookups so repeated LISTCAT calls for the same
+dataset or LEVEL pattern do not cost another TSO round trip:
+- Entries keyed by dataset name (ENT) and by LEVEL pattern
+- TTL expiry and LRU eviction with a bounded entry count
+- Explicit invalidation when datasets are created or deleted
+- Optional on-disk JSON snapshot shared between workflow steps; saving
+  merges this process's changes into the current file, so entries other
+  steps invalidated meanwhile are not written back
+- Hit/miss/eviction counters for sizing
+
+Usage:
+    python3 catalog_cache.py stats --snapshot /u/user/workflow/temp/catalog_cache.json
+    python3 catalog_cache.py invalidate --snapshot FILE USER.WORK.DATA USER.LOG.TEST
+    python3 catalog_cache.py invalidate --snapshot FILE --level USER
+    python3 catalog_cache.py clear --snapshot FILE
+
+Environment:
+    WORKFLOW_CATALOG_CACHE          - snapshot file (default: none, in-process only)
+    WORKFLOW_CATALOG_CACHE_TTL      - entry lifetime in seconds (default: 300)
+    WORKFLOW_CATALOG_CACHE_ENTRIES  - maximum entries (default: 10000)
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import logging
+import argparse
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+SNAPSHOT_VERSION = 1
+
+ENTRY_PREFIX = 'ENT:'
+LEVEL_PREFIX = 'LEVEL:'
+
+
+def entry_key(dataset_name: str) -> str:
+    """Cache key for a LISTCAT ENT(...) lookup"""
+    return ENTRY_PREFIX + dataset_name.upper()
+
+
+def level_key(pattern: str) -> str:
+    """Cache key for a LISTCAT LEVEL(...) lookup"""
+    return LEVEL_PREFIX + pattern.upper()
+
+
+def _level_matches(pattern: str, dataset_name: str) -> bool:
+    """Check whether a dataset could appear under a LEVEL pattern"""
+    prefix = pattern.split('*', 1)[0].rstrip('.')
+    return dataset_name == prefix or dataset_name.startswith(prefix + '.') or \
+        ('*' in pattern and dataset_name.startswith(prefix))
+
+
+def _names_hit(key: str, names: Iterable[str]) -> bool:
+    """Check whether a key is stale once the named datasets changed"""
+    if key.startswith(ENTRY_PREFIX):
+        return key[len(ENTRY_PREFIX):] in names
+    pattern = key[len(LEVEL_PREFIX):]
+    return any(_level_matches(pattern, name) for name in names)
+
+
+def _level_hit(key: str, prefix: str) -> bool:
+    """Check whether a key is stale once everything under a LEVEL prefix changed"""
+    name = key.split(':', 1)[1]
+    return name == prefix or name.startswith(prefix + '.') or \
+        (key.startswith(LEVEL_PREFIX) and _level_matches(name, prefix))
+
+
+class CatalogCache:
+    """TTL + LRU cache of LISTCAT output"""
+
+    def __init__(self, ttl: float = 300, max_entries: int = 10000,
+                 snapshot_file: Optional[Union[str, Path]] = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.snapshot_file = Path(snapshot_file) if snapshot_file else None
+
+        # key -> (stored_at, value); wall-clock time so snapshots stay valid across processes
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._snapshot_mtime = None
+        # Changes since the snapshot was loaded, replayed onto it when saving
+        self._changed = set()
+        self._invalidations = []
+        self._cleared = False
+
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'expired': 0,
+            'evictions': 0,
+            'invalidations': 0
+        }
+
+        if self.snapshot_file:
+            self.load_snapshot()
+
+    def get(self, key: str) -> Tuple[bool, Optional[str]]:
+        """Return (found, value) for a key, counting hits and misses"""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self.stats['misses'] += 1
+                return False, None
+
+            stored_at, value = item
+            if time.time() - stored_at > self.ttl:
+                del self._entries[key]
+                self._dirty = True
+                self.stats['expired'] += 1
+                self.stats['misses'] += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return True, value
+
+    def put(self, key: str, value: Optional[str]):
+        """Store LISTCAT output for a key"""
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            self._changed.add(key)
+            self._dirty = True
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def invalidate(self, dataset_names: Iterable[str]) -> int:
+        """Drop entries for datasets and every LEVEL pattern covering them"""
+        names = [name.upper() for name in dataset_names]
+        removed = 0
+        with self._lock:
+            for key in list(self._entries):
+                if _names_hit(key, names):
+                    del self._entries[key]
+                    self._changed.discard(key)
+                    removed += 1
+            if names:
+                self._invalidations.append((_names_hit, names))
+                self._dirty = True
+            self.stats['invalidations'] += removed
+        return removed
+
+    def invalidate_level(self, pattern: str) -> int:
+        """Drop every entry under a LEVEL pattern, e.g. after a cleanup job"""
+        prefix = pattern.upper().split('*', 1)[0].rstrip('.')
+        removed = 0
+        with self._lock:
+            for key in list(self._entries):
+                if _level_hit(key, prefix):
+                    del self._entries[key]
+                    self._changed.discard(key)
+                    removed += 1
+            self._invalidations.append((_level_hit, prefix))
+            self._dirty = True
+            self.stats['invalidations'] += removed
+        return removed
+
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self.stats['invalidations'] += len(self._entries)
+            self._entries.clear()
+            self._changed.clear()
+            self._invalidations = []
+            self._cleared = True
+            self._dirty = True
+
+    def get_stats(self) -> Dict:
+        """Return counters plus current size and hit ratio"""
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            stats = dict(self.stats)
+            stats['entries'] = len(self._entries)
+            stats['max_entries'] = self.max_entries
+            stats['hit_ratio'] = round(self.stats['hits'] / lookups, 4) if lookups else 0.0
+            return stats
+
+    def _read_snapshot(self) -> Optional[list]:
+        """Entries of the snapshot file, None if there is no usable snapshot"""
+        if not self.snapshot_file or not self.snapshot_file.exists():
+            return None
+        try:
+            with open(self.snapshot_file, 'r') as f:
+                snapshot = json.load(f)
+        except Exception as e:
+            logging.warning(f"Error loading catalog cache snapshot {self.snapshot_file}: {e}")
+            return None
+        if snapshot.get('version') != SNAPSHOT_VERSION:
+            logging.warning(f"Ignoring catalog cache snapshot with unknown version: {self.snapshot_file}")
+            return None
+        return snapshot.get('entries', [])
+
+    def load_snapshot(self) -> bool:
+        """Load unexpired entries from the snapshot file"""
+        entries = self._read_snapshot()
+        if entries is None:
+            return False
+        now = time.time()
+        with self._lock:
+            for key, stored_at, value in entries:
+                if now - stored_at <= self.ttl:
+                    self._entries[key] = (stored_at, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._reset_changes()
+        self._snapshot_mtime = self._stat_snapshot()
+        logging.info(f"Loaded {len(self._entries)} catalog cache entries from {self.snapshot_file}")
+        return True
+
+    def _reset_changes(self):
+        """Forget changes once they are in the snapshot file (lock held)"""
+        self._changed.clear()
+        self._invalidations = []
+        self._cleared = False
+        self._dirty = False
+
+    def _merge_snapshot(self, now: float):
+        """Replay this process's changes onto the current snapshot file (lock held)
+
+        Entries on disk that this process did not store are kept as they are
+        now, so an invalidation made by another step since the snapshot was
+        loaded is not undone by writing back stale entries.
+        """
+        merged = OrderedDict()
+        if not self._cleared:
+            for key, stored_at, value in self._read_snapshot() or []:
+                if now - stored_at > self.ttl:
+                    continue
+                if any(hit(key, argument) for hit, argument in self._invalidations):
+                    continue
+                merged[key] = (stored_at, value)
+        for key, item in self._entries.items():
+            if key in self._changed and (key not in merged or merged[key][0] <= item[0]):
+                merged[key] = item
+        while len(merged) > self.max_entries:
+            merged.popitem(last=False)
+        self._entries = merged
+        self._reset_changes()
+
+    def save_snapshot(self, force: bool = False) -> bool:
+        """Merge changes into the snapshot file and replace it atomically"""
+        if not self.snapshot_file:
+            return False
+        with self._lock:
+            if not self._dirty and not force:
+                return True
+            now = time.time()
+            self._merge_snapshot(now)
+            entries = [[key, stored_at, value] for key, (stored_at, value) in self._entries.items()
+                       if now - stored_at <= self.ttl]
+
+        tmp_file = self.snapshot_file.with_name(f"{self.snapshot_file.name}.{os.getpid()}.tmp")
+        try:
+            self.snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_file, 'w') as f:
+                json.dump({'version': SNAPSHOT_VERSION, 'saved': now, 'entries': entries}, f)
+            os.replace(tmp_file, self.snapshot_file)
+            self._snapshot_mtime = self._stat_snapshot()
+            return True
+        except Exception as e:
+            logging.warning(f"Error saving catalog cache snapshot {self.snapshot_file}: {e}")
+            try:
+                tmp_file.unlink()
+            except OSError:
+                pass
+            return False
+
+    def _stat_snapshot(self) -> Optional[int]:
+        try:
+            return self.snapshot_file.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def sync_snapshot(self) -> bool:
+        """Reload the snapshot if another process changed it (long-lived processes); True if reloaded"""
+        if not self.snapshot_file:
+            return False
+        mtime = self._stat_snapshot()
+        if mtime == self._snapshot_mtime:
+            return False
+        # Invalidations by workflow steps only show up in the snapshot file
+        with self._lock:
+            self._entries.clear()
+            self._reset_changes()
+        self._snapshot_mtime = mtime
+        if mtime is not None:
+            self.load_snapshot()
+        return True
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> CatalogCache:
+    """Return the process-wide catalog cache configured from the environment"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = CatalogCache(
+                ttl=float(os.getenv('WORKFLOW_CATALOG_CACHE_TTL', '300')),
+                max_entries=int(os.getenv('WORKFLOW_CATALOG_CACHE_ENTRIES', '10000')),
+                snapshot_file=os.getenv('WORKFLOW_CATALOG_CACHE') or None
+            )
+            atexit.register(_default_cache.save_snapshot)
+        return _default_cache
+
+
+def main():
+    """Command line entry point for maintaining a snapshot from workflow steps"""
+    parser = argparse.ArgumentParser(description='zOS Workflow Catalog Cache')
+    parser.add_argument('action', choices=['stats', 'invalidate', 'clear'])
+    parser.add_argument('datasets', nargs='*', help='Dataset names to invalidate')
+    parser.add_argument('--snapshot', default=os.getenv('WORKFLOW_CATALOG_CACHE'),
+                        help='Snapshot file')
+    parser.add_argument('--level', help='Invalidate everything under this LEVEL pattern')
+    args = parser.parse_intermixed_args()
+
+    if not args.snapshot:
+        parser.error('--snapshot or WORKFLOW_CATALOG_CACHE is required')
+
+    if args.action != 'stats' and not os.path.exists(args.snapshot):
+        # Nothing cached yet, e.g. invalidation from the first create_datasets run
+        print(f"No catalog cache snapshot at {args.snapshot}")
+        return 0
+
+    # Disable TTL filtering so maintenance never drops entries silently
+    cache = CatalogCache(ttl=float('inf'), snapshot_file=args.snapshot)
+
+    if args.action == 'stats':
+        print(json.dumps(cache.get_stats(), indent=2))
+        return 0
+    if args.action == 'clear':
+        cache.clear()
+    else:
+        removed = cache.invalidate(args.datasets)
+        if args.level:
+            removed += cache.invalidate_level(args.level)
+        print(f"Invalidated {removed} catalog cache entries")
+    return 0 if cache.save_snapshot(force=True) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
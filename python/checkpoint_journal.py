@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+checkpoint_journal.py - Checkpoint journal for resumable data processing runs
+
+This module records the progress of WorkflowDataProcessor.run_processing in
+output_dir so an interrupted run can be resumed with --resume:
+- NDJSON journal: a header (schema version, HLQ, environment, report
+  timestamp, workflow_info and configuration), then one record per
+  completed dataset analysis or processing step
+- Records are buffered and written/fsynced at most every `interval`
+  seconds or `batch` records, which bounds the checkpoint overhead
+- On resume only offsets are indexed; analyses are read back on demand and
+  reused when the dataset fingerprint still matches. A truncated last line
+  from a crash is ignored
+- The journal is removed once the reports are complete
+"""
+
+import os
+import json
+import time
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+JOURNAL_VERSION = 1
+JOURNAL_NAME = 'processing_checkpoint.ndjson'
+
+
+class CheckpointJournal:
+    """Append-only progress journal of one processing run"""
+
+    def __init__(self, output_dir: Union[str, Path], hlq: str, environment: str,
+                 interval: float = 30.0, batch: int = 100):
+        self.journal_file = Path(output_dir) / JOURNAL_NAME
+        self.hlq = hlq
+        self.environment = environment
+        self.interval = interval
+        self.batch = max(1, batch)
+
+        self.header = None
+        self.analyses = {}
+        self.steps = {}
+        self._resumed = set()
+        self._reader = None
+        self._writer = None
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self.stats = {'records': 0, 'flushes': 0, 'resumed_analyses': 0}
+
+    # Resume
+
+    def load(self) -> bool:
+        """Index a previous journal of the same HLQ/environment; True if usable"""
+        if not self.journal_file.exists():
+            return False
+        try:
+            with open(self.journal_file, 'rb') as reader:
+                header = json.loads(reader.readline() or b'{}')
+                if (header.get('version') != JOURNAL_VERSION or header.get('hlq') != self.hlq
+                        or header.get('environment') != self.environment):
+                    logging.warning(f"Checkpoint journal {self.journal_file} belongs to another run, ignoring it")
+                    return False
+
+                offset = reader.tell()
+                valid_end = offset
+                for line in reader:
+                    if not line.endswith(b'\n'):
+                        # Partial record written when the previous run died
+                        break
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    if record.get('record_type') == 'dataset':
+                        self.analyses[record['dataset_name']] = (record.get('fingerprint'), offset)
+                    elif record.get('record_type') == 'step':
+                        self.steps[record['step']] = record.get('data')
+                    offset += len(line)
+                    valid_end = offset
+        except Exception as e:
+            logging.warning(f"Error reading checkpoint journal {self.journal_file}: {e}")
+            self.analyses = {}
+            self.steps = {}
+            return False
+
+        self.header = header
+        self._valid_end = valid_end
+        return True
+
+    def get(self, dataset_name: str, fingerprint: Optional[str]) -> Optional[Dict]:
+        """Return a journaled analysis if the dataset is unchanged"""
+        journaled = self.analyses.get(dataset_name)
+        if journaled is None or journaled[0] != fingerprint:
+            return None
+        if self._reader is None:
+            # Held open for the run, analyses are read back one at a time
+            self._reader = open(self.journal_file, 'rb')
+        self._reader.seek(journaled[1])
+        self._resumed.add(dataset_name)
+        self.stats['resumed_analyses'] += 1
+        return json.loads(self._reader.readline())['analysis']
+
+    # Recording
+
+    def start(self, timestamp: str, workflow_info: Dict, config: Dict):
+        """Open the journal: append to a loaded one, otherwise start a new one"""
+        if self.header is not None:
+            self._writer = open(self.journal_file, 'r+b')
+            # Drop any partial trailing record before appending
+            self._writer.truncate(self._valid_end)
+            self._writer.seek(self._valid_end)
+            return
+
+        self.header = {
+            'version': JOURNAL_VERSION,
+            'hlq': self.hlq,
+            'environment': self.environment,
+            'timestamp': timestamp,
+            'workflow_info': workflow_info,
+            'config': config
+        }
+        self._writer = open(self.journal_file, 'wb')
+        self._writer.write((json.dumps(self.header) + '\n').encode('utf-8'))
+        self.flush()
+
+    def record_analysis(self, analysis: Dict, fingerprint: Optional[str]):
+        """Queue a completed dataset analysis"""
+        if analysis['dataset_name'] in self._resumed or 'error' in analysis:
+            # Already journaled, or worth retrying on resume
+            return
+        self._append({'record_type': 'dataset', 'dataset_name': analysis['dataset_name'],
+                      'fingerprint': fingerprint, 'analysis': analysis})
+
+    def record_step(self, step: str, data=None):
+        """Record a completed processing step and checkpoint immediately"""
+        self.steps[step] = data
+        self._append({'record_type': 'step', 'step': step, 'data': data})
+        self.flush()
+
+    def _append(self, record: Dict):
+        self._buffer.append(json.dumps(record, separators=(',', ':')) + '\n')
+        self.stats['records'] += 1
+        if len(self._buffer) >= self.batch or time.monotonic() - self._last_flush >= self.interval:
+            self.flush()
+
+    def flush(self):
+        """Write buffered records and make them durable"""
+        if self._writer is None:
+            return
+        if self._buffer:
+            self._writer.write(''.join(self._buffer).encode('utf-8'))
+            self._buffer.clear()
+        self._writer.flush()
+        os.fsync(self._writer.fileno())
+        self._last_flush = time.monotonic()
+        self.stats['flushes'] += 1
+
+    def close(self):
+        """Flush and close, keeping the journal for a later resume"""
+        if self._writer is not None:
+            self.flush()
+            self._writer.close()
+            self._writer = None
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def complete(self):
+        """The run finished: the journal is no longer needed"""
+        self._buffer.clear()
+        self.close()
+        try:
+            self.journal_file.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+config_store.py - Cached configuration files and the workflow status journal
+
+This module backs ConfigurationManager in workflow_utilities.py:
+- Parsed .conf/.json files are cached per path and invalidated when the
+  file's mtime, size or inode changes. Files modified within the last
+  couple of seconds are always re-read, since USS timestamps may only have
+  one second resolution
+- Status updates are appended to <file>.journal as one JSON line per update
+  under an fcntl lock, so concurrent workflow steps never lose updates and
+  an update costs the same regardless of the status file size
+- The journal is compacted into the key=value snapshot (written to a
+  temporary file and moved into place with os.replace) once it exceeds
+  `compact_bytes`, after `compact_interval` seconds and at exit, so shell
+  steps reading the snapshot with grep see the merged state
+
+Usage:
+    python3 config_store.py get /u/user/workflow/config/workflow_status.conf [KEY]
+    python3 config_store.py set /u/user/workflow/config/workflow_status.conf STATUS=RUNNING
+    python3 config_store.py compact /u/user/workflow/config/workflow_status.conf
+    python3 config_store.py reset /u/user/workflow/config/workflow_status.conf STATUS=INITIALIZED ...
+"""
+
+import os
+import sys
+import copy
+import json
+import time
+import fcntl
+import atexit
+import logging
+import argparse
+import datetime
+import threading
+import contextlib
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, Union
+
+# Files changed this recently are re-read even if their stat looks unchanged
+RACY_SECONDS = 2.0
+
+
+def parse_conf(path: Union[str, Path]) -> Dict:
+    """Parse a key=value file, ignoring comments and blank lines"""
+    config = {}
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#') and '=' in line:
+                key, value = line.split('=', 1)
+                config[key.strip()] = value.strip()
+    return config
+
+
+def parse_json(path: Union[str, Path]):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def parser_for(path: Union[str, Path]) -> Callable:
+    return parse_json if str(path).endswith('.json') else parse_conf
+
+
+def write_atomic(path: Union[str, Path], content: str):
+    """Write a file through a temporary file and os.replace"""
+    path = Path(path)
+    tmp_file = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_file, 'w') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+    except BaseException:
+        try:
+            tmp_file.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def format_conf(config: Dict) -> str:
+    lines = [f"# Configuration file generated on {datetime.datetime.now()}\n"]
+    lines.extend(f"{key}={value}\n" for key, value in config.items())
+    return ''.join(lines)
+
+
+def _copy(value):
+    # key=value files only hold strings; JSON may be nested
+    if isinstance(value, dict) and all(type(item) is str for item in value.values()):
+        return dict(value)
+    return copy.deepcopy(value)
+
+
+def _signature(stat: os.stat_result) -> Tuple[int, int, int]:
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class ConfigFileCache:
+    """Parsed configuration files keyed by path, invalidated on stat changes"""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def load(self, path: Union[str, Path], parser: Optional[Callable] = None):
+        """Return a private copy of the parsed file (FileNotFoundError if missing)"""
+        path = str(path)
+        stat = os.stat(path)
+        signature = _signature(stat)
+        with self._lock:
+            cached = self._entries.get(path)
+            if cached is not None and cached[0] == signature and time.time() - stat.st_mtime > RACY_SECONDS:
+                self.stats['hits'] += 1
+                return _copy(cached[1])
+            self.stats['misses'] += 1
+
+        value = (parser or parser_for(path))(path)
+        with self._lock:
+            self._entries[path] = (signature, value)
+        return _copy(value)
+
+    def invalidate(self, path: Union[str, Path]):
+        with self._lock:
+            self._entries.pop(str(path), None)
+
+
+FILE_CACHE = ConfigFileCache()
+
+
+class StatusJournal:
+    """key=value snapshot plus an append-only journal of updates"""
+
+    def __init__(self, snapshot_file: Union[str, Path], compact_bytes: int = 64 * 1024,
+                 compact_interval: float = 60.0):
+        self.snapshot_file = Path(snapshot_file)
+        self.journal_file = self.snapshot_file.with_name(self.snapshot_file.name + '.journal')
+        self.lock_file = self.snapshot_file.with_name(self.snapshot_file.name + '.lock')
+        self.compact_bytes = compact_bytes
+        self.compact_interval = compact_interval
+        # fcntl locks are per process; threads are serialized separately
+        self._thread_lock = threading.RLock()
+        self._last_compaction = time.monotonic()
+        self._pending = False
+        self.stats = {'updates': 0, 'compactions': 0}
+
+    @contextlib.contextmanager
+    def _locked(self, exclusive: bool):
+        with self._thread_lock:
+            self.lock_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.lock_file, 'a+') as lock:
+                fcntl.lockf(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                try:
+                    yield
+                finally:
+                    fcntl.lockf(lock, fcntl.LOCK_UN)
+
+    def _read_journal(self) -> Tuple[Dict, int]:
+        """Merged updates from the journal and the number of entries"""
+        updates = {}
+        entries = 0
+        try:
+            with open(self.journal_file, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        # Writer died mid-append; the entry never completed
+                        break
+                    try:
+                        updates.update(json.loads(line)['updates'])
+                    except (ValueError, KeyError):
+                        continue
+                    entries += 1
+        except FileNotFoundError:
+            pass
+        return updates, entries
+
+    def _read_snapshot(self) -> Dict:
+        try:
+            return FILE_CACHE.load(self.snapshot_file, parse_conf)
+        except FileNotFoundError:
+            return {}
+
+    def read(self) -> Dict:
+        """Current status: snapshot with the journaled updates applied"""
+        with self._locked(exclusive=False):
+            status = self._read_snapshot()
+            updates, _ = self._read_journal()
+        status.update(updates)
+        return status
+
+    def update(self, updates: Dict) -> Dict:
+        """Append one update; compacts when the journal is due"""
+        record = json.dumps({'time': time.time(), 'pid': os.getpid(),
+                             'updates': {key: str(value) for key, value in updates.items()}})
+        with self._locked(exclusive=True):
+            # O_APPEND with a single write keeps each entry contiguous
+            fd = os.open(self.journal_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, (record + '\n').encode('utf-8'))
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            self.stats['updates'] += 1
+            self._pending = True
+
+            if (self.journal_file.stat().st_size >= self.compact_bytes
+                    or time.monotonic() - self._last_compaction >= self.compact_interval):
+                self._compact_locked()
+        return updates
+
+    def _compact_locked(self) -> int:
+        updates, entries = self._read_journal()
+        if entries:
+            status = self._read_snapshot()
+            status.update(updates)
+            write_atomic(self.snapshot_file, format_conf(status))
+            FILE_CACHE.invalidate(self.snapshot_file)
+            # The snapshot now holds every entry; only then drop the journal
+            os.unlink(self.journal_file)
+            self.stats['compactions'] += 1
+        self._last_compaction = time.monotonic()
+        self._pending = False
+        return entries
+
+    def compact(self) -> int:
+        """Merge the journal into the snapshot; returns the entries merged"""
+        with self._locked(exclusive=True):
+            return self._compact_locked()
+
+    def reset(self, status: Dict) -> int:
+        """Replace the snapshot and discard the journal; returns the entries discarded"""
+        with self._locked(exclusive=True):
+            _, entries = self._read_journal()
+            write_atomic(self.snapshot_file, format_conf({key: str(value) for key, value in status.items()}))
+            FILE_CACHE.invalidate(self.snapshot_file)
+            # A leftover journal would otherwise be replayed over the new snapshot
+            try:
+                os.unlink(self.journal_file)
+            except FileNotFoundError:
+                pass
+            self._last_compaction = time.monotonic()
+            self._pending = False
+        return entries
+
+
+_journals: Dict[str, StatusJournal] = {}
+_journals_lock = threading.Lock()
+
+
+def get_status_journal(snapshot_file: Union[str, Path]) -> StatusJournal:
+    """Return the process-wide journal of a status file"""
+    key = os.path.abspath(snapshot_file)
+    with _journals_lock:
+        journal = _journals.get(key)
+        if journal is None:
+            journal = _journals[key] = StatusJournal(snapshot_file)
+        return journal
+
+
+@atexit.register
+def _compact_pending():
+    """Leave an up to date snapshot for shell steps when the process ends"""
+    for journal in list(_journals.values()):
+        if journal._pending:
+            try:
+                journal.compact()
+            except Exception as e:
+                logging.warning(f"Error compacting status journal {journal.journal_file}: {e}")
+
+
+def main():
+    """Command line entry point for shell steps"""
+    parser = argparse.ArgumentParser(description='zOS Workflow status journal')
+    parser.add_argument('action', choices=['get', 'set', 'compact', 'reset'])
+    parser.add_argument('status_file', help='Status snapshot file (workflow_status.conf)')
+    parser.add_argument('items', nargs='*', help='KEY for get, KEY=VALUE for set and reset')
+    args = parser.parse_args()
+
+    journal = get_status_journal(args.status_file)
+    if args.action == 'get':
+        status = journal.read()
+        if args.items:
+            for key in args.items:
+                print(status.get(key, ''))
+        else:
+            for key, value in status.items():
+                print(f"{key}={value}")
+    elif args.action == 'set':
+        updates = dict(item.split('=', 1) for item in args.items if '=' in item)
+        if not updates:
+            parser.error('set requires KEY=VALUE items')
+        updates['LAST_UPDATE'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        journal.update(updates)
+    elif args.action == 'reset':
+        status = dict(item.split('=', 1) for item in args.items if '=' in item)
+        discarded = journal.reset(status)
+        if discarded:
+            print(f"Discarded {discarded} journal entries of {args.status_file}")
+    else:
+        print(f"Compacted {journal.compact()} journal entries into {args.status_file}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
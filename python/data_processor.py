@@ -17,72 +17,173 @@ Arguments:
     --environment: Target environment (DEV/TEST/PROD)
     --log-dir: Directory for log files
     --output-dir: Directory for output files
+    --workers: Number of concurrent dataset analysis workers (default: 1)
+    --executor: Worker type for concurrent analysis, thread or process (default: thread)
+    --ndjson: Also write the processing report as NDJSON
+    --gzip-reports: Compress the JSON/NDJSON reports with gzip
+    --incremental: Only analyze datasets changed since the previous run
+    --resume: Resume an interrupted run from output_dir/processing_checkpoint.ndjson
+    --checkpoint-interval/--checkpoint-batch: Bound checkpoint flushes (seconds/analyses)
+    --no-checkpoint: Do not write a checkpoint journal
+    --metrics: Collect timing/volume metrics, exported as a Prometheus textfile and
+               added to the JSON report (--metrics-file sets the textfile path)
+    --log-format: Log file format, text or json lines (see log_queue.py for rotation settings)
+    --hlq: High level qualifier to process (overrides HLQ in environment.conf)
 """
 
 import sys
 import os
 import argparse
-import logging
-import json
 import subprocess
 import datetime
 from pathlib import Path
-import re
+import functools
+import itertools
+import collections
+import concurrent.futures
+
+from tso_session import run_tso_command
+from listcat_parser import parse_listcat_text, unique_names
+from record_analysis import analyze_file, record_layout, ebcdic_encoding, EBCDIC_NEWLINE
+from workflow_utilities import DatasetUtilities
+from report_writer import ReportWriter
+from dataset_manifest import DatasetManifest, fingerprint_entry
+from checkpoint_journal import CheckpointJournal
+from metrics import METRICS, span, count
+from log_queue import configure_logger, shutdown_logging
+
+def new_dataset_analysis(dataset_name):
+    """Create an empty analysis record for a dataset"""
+    return {
+        'dataset_name': dataset_name,
+        'analysis_time': datetime.datetime.now().isoformat(),
+        'record_count': 0,
+        'total_bytes': 0,
+        'sample_records': [],
+        'statistics': {}
+    }
+
+def dataset_attributes(entry):
+    """DCB attributes of a LISTCAT entry needed to read its records"""
+    return {'record_format': entry.recfm, 'record_length': entry.lrecl}
+
+def build_dataset_analysis(dataset_name, temp_dir, attributes=None):
+    """Analyze content of a dataset without logging, safe to run in worker processes
+    
+    attributes are the dataset's DCB attributes from an earlier LISTCAT LEVEL
+    listing; without them the dataset is looked up with its own LISTCAT.
+    """
+    analysis = new_dataset_analysis(dataset_name)
+    
+    if dataset_name.startswith('/'):
+        # USS path: newline delimited text file
+        analysis['source'] = dataset_name
+        analysis.update(analyze_file(dataset_name))
+        return analysis
+    
+    if attributes is None:
+        info = DatasetUtilities.get_dataset_info(dataset_name)
+        if not info['exists']:
+            raise ValueError(f"Dataset not found: {dataset_name}")
+        attributes = info
+    
+    recfm = attributes['record_format']
+    lrecl = attributes['record_length']
+    layout = record_layout(recfm)
+    fixed = layout == 'fixed' and bool(lrecl)
+    rdw = layout == 'variable' and DatasetUtilities.can_copy_with_rdw()
+    analysis['record_format'] = recfm
+    
+    # Fixed records are copied as-is and memory-mapped, variable records are
+    # copied in binary with their RDWs; anything else is copied in text mode,
+    # which keeps record boundaries as EBCDIC newlines
+    staged_file = Path(temp_dir) / f"analysis_{os.getpid()}_{dataset_name}.dat"
+    if not DatasetUtilities.copy_dataset_to_file(dataset_name, staged_file, binary=fixed or rdw, rdw=rdw):
+        raise IOError(f"Could not copy dataset {dataset_name} for analysis")
+    
+    try:
+        analysis['source'] = str(staged_file)
+        if fixed or rdw:
+            result = analyze_file(staged_file, recfm, lrecl, encoding=ebcdic_encoding())
+        else:
+            result = analyze_file(staged_file, encoding=ebcdic_encoding(), newline=EBCDIC_NEWLINE)
+        analysis.update(result)
+    finally:
+        try:
+            staged_file.unlink()
+        except OSError:
+            pass
+    
+    return analysis
+
+def analyze_dataset_worker(dataset_name, attributes, temp_dir):
+    """Process pool entry point: failures are returned, never raised"""
+    try:
+        return build_dataset_analysis(dataset_name, temp_dir, attributes)
+    except Exception as e:
+        analysis = new_dataset_analysis(dataset_name)
+        analysis['error'] = str(e)
+        return analysis
 
 class WorkflowDataProcessor:
     """Main class for workflow data processing"""
     
-    def __init__(self, work_dir, environment, log_dir=None, output_dir=None):
+    def __init__(self, work_dir, environment, log_dir=None, output_dir=None,
+                 workers=1, executor='thread', report_ndjson=False, compress_reports=False,
+                 incremental=False, resume=False, checkpoint=True, checkpoint_interval=30.0,
+                 checkpoint_batch=100, metrics_file=None, log_format=None, hlq=None):
         self.work_dir = Path(work_dir)
         self.environment = environment
+        self.workers = max(1, workers)
+        self.executor = executor
+        self.report_ndjson = report_ndjson
+        self.compress_reports = compress_reports
+        self.incremental = incremental
+        self.resume = resume
+        self.checkpoint = checkpoint
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoint_batch = checkpoint_batch
+        self.metrics_file = Path(metrics_file) if metrics_file else None
+        self.log_format = log_format
+        self.dataset_fingerprints = {}
+        self.dataset_attributes = {}
         self.log_dir = Path(log_dir) if log_dir else self.work_dir / "logs"
         self.output_dir = Path(output_dir) if output_dir else self.work_dir / "output"
+        self.temp_dir = self.work_dir / "temp"
         
         # Create directories if they don't exist
         self.log_dir.mkdir(parents=True, exist_ok=True)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.temp_dir.mkdir(parents=True, exist_ok=True)
         
         # Setup logging
         self.setup_logging()
         
         # Configuration
         self.config = self.load_configuration()
+        if hlq:
+            self.config['HLQ'] = hlq
         
         self.logger.info(f"Initialized WorkflowDataProcessor")
         self.logger.info(f"Work Directory: {self.work_dir}")
         self.logger.info(f"Environment: {self.environment}")
         self.logger.info(f"Log Directory: {self.log_dir}")
         self.logger.info(f"Output Directory: {self.output_dir}")
+        self.logger.info(f"Analysis Workers: {self.workers} ({self.executor})")
     
     def setup_logging(self):
         """Setup logging configuration"""
         log_file = self.log_dir / f"python_processor_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
         
-        # Create logger
-        self.logger = logging.getLogger('WorkflowDataProcessor')
-        self.logger.setLevel(logging.INFO)
-        
-        # Create formatters
-        file_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        # Queued handlers: file/console I/O happens on a listener thread, and
+        # a second processor instance replaces them instead of adding more
+        self.logger = configure_logger(
+            'WorkflowDataProcessor',
+            log_file,
+            json_format=self.log_format == 'json' if self.log_format else None,
+            console_format='%(levelname)s - %(message)s'
         )
-        console_formatter = logging.Formatter(
-            '%(levelname)s - %(message)s'
-        )
-        
-        # File handler
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(logging.INFO)
-        file_handler.setFormatter(file_formatter)
-        
-        # Console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        console_handler.setFormatter(console_formatter)
-        
-        # Add handlers to logger
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        self.log_file = log_file
         
         self.logger.info(f"Logging initialized - log file: {log_file}")
     
@@ -113,28 +214,29 @@ class WorkflowDataProcessor:
     def execute_tso_command(self, command):
         """Execute TSO command and return output"""
         self.logger.info(f"Executing TSO command: {command}")
+        verb = command.split(None, 1)[0].upper()
+        count('tso_calls_total', command=verb)
         try:
-            # Use subprocess to execute TSO command
-            # Note: This is a simplified example - adjust for your system
-            result = subprocess.run(
-                ['tso', command],
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
+            # Runs on a pooled TSO session, see tso_session.py
+            with span('tso_command', command=verb):
+                result = run_tso_command(command, timeout=60)
             
             if result.returncode == 0:
                 self.logger.info("TSO command executed successfully")
+                count('tso_output_bytes_total', len(result.stdout), command=verb)
                 return result.stdout
             else:
+                count('tso_failures_total', command=verb)
                 self.logger.error(f"TSO command failed with return code: {result.returncode}")
                 self.logger.error(f"Error output: {result.stderr}")
                 return None
                 
         except subprocess.TimeoutExpired:
+            count('tso_failures_total', command=verb)
             self.logger.error("TSO command timed out")
             return None
         except Exception as e:
+            count('tso_failures_total', command=verb)
             self.logger.error(f"Error executing TSO command: {e}")
             return None
     
@@ -147,61 +249,126 @@ class WorkflowDataProcessor:
         output = self.execute_tso_command(command)
         
         datasets = []
+        self.dataset_fingerprints = {}
+        self.dataset_attributes = {}
         if output:
-            # Parse dataset names from output
-            lines = output.split('\n')
-            for line in lines:
-                # Look for dataset names (simplified parsing)
-                if hlq in line and 'NONVSAM' in line:
-                    dataset_match = re.search(r'([A-Z0-9.]+)', line)
-                    if dataset_match:
-                        datasets.append(dataset_match.group(1))
+            # Only sequential (NONVSAM) datasets can be analyzed record by record
+            with span('listcat_parse'):
+                entries = [entry for entry in parse_listcat_text(output) if entry.type == 'NONVSAM']
+                datasets = unique_names(entries, prefix=hlq)
+                for entry in entries:
+                    self.dataset_fingerprints.setdefault(entry.name, fingerprint_entry(entry))
+                    # Reused for the analysis copy instead of a LISTCAT per dataset
+                    self.dataset_attributes.setdefault(entry.name, dataset_attributes(entry))
         
         self.logger.info(f"Found {len(datasets)} datasets")
         return datasets
     
-    def analyze_dataset_content(self, dataset_name):
+    def analyze_dataset_content(self, dataset_name, attributes=None):
         """Analyze content of a dataset"""
         self.logger.info(f"Analyzing dataset: {dataset_name}")
-        
-        analysis = {
-            'dataset_name': dataset_name,
-            'analysis_time': datetime.datetime.now().isoformat(),
-            'record_count': 0,
-            'total_bytes': 0,
-            'sample_records': [],
-            'statistics': {}
-        }
+        if attributes is None:
+            attributes = self.dataset_attributes.get(dataset_name)
         
         try:
-            # Read dataset content (simplified example)
-            # In a real implementation, you would use appropriate z/OS dataset access methods
-            
-            # For demonstration, we'll simulate dataset analysis
-            analysis['record_count'] = 100  # Simulated
-            analysis['total_bytes'] = 8000   # Simulated
-            analysis['sample_records'] = [
-                'RECORD001 TEST DATA FOR ENVIRONMENT',
-                'RECORD002 PROCESSING DATE: 2024-01-01',
-                'RECORD003 PROCESSING TIME: 12:00:00'
-            ]
-            
-            analysis['statistics'] = {
-                'min_record_length': 80,
-                'max_record_length': 80,
-                'avg_record_length': 80,
-                'empty_records': 0,
-                'comment_records': 0
-            }
-            
+            with span('dataset_analysis'):
+                analysis = build_dataset_analysis(dataset_name, self.temp_dir, attributes)
             self.logger.info(f"Dataset analysis completed: {analysis['record_count']} records")
-            
         except Exception as e:
             self.logger.error(f"Error analyzing dataset {dataset_name}: {e}")
+            analysis = new_dataset_analysis(dataset_name)
             analysis['error'] = str(e)
         
         return analysis
     
+    def analyze_datasets(self, datasets):
+        """Analyze datasets, concurrently when more than one worker is configured"""
+        return list(self.iter_analyses(datasets))
+    
+    def iter_analyses(self, datasets, cached=None):
+        """Yield dataset analyses in listing order; cached(dataset) may supply unchanged ones"""
+        if cached is None:
+            cached = lambda dataset: None
+        
+        if self.workers <= 1 or len(datasets) <= 1:
+            for dataset in datasets:
+                analysis = cached(dataset)
+                yield analysis if analysis is not None else self.analyze_dataset_content(dataset)
+            return
+        
+        self.logger.info(f"Analyzing {len(datasets)} datasets with {self.workers} {self.executor} workers")
+        
+        if self.executor == 'process':
+            # CPU-bound statistics: worker processes cannot use our logger
+            executor_class = concurrent.futures.ProcessPoolExecutor
+            task = functools.partial(analyze_dataset_worker, temp_dir=str(self.temp_dir))
+        else:
+            # I/O-bound reads: threads share the logger and TSO session pool
+            executor_class = concurrent.futures.ThreadPoolExecutor
+            task = self.analyze_dataset_content
+        
+        # A bounded window of submitted tasks keeps results in listing order
+        # without holding more than a few finished analyses in memory
+        window = self.workers * 2
+        pending = collections.deque()
+        datasets_iter = iter(datasets)
+        with executor_class(max_workers=self.workers) as executor:
+            def submit(dataset):
+                analysis = cached(dataset)
+                if analysis is None:
+                    pending.append((dataset, executor.submit(task, dataset,
+                                                             self.dataset_attributes.get(dataset))))
+                else:
+                    pending.append((dataset, analysis))
+            
+            for dataset in itertools.islice(datasets_iter, window):
+                submit(dataset)
+            while pending:
+                dataset, future = pending.popleft()
+                if not isinstance(future, concurrent.futures.Future):
+                    for next_dataset in itertools.islice(datasets_iter, 1):
+                        submit(next_dataset)
+                    yield future
+                    continue
+                try:
+                    analysis = future.result()
+                except Exception as e:
+                    # e.g. a crashed worker process; keep the other results
+                    self.logger.error(f"Error analyzing dataset {dataset}: {e}")
+                    analysis = new_dataset_analysis(dataset)
+                    analysis['error'] = str(e)
+                else:
+                    if self.executor == 'process':
+                        if 'error' in analysis:
+                            self.logger.error(f"Error analyzing dataset {dataset}: {analysis['error']}")
+                        else:
+                            self.logger.info(f"Dataset analysis completed: {dataset} ({analysis['record_count']} records)")
+                for next_dataset in itertools.islice(datasets_iter, 1):
+                    submit(next_dataset)
+                yield analysis
+    
+    def record_analysis_metrics(self, analysis, cached=False):
+        """Count a finished analysis (also covers analyses from worker processes)"""
+        if not METRICS.enabled:
+            return
+        if 'error' in analysis:
+            count('analysis_failures_total')
+            return
+        count('datasets_total', source='cached' if cached else 'analyzed')
+        if not cached:
+            count('analysis_records_total', analysis.get('record_count', 0))
+            count('analysis_bytes_read_total', analysis.get('total_bytes', 0))
+    
+    def export_metrics(self):
+        """Write the Prometheus textfile when metrics are enabled"""
+        if not METRICS.enabled:
+            return
+        try:
+            metrics_file = METRICS.write_prometheus(self.metrics_file or self.output_dir / "processing_metrics.prom")
+            self.logger.info(f"Metrics written: {metrics_file}")
+        except Exception as e:
+            self.logger.warning(f"Error writing metrics: {e}")
+    
     def process_environment_data(self):
         """Process data based on environment"""
         self.logger.info(f"Processing data for environment: {self.environment}")
@@ -254,81 +421,45 @@ class WorkflowDataProcessor:
         
         return processing_result
     
-    def generate_reports(self, datasets_analysis, processing_result):
-        """Generate reports from processing results"""
-        self.logger.info("Generating processing reports")
-        
+    def report_identity(self):
+        """Timestamp and workflow_info of a new report"""
         timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
-        
-        # Generate JSON report
-        json_report_file = self.output_dir / f"processing_report_{timestamp}.json"
-        json_report = {
-            'workflow_info': {
-                'version': self.config.get('version', '1.0.0'),
-                'environment': self.environment,
-                'processing_date': datetime.datetime.now().isoformat(),
-                'work_directory': str(self.work_dir)
-            },
-            'datasets_analysis': datasets_analysis,
-            'processing_result': processing_result,
-            'summary': {
-                'total_datasets': len(datasets_analysis),
-                'processing_success': processing_result.get('results', {}).get('success', False),
-                'steps_completed': len(processing_result.get('steps_completed', [])),
-                'environment': self.environment
-            }
+        workflow_info = {
+            'version': self.config.get('version', '1.0.0'),
+            'environment': self.environment,
+            'processing_date': datetime.datetime.now().isoformat(),
+            'work_directory': str(self.work_dir)
         }
+        return timestamp, workflow_info
+    
+    def open_reports(self, timestamp=None, workflow_info=None):
+        """Start the streaming JSON/NDJSON/text reports"""
+        if timestamp is None:
+            timestamp, workflow_info = self.report_identity()
+        return ReportWriter(self.output_dir, timestamp, workflow_info,
+                            ndjson=self.report_ndjson, compress=self.compress_reports)
+    
+    def generate_reports(self, datasets_analysis, processing_result, report=None):
+        """Generate reports from processing results (any iterable of analyses)"""
+        self.logger.info("Generating processing reports")
         
         try:
-            with open(json_report_file, 'w') as f:
-                json.dump(json_report, f, indent=2)
-            self.logger.info(f"JSON report created: {json_report_file}")
+            if report is None:
+                report = self.open_reports()
+            for analysis in datasets_analysis:
+                report.add_dataset(analysis)
+            metrics = METRICS.summary() if METRICS.enabled else None
+            report.finish(processing_result, self.config, metrics)
         except Exception as e:
-            self.logger.error(f"Error creating JSON report: {e}")
+            self.logger.error(f"Error creating reports: {e}")
+            if report is not None:
+                report.abort()
+            return
         
-        # Generate text report
-        text_report_file = self.output_dir / f"processing_summary_{timestamp}.txt"
-        try:
-            with open(text_report_file, 'w') as f:
-                f.write("=" * 60 + "\n")
-                f.write("          WORKFLOW PROCESSING REPORT\n")
-                f.write("=" * 60 + "\n")
-                f.write(f"Date: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"Environment: {self.environment}\n")
-                f.write(f"Work Directory: {self.work_dir}\n")
-                f.write(f"Workflow Version: {self.config.get('version', '1.0.0')}\n")
-                f.write("\n")
-                
-                f.write("DATASET ANALYSIS SUMMARY:\n")
-                f.write("-" * 30 + "\n")
-                f.write(f"Total Datasets Analyzed: {len(datasets_analysis)}\n")
-                for analysis in datasets_analysis:
-                    f.write(f"  {analysis['dataset_name']}: {analysis['record_count']} records\n")
-                f.write("\n")
-                
-                f.write("PROCESSING RESULTS:\n")
-                f.write("-" * 20 + "\n")
-                f.write(f"Environment: {processing_result['environment']}\n")
-                f.write(f"Success: {processing_result.get('results', {}).get('success', False)}\n")
-                f.write(f"Steps Completed: {len(processing_result.get('steps_completed', []))}\n")
-                f.write("Steps:\n")
-                for step in processing_result.get('steps_completed', []):
-                    f.write(f"  - {step}\n")
-                f.write("\n")
-                
-                f.write("CONFIGURATION:\n")
-                f.write("-" * 15 + "\n")
-                for key, value in self.config.items():
-                    f.write(f"  {key}: {value}\n")
-                f.write("\n")
-                
-                f.write("=" * 60 + "\n")
-                f.write("              END OF REPORT\n")
-                f.write("=" * 60 + "\n")
-            
-            self.logger.info(f"Text report created: {text_report_file}")
-        except Exception as e:
-            self.logger.error(f"Error creating text report: {e}")
+        self.logger.info(f"JSON report created: {report.json_file}")
+        if report.ndjson_file:
+            self.logger.info(f"NDJSON report created: {report.ndjson_file}")
+        self.logger.info(f"Text report created: {report.text_file}")
     
     def run_processing(self):
         """Main processing method"""
@@ -336,6 +467,7 @@ class WorkflowDataProcessor:
         self.logger.info("Starting workflow data processing")
         self.logger.info("=" * 50)
         
+        journal = None
         try:
             # Get HLQ from configuration
             hlq = self.config.get('HLQ', 'USER')
@@ -343,20 +475,90 @@ class WorkflowDataProcessor:
             
             # Step 1: List and analyze datasets
             self.logger.info("Step 1: Analyzing datasets")
-            datasets = self.list_datasets(hlq)
-            datasets_analysis = []
+            with span('step', step='list_datasets'):
+                datasets = self.list_datasets(hlq)
             
-            for dataset in datasets:
-                analysis = self.analyze_dataset_content(dataset)
-                datasets_analysis.append(analysis)
+            # Checkpoint journal: a resumed run reuses completed analyses and
+            # the report identity, so its report matches an uninterrupted run
+            if self.checkpoint:
+                journal = CheckpointJournal(self.output_dir, hlq, self.environment,
+                                            self.checkpoint_interval, self.checkpoint_batch)
+                if self.resume:
+                    if journal.load():
+                        self.logger.info(f"Resuming from checkpoint: {len(journal.analyses)} datasets "
+                                         f"and {len(journal.steps)} steps already completed")
+                        self.config = journal.header['config']
+                    else:
+                        self.logger.warning("No usable checkpoint journal found, starting from the beginning")
+            
+            # Incremental mode: unchanged datasets reuse their previous analysis
+            manifest = None
+            reused = set()
+            if self.incremental:
+                manifest = DatasetManifest(self.output_dir / f"dataset_manifest_{hlq}.ndjson", hlq)
+                manifest.begin()
+            
+            def cached(dataset):
+                fingerprint = self.dataset_fingerprints.get(dataset)
+                analysis = journal.get(dataset, fingerprint) if journal is not None else None
+                if analysis is None and manifest is not None:
+                    analysis = manifest.get(dataset, fingerprint)
+                    if analysis is not None:
+                        reused.add(dataset)
+                return analysis
+            
+            if journal is not None and journal.header is not None:
+                timestamp, workflow_info = journal.header['timestamp'], journal.header['workflow_info']
+            else:
+                timestamp, workflow_info = self.report_identity()
+            if journal is not None:
+                journal.start(timestamp, workflow_info, self.config)
+            
+            # Each analysis goes straight to the reports as it completes
+            report = self.open_reports(timestamp, workflow_info)
+            try:
+                with span('step', step='analyze_datasets'):
+                    for analysis in self.iter_analyses(datasets, cached):
+                        self.record_analysis_metrics(analysis, cached=analysis['dataset_name'] in reused)
+                        report.add_dataset(analysis)
+                        name = analysis['dataset_name']
+                        fingerprint = self.dataset_fingerprints.get(name)
+                        if journal is not None:
+                            journal.record_analysis(analysis, fingerprint)
+                        if manifest is not None:
+                            manifest.record(name, fingerprint, analysis, name in reused)
+            except BaseException:
+                report.abort()
+                if manifest is not None:
+                    manifest.abort()
+                if journal is not None:
+                    journal.close()
+                raise
+            
+            if manifest is not None:
+                manifest.commit()
+                self.logger.info(f"Incremental analysis: {manifest.stats['analyzed']} analyzed, "
+                                 f"{manifest.stats['reused']} unchanged, {manifest.stats['removed']} removed")
             
             # Step 2: Environment-specific processing
             self.logger.info("Step 2: Environment-specific processing")
-            processing_result = self.process_environment_data()
+            if journal is not None and 'environment_processing' in journal.steps:
+                processing_result = journal.steps['environment_processing']
+                self.logger.info("Environment-specific processing restored from checkpoint")
+            else:
+                with span('step', step='environment_processing'):
+                    processing_result = self.process_environment_data()
+                if journal is not None:
+                    journal.record_step('environment_processing', processing_result)
             
             # Step 3: Generate reports
             self.logger.info("Step 3: Generating reports")
-            self.generate_reports(datasets_analysis, processing_result)
+            with span('step', step='reports'):
+                self.generate_reports([], processing_result, report)
+            if journal is not None:
+                journal.complete()
+            
+            self.export_metrics()
             
             # Step 4: Summary
             self.logger.info("Step 4: Processing summary")
@@ -373,32 +575,84 @@ class WorkflowDataProcessor:
                 
         except Exception as e:
             self.logger.error(f"Unexpected error in processing: {e}")
+            if journal is not None:
+                journal.close()
+                self.logger.info(f"Checkpoint kept for --resume: {journal.journal_file}")
             print(f"ERROR: {e}")
             return 1
 
-def main():
-    """Main entry point"""
+def build_parser():
+    """Command line options (shared with processor_daemon.py)"""
     parser = argparse.ArgumentParser(description='zOS Workflow Data Processor')
     parser.add_argument('--work-dir', required=True, help='Base working directory')
     parser.add_argument('--environment', required=True, choices=['DEV', 'TEST', 'PROD'], 
                        help='Target environment')
     parser.add_argument('--log-dir', help='Directory for log files')
     parser.add_argument('--output-dir', help='Directory for output files')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Number of concurrent dataset analysis workers (default: 1)')
+    parser.add_argument('--executor', choices=['thread', 'process'], default='thread',
+                       help='Worker type: thread for I/O-bound reads, process for CPU-bound statistics')
+    parser.add_argument('--ndjson', action='store_true',
+                       help='Also write the report as NDJSON (one record per line)')
+    parser.add_argument('--gzip-reports', action='store_true',
+                       help='Compress the JSON/NDJSON reports with gzip')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Only analyze datasets changed since the previous run')
+    parser.add_argument('--resume', action='store_true',
+                       help='Resume an interrupted run from its checkpoint journal')
+    parser.add_argument('--checkpoint-interval', type=float, default=30.0,
+                       help='Maximum seconds between checkpoint flushes (default: 30)')
+    parser.add_argument('--checkpoint-batch', type=int, default=100,
+                       help='Maximum analyses buffered between checkpoint flushes (default: 100)')
+    parser.add_argument('--no-checkpoint', action='store_true',
+                       help='Do not write a checkpoint journal')
+    parser.add_argument('--metrics', action='store_true',
+                       help='Collect timing/volume metrics (also WORKFLOW_METRICS=1)')
+    parser.add_argument('--metrics-file',
+                       help='Prometheus textfile path (default: output_dir/processing_metrics.prom)')
+    parser.add_argument('--log-format', choices=['text', 'json'],
+                       help='Log file format (default: WORKFLOW_LOG_FORMAT or text)')
+    parser.add_argument('--hlq', help='High level qualifier (default: HLQ from environment.conf)')
+    return parser
+
+def run_from_args(argv=None):
+    """Parse options, run one processing job and return its exit code"""
+    args = build_parser().parse_args(argv)
     
-    args = parser.parse_args()
+    if args.metrics:
+        METRICS.enabled = True
     
     # Create processor instance
     processor = WorkflowDataProcessor(
         work_dir=args.work_dir,
         environment=args.environment,
         log_dir=args.log_dir,
-        output_dir=args.output_dir
+        output_dir=args.output_dir,
+        workers=args.workers,
+        executor=args.executor,
+        report_ndjson=args.ndjson,
+        compress_reports=args.gzip_reports,
+        incremental=args.incremental,
+        resume=args.resume,
+        checkpoint=not args.no_checkpoint,
+        checkpoint_interval=args.checkpoint_interval,
+        checkpoint_batch=args.checkpoint_batch,
+        metrics_file=args.metrics_file,
+        log_format=args.log_format,
+        hlq=args.hlq
     )
     
     # Run processing
-    exit_code = processor.run_processing()
-    
-    sys.exit(exit_code)
+    try:
+        return processor.run_processing()
+    finally:
+        # Drain the log queue before returning
+        shutdown_logging()
+
+def main():
+    """Main entry point"""
+    sys.exit(run_from_args())
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
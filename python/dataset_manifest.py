@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+dataset_manifest.py - Dataset fingerprint manifest for incremental processing
+
+This module lets data_processor.py skip datasets that have not changed since
+the previous run:
+- Fingerprints are a digest of every LISTCAT ALL attribute of the entry
+  (dates, DCB attributes, space, extents/RBAs, volumes), so any catalog
+  visible change causes a re-analysis
+- USS files are fingerprinted from their size and modification time
+- The manifest is NDJSON: a header with the schema version, then one line
+  per dataset holding its fingerprint and last analysis. Only the
+  fingerprints and file offsets are kept in memory; cached analyses are read
+  back on demand
+- A new manifest is written alongside the old one and moved into place with
+  os.replace, so an interrupted run never leaves a corrupt manifest
+- Datasets missing from the current listing are dropped automatically
+"""
+
+import os
+import json
+import hashlib
+import logging
+import datetime
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from listcat_parser import CatalogEntry
+
+MANIFEST_VERSION = 1
+
+
+def fingerprint_entry(entry: CatalogEntry) -> str:
+    """Digest of all catalog attributes of a LISTCAT entry"""
+    digest = hashlib.sha1()
+    digest.update(f"{entry.type}|{entry.name}|{entry.organization}".encode('utf-8'))
+    for key in sorted(entry.fields):
+        digest.update(f"|{key}={entry.fields[key]}".encode('utf-8'))
+    digest.update(('|' + ','.join(entry.volumes)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def fingerprint_file(path: Union[str, Path]) -> Optional[str]:
+    """Size/mtime fingerprint of a USS file"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return f"uss:{stat.st_size}:{stat.st_mtime_ns}:{stat.st_ino}"
+
+
+class DatasetManifest:
+    """Previous fingerprints/analyses and the manifest being written for this run"""
+
+    def __init__(self, manifest_file: Union[str, Path], hlq: Optional[str] = None):
+        self.manifest_file = Path(manifest_file)
+        self.hlq = hlq
+        self.index = {}
+        self._previous = None
+        self._new = None
+        self._new_file = None
+        self.stats = {'reused': 0, 'analyzed': 0, 'removed': 0}
+        self.load()
+
+    def load(self):
+        """Index fingerprints and offsets of the previous manifest"""
+        if not self.manifest_file.exists():
+            return
+        try:
+            handle = open(self.manifest_file, 'rb')
+            header = json.loads(handle.readline() or b'{}')
+            if header.get('version') != MANIFEST_VERSION or header.get('hlq') != self.hlq:
+                logging.warning(f"Ignoring dataset manifest {self.manifest_file}: "
+                                f"version {header.get('version')}, HLQ {header.get('hlq')}")
+                handle.close()
+                return
+
+            offset = handle.tell()
+            for line in handle:
+                record = json.loads(line)
+                self.index[record['dataset_name']] = (record['fingerprint'], offset)
+                offset += len(line)
+            self._previous = handle
+        except Exception as e:
+            logging.warning(f"Error loading dataset manifest {self.manifest_file}: {e}")
+            self.index = {}
+
+    def get(self, dataset_name: str, fingerprint: Optional[str]) -> Optional[Dict]:
+        """Return the cached analysis if the dataset is unchanged"""
+        cached = self.index.get(dataset_name)
+        if cached is None or fingerprint is None or cached[0] != fingerprint:
+            return None
+        self._previous.seek(cached[1])
+        record = json.loads(self._previous.readline())
+        return record['analysis']
+
+    def begin(self):
+        """Start writing the manifest for this run"""
+        self._new_file = self.manifest_file.with_name(f"{self.manifest_file.name}.{os.getpid()}.tmp")
+        self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        self._new = open(self._new_file, 'w')
+        self._new.write(json.dumps({
+            'version': MANIFEST_VERSION,
+            'hlq': self.hlq,
+            'created': datetime.datetime.now().isoformat()
+        }) + '\n')
+        self._seen = set()
+
+    def record(self, dataset_name: str, fingerprint: Optional[str], analysis: Dict, reused: bool):
+        """Add a dataset to the new manifest; failed analyses are not cached"""
+        self.stats['reused' if reused else 'analyzed'] += 1
+        self._seen.add(dataset_name)
+        if fingerprint is None or 'error' in analysis:
+            return
+        self._new.write(json.dumps({
+            'dataset_name': dataset_name,
+            'fingerprint': fingerprint,
+            'analysis': analysis
+        }, separators=(',', ':')) + '\n')
+
+    def commit(self):
+        """Atomically replace the previous manifest"""
+        self.stats['removed'] = len(set(self.index) - self._seen)
+        self._new.flush()
+        os.fsync(self._new.fileno())
+        self._new.close()
+        self._new = None
+        self.close()
+        os.replace(self._new_file, self.manifest_file)
+
+    def abort(self):
+        """Discard the manifest being written"""
+        if self._new is not None:
+            self._new.close()
+            self._new = None
+            try:
+                os.unlink(self._new_file)
+            except OSError:
+                pass
+        self.close()
+
+    def close(self):
+        if self._previous is not None:
+            self._previous.close()
+            self._previous = None
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+fake_tso.py - Local stand-in for the `tso` command used by benchmarks
+
+This module answers the TSO commands issued by the workflow utilities
+without a z/OS system:
+- Interactive session mode (no command argument) following the tso_session
+  protocol: one command per stdin line, output terminated by ECHO <token>
+- One-shot mode when the command is passed as an argument, like `tso CMD`
+- LISTCAT LEVEL(...) returns a synthetic catalog of a configurable size,
+  LISTCAT ENT(...) a single NONVSAM entry; names containing MISSING are
+  reported as not found
+- Configurable address space startup delay and per-command latency
+
+Usage:
+    WORKFLOW_TSO_COMMAND="python3 fake_tso.py --latency 0.02 --entries 5000" \\
+        python3 data_processor.py ...
+    python3 fake_tso.py "LISTCAT LEVEL('USER') ALL"
+
+Environment (defaults for the options):
+    FAKE_TSO_LATENCY   - seconds per command (default: 0)
+    FAKE_TSO_STARTUP   - seconds before the first prompt (default: 0)
+    FAKE_TSO_ENTRIES   - entries returned by LISTCAT LEVEL (default: 100)
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+
+from listcat_parser import generate_synthetic_listcat
+
+LEVEL_PATTERN = re.compile(r"LEVEL\('?([^')]+)'?\)", re.IGNORECASE)
+ENTRY_PATTERN = re.compile(r"ENT(?:RIES)?\('?([^')]+)'?\)", re.IGNORECASE)
+
+NONVSAM_ENTRY = (
+    "NONVSAM ------- {name}\n"
+    "     IN-CAT --- CATALOG.USER.UCAT\n"
+    "     HISTORY\n"
+    "       DATASET-OWNER-----(NULL)     CREATION--------2024.015\n"
+    "     DSCBINFO\n"
+    "       RECFM-FB  LRECL-80  BLKSIZE-27920\n"
+    "     VOLUMES\n"
+    "       VOLSER------------VOL001     DEVTYPE------X'3010200F'\n"
+)
+
+
+def respond(command: str, entries: int) -> str:
+    """Output of one TSO command"""
+    verb = command.split(None, 1)[0].upper() if command.strip() else ''
+    if verb in ('LISTCAT', 'LISTC'):
+        match = LEVEL_PATTERN.search(command)
+        if match:
+            level = match.group(1).upper().rstrip('.*')
+            return ''.join(generate_synthetic_listcat(0, level, entry_count=entries))
+        match = ENTRY_PATTERN.search(command)
+        if match:
+            name = match.group(1).upper()
+            if 'MISSING' in name:
+                return f"IDC3012I ENTRY {name} NOT FOUND\n"
+            return NONVSAM_ENTRY.format(name=name)
+    if verb == 'TIME':
+        return time.strftime("IKJ56650I TIME-%I:%M:%S %p. CPU-00:00:00 SERVICE-0 SESSION-00:00:00\n")
+    return ''
+
+
+def run_session(latency: float, entries: int):
+    """Command/response loop used by TSOSession"""
+    for line in sys.stdin:
+        command = line.rstrip('\n')
+        if command.upper().startswith('ECHO '):
+            # Sentinel: print the token only (return code 0)
+            sys.stdout.write(command[5:] + '\n')
+            sys.stdout.flush()
+            continue
+        if command.strip().upper() in ('END', 'LOGOFF'):
+            break
+        if latency:
+            time.sleep(latency)
+        sys.stdout.write(respond(command, entries))
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Fake TSO for benchmarks')
+    parser.add_argument('command', nargs='*', help='Run one command and exit (one-shot mode)')
+    parser.add_argument('--latency', type=float, default=float(os.getenv('FAKE_TSO_LATENCY', '0')),
+                        help='Seconds added to every command')
+    parser.add_argument('--startup', type=float, default=float(os.getenv('FAKE_TSO_STARTUP', '0')),
+                        help='Seconds to start the (simulated) address space')
+    parser.add_argument('--entries', type=int, default=int(os.getenv('FAKE_TSO_ENTRIES', '100')),
+                        help='Entries returned by LISTCAT LEVEL')
+    args = parser.parse_args()
+
+    if args.startup:
+        time.sleep(args.startup)
+
+    if args.command:
+        if args.latency:
+            time.sleep(args.latency)
+        output = respond(' '.join(args.command), args.entries)
+        sys.stdout.write(output)
+        return 4 if 'NOT FOUND' in output else 0
+
+    run_session(args.latency, args.entries)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
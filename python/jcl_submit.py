@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+jcl_submit.py - Batch JCL submission with compiled templates and a shared completion wait
+
+This module submits the jcl/ templates through the zOSMF jobs REST API:
+- Each template is parsed once into literal text and symbol references
+  (&HLQ, &HLQ.., &JOB_PREFIX.01; && temporary names are left alone) and
+  cached in config_store.FILE_CACHE until the file changes, so rendering a
+  template for another variable set is a single join
+- Variables come from the default.* entries of workflow.properties, the
+  submission date/time and --var overrides; --each renders the templates
+  once per value (e.g. --each ENVIRONMENT=DEV,TEST)
+- At most system.max_concurrent_jobs jobs are in flight; free slots are
+  refilled as jobs finish
+- All in-flight jobs are waited for together: one job list request per
+  poll with exponential backoff while nothing changes
+- Per-job queue time (submitted -> started) and execution time
+  (started -> ended) are reported, from zOSMF exec-data when available
+
+Usage:
+    python3 jcl_submit.py --host zosmf.example.com --user USER \\
+        jcl/create_datasets.jcl jcl/process_data.jcl jcl/cleanup.jcl \\
+        [--properties workflow.properties] [--var HLQ=USER] [--max-concurrent 5] [--json]
+
+The password is read from ZOSMF_PASSWORD or prompted for. The exit code is 1 if
+a job failed (abend, JCL error or return code above --max-rc).
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import getpass
+import logging
+import argparse
+import datetime
+import collections
+import concurrent.futures
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from config_store import FILE_CACHE, parse_conf
+from zosmf_client import ZosmfClient, ZosmfError
+
+# && starts a temporary dataset name; &NAME. consumes the delimiting period
+SYMBOL_PATTERN = re.compile(r"&&|&([A-Z@#$][A-Z0-9@#$_]*)(\.?)")
+
+MAX_JCL_COLUMNS = 80
+
+# variables.properties restricts these to upper case identifiers
+UPPER_CASE_VARIABLES = ('WORKFLOW_OWNER', 'HLQ', 'JOB_PREFIX')
+
+FINAL_JOB_STATUS = 'OUTPUT'
+
+
+class JclTemplateError(ValueError):
+    """Raised when a rendered template is not valid JCL"""
+
+
+class JclTemplate:
+    """JCL text compiled into literals and symbol references"""
+
+    def __init__(self, text: str, name: str = ''):
+        self.name = name
+        # literals[i] precedes symbols[i]; the last literal follows the last symbol
+        self.literals: List[str] = []
+        self.symbols: List[Tuple[str, str]] = []
+        position = 0
+        for match in SYMBOL_PATTERN.finditer(text):
+            if match.group(1) is None:
+                continue
+            self.literals.append(text[position:match.start()])
+            self.symbols.append((match.group(1), match.group()))
+            position = match.end()
+        self.literals.append(text[position:])
+        self.names = frozenset(name for name, _ in self.symbols)
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> 'JclTemplate':
+        with open(path, 'r') as f:
+            return cls(f.read(), Path(path).stem)
+
+    def __deepcopy__(self, memo):
+        # Immutable; FILE_CACHE may hand out the same instance
+        return self
+
+    def render(self, variables: Dict[str, str], strict: bool = True) -> str:
+        """Substitute variables; unknown or empty symbols are an error unless strict is False"""
+        missing = {name for name in self.names if variables.get(name) in (None, '')}
+        if missing and strict:
+            raise JclTemplateError(f"{self.name}: no value for {', '.join(sorted(missing))}")
+
+        parts = [self.literals[0]]
+        for (name, original), literal in zip(self.symbols, self.literals[1:]):
+            value = variables.get(name)
+            parts.append(original if value is None else value)
+            parts.append(literal)
+
+        lines = [line.rstrip() for line in ''.join(parts).splitlines()]
+        for number, line in enumerate(lines, 1):
+            if len(line) > MAX_JCL_COLUMNS:
+                raise JclTemplateError(f"{self.name} line {number} exceeds {MAX_JCL_COLUMNS} columns "
+                                       f"after substitution: {line}")
+        return '\n'.join(lines) + '\n'
+
+
+def load_template(path: Union[str, Path]) -> JclTemplate:
+    """Compiled template, re-parsed only when the file changes"""
+    return FILE_CACHE.load(path, JclTemplate.from_file)
+
+
+def _user_name() -> str:
+    """Value of ${user.name}; USER is not always set in batch and BPXBATCH steps"""
+    user = os.getenv('USER') or os.getenv('LOGNAME')
+    if not user:
+        try:
+            user = getpass.getuser()
+        except (KeyError, OSError):
+            user = ''
+    return user
+
+
+def workflow_variables(properties_file: Optional[Union[str, Path]] = None,
+                       overrides: Optional[Dict[str, str]] = None,
+                       now: Optional[datetime.datetime] = None) -> Dict[str, str]:
+    """Template variables from workflow.properties defaults, the clock and overrides"""
+    variables = {}
+    if properties_file and os.path.isfile(properties_file):
+        properties = FILE_CACHE.load(properties_file, parse_conf)
+        user = _user_name()
+        for key, value in properties.items():
+            if key.startswith('default.'):
+                variables[key[len('default.'):]] = value.replace('${user.name}', user)
+        variables['JOB_CLASS'] = properties.get('system.default_job_class', 'A')
+        variables['MSGCLASS'] = properties.get('system.default_msgclass', 'H')
+    for name in UPPER_CASE_VARIABLES:
+        if name in variables:
+            variables[name] = variables[name].upper()
+
+    now = now or datetime.datetime.now()
+    variables['CURRENT_DATE'] = now.strftime('%Y/%m/%d')
+    variables['CURRENT_TIME'] = now.strftime('%H:%M:%S')
+    # Four digits (yddd) so that G&CURRENT_JULDATE.V00 is a valid qualifier
+    variables['CURRENT_JULDATE'] = now.strftime('%y%j')[-4:]
+    variables.update(overrides or {})
+    return variables
+
+
+def _exec_time(status: Dict, field: str) -> Optional[float]:
+    value = status.get(field)
+    if not value:
+        return None
+    try:
+        return datetime.datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
+
+def job_failed(retcode: Optional[str], max_rc: int) -> bool:
+    if not retcode:
+        return False
+    if retcode.startswith('CC '):
+        return int(retcode[3:]) > max_rc
+    # ABEND Sxxx, JCL ERROR, CANCELED, SEC ERROR, CONV ABEND, ...
+    return True
+
+
+class SubmittedJob:
+    """One submission and its observed lifecycle"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.jobname = None
+        self.jobid = None
+        self.status = None
+        self.retcode = None
+        self.error = None
+        self.submitted = None
+        self.started = None
+        self.ended = None
+
+    @property
+    def queue_seconds(self) -> Optional[float]:
+        if self.submitted is None or self.started is None:
+            return None
+        return max(0.0, self.started - self.submitted)
+
+    @property
+    def exec_seconds(self) -> Optional[float]:
+        if self.started is None or self.ended is None:
+            return None
+        return max(0.0, self.ended - self.started)
+
+    def update(self, status: Dict):
+        """Apply a job status; returns True if the status changed"""
+        changed = status.get('status') != self.status
+        self.status = status.get('status')
+        self.retcode = status.get('retcode')
+        now = time.time()
+        # exec-data timestamps are exact; the poll time is the fallback
+        self.submitted = _exec_time(status, 'exec-submitted') or self.submitted
+        if self.status in ('ACTIVE', FINAL_JOB_STATUS):
+            self.started = _exec_time(status, 'exec-started') or self.started or now
+        if self.status == FINAL_JOB_STATUS:
+            self.ended = _exec_time(status, 'exec-ended') or self.ended or now
+        return changed
+
+    def to_dict(self) -> Dict:
+        return {'name': self.name, 'jobname': self.jobname, 'jobid': self.jobid,
+                'status': self.status, 'retcode': self.retcode, 'error': self.error,
+                'queue_seconds': self.queue_seconds, 'exec_seconds': self.exec_seconds}
+
+
+class JobSubmitter:
+    """Submit jobs with a concurrency limit and wait for all of them together"""
+
+    def __init__(self, client: ZosmfClient, max_concurrent: int = 5, min_interval: float = 1.0,
+                 max_interval: float = 30.0, backoff: float = 2.0):
+        self.client = client
+        self.max_concurrent = max(1, max_concurrent)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.stats = {'submitted': 0, 'polls': 0, 'status_requests': 0}
+
+    def submit(self, name: str, jcl: str) -> SubmittedJob:
+        job = SubmittedJob(name)
+        job.submitted = time.time()
+        try:
+            result = self.client.submit_job(jcl)
+        except (ZosmfError, OSError) as e:
+            job.error = str(e)
+            logging.error(f"Submission of {name} failed: {e}")
+            return job
+        job.jobname = result.get('jobname')
+        job.jobid = result.get('jobid')
+        job.status = result.get('status')
+        self.stats['submitted'] += 1
+        logging.info(f"Submitted {name} as {job.jobname}({job.jobid})")
+        return job
+
+    def poll(self, active: Dict[str, SubmittedJob]) -> bool:
+        """Refresh all active jobs; finished jobs are removed. Returns True on any change"""
+        self.stats['polls'] += 1
+        jobnames = [job.jobname for job in active.values()]
+        prefix = os.path.commonprefix(jobnames)
+        statuses = {}
+        # Without a common prefix the list would cover every job on the system
+        if prefix:
+            # Jobs go through the internal reader under the client's user ID
+            owner = self.client.user.upper() if self.client.user else '*'
+            try:
+                self.stats['status_requests'] += 1
+                for status in self.client.list_jobs(owner=owner, prefix=prefix + '*', **{'exec-data': 'Y'}):
+                    statuses[status.get('jobid')] = status
+            except (ZosmfError, OSError) as e:
+                logging.warning(f"Job list failed, polling jobs one by one: {e}")
+
+        changed = False
+        for jobid, job in list(active.items()):
+            status = statuses.get(jobid)
+            if status is None:
+                # Not in the list (purged or list truncated): ask for the job itself
+                try:
+                    self.stats['status_requests'] += 1
+                    status = self.client.get_job(job.jobname, jobid)
+                except (ZosmfError, OSError) as e:
+                    if isinstance(e, ZosmfError) and e.status == 404:
+                        job.error = 'job no longer exists'
+                        del active[jobid]
+                        changed = True
+                    else:
+                        # Transient: the job stays active and is asked for again next poll
+                        logging.warning(f"Status request for {job.jobname}({jobid}) failed: {e}")
+                    continue
+            if job.update(status):
+                changed = True
+                logging.info(f"{job.jobname}({jobid}) {job.status} {job.retcode or ''}".rstrip())
+            if job.status == FINAL_JOB_STATUS:
+                del active[jobid]
+        return changed
+
+    def run(self, jobs: List[Tuple[str, str]], timeout: Optional[float] = None) -> List[SubmittedJob]:
+        """Submit (name, jcl) pairs and wait until every job has ended"""
+        deadline = time.monotonic() + timeout if timeout else None
+        pending = collections.deque(jobs)
+        active: Dict[str, SubmittedJob] = {}
+        results: List[SubmittedJob] = []
+        interval = self.min_interval
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_concurrent) as executor:
+            while pending or active:
+                batch = []
+                while pending and len(active) + len(batch) < self.max_concurrent:
+                    batch.append(pending.popleft())
+                for job in executor.map(lambda item: self.submit(*item), batch):
+                    results.append(job)
+                    if job.jobid:
+                        active[job.jobid] = job
+                if batch:
+                    # New submissions restart the short interval
+                    interval = self.min_interval
+                if not active:
+                    continue
+
+                if deadline is not None and time.monotonic() >= deadline:
+                    logging.error(f"Timed out waiting for {len(active)} jobs")
+                    for job in active.values():
+                        job.error = 'timed out'
+                    for name, _ in pending:
+                        job = SubmittedJob(name)
+                        job.error = 'not submitted (timed out)'
+                        results.append(job)
+                    break
+
+                time.sleep(interval)
+                if self.poll(active):
+                    interval = self.min_interval
+                else:
+                    interval = min(interval * self.backoff, self.max_interval)
+        return results
+
+
+def format_report(results: List[SubmittedJob], max_rc: int) -> str:
+    def seconds(value: Optional[float]) -> str:
+        return f"{value:.1f}" if value is not None else '-'
+
+    lines = [f"{'TEMPLATE':<20} {'JOB':<18} {'RETCODE':<12} {'QUEUE(s)':>9} {'EXEC(s)':>9}  RESULT"]
+    for job in results:
+        job_id = f"{job.jobname}({job.jobid})" if job.jobid else '-'
+        if job.error:
+            outcome = job.error
+        else:
+            outcome = 'FAILED' if job_failed(job.retcode, max_rc) else 'OK'
+        lines.append(f"{job.name:<20} {job_id:<18} {job.retcode or '-':<12} "
+                     f"{seconds(job.queue_seconds):>9} {seconds(job.exec_seconds):>9}  {outcome}")
+    return '\n'.join(lines)
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Batch JCL submission through zOSMF')
+    parser.add_argument('templates', nargs='+', help='JCL template files')
+    parser.add_argument('--host', default='localhost', help='zOSMF host')
+    parser.add_argument('--port', type=int, default=443, help='zOSMF port')
+    parser.add_argument('--user', default=os.getenv('USER'), help='User ID for authentication')
+    parser.add_argument('--scheme', choices=['https', 'http'], default='https')
+    parser.add_argument('--insecure', action='store_true', help='Do not verify the TLS certificate')
+    parser.add_argument('--properties', default='workflow.properties', help='workflow.properties file')
+    parser.add_argument('--var', action='append', default=[], help='KEY=VALUE variable override')
+    parser.add_argument('--each', help='KEY=V1,V2,... submit the templates once per value')
+    parser.add_argument('--max-concurrent', type=int, help='Jobs in flight (default: system.max_concurrent_jobs)')
+    parser.add_argument('--timeout', type=float, help='Seconds to wait (default: system.job_timeout)')
+    parser.add_argument('--max-rc', type=int, default=4, help='Highest return code that is not a failure')
+    parser.add_argument('--min-interval', type=float, default=1.0)
+    parser.add_argument('--max-interval', type=float, default=30.0)
+    parser.add_argument('--render-only', action='store_true', help='Print the rendered JCL, do not submit')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s',
+                        datefmt='%Y-%m-%d %H:%M:%S')
+
+    overrides = dict(item.split('=', 1) for item in args.var if '=' in item)
+    variables = workflow_variables(args.properties, overrides)
+    variable_sets = [variables]
+    if args.each:
+        key, _, values = args.each.partition('=')
+        variable_sets = [{**variables, key: value} for value in values.split(',') if value]
+
+    jobs = []
+    try:
+        for variable_set in variable_sets:
+            for path in args.templates:
+                template = load_template(path)
+                jobs.append((template.name, template.render(variable_set)))
+    except (OSError, JclTemplateError) as e:
+        logging.error(f"Template error: {e}")
+        return 2
+
+    if args.render_only:
+        for _, jcl in jobs:
+            sys.stdout.write(jcl)
+        return 0
+
+    properties = FILE_CACHE.load(args.properties, parse_conf) if os.path.isfile(args.properties) else {}
+    max_concurrent = args.max_concurrent or int(properties.get('system.max_concurrent_jobs', 5))
+    timeout = args.timeout or float(properties.get('system.job_timeout', 3600))
+
+    password = os.getenv('ZOSMF_PASSWORD')
+    if password is None:
+        password = getpass.getpass(f"Enter password for user {args.user}: ")
+
+    started = time.monotonic()
+    with ZosmfClient(args.host, args.port, args.user, password, scheme=args.scheme,
+                     verify=not args.insecure, pool_size=max_concurrent) as client:
+        client.login()
+        submitter = JobSubmitter(client, max_concurrent, args.min_interval, args.max_interval)
+        results = submitter.run(jobs, timeout)
+    elapsed = time.monotonic() - started
+
+    if args.json:
+        print(json.dumps({'elapsed_seconds': elapsed, 'stats': submitter.stats,
+                          'jobs': [job.to_dict() for job in results]}, indent=2))
+    else:
+        print(format_report(results, args.max_rc))
+        print(f"{len(results)} jobs in {elapsed:.1f}s ({submitter.stats['polls']} polls, "
+              f"{submitter.stats['status_requests']} status requests)")
+
+    failed = any(job.error or job_failed(job.retcode, args.max_rc) for job in results)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+job_spool.py - Streaming, parallel job spool retrieval over the zOSMF jobs REST API
+
+This module replaces after-the-fact scraping of the process_data, create_datasets
+and cleanup job output:
+- Lists a job's spool files and downloads them concurrently over the pooled
+  connections of ZosmfClient (one worker per pooled connection)
+- Large SYSOUT is requested in record ranges (X-IBM-Record-Range) and each
+  range is streamed to disk as it arrives; nothing is held in memory
+- Return codes, abends and JCL errors are detected while the data arrives by
+  SpoolScanner (IEF142I, IEF272I, IEF450I, IEF472I, IEFC452I, IEF453I, $HASP395)
+- Follow mode tails a running job: new records of every spool file are fetched
+  from the last record read, with a backoff while nothing changes, until the
+  job reaches OUTPUT
+
+Usage:
+    python3 job_spool.py --host zosmf.example.com --user USER PROCDATA JOB01234 \\
+        [--output-dir /u/user/workflow/output/spool] [--ddname JESMSGLG ...] [--follow]
+
+The password is read from ZOSMF_PASSWORD or prompted for. The exit code is 1 if
+the job abended, failed with a JCL error or ended with RC above --max-rc.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import codecs
+import getpass
+import logging
+import argparse
+import threading
+import concurrent.futures
+from pathlib import Path
+from urllib.parse import quote
+from typing import Callable, Dict, IO, Iterable, List, Optional
+
+from zosmf_client import ZosmfClient, ZosmfError, JOBS_PATH
+
+# One pattern per message of interest, matched over whole chunks at once
+SPOOL_PATTERN = re.compile(
+    r"IEF142I (?P<cc_step>.+?) - STEP WAS EXECUTED - COND CODE (?P<cc>\d{4})"
+    r"|IEF272I (?P<nx_step>.+?) - STEP WAS NOT EXECUTED"
+    r"|IEF450I (?P<ab_step>.+?) - ABEND=(?P<ab>[SU][0-9A-F]{3,4})"
+    r"|IEF472I (?P<cc_abend_step>.+?) - COMPLETION CODE - SYSTEM=(?P<sys>[0-9A-F]{3}) USER=(?P<user>\d{4})"
+    r"|(?P<jcl>(?:IEFC452I|IEF453I) .*?JCL ERROR)"
+    r"|\$HASP395 (?P<job>\S+)\s+ENDED(?: - (?:RC=(?P<job_rc>\d+)|ABEND=(?P<job_abend>\S+)))?"
+)
+
+DEFAULT_CHUNK_RECORDS = 5000
+
+# zOSMF job status after which no more spool output is written
+FINAL_JOB_STATUS = 'OUTPUT'
+
+
+class SpoolEvent:
+    """A return code, abend or JCL error found in the spool"""
+
+    def __init__(self, kind: str, step: Optional[str], code: Optional[str], ddname: str, text: str):
+        self.kind = kind
+        self.step = step
+        self.code = code
+        self.ddname = ddname
+        self.text = text
+
+    @property
+    def is_failure(self) -> bool:
+        return self.kind in ('abend', 'jcl_error')
+
+    def to_dict(self) -> Dict:
+        return {'kind': self.kind, 'step': self.step, 'code': self.code,
+                'ddname': self.ddname, 'text': self.text}
+
+    def __repr__(self):
+        return f"SpoolEvent({self.kind}, {self.step}, {self.code})"
+
+
+def _step_name(names: str) -> str:
+    # "JOBNAME [PROCSTEP] STEPNAME": everything after the job name
+    return names.split(None, 1)[-1]
+
+
+class SpoolScanner:
+    """Incremental scanner; feed() accepts arbitrary chunks of spool text"""
+
+    def __init__(self, ddname: str = '', callback: Optional[Callable[[SpoolEvent], None]] = None):
+        self.ddname = ddname
+        self.callback = callback
+        self.events: List[SpoolEvent] = []
+        self.max_rc = None
+        self._tail = ''
+
+    def feed(self, text: str):
+        """Scan complete lines; a trailing partial line waits for the next chunk"""
+        text = self._tail + text
+        end = text.rfind('\n') + 1
+        self._tail = text[end:]
+        if end:
+            self._scan(text, end)
+
+    def finish(self):
+        """Scan whatever is left after the last chunk"""
+        if self._tail:
+            tail, self._tail = self._tail, ''
+            self._scan(tail, len(tail))
+
+    def _scan(self, text: str, end: int):
+        for match in SPOOL_PATTERN.finditer(text, 0, end):
+            groups = match.groupdict()
+            if groups['cc'] is not None:
+                event = SpoolEvent('rc', _step_name(groups['cc_step']), groups['cc'], self.ddname, match.group())
+                self.max_rc = max(self.max_rc or 0, int(groups['cc']))
+            elif groups['nx_step'] is not None:
+                event = SpoolEvent('not_executed', _step_name(groups['nx_step']), None, self.ddname, match.group())
+            elif groups['ab'] is not None:
+                event = SpoolEvent('abend', _step_name(groups['ab_step']), groups['ab'], self.ddname, match.group())
+            elif groups['sys'] is not None:
+                if groups['sys'] == '000' and groups['user'] == '0000':
+                    continue
+                code = f"S{groups['sys']}" if groups['sys'] != '000' else f"U{groups['user']}"
+                event = SpoolEvent('abend', _step_name(groups['cc_abend_step']), code, self.ddname, match.group())
+            elif groups['jcl'] is not None:
+                event = SpoolEvent('jcl_error', None, None, self.ddname, match.group())
+            elif groups['job_abend'] is not None:
+                event = SpoolEvent('abend', None, groups['job_abend'], self.ddname, match.group())
+            else:
+                event = SpoolEvent('job_ended', None, groups['job_rc'], self.ddname, match.group())
+                if groups['job_rc'] is not None:
+                    self.max_rc = max(self.max_rc or 0, int(groups['job_rc']))
+            self.events.append(event)
+            if self.callback is not None:
+                self.callback(event)
+
+
+class SpoolFile:
+    """Download state of one spool file"""
+
+    def __init__(self, info: Dict):
+        self.info = info
+        self.id = info.get('id')
+        self.ddname = info.get('ddname', '')
+        self.stepname = info.get('stepname') or ''
+        self.records = 0
+        self.bytes = 0
+
+    @property
+    def file_name(self) -> str:
+        parts = [str(self.id), self.stepname, self.ddname]
+        return '.'.join(part for part in parts if part) + '.txt'
+
+
+class JobResult:
+    """Outcome of a job, merged from the scanners of all its spool files"""
+
+    def __init__(self, jobname: str, jobid: str):
+        self.jobname = jobname
+        self.jobid = jobid
+        self.status = None
+        self.retcode = None
+        self.events: List[SpoolEvent] = []
+        self.max_rc = None
+        self.files: Dict[str, str] = {}
+
+    def set_status(self, status: Dict):
+        self.status = status.get('status')
+        self.retcode = status.get('retcode')
+        if self.retcode and self.retcode.startswith('CC '):
+            self.max_rc = max(self.max_rc or 0, int(self.retcode[3:]))
+
+    def add(self, scanner: SpoolScanner):
+        self.events.extend(scanner.events)
+        if scanner.max_rc is not None:
+            self.max_rc = max(self.max_rc or 0, scanner.max_rc)
+
+    @property
+    def failed(self) -> bool:
+        retcode = self.retcode or ''
+        return (any(event.is_failure for event in self.events)
+                or retcode.startswith(('ABEND', 'JCL ERROR', 'CANCELED', 'SYS ')))
+
+    def to_dict(self) -> Dict:
+        return {'jobname': self.jobname, 'jobid': self.jobid, 'status': self.status,
+                'retcode': self.retcode, 'max_rc': self.max_rc, 'failed': self.failed,
+                'files': self.files, 'events': [event.to_dict() for event in self.events]}
+
+
+class JobSpool:
+    """Spool access for one job"""
+
+    def __init__(self, client: ZosmfClient, jobname: str, jobid: str,
+                 chunk_records: int = DEFAULT_CHUNK_RECORDS, workers: Optional[int] = None,
+                 callback: Optional[Callable[[SpoolEvent], None]] = None):
+        self.client = client
+        self.jobname = jobname
+        self.jobid = jobid
+        self.chunk_records = chunk_records
+        # More workers than pooled connections would only wait for a slot
+        self.workers = workers or client.pool_size
+        self.callback = callback
+        self._callback_lock = threading.Lock()
+        self.stats = {'files': 0, 'records': 0, 'bytes': 0, 'range_requests': 0}
+        self._stats_lock = threading.Lock()
+
+    def status(self) -> Dict:
+        return self.client.get_job(self.jobname, self.jobid)
+
+    def files(self, ddnames: Optional[Iterable[str]] = None) -> List[SpoolFile]:
+        """Spool files, optionally restricted to some DD names"""
+        wanted = {ddname.upper() for ddname in ddnames} if ddnames else None
+        return [SpoolFile(info) for info in self.client.list_spool_files(self.jobname, self.jobid)
+                if wanted is None or info.get('ddname', '').upper() in wanted]
+
+    def _event(self, event: SpoolEvent):
+        if self.callback is not None:
+            # Workers report concurrently; keep callback output whole
+            with self._callback_lock:
+                self.callback(event)
+
+    def read_range(self, spool_file: SpoolFile, output: IO[str], scanner: SpoolScanner,
+                   count: int) -> int:
+        """Stream `count` records from the current offset; returns the records received"""
+        path = f"{JOBS_PATH}/{quote(self.jobname)}/{quote(self.jobid)}/files/{spool_file.id}/records"
+        headers = {'Accept': 'text/plain', 'X-IBM-Record-Range': f"{spool_file.records},{count}"}
+        decoder = codecs.getincrementaldecoder('utf-8')('replace')
+        received = 0
+        last = ''
+        for chunk in self.client.stream('GET', path, headers):
+            text = decoder.decode(chunk)
+            if not text:
+                continue
+            output.write(text)
+            scanner.feed(text)
+            received += text.count('\n')
+            last = text[-1]
+            spool_file.bytes += len(chunk)
+        text = decoder.decode(b'', final=True)
+        if text:
+            output.write(text)
+            scanner.feed(text)
+            received += text.count('\n')
+            last = text[-1]
+        if last and last != '\n':
+            # Keep one record per line in the output file
+            output.write('\n')
+            scanner.feed('\n')
+            received += 1
+
+        spool_file.records += received
+        with self._stats_lock:
+            self.stats['range_requests'] += 1
+            self.stats['records'] += received
+        return received
+
+    def read_new(self, spool_file: SpoolFile, output: IO[str], scanner: SpoolScanner) -> int:
+        """Read everything after the current offset, one record range at a time"""
+        total = 0
+        while True:
+            received = self.read_range(spool_file, output, scanner, self.chunk_records)
+            total += received
+            if received < self.chunk_records:
+                return total
+
+    def download_file(self, spool_file: SpoolFile, destination: Path) -> SpoolScanner:
+        scanner = SpoolScanner(spool_file.ddname, self._event)
+        with open(destination, 'w', encoding='utf-8') as output:
+            self.read_new(spool_file, output, scanner)
+        scanner.finish()
+        with self._stats_lock:
+            self.stats['files'] += 1
+            self.stats['bytes'] += spool_file.bytes
+        return scanner
+
+    def download(self, output_dir: str, ddnames: Optional[Iterable[str]] = None) -> JobResult:
+        """Download all (or the selected) spool files concurrently"""
+        result = JobResult(self.jobname, self.jobid)
+        directory = Path(output_dir) / f"{self.jobname}.{self.jobid}"
+        directory.mkdir(parents=True, exist_ok=True)
+
+        spool_files = self.files(ddnames)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self.download_file, spool_file, directory / spool_file.file_name):
+                       spool_file for spool_file in spool_files}
+            # Merge in spool order, independent of completion order
+            for future, spool_file in futures.items():
+                result.add(future.result())
+                # DD names repeat across steps (one SYSPRINT per step); file names carry the spool id
+                result.files[spool_file.file_name] = str(directory / spool_file.file_name)
+
+        result.set_status(self.status())
+        return result
+
+    def follow(self, output: IO[str], ddnames: Optional[Iterable[str]] = None,
+               min_interval: float = 1.0, max_interval: float = 30.0,
+               timeout: Optional[float] = None) -> JobResult:
+        """Tail a running job's spool until it reaches OUTPUT"""
+        result = JobResult(self.jobname, self.jobid)
+        deadline = time.monotonic() + timeout if timeout else None
+        tracked: Dict[int, SpoolFile] = {}
+        scanners: Dict[int, SpoolScanner] = {}
+        interval = min_interval
+        while True:
+            status = self.status()
+            finished = status.get('status') == FINAL_JOB_STATUS
+            for spool_file in self.files(ddnames):
+                if spool_file.id not in tracked:
+                    tracked[spool_file.id] = spool_file
+                    scanners[spool_file.id] = SpoolScanner(spool_file.ddname, self._event)
+
+            received = 0
+            for file_id, spool_file in tracked.items():
+                # Ranges are read one file at a time so tailed lines stay in order
+                received += self.read_new(spool_file, output, scanners[file_id])
+            output.flush()
+
+            # The last read after OUTPUT has every record
+            if finished or (deadline is not None and time.monotonic() >= deadline):
+                result.set_status(status)
+                break
+            interval = min_interval if received else min(interval * 2, max_interval)
+            time.sleep(interval)
+
+        for file_id, spool_file in tracked.items():
+            scanners[file_id].finish()
+            result.add(scanners[file_id])
+        return result
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Streaming zOSMF job spool retrieval')
+    parser.add_argument('jobname', help='Job name')
+    parser.add_argument('jobid', help='Job ID (JOBnnnnn)')
+    parser.add_argument('--host', default='localhost', help='zOSMF host')
+    parser.add_argument('--port', type=int, default=443, help='zOSMF port')
+    parser.add_argument('--user', default=os.getenv('USER'), help='User ID for authentication')
+    parser.add_argument('--scheme', choices=['https', 'http'], default='https')
+    parser.add_argument('--insecure', action='store_true', help='Do not verify the TLS certificate')
+    parser.add_argument('--output-dir', default='spool', help='Directory for downloaded spool files')
+    parser.add_argument('--ddname', action='append', default=[], help='Only this DD (repeatable)')
+    parser.add_argument('--follow', action='store_true', help='Tail the spool to stdout until the job ends')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent downloads (pooled connections)')
+    parser.add_argument('--chunk-records', type=int, default=DEFAULT_CHUNK_RECORDS,
+                        help='Records per range request')
+    parser.add_argument('--max-rc', type=int, default=4, help='Highest return code that is not a failure')
+    parser.add_argument('--timeout', type=float, help='Stop following after this many seconds')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s',
+                        datefmt='%Y-%m-%d %H:%M:%S')
+
+    password = os.getenv('ZOSMF_PASSWORD')
+    if password is None:
+        password = getpass.getpass(f"Enter password for user {args.user}: ")
+
+    def report(event: SpoolEvent):
+        if event.kind != 'rc' or int(event.code) > args.max_rc:
+            logging.warning(f"{event.ddname}: {event.text}")
+
+    try:
+        with ZosmfClient(args.host, args.port, args.user, password, scheme=args.scheme,
+                         verify=not args.insecure, pool_size=args.workers) as client:
+            client.login()
+            spool = JobSpool(client, args.jobname.upper(), args.jobid.upper(), args.chunk_records,
+                             args.workers, report)
+            if args.follow:
+                result = spool.follow(sys.stdout, args.ddname, timeout=args.timeout)
+            else:
+                result = spool.download(args.output_dir, args.ddname)
+            logging.info(f"Spool statistics: {spool.stats}")
+    except ZosmfError as e:
+        logging.error(f"Spool retrieval failed: {e}")
+        return 2
+
+    print(json.dumps(result.to_dict(), indent=2), file=sys.stderr if args.follow else sys.stdout)
+    if result.failed or (result.max_rc or 0) > args.max_rc:
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
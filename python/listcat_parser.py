@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+listcat_parser.py - Streaming IDCAMS LISTCAT output parser
+
+This module turns LISTCAT output into typed catalog entries in one pass:
+- Reads any iterable of lines (pipe, file object, StringIO) incrementally;
+  TSO command output is buffered by the catalog cache and parsed as a string
+- Yields one CatalogEntry per NONVSAM, VSAM cluster/data/index, AIX, PATH,
+  GDG base and ALIAS entry as soon as the entry is complete
+- Extracts RECFM, LRECL, BLKSIZE, space, RBA and creation/expiration dates
+- Set-based de-duplication of entry names, linear in the size of the output
+
+Usage:
+    python3 listcat_parser.py listcat_output.txt
+    python3 listcat_parser.py --benchmark 1000000
+"""
+
+import io
+import re
+import sys
+import json
+import time
+import argparse
+import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+# Entry header lines, e.g. "NONVSAM ------- USER.WORK.DATA" or "   DATA ------- USER.KSDS.DATA"
+HEADER_PATTERN = re.compile(
+    r'^\s*(NONVSAM|CLUSTER|DATA|INDEX|AIX|PATH|GDG BASE|ALIAS|USERCATALOG|PAGESPACE)\s+-+\s+(\S+)'
+)
+
+# Attribute fields, e.g. "LRECL-80", "CREATION--------2024.001", "STORAGECLASS ---STANDARD"
+FIELD_PATTERN = re.compile(r'([A-Z][A-Z0-9]*(?:-[A-Z][A-Z0-9]*)*) ?-+ ?(\S+)')
+
+ENTRY_TYPES = {
+    'NONVSAM': 'NONVSAM',
+    'CLUSTER': 'CLUSTER',
+    'DATA': 'DATA',
+    'INDEX': 'INDEX',
+    'AIX': 'AIX',
+    'PATH': 'PATH',
+    'GDG BASE': 'GDG',
+    'ALIAS': 'ALIAS',
+    'USERCATALOG': 'USERCATALOG',
+    'PAGESPACE': 'PAGESPACE'
+}
+
+VSAM_TYPES = {'CLUSTER', 'DATA', 'INDEX', 'AIX', 'PATH'}
+COMPONENT_TYPES = {'DATA', 'INDEX'}
+
+# VSAM organization keywords printed in the ATTRIBUTES group
+ORGANIZATION_FLAGS = {
+    'INDEXED': 'KSDS',
+    'NONINDEXED': 'ESDS',
+    'NUMBERED': 'RRDS',
+    'LINEAR': 'LDS'
+}
+
+
+def julian_to_iso(value: Optional[str]) -> Optional[str]:
+    """Convert a LISTCAT yyyy.ddd date to ISO format (None for 0000.000)"""
+    if not value:
+        return None
+    try:
+        year, day = value.split('.', 1)
+        if int(year) == 0:
+            return None
+        date = datetime.date(int(year), 1, 1) + datetime.timedelta(days=int(day[:3]) - 1)
+        return date.isoformat()
+    except (ValueError, OverflowError):
+        return None
+
+
+def _to_int(value: Optional[str]) -> Optional[int]:
+    """Parse a numeric LISTCAT field"""
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+class CatalogEntry:
+    """One catalog entry from LISTCAT output"""
+
+    __slots__ = ('name', 'type', 'parent', 'fields', 'volumes', 'organization')
+
+    def __init__(self, name: str, entry_type: str, parent: Optional[str] = None):
+        self.name = name
+        self.type = entry_type
+        self.parent = parent
+        self.fields = {}
+        self.volumes = []
+        self.organization = None
+
+    @property
+    def is_vsam(self) -> bool:
+        return self.type in VSAM_TYPES
+
+    @property
+    def is_component(self) -> bool:
+        return self.type in COMPONENT_TYPES
+
+    @property
+    def catalog(self) -> Optional[str]:
+        return self.fields.get('IN-CAT')
+
+    @property
+    def recfm(self) -> Optional[str]:
+        return self.fields.get('RECFM')
+
+    @property
+    def lrecl(self) -> Optional[int]:
+        return _to_int(self.fields.get('LRECL') or self.fields.get('MAXLRECL'))
+
+    @property
+    def blksize(self) -> Optional[int]:
+        return _to_int(self.fields.get('BLKSIZE') or self.fields.get('CISIZE'))
+
+    @property
+    def space_type(self) -> Optional[str]:
+        return self.fields.get('SPACE-TYPE')
+
+    @property
+    def space_primary(self) -> Optional[int]:
+        return _to_int(self.fields.get('SPACE-PRI'))
+
+    @property
+    def space_secondary(self) -> Optional[int]:
+        return _to_int(self.fields.get('SPACE-SEC'))
+
+    @property
+    def allocated_bytes(self) -> Optional[int]:
+        return _to_int(self.fields.get('HI-A-RBA'))
+
+    @property
+    def used_bytes(self) -> Optional[int]:
+        return _to_int(self.fields.get('HI-U-RBA'))
+
+    @property
+    def created(self) -> Optional[str]:
+        return julian_to_iso(self.fields.get('CREATION'))
+
+    @property
+    def expires(self) -> Optional[str]:
+        return julian_to_iso(self.fields.get('EXPIRATION'))
+
+    def to_dict(self) -> Dict:
+        """Convert entry to a JSON friendly dictionary"""
+        return {
+            'name': self.name,
+            'type': self.type,
+            'parent': self.parent,
+            'catalog': self.catalog,
+            'organization': self.organization,
+            'recfm': self.recfm,
+            'lrecl': self.lrecl,
+            'blksize': self.blksize,
+            'space_type': self.space_type,
+            'space_primary': self.space_primary,
+            'space_secondary': self.space_secondary,
+            'allocated_bytes': self.allocated_bytes,
+            'used_bytes': self.used_bytes,
+            'created': self.created,
+            'expires': self.expires,
+            'volumes': list(self.volumes)
+        }
+
+    def __repr__(self):
+        return f"CatalogEntry({self.type} {self.name})"
+
+
+def parse_listcat(lines: Iterable[str]) -> Iterator[CatalogEntry]:
+    """Parse LISTCAT output incrementally, yielding entries as they complete"""
+    header_match = HEADER_PATTERN.match
+    field_findall = FIELD_PATTERN.findall
+    # A cluster is held back until its DATA/INDEX components have been read,
+    # so its organization is known when it is yielded
+    pending = []
+    entry = None
+    cluster = None
+
+    for line in lines:
+        header = header_match(line)
+        if header:
+            entry_type = ENTRY_TYPES[header.group(1)]
+            name = header.group(2)
+            if entry_type in COMPONENT_TYPES:
+                entry = CatalogEntry(name, entry_type, cluster.name if cluster else None)
+            else:
+                yield from pending
+                pending.clear()
+                entry = CatalogEntry(name, entry_type)
+                cluster = entry if entry_type in ('CLUSTER', 'AIX') else None
+            pending.append(entry)
+            continue
+
+        if entry is None or '-' not in line:
+            if entry is not None and entry.type in VSAM_TYPES:
+                for word in line.split():
+                    organization = ORGANIZATION_FLAGS.get(word)
+                    if organization:
+                        entry.organization = organization
+                        if cluster is not None and cluster.organization is None:
+                            cluster.organization = organization
+            continue
+
+        entry_fields = entry.fields
+        for key, value in field_findall(line):
+            if key == 'VOLSER':
+                entry.volumes.append(value)
+            elif key not in entry_fields:
+                entry_fields[key] = value
+
+    yield from pending
+
+
+def parse_listcat_text(text: str) -> Iterator[CatalogEntry]:
+    """Parse LISTCAT output held in a string
+
+    TSO output reaches the workflow utilities whole: a pooled session reads
+    up to the sentinel, one-shot `tso` runs through subprocess.run, and the
+    catalog cache stores the complete text for later lookups and steps.
+    Those callers parse the string; parse_listcat() streams files and pipes.
+    """
+    return parse_listcat(io.StringIO(text))
+
+
+def unique_names(entries: Iterable[CatalogEntry], types: Optional[Set[str]] = None,
+                 prefix: Optional[str] = None) -> List[str]:
+    """Return de-duplicated entry names in first-seen order, optionally filtered"""
+    seen = set()
+    names = []
+    for entry in entries:
+        if types is not None and entry.type not in types:
+            continue
+        if prefix is not None and not entry.name.startswith(prefix):
+            continue
+        if entry.name not in seen:
+            seen.add(entry.name)
+            names.append(entry.name)
+    return names
+
+
+def generate_synthetic_listcat(line_count: int, hlq: str = 'USER',
+                               entry_count: Optional[int] = None) -> Iterator[str]:
+    """Generate synthetic LISTCAT ALL output with roughly line_count lines (or entry_count entries)"""
+    nonvsam_block = [
+        "     IN-CAT --- CATALOG.USER.UCAT\n",
+        "     HISTORY\n",
+        "       DATASET-OWNER-----(NULL)     CREATION--------2024.015\n",
+        "       RELEASE----------------2     EXPIRATION------0000.000\n",
+        "     SMSDATA\n",
+        "       STORAGECLASS ---STANDARD     MANAGEMENTCLASS---(NULL)\n",
+        "       DATACLASS ------(NULL)       LBACKUP ---0000.000.0000\n",
+        "     DSCBINFO\n",
+        "       RECFM-FB  LRECL-80  BLKSIZE-27920\n",
+        "     VOLUMES\n",
+        "       VOLSER------------VOL001     DEVTYPE------X'3010200F'\n",
+        "     ASSOCIATIONS--------(NULL)\n",
+        "     ATTRIBUTES\n"
+    ]
+    vsam_block = [
+        "     IN-CAT --- CATALOG.USER.UCAT\n",
+        "     HISTORY\n",
+        "       DATASET-OWNER-----(NULL)     CREATION--------2024.015\n",
+        "   DATA ------- {name}.DATA\n",
+        "     ATTRIBUTES\n",
+        "       KEYLEN-----------------8     AVGLRECL--------------80     BUFSPACE------------8192\n",
+        "       RKP--------------------0     MAXLRECL-------------200     CISIZE--------------4096\n",
+        "       INDEXED  NOWRITECHK  NOIMBED  NOREPLICAT\n",
+        "     ALLOCATION\n",
+        "       SPACE-TYPE------CYLINDER     HI-A-RBA---------737280\n",
+        "       SPACE-PRI--------------1     HI-U-RBA---------368640\n",
+        "       SPACE-SEC--------------1\n",
+        "   INDEX ------ {name}.INDEX\n",
+        "     ATTRIBUTES\n",
+        "       KEYLEN-----------------8     AVGLRECL---------------0     CISIZE--------------1024\n"
+    ]
+
+    produced = 0
+    index = 0
+    while (produced < line_count) if entry_count is None else (index < entry_count):
+        index += 1
+        if index % 10 == 0:
+            name = f"{hlq}.VSAM.K{index:07d}"
+            yield f"CLUSTER ------- {name}\n"
+            block = [line.format(name=name) for line in vsam_block]
+        else:
+            name = f"{hlq}.DATA.D{index:07d}"
+            yield f"NONVSAM ------- {name}\n"
+            block = nonvsam_block
+        produced += 1
+        for line in block:
+            yield line
+        produced += len(block)
+
+
+def run_benchmark(line_count: int) -> Dict:
+    """Time parsing and de-duplication of synthetic LISTCAT output"""
+    text = ''.join(generate_synthetic_listcat(line_count))
+    lines = text.count('\n')
+
+    start = time.perf_counter()
+    entries = 0
+    for _ in parse_listcat_text(text):
+        entries += 1
+    parse_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    names = unique_names(parse_listcat_text(text), types={'NONVSAM', 'CLUSTER'})
+    names_seconds = time.perf_counter() - start
+
+    return {
+        'lines': lines,
+        'bytes': len(text),
+        'entries': entries,
+        'unique_datasets': len(names),
+        'parse_seconds': round(parse_seconds, 3),
+        'lines_per_second': int(lines / parse_seconds) if parse_seconds else None,
+        'list_datasets_seconds': round(names_seconds, 3)
+    }
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='LISTCAT output parser')
+    parser.add_argument('file', nargs='?', help='LISTCAT output file (default: stdin)')
+    parser.add_argument('--benchmark', type=int, metavar='LINES',
+                        help='Benchmark parsing of synthetic output with this many lines')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        print(json.dumps(run_benchmark(args.benchmark), indent=2))
+        return 0
+
+    stream = open(args.file, 'r') if args.file else sys.stdin
+    try:
+        for entry in parse_listcat(stream):
+            print(json.dumps(entry.to_dict()))
+    finally:
+        if args.file:
+            stream.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+log_queue.py - Non-blocking queue based logging for workflow processing
+
+This module moves log file and console I/O off the calling thread:
+- Loggers get a single QueueHandler; a background listener thread writes the
+  records to the real handlers
+- The file handler writes through a buffer that is flushed in batches (every
+  `batch_size` records or `flush_interval` seconds, whichever comes first)
+- Size and time based rotation (name.log -> name.log.1 ... name.log.N)
+- Optional structured output: one JSON object per line
+- configure_logger() is idempotent: calling it again for the same logger
+  replaces its queue handler and listener instead of adding another one
+- shutdown_logging() (also registered with atexit) drains the queues and
+  flushes every file
+
+Usage:
+    logger = configure_logger('WorkflowDataProcessor', log_file, json_format=True)
+    logger.info("...")
+    shutdown_logging()
+
+Environment (defaults for configure_logger):
+    WORKFLOW_LOG_FORMAT          - text or json file format (default: text)
+    WORKFLOW_LOG_MAX_BYTES       - rotate when the file exceeds this size, 0 disables (default: 52428800)
+    WORKFLOW_LOG_ROTATE_SECONDS  - rotate after this many seconds, 0 disables (default: 0)
+    WORKFLOW_LOG_BACKUPS         - rotated files kept (default: 5)
+    WORKFLOW_LOG_FLUSH_INTERVAL  - maximum seconds between file flushes (default: 1.0)
+"""
+
+import os
+import json
+import time
+import queue
+import atexit
+import logging
+import datetime
+import threading
+import logging.handlers
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+DEFAULT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+_STOP = object()
+
+
+class JsonLineFormatter(logging.Formatter):
+    """One JSON object per record"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'timestamp': datetime.datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName,
+            'process': record.process
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class BatchedRotatingFileHandler(logging.Handler):
+    """File handler that flushes in batches and rotates by size and/or age"""
+
+    def __init__(self, filename: Union[str, Path], max_bytes: int = 0, rotate_seconds: float = 0,
+                 backup_count: int = 5, encoding: str = 'utf-8'):
+        super().__init__()
+        self.filename = Path(filename)
+        self.max_bytes = max_bytes
+        self.rotate_seconds = rotate_seconds
+        self.backup_count = backup_count
+        self.encoding = encoding
+        self.rotations = 0
+        self.stream = None
+        self._open()
+
+    def _open(self):
+        self.stream = open(self.filename, 'a', encoding=self.encoding, buffering=DEFAULT_BUFFER_SIZE)
+        self.opened = time.time()
+
+    def _should_rotate(self, size: int) -> bool:
+        if self.max_bytes and self.stream.tell() + size > self.max_bytes and self.stream.tell() > 0:
+            return True
+        return bool(self.rotate_seconds) and time.time() - self.opened >= self.rotate_seconds
+
+    def rotate(self):
+        """Close the current file and shift name.log -> name.log.1 -> ... name.log.N"""
+        self.stream.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = self.filename.with_name(f"{self.filename.name}.{index}")
+                if source.exists():
+                    os.replace(source, self.filename.with_name(f"{self.filename.name}.{index + 1}"))
+            os.replace(self.filename, self.filename.with_name(f"{self.filename.name}.1"))
+        else:
+            self.filename.unlink()
+        self.rotations += 1
+        self._open()
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            line = self.format(record) + '\n'
+            if self._should_rotate(len(line)):
+                self.rotate()
+            # No flush here: the listener flushes once per batch
+            self.stream.write(line)
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        with self.lock:
+            if self.stream and not self.stream.closed:
+                self.stream.flush()
+
+    def close(self):
+        with self.lock:
+            if self.stream and not self.stream.closed:
+                self.stream.flush()
+                self.stream.close()
+        super().close()
+
+
+class BatchingQueueListener:
+    """Background thread draining a log queue into handlers"""
+
+    def __init__(self, log_queue: queue.Queue, handlers: List[logging.Handler],
+                 flush_interval: float = 1.0, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.queue = log_queue
+        self.handlers = handlers
+        self.flush_interval = flush_interval
+        self.batch_size = max(1, batch_size)
+        self.stats = {'records': 0, 'flushes': 0}
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='log-listener', daemon=True)
+        self._thread.start()
+
+    def _handle(self, record: logging.LogRecord):
+        self.stats['records'] += 1
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def _flush(self):
+        for handler in self.handlers:
+            handler.flush()
+        self.stats['flushes'] += 1
+
+    def _run(self):
+        pending = 0
+        last_flush = time.monotonic()
+        while True:
+            try:
+                record = self.queue.get(timeout=self.flush_interval if pending else None)
+            except queue.Empty:
+                # Quiet period: make the batch visible
+                self._flush()
+                pending = 0
+                last_flush = time.monotonic()
+                continue
+            if record is _STOP:
+                break
+            self._handle(record)
+            pending += 1
+            if pending >= self.batch_size or time.monotonic() - last_flush >= self.flush_interval:
+                self._flush()
+                pending = 0
+                last_flush = time.monotonic()
+        self._flush()
+
+    def stop(self):
+        """Write everything queued so far, then close the handlers"""
+        if self._thread is not None:
+            self.queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+        for handler in self.handlers:
+            handler.close()
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler tagged with the logger it was installed on"""
+
+    def __init__(self, log_queue: queue.Queue, logger_name: str):
+        super().__init__(log_queue)
+        self.logger_name = logger_name
+
+
+_listeners: Dict[str, BatchingQueueListener] = {}
+_listeners_lock = threading.Lock()
+
+
+def _env_float(name: str, default: str) -> float:
+    return float(os.getenv(name, default))
+
+
+def configure_logger(name: str, log_file: Optional[Union[str, Path]] = None, level: int = logging.INFO,
+                     console: bool = True, json_format: Optional[bool] = None,
+                     file_format: str = DEFAULT_FORMAT, console_format: str = DEFAULT_FORMAT,
+                     max_bytes: Optional[int] = None, rotate_seconds: Optional[float] = None,
+                     backup_count: Optional[int] = None, flush_interval: Optional[float] = None,
+                     batch_size: int = DEFAULT_BATCH_SIZE) -> logging.Logger:
+    """Route a logger through a queue to file/console handlers (idempotent per logger name)"""
+    if json_format is None:
+        json_format = os.getenv('WORKFLOW_LOG_FORMAT', 'text').lower() == 'json'
+    if max_bytes is None:
+        max_bytes = int(os.getenv('WORKFLOW_LOG_MAX_BYTES', str(50 * 1024 * 1024)))
+    if rotate_seconds is None:
+        rotate_seconds = _env_float('WORKFLOW_LOG_ROTATE_SECONDS', '0')
+    if backup_count is None:
+        backup_count = int(os.getenv('WORKFLOW_LOG_BACKUPS', '5'))
+    if flush_interval is None:
+        flush_interval = _env_float('WORKFLOW_LOG_FLUSH_INTERVAL', '1.0')
+
+    handlers = []
+    if log_file is not None:
+        file_handler = BatchedRotatingFileHandler(log_file, max_bytes, rotate_seconds, backup_count)
+        file_handler.setLevel(level)
+        file_handler.setFormatter(JsonLineFormatter() if json_format else logging.Formatter(file_format))
+        handlers.append(file_handler)
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(level)
+        console_handler.setFormatter(logging.Formatter(console_format))
+        handlers.append(console_handler)
+
+    logger = logging.getLogger(name)
+    with _listeners_lock:
+        log_queue = queue.SimpleQueue()
+        listener = BatchingQueueListener(log_queue, handlers, flush_interval, batch_size)
+        listener.start()
+        queue_handler = _QueueHandler(log_queue, name)
+
+        # Replace rather than add, so repeated setup never duplicates lines
+        logger.addHandler(queue_handler)
+        for handler in list(logger.handlers):
+            if isinstance(handler, _QueueHandler) and handler is not queue_handler:
+                logger.removeHandler(handler)
+        previous = _listeners.pop(name, None)
+        if previous is not None:
+            previous.stop()
+        _listeners[name] = listener
+
+        logger.setLevel(level)
+        # Records must not reach the root logger's handlers as well
+        logger.propagate = False
+    return logger
+
+
+def listener_stats(name: str) -> Optional[Dict]:
+    """Records/flushes written for a configured logger"""
+    listener = _listeners.get(name)
+    return dict(listener.stats) if listener else None
+
+
+def shutdown_logging(name: Optional[str] = None):
+    """Drain and close the listener of one logger, or of all loggers"""
+    with _listeners_lock:
+        names = [name] if name is not None else list(_listeners)
+        for logger_name in names:
+            listener = _listeners.pop(logger_name, None)
+            if listener is None:
+                continue
+            logger = logging.getLogger(logger_name)
+            for handler in list(logger.handlers):
+                if isinstance(handler, _QueueHandler):
+                    logger.removeHandler(handler)
+            listener.stop()
+
+
+atexit.register(shutdown_logging)
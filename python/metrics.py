@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+metrics.py - Lightweight instrumentation for workflow processing
+
+This module collects timing and volume metrics from the processor and
+utilities without external dependencies:
+- Spans: timed blocks per processing step and external call, recorded in
+  latency histograms and, for top-level steps, in a step timeline
+- Counters: TSO calls, bytes read/written, cache hits, failures, ...
+- Histograms with fixed latency buckets
+- Export as a Prometheus textfile (node_exporter textfile collector) and as
+  a JSON summary added to the processing report
+
+Metrics are off unless enabled with WORKFLOW_METRICS=1 or metrics.enable().
+While disabled, span() returns a shared no-op object and count()/observe()
+return after a single flag test.
+
+Usage:
+    from metrics import METRICS, span, count, timed
+
+    with span('tso_command', command='LISTCAT'):
+        ...
+    count('bytes_read_total', len(data))
+
+    @timed('config_load')
+    def load(...):
+        ...
+"""
+
+import os
+import time
+import json
+import bisect
+import functools
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+METRIC_PREFIX = 'zos_workflow_'
+
+# Latency buckets in seconds (upper bounds)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _label_key(labels: Dict) -> tuple:
+    return tuple(sorted(labels.items())) if labels else ()
+
+
+def _format_labels(label_key: tuple, extra: Optional[Dict] = None) -> str:
+    items = list(label_key) + (list(extra.items()) if extra else [])
+    if not items:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for _, value in items)
+    return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(items, escaped)) + '}'
+
+
+class Histogram:
+    """Fixed bucket histogram"""
+
+    __slots__ = ('buckets', 'counts', 'count', 'total', 'maximum')
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.maximum:
+            self.maximum = value
+
+    def quantile(self, q: float) -> float:
+        """Bucket upper bound containing the q-quantile"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(bound, self.maximum)
+        return self.maximum
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'sum': round(self.total, 6),
+            'avg': round(self.total / self.count, 6) if self.count else 0.0,
+            'max': round(self.maximum, 6),
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99)
+        }
+
+
+class _NullSpan:
+    """Span used while metrics are disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """Timed block recorded in the <name>_seconds histogram"""
+
+    __slots__ = ('registry', 'name', 'labels', 'start')
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, labels: Dict):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        self.registry.observe(f"{self.name}_seconds", duration, **self.labels)
+        if exc_type is not None:
+            self.registry.count(f"{self.name}_errors_total", **self.labels)
+        if self.name == 'step':
+            self.registry.record_step(self.labels.get('step', ''), self.start, duration, exc_type is None)
+        return False
+
+
+class MetricsRegistry:
+    """Thread-safe store of counters, histograms and the step timeline"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counters = {}
+            self.histograms = {}
+            self.steps = []
+            self.started = time.perf_counter()
+            self.started_at = time.time()
+
+    def span(self, name: str, **labels):
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, labels)
+
+    def count(self, name: str, value: float = 1, **labels):
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def record_step(self, step: str, start: float, duration: float, success: bool):
+        with self._lock:
+            self.steps.append({
+                'step': step,
+                'offset_seconds': round(start - self.started, 6),
+                'duration_seconds': round(duration, 6),
+                'success': success
+            })
+
+    # Export
+
+    def summary(self) -> Dict:
+        """JSON friendly summary of all metrics"""
+        def name_of(key):
+            name, label_key = key
+            return name + _format_labels(label_key)
+
+        with self._lock:
+            return {
+                'collected_at': self.started_at,
+                'elapsed_seconds': round(time.perf_counter() - self.started, 6),
+                'steps': list(self.steps),
+                'counters': {name_of(key): value for key, value in sorted(self.counters.items())},
+                'histograms': {name_of(key): histogram.to_dict()
+                               for key, histogram in sorted(self.histograms.items(), key=lambda item: item[0])}
+            }
+
+    def prometheus_text(self) -> str:
+        """Render metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            typed = set()
+            for (name, label_key), value in sorted(self.counters.items()):
+                metric = METRIC_PREFIX + name
+                if metric not in typed:
+                    lines.append(f"# TYPE {metric} counter")
+                    typed.add(metric)
+                lines.append(f"{metric}{_format_labels(label_key)} {value}")
+
+            for (name, label_key), histogram in sorted(self.histograms.items(), key=lambda item: item[0]):
+                metric = METRIC_PREFIX + name
+                if metric not in typed:
+                    lines.append(f"# TYPE {metric} histogram")
+                    typed.add(metric)
+                cumulative = 0
+                for bound, bucket_count in zip(histogram.buckets, histogram.counts):
+                    cumulative += bucket_count
+                    lines.append(f"{metric}_bucket{_format_labels(label_key, {'le': bound})} {cumulative}")
+                lines.append(f"{metric}_bucket{_format_labels(label_key, {'le': '+Inf'})} {histogram.count}")
+                lines.append(f"{metric}_sum{_format_labels(label_key)} {histogram.total}")
+                lines.append(f"{metric}_count{_format_labels(label_key)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: Union[str, Path]) -> Path:
+        """Write the textfile atomically so the collector never reads a partial file"""
+        path = Path(path)
+        tmp_file = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_file, 'w') as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_file, path)
+        return path
+
+    def write_json(self, path: Union[str, Path]) -> Path:
+        path = Path(path)
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+        return path
+
+
+METRICS = MetricsRegistry(os.environ.get('WORKFLOW_METRICS', '').lower() in ('1', 'true', 'yes'))
+
+
+def enable(enabled: bool = True):
+    """Switch metrics collection on or off"""
+    METRICS.enabled = enabled
+
+
+def span(name: str, **labels):
+    """Timed block (no-op while disabled)"""
+    if not METRICS.enabled:
+        return NULL_SPAN
+    return Span(METRICS, name, labels)
+
+
+def count(name: str, value: float = 1, **labels):
+    """Increment a counter (no-op while disabled)"""
+    if METRICS.enabled:
+        METRICS.count(name, value, **labels)
+
+
+def observe(name: str, value: float, **labels):
+    """Record a histogram value (no-op while disabled)"""
+    if METRICS.enabled:
+        METRICS.observe(name, value, **labels)
+
+
+def timed(name: str, **labels):
+    """Decorator recording each call as a span"""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not METRICS.enabled:
+                return function(*args, **kwargs)
+            with Span(METRICS, name, labels):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+processor_daemon.py - Long-lived data_processor.py server for workflow steps
+
+This module keeps one warm interpreter per work directory so workflow steps
+do not pay Python startup and imports again:
+- `serve` listens on a Unix domain socket (mode 0600) and runs
+  data_processor.py jobs in-process, one at a time, with the TSO session
+  pool and catalog cache shared between jobs
+- `run` is the thin client used by run_python.sh: it sends the
+  data_processor.py arguments, streams the job's stdout/stderr back and
+  exits with the job's exit code
+- With --start the client launches the daemon when none is listening; when
+  the daemon is still not reachable it runs the job in-process (one-shot)
+- The daemon exits after --idle-timeout seconds without jobs, and on
+  `stop` or SIGTERM
+- Before each job the catalog cache is re-synchronized with its snapshot
+  file, so invalidations by other workflow steps are honoured
+- The client's WORKFLOW_* settings (and USER, LOGNAME, HOME, TZ) are
+  applied for the duration of the job and restored afterwards; the TSO
+  session pool and catalog cache are recreated when their settings differ
+  from the ones they were built with
+
+Protocol:
+    One JSON object per line. Requests: {"action": "run", "argv": [...],
+    "cwd": "...", "env": {...}}, {"action": "ping"}, {"action": "stop"}. A run is answered
+    with {"type": "stdout"|"stderr"|"status", "data": "..."} messages and a
+    final {"type": "exit", "code": N}.
+
+Usage:
+    python3 processor_daemon.py serve --socket /u/user/workflow/temp/processor.sock [--idle-timeout 600]
+    python3 processor_daemon.py run --socket SOCKET --start -- --work-dir /u/user/workflow --environment TEST
+    python3 processor_daemon.py ping|stop --socket SOCKET
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import socket
+import signal
+import logging
+import argparse
+import threading
+import traceback
+import subprocess
+import socketserver
+import contextlib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROTOCOL_VERSION = 1
+DEFAULT_IDLE_TIMEOUT = 600
+DEFAULT_START_TIMEOUT = 30
+
+# Client environment applied around each job
+FORWARDED_ENV_PREFIX = 'WORKFLOW_'
+FORWARDED_ENV = ('USER', 'LOGNAME', 'HOME', 'TZ')
+
+# Read once, when the process-wide TSO session pool and catalog cache are created
+POOL_ENV = ('WORKFLOW_TSO_POOL_SIZE', 'WORKFLOW_TSO_IDLE_TIMEOUT', 'WORKFLOW_TSO_COMMAND',
+            'WORKFLOW_TSO_SENTINEL')
+CACHE_ENV = ('WORKFLOW_CATALOG_CACHE', 'WORKFLOW_CATALOG_CACHE_TTL', 'WORKFLOW_CATALOG_CACHE_ENTRIES')
+
+
+def job_environment() -> Dict[str, str]:
+    """Environment variables a job takes from the client"""
+    return {name: value for name, value in os.environ.items()
+            if name.startswith(FORWARDED_ENV_PREFIX) or name in FORWARDED_ENV}
+
+
+def _env_values(names) -> Dict[str, Optional[str]]:
+    return {name: os.environ.get(name) for name in names}
+
+
+def send_message(stream, message: Dict):
+    stream.write((json.dumps(message) + '\n').encode('utf-8'))
+    stream.flush()
+
+
+class JobStream(io.TextIOBase):
+    """Text stream forwarding writes to the client as protocol messages"""
+
+    def __init__(self, connection, stream_type: str, lock: threading.Lock):
+        self.connection = connection
+        self.stream_type = stream_type
+        self.lock = lock
+        self.disconnected = False
+
+    def writable(self):
+        return True
+
+    def write(self, text: str) -> int:
+        if text and not self.disconnected:
+            with self.lock:
+                try:
+                    send_message(self.connection, {'type': self.stream_type, 'data': text})
+                except OSError:
+                    # The client went away; the job still runs to completion
+                    self.disconnected = True
+        return len(text)
+
+
+class DaemonHandler(socketserver.StreamRequestHandler):
+    """One client connection"""
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+        except ValueError:
+            send_message(self.wfile, {'type': 'exit', 'code': 2, 'error': 'malformed request'})
+            return
+
+        daemon = self.server.processor_daemon
+        action = request.get('action')
+        if action == 'ping':
+            send_message(self.wfile, {'type': 'pong', **daemon.status()})
+        elif action == 'stop':
+            send_message(self.wfile, {'type': 'stopping'})
+            daemon.stop()
+        elif action == 'run':
+            daemon.run_job(request, self.wfile)
+        else:
+            send_message(self.wfile, {'type': 'exit', 'code': 2, 'error': f"unknown action {action}"})
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class ProcessorDaemon:
+    """Warm data_processor.py runner listening on a Unix domain socket"""
+
+    def __init__(self, socket_path: str, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout
+        self.started = time.monotonic()
+        self.last_activity = self.started
+        self.jobs_run = 0
+        self.active_jobs = 0
+        self._job_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self.server = None
+        # Settings the TSO session pool and catalog cache were built with
+        self.pool_env = _env_values(POOL_ENV)
+        self.cache_env = _env_values(CACHE_ENV)
+
+    def status(self) -> Dict:
+        return {
+            'pid': os.getpid(),
+            'uptime_seconds': round(time.monotonic() - self.started, 1),
+            'jobs_run': self.jobs_run,
+            'active_jobs': self.active_jobs,
+            'idle_timeout': self.idle_timeout
+        }
+
+    def bind(self) -> bool:
+        """Claim the socket; False if another daemon already serves it"""
+        if os.path.exists(self.socket_path):
+            if ping(self.socket_path, timeout=2) is not None:
+                return False
+            # Stale socket left by a daemon that was killed
+            os.unlink(self.socket_path)
+        previous_umask = os.umask(0o177)
+        try:
+            self.server = _UnixServer(self.socket_path, DaemonHandler)
+        except OSError as e:
+            logging.error(f"Cannot listen on {self.socket_path}: {e}")
+            return False
+        finally:
+            os.umask(previous_umask)
+        self.server.processor_daemon = self
+        self.server.timeout = 1.0
+        return True
+
+    def serve(self):
+        """Handle requests until stopped or idle for idle_timeout seconds"""
+        # Pay the imports once, before the first job arrives
+        import data_processor  # noqa: F401
+
+        logging.info(f"Processor daemon {os.getpid()} listening on {self.socket_path} "
+                     f"(idle timeout {self.idle_timeout}s)")
+        try:
+            while not self._stopping.is_set():
+                self.server.handle_request()
+                with self._state_lock:
+                    idle = self.active_jobs == 0 and time.monotonic() - self.last_activity > self.idle_timeout
+                if idle:
+                    logging.info(f"Idle for {self.idle_timeout}s, shutting down")
+                    break
+        finally:
+            self.server.server_close()
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+            logging.info(f"Processor daemon stopped after {self.jobs_run} jobs")
+
+    def stop(self):
+        self._stopping.set()
+
+    def apply_environment(self, env: Dict[str, str]) -> Dict[str, Optional[str]]:
+        """Switch to a job's environment, returning the values to restore"""
+        saved = _env_values(set(job_environment()) | set(env))
+        for name in saved:
+            if name in env:
+                os.environ[name] = str(env[name])
+            else:
+                os.environ.pop(name, None)
+
+        import tso_session
+        import catalog_cache
+        pool_env = _env_values(POOL_ENV)
+        if pool_env != self.pool_env:
+            logging.info("TSO session pool settings changed, recreating the pool")
+            if tso_session._default_pool is not None:
+                tso_session._default_pool.close()
+                tso_session._default_pool = None
+            self.pool_env = pool_env
+        cache_env = _env_values(CACHE_ENV)
+        if cache_env != self.cache_env:
+            logging.info("Catalog cache settings changed, recreating the cache")
+            if catalog_cache._default_cache is not None:
+                catalog_cache._default_cache.save_snapshot()
+                catalog_cache._default_cache = None
+            self.cache_env = cache_env
+        return saved
+
+    @staticmethod
+    def restore_environment(saved: Dict[str, Optional[str]]):
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+    def run_job(self, request: Dict, connection):
+        """Run one data_processor.py job, streaming its output to the client"""
+        from data_processor import run_from_args
+        from catalog_cache import get_default_cache
+        from metrics import METRICS
+
+        write_lock = threading.Lock()
+        with self._state_lock:
+            self.active_jobs += 1
+            self.last_activity = time.monotonic()
+        try:
+            if not self._job_lock.acquire(blocking=False):
+                send_message(connection, {'type': 'status', 'data': 'waiting for the running job to finish'})
+                self._job_lock.acquire()
+            saved_env = None
+            try:
+                metrics_enabled = METRICS.enabled
+                if request.get('env') is not None:
+                    saved_env = self.apply_environment(request['env'])
+                    METRICS.enabled = os.environ.get('WORKFLOW_METRICS', '').lower() in ('1', 'true', 'yes')
+                cache = get_default_cache()
+                cache.sync_snapshot()
+                METRICS.reset()
+
+                stdout = JobStream(connection, 'stdout', write_lock)
+                stderr = JobStream(connection, 'stderr', write_lock)
+                cwd = os.getcwd()
+                # Module level logging.* calls of the utilities go to the client as well
+                root_streams = [(handler, handler.setStream(stderr)) for handler in logging.getLogger().handlers
+                                if type(handler) is logging.StreamHandler]
+                start = time.monotonic()
+                try:
+                    os.chdir(request.get('cwd') or cwd)
+                    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                        try:
+                            exit_code = run_from_args(list(request.get('argv', [])))
+                        except SystemExit as e:
+                            # argparse errors and sys.exit() inside the job
+                            exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+                        except Exception:
+                            traceback.print_exc()
+                            exit_code = 1
+                finally:
+                    os.chdir(cwd)
+                    for handler, stream in root_streams:
+                        handler.setStream(stream)
+                    METRICS.enabled = metrics_enabled
+                    cache.save_snapshot()
+                self.jobs_run += 1
+                logging.info(f"Job {self.jobs_run} finished with exit code {exit_code} "
+                             f"in {time.monotonic() - start:.1f}s: {request.get('argv')}")
+            finally:
+                if saved_env is not None:
+                    self.restore_environment(saved_env)
+                self._job_lock.release()
+
+            with write_lock:
+                try:
+                    send_message(connection, {'type': 'exit', 'code': exit_code})
+                except OSError:
+                    pass
+        finally:
+            with self._state_lock:
+                self.active_jobs -= 1
+                self.last_activity = time.monotonic()
+
+
+# Client
+
+def connect(socket_path: str, timeout: Optional[float] = None) -> Optional[socket.socket]:
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(timeout)
+    try:
+        client.connect(socket_path)
+        return client
+    except OSError:
+        client.close()
+        return None
+
+
+def request(socket_path: str, message: Dict, timeout: float = 10) -> Optional[Dict]:
+    """Send a single request and return the first reply"""
+    client = connect(socket_path, timeout)
+    if client is None:
+        return None
+    try:
+        with client, client.makefile('rwb') as stream:
+            send_message(stream, message)
+            line = stream.readline()
+            return json.loads(line) if line else None
+    except (OSError, ValueError):
+        return None
+
+
+def ping(socket_path: str, timeout: float = 10) -> Optional[Dict]:
+    return request(socket_path, {'action': 'ping'}, timeout)
+
+
+def start_daemon(socket_path: str, idle_timeout: float, log_file: Optional[str],
+                 start_timeout: float = DEFAULT_START_TIMEOUT) -> bool:
+    """Launch a detached daemon and wait until it answers"""
+    log_path = log_file or str(Path(socket_path).with_suffix('.log'))
+    with open(log_path, 'a') as log:
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), 'serve', '--socket', socket_path,
+             '--idle-timeout', str(idle_timeout)],
+            stdin=subprocess.DEVNULL, stdout=log, stderr=log,
+            start_new_session=True, close_fds=True
+        )
+    deadline = time.monotonic() + start_timeout
+    while time.monotonic() < deadline:
+        if ping(socket_path, timeout=2) is not None:
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def run_client(socket_path: str, argv: List[str]) -> Optional[int]:
+    """Run a job on the daemon; None if no daemon accepted it"""
+    client = connect(socket_path)
+    if client is None:
+        return None
+    with client, client.makefile('rwb') as stream:
+        try:
+            send_message(stream, {'version': PROTOCOL_VERSION, 'action': 'run',
+                                  'argv': argv, 'cwd': os.getcwd(), 'env': job_environment()})
+        except OSError:
+            return None
+        for line in stream:
+            message = json.loads(line)
+            kind = message.get('type')
+            if kind == 'stdout':
+                sys.stdout.write(message['data'])
+            elif kind in ('stderr', 'status'):
+                sys.stderr.write(message['data'] + ('\n' if kind == 'status' else ''))
+            elif kind == 'exit':
+                sys.stdout.flush()
+                return message['code']
+    # The daemon died mid-job: the job may have partially run, do not repeat it
+    sys.stderr.write("ERROR: processor daemon closed the connection before the job finished\n")
+    return 1
+
+
+def run_one_shot(argv: List[str]) -> int:
+    """Fallback: run the job in this interpreter"""
+    from data_processor import run_from_args
+    try:
+        return run_from_args(argv)
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='zOS Workflow data processor daemon')
+    parser.add_argument('action', choices=['serve', 'run', 'ping', 'stop'],
+                        help='run takes the data_processor.py arguments after --')
+    parser.add_argument('--socket', default=os.getenv('PROCESSOR_DAEMON_SOCKET'),
+                        help='Unix domain socket path')
+    parser.add_argument('--idle-timeout', type=float,
+                        default=float(os.getenv('PROCESSOR_DAEMON_IDLE_TIMEOUT', DEFAULT_IDLE_TIMEOUT)),
+                        help='Seconds without jobs before the daemon exits')
+    parser.add_argument('--start', action='store_true', help='run: start the daemon if it is not running')
+    parser.add_argument('--start-timeout', type=float, default=DEFAULT_START_TIMEOUT)
+    parser.add_argument('--log-file', help='Daemon log file (default: socket path with .log)')
+    parser.add_argument('--no-fallback', action='store_true',
+                        help='run: fail instead of running in-process when no daemon is available')
+    options = sys.argv[1:]
+    argv = []
+    if '--' in options:
+        argv = options[options.index('--') + 1:]
+        options = options[:options.index('--')]
+    args = parser.parse_args(options)
+
+    if not args.socket:
+        if args.action != 'run':
+            parser.error('--socket is required')
+        return run_one_shot(argv)
+
+    if args.action == 'serve':
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s',
+                            datefmt='%Y-%m-%d %H:%M:%S')
+        daemon = ProcessorDaemon(args.socket, args.idle_timeout)
+        if not daemon.bind():
+            logging.info(f"Another processor daemon is serving {args.socket}")
+            return 0
+        signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+        daemon.serve()
+        return 0
+
+    if args.action in ('ping', 'stop'):
+        reply = request(args.socket, {'action': args.action})
+        if reply is None:
+            print(f"No processor daemon listening on {args.socket}")
+            return 1
+        print(json.dumps(reply))
+        return 0
+
+    exit_code = run_client(args.socket, argv)
+    if exit_code is None and args.start:
+        if start_daemon(args.socket, args.idle_timeout, args.log_file, args.start_timeout):
+            exit_code = run_client(args.socket, argv)
+    if exit_code is None:
+        if args.no_fallback:
+            sys.stderr.write(f"ERROR: no processor daemon listening on {args.socket}\n")
+            return 1
+        sys.stderr.write("Processor daemon not available, running in-process\n")
+        exit_code = run_one_shot(argv)
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
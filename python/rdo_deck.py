@@ -0,0 +1,545 @@
+#!/usr/bin/env python3
+"""
+rdo_deck.py - Streaming DFHCSDUP deck parser, CSD snapshot diff and deck generator
+
+Replaces hand-written and hand-diffed RDO decks such as mails/CICS_RDO_w4:
+- Streams DFHCSDUP input: comments, blank lines, columns 73-80 sequence numbers,
+  commands continued over any number of lines, nested and quoted values
+  (DESCRIPTION(RCT ENTRY FOR REGION UA), DESCRIPTION('IT''S'))
+- DEFINE/ALTER/DELETE are applied to a snapshot of compact per-group records
+  (attribute tuples with interned keywords and values); EXTRACT and other
+  commands are kept as they are
+- Diffs two snapshots (decks or DFH0CBDC EXTRACT output) by group, resource
+  and attribute, and turns a diff into a DEFINE/ALTER/DELETE deck
+- Generates bulk DEFINE decks from a region/transaction matrix in the layout
+  of the existing wave decks
+Parsing, diffing and generation are linear in the deck size.
+
+Usage:
+    python3 rdo_deck.py parse mails/CICS_RDO_w4 [--json]
+    python3 rdo_deck.py diff before.deck after.deck [--deck]
+    python3 rdo_deck.py generate --matrix wave5.csv --transid RS7P:F,RSER:G,RSEV:H > wave5.deck
+    python3 rdo_deck.py --benchmark 100000
+"""
+
+import io
+import re
+import sys
+import csv
+import json
+import time
+import argparse
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+VERBS = frozenset({'ADD', 'ALTER', 'APPEND', 'CHECK', 'COPY', 'DEFINE', 'DELETE', 'EXTRACT', 'INITIALIZE',
+                   'LIST', 'MIGRATE', 'PROCESS', 'REMOVE', 'SCAN', 'SERVICE', 'UPGRADE', 'USERDEFINE'})
+
+# Abbreviations accepted by DFHCSDUP for the keywords that identify a definition
+ALIASES = {'GR': 'GROUP', 'GRO': 'GROUP', 'GROU': 'GROUP', 'DESC': 'DESCRIPTION'}
+
+RESOURCE_TYPES = frozenset({'ATOMSERVICE', 'BUNDLE', 'CONNECTION', 'CORBASERVER', 'DB2CONN', 'DB2ENTRY',
+                            'DB2TRAN', 'DJAR', 'DOCTEMPLATE', 'ENQMODEL', 'FILE', 'IPCONN', 'JOURNALMODEL',
+                            'JVMSERVER', 'LIBRARY', 'LSRPOOL', 'MAPSET', 'MQCONN', 'MQMONITOR',
+                            'PARTITIONSET', 'PARTNER', 'PIPELINE', 'PROCESSTYPE', 'PROFILE', 'PROGRAM',
+                            'REQUESTMODEL', 'SESSIONS', 'TCPIPSERVICE', 'TDQUEUE', 'TERMINAL', 'TRANCLASS',
+                            'TRANSACTION', 'TSMODEL', 'TYPETERM', 'URIMAP', 'WEBSERVICE'})
+
+SEQUENCE_COLUMN = 72
+DECK_WIDTH = 71
+CONTINUATION_INDENT = ' ' * 7
+
+# Attributes of the DB2ENTRY definitions rolled out in the thread reuse waves
+DEFAULT_ENTRY_ATTRIBUTES = (('ACCOUNTREC', 'TASK'), ('AUTHTYPE', 'TX'), ('DROLLBACK', 'YES'),
+                            ('PRIORITY', 'EQUAL'), ('PROTECTNUM', '3'), ('THREADLIMIT', '3'),
+                            ('THREADWAIT', 'POOL'))
+
+TOKEN_PATTERN = re.compile(r"\s*([A-Za-z0-9@#$_*.-]+)(\()?")
+
+
+class DeckError(ValueError):
+    """Malformed DFHCSDUP command"""
+
+
+class Command(NamedTuple):
+    """One DFHCSDUP command: verb, operands in order, first line number"""
+    verb: str
+    operands: Tuple[Tuple[str, Optional[str]], ...]
+    line: int
+
+    def operand(self, keyword: str) -> Optional[str]:
+        for name, value in self.operands:
+            if name == keyword:
+                return value
+        return None
+
+
+def _read_value(text: str, position: int, line: int) -> Tuple[str, int]:
+    """Value after an opening parenthesis; returns (value, position after the closing one)"""
+    depth = 1
+    start = position
+    length = len(text)
+    while position < length:
+        char = text[position]
+        if char == "'":
+            # Quoted string, '' is an escaped quote
+            position += 1
+            while position < length:
+                if text[position] == "'":
+                    if position + 1 < length and text[position + 1] == "'":
+                        position += 2
+                        continue
+                    break
+                position += 1
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if not depth:
+                return text[start:position], position + 1
+        position += 1
+    raise DeckError(f"Line {line}: unbalanced parentheses")
+
+
+def parse_command(text: str, line: int = 0) -> Command:
+    """Tokenize one complete command"""
+    operands = []
+    position = 0
+    length = len(text)
+    while position < length:
+        if text[position].isspace() or text[position] == ',':
+            position += 1
+            continue
+        match = TOKEN_PATTERN.match(text, position)
+        if match is None:
+            raise DeckError(f"Line {line}: unexpected {text[position:position + 20]!r}")
+        keyword = match.group(1).upper()
+        keyword = sys.intern(ALIASES.get(keyword, keyword))
+        position = match.end()
+        value = None
+        if match.group(2):
+            value, position = _read_value(text, position, line)
+            value = sys.intern(value)
+        operands.append((keyword, value))
+    if not operands:
+        raise DeckError(f"Line {line}: empty command")
+    verb = operands[0][0]
+    return Command(verb, tuple(operands[1:]), line)
+
+
+def iter_commands(lines: Iterable[str]) -> Iterator[Command]:
+    """Stream commands; a command runs until the next verb, comment or blank line"""
+    buffer: List[str] = []
+    start = 0
+    number = 0
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip('\r\n')
+        if len(line) > SEQUENCE_COLUMN:
+            line = line[:SEQUENCE_COLUMN]
+        stripped = line.strip()
+        if not stripped or stripped.startswith('*'):
+            if buffer:
+                yield parse_command(' '.join(buffer), start)
+                buffer = []
+            continue
+        first = stripped.split(None, 1)[0].upper()
+        if first in VERBS and buffer and not _inside_value(buffer):
+            yield parse_command(' '.join(buffer), start)
+            buffer = []
+        if not buffer:
+            start = number
+        buffer.append(stripped)
+    if buffer:
+        yield parse_command(' '.join(buffer), start)
+
+
+def _inside_value(buffer: List[str]) -> bool:
+    """True when the buffered command has an unclosed parenthesis (value continues)"""
+    depth = 0
+    quoted = False
+    for part in buffer:
+        for char in part:
+            if char == "'":
+                quoted = not quoted
+            elif not quoted:
+                if char == '(':
+                    depth += 1
+                elif char == ')':
+                    depth -= 1
+    return depth > 0
+
+
+class Definition(NamedTuple):
+    """Compact resource definition; attributes exclude the name and GROUP"""
+    resource_type: str
+    name: str
+    group: str
+    attributes: Tuple[Tuple[str, str], ...]
+
+    def attribute(self, keyword: str) -> Optional[str]:
+        for name, value in self.attributes:
+            if name == keyword:
+                return value
+        return None
+
+
+def _split_define(command: Command) -> Tuple[str, str, str, List[Tuple[str, str]]]:
+    resource_type = name = group = None
+    attributes = []
+    for keyword, value in command.operands:
+        if resource_type is None and keyword in RESOURCE_TYPES:
+            resource_type, name = keyword, (value or '').upper()
+        elif keyword == 'GROUP':
+            group = (value or '').upper()
+        else:
+            attributes.append((keyword, value if value is not None else ''))
+    if resource_type is None or not name or not group:
+        raise DeckError(f"Line {command.line}: {command.verb} needs a resource type, name and GROUP")
+    return resource_type, name, group, attributes
+
+
+class CsdSnapshot:
+    """Definitions by group, built by applying DEFINE/ALTER/DELETE commands"""
+
+    def __init__(self):
+        self.groups: Dict[str, Dict[Tuple[str, str], Definition]] = {}
+        self.extracts: List[Command] = []
+        self.other: List[Command] = []
+        self.warnings: List[str] = []
+
+    def __len__(self):
+        return sum(len(definitions) for definitions in self.groups.values())
+
+    def __iter__(self) -> Iterator[Definition]:
+        for group in self.groups.values():
+            yield from group.values()
+
+    def get(self, group: str, resource_type: str, name: str) -> Optional[Definition]:
+        return self.groups.get(group, {}).get((resource_type, name))
+
+    def apply(self, command: Command):
+        verb = command.verb
+        if verb == 'DEFINE':
+            resource_type, name, group, attributes = _split_define(command)
+            self.groups.setdefault(group, {})[(resource_type, name)] = \
+                Definition(resource_type, name, group, tuple(attributes))
+        elif verb == 'ALTER':
+            resource_type, name, group, attributes = _split_define(command)
+            current = self.get(group, resource_type, name)
+            if current is None:
+                self.warnings.append(f"Line {command.line}: ALTER of undefined {resource_type}({name}) "
+                                     f"in {group}")
+                return
+            merged = dict(current.attributes)
+            merged.update(attributes)
+            self.groups[group][(resource_type, name)] = current._replace(attributes=tuple(merged.items()))
+        elif verb == 'DELETE':
+            group = (command.operand('GROUP') or '').upper()
+            targets = [(keyword, (value or '').upper()) for keyword, value in command.operands
+                       if keyword in RESOURCE_TYPES]
+            if not targets:
+                self.groups.pop(group, None)
+            for target in targets:
+                if self.groups.get(group, {}).pop(target, None) is None:
+                    self.warnings.append(f"Line {command.line}: DELETE of undefined {target[0]}({target[1]}) "
+                                         f"in {group}")
+        elif verb == 'EXTRACT':
+            self.extracts.append(command)
+        else:
+            self.other.append(command)
+
+    @classmethod
+    def load(cls, lines: Iterable[str]) -> 'CsdSnapshot':
+        snapshot = cls()
+        for command in iter_commands(lines):
+            snapshot.apply(command)
+        return snapshot
+
+    @classmethod
+    def load_file(cls, path: str, encoding: str = 'utf-8') -> 'CsdSnapshot':
+        with open(path, 'r', encoding=encoding) as f:
+            return cls.load(f)
+
+    def summary(self) -> Dict:
+        types: Dict[str, int] = {}
+        for definition in self:
+            types[definition.resource_type] = types.get(definition.resource_type, 0) + 1
+        return {'groups': len(self.groups), 'definitions': len(self), 'types': types,
+                'extracts': [command.operand('GROUP') for command in self.extracts],
+                'other_commands': len(self.other), 'warnings': self.warnings}
+
+
+class Change(NamedTuple):
+    """Difference for one definition; attributes maps keyword -> (old, new)"""
+    kind: str
+    definition: Definition
+    attributes: Dict[str, Tuple[Optional[str], Optional[str]]]
+
+
+def diff_snapshots(old: CsdSnapshot, new: CsdSnapshot) -> List[Change]:
+    """Added, removed and changed definitions, ordered by group and name"""
+    changes = []
+    for group in sorted(set(old.groups) | set(new.groups)):
+        before = old.groups.get(group, {})
+        after = new.groups.get(group, {})
+        for key in sorted(set(before) | set(after)):
+            previous, current = before.get(key), after.get(key)
+            if previous is None:
+                changes.append(Change('added', current, {}))
+            elif current is None:
+                changes.append(Change('removed', previous, {}))
+            else:
+                # Operand order differs between hand decks and EXTRACT output
+                old_values, new_values = dict(previous.attributes), dict(current.attributes)
+                if old_values == new_values:
+                    continue
+                delta = {keyword: (old_values.get(keyword), new_values.get(keyword))
+                         for keyword in list(old_values) + [k for k in new_values if k not in old_values]
+                         if old_values.get(keyword) != new_values.get(keyword)}
+                changes.append(Change('changed', current, delta))
+    return changes
+
+
+def _operand_text(keyword: str, value: Optional[str]) -> str:
+    return keyword if value is None else f"{keyword}({value})"
+
+
+def format_command(verb: str, definition: Definition, attributes: Iterable[Tuple[str, Optional[str]]],
+                   width: int = DECK_WIDTH) -> List[str]:
+    """DFHCSDUP lines: DESCRIPTION on its own line, other operands wrapped at width"""
+    lines = [f"{verb} {definition.resource_type}({definition.name}) GROUP({definition.group})"]
+    current = ''
+    for keyword, value in attributes:
+        text = _operand_text(keyword, value)
+        if keyword == 'DESCRIPTION':
+            if current:
+                lines.append(current)
+                current = ''
+            lines.append(CONTINUATION_INDENT + text)
+            continue
+        if current and len(current) + 1 + len(text) > width:
+            lines.append(current)
+            current = ''
+        current = f"{current} {text}" if current else CONTINUATION_INDENT + text
+    if current:
+        lines.append(current)
+    return lines
+
+
+def format_definition(definition: Definition, width: int = DECK_WIDTH) -> List[str]:
+    return format_command('DEFINE', definition, definition.attributes, width)
+
+
+def diff_deck(changes: Iterable[Change], width: int = DECK_WIDTH) -> Iterator[str]:
+    """DEFINE for added, ALTER for changed and DELETE for removed definitions"""
+    for change in changes:
+        definition = change.definition
+        if change.kind == 'added':
+            yield from format_definition(definition, width)
+        elif change.kind == 'changed':
+            removed = [keyword for keyword, (_, new) in change.attributes.items() if new is None]
+            if removed:
+                # ALTER cannot drop an attribute; redefine with REPLACE semantics instead
+                yield f"* {definition.resource_type}({definition.name}) drops {', '.join(removed)}"
+                yield f"DELETE {definition.resource_type}({definition.name}) GROUP({definition.group})"
+                yield from format_definition(definition, width)
+            else:
+                yield from format_command('ALTER', definition,
+                                          [(keyword, new) for keyword, (_, new) in change.attributes.items()],
+                                          width)
+        else:
+            yield f"DELETE {definition.resource_type}({definition.name}) GROUP({definition.group})"
+        yield ''
+
+
+class MatrixRegion(NamedTuple):
+    """One row of a rollout matrix"""
+    region: str
+    prefix: str
+    transactions: Tuple[Tuple[str, str], ...]
+
+
+def parse_transactions(spec: str) -> Tuple[Tuple[str, str], ...]:
+    """TRANSID:SUFFIX pairs separated by commas or blanks (RS7P:F,RSER:G)"""
+    pairs = []
+    for item in re.split(r"[,\s]+", spec.strip()):
+        if item:
+            transid, _, suffix = item.partition(':')
+            if not suffix:
+                raise DeckError(f"Transaction {item} has no entry suffix (TRANSID:SUFFIX)")
+            pairs.append((transid.upper(), suffix.upper()))
+    return tuple(pairs)
+
+
+def load_matrix(path: str, transactions: Optional[Tuple[Tuple[str, str], ...]] = None) -> List[MatrixRegion]:
+    """REGION,DB2PREFIX[,TRANSID:SUFFIX ...] rows; the default transactions fill empty third columns"""
+    regions = []
+    with open(path, 'r', newline='') as f:
+        for row in csv.reader(f):
+            if not row or not row[0].strip() or row[0].strip().startswith('#') or \
+                    row[0].strip().upper() == 'REGION':
+                continue
+            if len(row) < 2:
+                raise DeckError(f"Matrix row {row} needs REGION,DB2PREFIX")
+            pairs = parse_transactions(' '.join(row[2:])) if len(row) > 2 and ''.join(row[2:]).strip() \
+                else transactions
+            if not pairs:
+                raise DeckError(f"No transactions for region {row[0].strip()}")
+            regions.append(MatrixRegion(row[0].strip().upper(), row[1].strip().upper(), pairs))
+    return regions
+
+
+def generate_deck(regions: Iterable[MatrixRegion], group_pattern: str = '{prefix}Q1{code}',
+                  plan_pattern: str = 'LQ01D1{code}', entry_pattern: str = '{group}{suffix}',
+                  attributes: Tuple[Tuple[str, str], ...] = DEFAULT_ENTRY_ATTRIBUTES,
+                  extract: bool = True, width: int = DECK_WIDTH) -> Iterator[str]:
+    """DB2ENTRY DEFINE deck for every region/transaction pair of the matrix
+
+    Patterns use {region}, {code} (last two characters of the region), {prefix},
+    {group}, {transid} and {suffix}.
+    """
+    regions = list(regions)
+    groups = []
+    for region in regions:
+        fields = {'region': region.region, 'code': region.region[-2:], 'prefix': region.prefix}
+        groups.append(group_pattern.format(**fields))
+    if extract:
+        for group in dict.fromkeys(groups):
+            yield f"EXTRACT GR({group}) USERPROGRAM(DFH0CBDC) OBJECTS"
+        yield ''
+
+    for region, group in zip(regions, groups):
+        fields = {'region': region.region, 'code': region.region[-2:], 'prefix': region.prefix, 'group': group}
+        yield f"* EMULATION OF {region.region}  (DB2 PREFIX {region.prefix}, REGION CODE {fields['code']})"
+        for transid, suffix in region.transactions:
+            fields.update(transid=transid, suffix=suffix)
+            definition = Definition('DB2ENTRY', entry_pattern.format(**fields), group, ())
+            operands = [('DESCRIPTION', f"RCT ENTRY FOR REGION {fields['code']}"), ('TRANSID', transid)]
+            for keyword, value in attributes:
+                if keyword == 'PRIORITY':
+                    # Keep the wave deck operand order: PLAN precedes PRIORITY
+                    operands.append(('PLAN', plan_pattern.format(**fields)))
+                operands.append((keyword, value))
+            if not any(keyword == 'PLAN' for keyword, _ in operands):
+                operands.append(('PLAN', plan_pattern.format(**fields)))
+            yield from format_command('DEFINE', definition, operands, width)
+            yield ''
+
+
+def run_benchmark(regions: int) -> Dict:
+    matrix = [MatrixRegion(f"LQ{index:06d}", f"DB{index % 9}", (('RS7P', 'F'), ('RSER', 'G'), ('RSEV', 'H')))
+              for index in range(regions)]
+    started = time.perf_counter()
+    text = '\n'.join(generate_deck(matrix, group_pattern='{prefix}{region}', plan_pattern='P{region}'))
+    generated = time.perf_counter() - started
+    lines = text.count('\n') + 1
+
+    started = time.perf_counter()
+    old = CsdSnapshot.load(io.StringIO(text))
+    parsed = time.perf_counter() - started
+
+    new = CsdSnapshot.load(io.StringIO(text.replace('THREADLIMIT(3)', 'THREADLIMIT(4)', regions // 2)))
+    started = time.perf_counter()
+    changes = diff_snapshots(old, new)
+    deck = list(diff_deck(changes))
+    diffed = time.perf_counter() - started
+    return {'regions': regions, 'lines': lines, 'definitions': len(old),
+            'generate_lines_per_second': lines / generated if generated else 0.0,
+            'parse_lines_per_second': lines / parsed if parsed else 0.0,
+            'diff_seconds': diffed, 'changes': len(changes), 'alter_lines': len(deck)}
+
+
+def _change_to_dict(change: Change) -> Dict:
+    definition = change.definition
+    return {'kind': change.kind, 'group': definition.group, 'type': definition.resource_type,
+            'name': definition.name,
+            'attributes': {keyword: {'old': old, 'new': new} for keyword, (old, new) in change.attributes.items()}}
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='DFHCSDUP deck parser, diff and generator')
+    parser.add_argument('--benchmark', type=int, metavar='REGIONS', help='Benchmark with a generated deck')
+    parser.add_argument('--encoding', default='utf-8', help='Deck encoding (e.g. cp1047)')
+    subparsers = parser.add_subparsers(dest='command')
+
+    parse_parser = subparsers.add_parser('parse', help='Summarize a deck')
+    parse_parser.add_argument('deck')
+    parse_parser.add_argument('--json', action='store_true', help='Print all definitions as JSON')
+
+    diff_parser = subparsers.add_parser('diff', help='Compare two decks or EXTRACT outputs')
+    diff_parser.add_argument('old')
+    diff_parser.add_argument('new')
+    diff_parser.add_argument('--deck', action='store_true', help='Print a DEFINE/ALTER/DELETE deck')
+    diff_parser.add_argument('--json', action='store_true', help='Print JSON')
+
+    generate_parser = subparsers.add_parser('generate', help='DB2ENTRY deck from a region matrix')
+    generate_parser.add_argument('--matrix', required=True, help='CSV: REGION,DB2PREFIX[,TRANSID:SUFFIX ...]')
+    generate_parser.add_argument('--transid', help='Default TRANSID:SUFFIX list, e.g. RS7P:F,RSER:G,RSEV:H')
+    generate_parser.add_argument('--group-pattern', default='{prefix}Q1{code}')
+    generate_parser.add_argument('--plan-pattern', default='LQ01D1{code}')
+    generate_parser.add_argument('--entry-pattern', default='{group}{suffix}')
+    generate_parser.add_argument('--set', action='append', default=[], metavar='KEYWORD=VALUE',
+                                 help='Override a DB2ENTRY attribute, e.g. PROTECTNUM=5')
+    generate_parser.add_argument('--no-extract', action='store_true', help='Omit the EXTRACT statements')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        print(json.dumps(run_benchmark(args.benchmark), indent=2))
+        return 0
+
+    try:
+        if args.command == 'parse':
+            snapshot = CsdSnapshot.load_file(args.deck, args.encoding)
+            if args.json:
+                print(json.dumps({'summary': snapshot.summary(),
+                                  'definitions': [{'group': d.group, 'type': d.resource_type, 'name': d.name,
+                                                   'attributes': dict(d.attributes)} for d in snapshot]},
+                                 indent=2))
+            else:
+                summary = snapshot.summary()
+                print(f"Groups: {summary['groups']}  Definitions: {summary['definitions']}  "
+                      f"Extracts: {len(summary['extracts'])}  Other commands: {summary['other_commands']}")
+                for resource_type, count in sorted(summary['types'].items()):
+                    print(f"  {resource_type:<12} {count}")
+                for warning in snapshot.warnings:
+                    print(f"WARNING: {warning}")
+            return 0
+
+        if args.command == 'diff':
+            changes = diff_snapshots(CsdSnapshot.load_file(args.old, args.encoding),
+                                     CsdSnapshot.load_file(args.new, args.encoding))
+            if args.deck:
+                for line in diff_deck(changes):
+                    print(line)
+            elif args.json:
+                print(json.dumps([_change_to_dict(change) for change in changes], indent=2))
+            else:
+                for change in changes:
+                    definition = change.definition
+                    detail = ', '.join(f"{keyword}: {old} -> {new}"
+                                       for keyword, (old, new) in change.attributes.items())
+                    print(f"{change.kind.upper():<8} {definition.group:<8} {definition.resource_type}"
+                          f"({definition.name}) {detail}".rstrip())
+                print(f"{len(changes)} change(s)")
+            return 1 if changes else 0
+
+        if args.command == 'generate':
+            defaults = parse_transactions(args.transid) if args.transid else None
+            attributes = dict(DEFAULT_ENTRY_ATTRIBUTES)
+            for item in args.set:
+                keyword, _, value = item.partition('=')
+                attributes[keyword.strip().upper()] = value.strip()
+            for line in generate_deck(load_matrix(args.matrix, defaults), args.group_pattern, args.plan_pattern,
+                                      args.entry_pattern, tuple(attributes.items()), not args.no_extract):
+                print(line)
+            return 0
+    except (OSError, KeyError, DeckError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 2
+
+    parser.print_help()
+    return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
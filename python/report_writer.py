@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+report_writer.py - Streaming processing report writer
+
+This module writes the data_processor reports while datasets are analyzed,
+so peak memory does not depend on the number of datasets:
+- JSON report written incrementally (same layout as a json.dump of the
+  complete report: workflow_info, datasets_analysis, processing_result, summary)
+- Optional NDJSON variant, one record per line
+- Text summary built from running aggregates; per-dataset lines are
+  spooled to a temporary file and copied in when the report is finished
+- Optional gzip compression of the JSON/NDJSON files
+- Optional metrics section (see metrics.py) after the summary
+
+Usage:
+    writer = ReportWriter(output_dir, timestamp, workflow_info, ndjson=True)
+    for analysis in analyses:
+        writer.add_dataset(analysis)
+    writer.finish(processing_result, config)
+"""
+
+import gzip
+import json
+import shutil
+import tempfile
+import datetime
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+
+class ReportAggregates:
+    """Running totals over the dataset analyses"""
+
+    def __init__(self):
+        self.total_datasets = 0
+        self.failed_datasets = 0
+        self.total_records = 0
+        self.total_bytes = 0
+
+    def add(self, analysis: Dict):
+        self.total_datasets += 1
+        if 'error' in analysis:
+            self.failed_datasets += 1
+        self.total_records += analysis.get('record_count', 0)
+        self.total_bytes += analysis.get('total_bytes', 0)
+
+
+def indent_json(value, level: int) -> str:
+    """Serialize like json.dump(indent=2) at a given nesting level"""
+    return json.dumps(value, indent=2).replace('\n', '\n' + '  ' * level)
+
+
+class ReportWriter:
+    """Incremental JSON, NDJSON and text report output"""
+
+    def __init__(self, output_dir: Union[str, Path], timestamp: str, workflow_info: Dict,
+                 ndjson: bool = False, compress: bool = False):
+        self.output_dir = Path(output_dir)
+        self.workflow_info = workflow_info
+        self.compress = compress
+        self.aggregates = ReportAggregates()
+
+        suffix = '.gz' if compress else ''
+        self.json_file = self.output_dir / f"processing_report_{timestamp}.json{suffix}"
+        self.ndjson_file = self.output_dir / f"processing_report_{timestamp}.ndjson{suffix}" if ndjson else None
+        self.text_file = self.output_dir / f"processing_summary_{timestamp}.txt"
+
+        self._json = self._open(self.json_file)
+        self._json.write('{\n  "workflow_info": ' + indent_json(workflow_info, 1) + ',\n  "datasets_analysis": [')
+        self._ndjson = None
+        if self.ndjson_file:
+            self._ndjson = self._open(self.ndjson_file)
+            self._write_record('workflow_info', workflow_info)
+        # Per-dataset text lines, copied into the summary once the totals are known
+        self._text_lines = tempfile.TemporaryFile('w+', dir=self.output_dir, prefix='.summary_')
+
+    def _open(self, path: Path):
+        if self.compress:
+            return gzip.open(path, 'wt', compresslevel=6)
+        return open(path, 'w')
+
+    def _write_record(self, record_type: str, record: Dict):
+        self._ndjson.write(json.dumps({'record_type': record_type, **record}, separators=(',', ':')) + '\n')
+
+    def add_dataset(self, analysis: Dict):
+        """Write one dataset analysis as soon as it is available"""
+        separator = ',' if self.aggregates.total_datasets else ''
+        self._json.write(f"{separator}\n    {indent_json(analysis, 2)}")
+        if self._ndjson:
+            self._write_record('dataset', analysis)
+        self._text_lines.write(f"  {analysis['dataset_name']}: {analysis['record_count']} records\n")
+        self.aggregates.add(analysis)
+
+    def summary(self, processing_result: Dict) -> Dict:
+        return {
+            'total_datasets': self.aggregates.total_datasets,
+            'processing_success': processing_result.get('results', {}).get('success', False),
+            'steps_completed': len(processing_result.get('steps_completed', [])),
+            'environment': self.workflow_info.get('environment')
+        }
+
+    def finish(self, processing_result: Dict, config: Optional[Dict] = None,
+               metrics: Optional[Dict] = None):
+        """Write the trailing sections and close all files"""
+        summary = self.summary(processing_result)
+        closing = '\n  ' if self.aggregates.total_datasets else ''
+        self._json.write(f"{closing}],\n  \"processing_result\": {indent_json(processing_result, 1)},"
+                         f"\n  \"summary\": {indent_json(summary, 1)}")
+        if metrics is not None:
+            self._json.write(f",\n  \"metrics\": {indent_json(metrics, 1)}")
+        self._json.write("\n}")
+        self._json.close()
+
+        if self._ndjson:
+            self._write_record('processing_result', processing_result)
+            self._write_record('summary', summary)
+            if metrics is not None:
+                self._write_record('metrics', metrics)
+            self._ndjson.close()
+
+        try:
+            self._write_text(processing_result, config or {})
+        finally:
+            self._text_lines.close()
+
+    def abort(self):
+        """Close and remove partially written reports"""
+        for handle in (self._json, self._ndjson, self._text_lines):
+            if handle:
+                handle.close()
+        for path in (self.json_file, self.ndjson_file):
+            if path and path.exists():
+                path.unlink()
+
+    def report_date(self) -> str:
+        """Processing date of the report (kept stable across resumed runs)"""
+        try:
+            date = datetime.datetime.fromisoformat(self.workflow_info['processing_date'])
+        except (KeyError, TypeError, ValueError):
+            date = datetime.datetime.now()
+        return date.strftime('%Y-%m-%d %H:%M:%S')
+
+    def _write_text(self, processing_result: Dict, config: Dict):
+        aggregates = self.aggregates
+        with open(self.text_file, 'w') as f:
+            f.write("=" * 60 + "\n")
+            f.write("          WORKFLOW PROCESSING REPORT\n")
+            f.write("=" * 60 + "\n")
+            f.write(f"Date: {self.report_date()}\n")
+            f.write(f"Environment: {self.workflow_info.get('environment')}\n")
+            f.write(f"Work Directory: {self.workflow_info.get('work_directory')}\n")
+            f.write(f"Workflow Version: {self.workflow_info.get('version')}\n")
+            f.write("\n")
+
+            f.write("DATASET ANALYSIS SUMMARY:\n")
+            f.write("-" * 30 + "\n")
+            f.write(f"Total Datasets Analyzed: {aggregates.total_datasets}\n")
+            f.write(f"Total Records: {aggregates.total_records}\n")
+            f.write(f"Total Bytes: {aggregates.total_bytes}\n")
+            if aggregates.failed_datasets:
+                f.write(f"Datasets With Errors: {aggregates.failed_datasets}\n")
+            self._text_lines.seek(0)
+            shutil.copyfileobj(self._text_lines, f)
+            f.write("\n")
+
+            f.write("PROCESSING RESULTS:\n")
+            f.write("-" * 20 + "\n")
+            f.write(f"Environment: {processing_result['environment']}\n")
+            f.write(f"Success: {processing_result.get('results', {}).get('success', False)}\n")
+            f.write(f"Steps Completed: {len(processing_result.get('steps_completed', []))}\n")
+            f.write("Steps:\n")
+            for step in processing_result.get('steps_completed', []):
+                f.write(f"  - {step}\n")
+            f.write("\n")
+
+            f.write("CONFIGURATION:\n")
+            f.write("-" * 15 + "\n")
+            for key, value in config.items():
+                f.write(f"  {key}: {value}\n")
+            f.write("\n")
+
+            f.write("=" * 60 + "\n")
+            f.write("              END OF REPORT\n")
+            f.write("=" * 60 + "\n")
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+result_validator.py - Batched, parallel workflow result validation
+
+This module performs the checks of scripts/validate_results.sh with far
+fewer TSO and process round trips:
+- All expected datasets are resolved from a single LISTCAT LEVEL(...) ALL
+  per high level qualifier (the same output also supplies the ARCHIVE
+  lines), instead of one LISTCAT ENT(...) per dataset
+- USS path, permission, status and system resource checks run
+  concurrently on a thread pool
+- Messages are logged in the order of the shell script, in the same
+  "timestamp [SEVERITY] message" format to stdout and logs/validation.log,
+  with the same ERROR/WARNING counting, report file and exit code
+
+Usage:
+    python3 result_validator.py --work-dir /u/user/workflow --hlq USER --environment TEST
+"""
+
+import os
+import sys
+import stat
+import glob
+import argparse
+import datetime
+import subprocess
+import concurrent.futures
+from typing import Iterable, List, Tuple, Union
+
+from listcat_parser import parse_listcat
+from workflow_utilities import DatasetUtilities
+from config_store import get_status_journal
+
+# (severity, message) or (severity, message, counted)
+Message = Union[Tuple[str, str], Tuple[str, str, bool]]
+
+VALID_STATUSES = ('INITIALIZED', 'RUNNING', 'COMPLETED', 'FAILED')
+
+
+class ResultValidator:
+    """Workflow validation with the messages and counters of validate_results.sh"""
+
+    def __init__(self, work_dir: str, hlq: str, environment: str, workers: int = 8):
+        self.work_dir = work_dir
+        self.hlq = hlq
+        self.environment = environment
+        self.workers = workers
+        self.log_dir = f"{work_dir}/logs"
+        self.output_dir = f"{work_dir}/output"
+        self.config_dir = f"{work_dir}/config"
+        self.errors = 0
+        self.warnings = 0
+        self._log = None
+
+    # Logging
+
+    def log_message(self, severity: str, message: str, counted: bool = True):
+        line = f"{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')} [{severity}] {message}\n"
+        sys.stdout.write(line)
+        self._log.write(line)
+        # validation.log is itself checked, and read by other steps
+        self._log.flush()
+        if not counted:
+            return
+        if severity == 'ERROR':
+            self.errors += 1
+        elif severity == 'WARNING':
+            self.warnings += 1
+
+    def emit(self, messages: Iterable[Message]):
+        for message in messages:
+            self.log_message(*message)
+
+    # Datasets
+
+    def expected_datasets(self) -> List[Tuple[str, str, bool]]:
+        datasets = [
+            (f"{self.hlq}.WORK.DATA", "Work dataset", True),
+            (f"{self.hlq}.LOG.{self.environment}", "Log dataset", True),
+            (f"{self.hlq}.BACKUP.{self.environment}", "Backup dataset", True),
+            (f"{self.hlq}.CONTROL.CARDS", "Control dataset", False)
+        ]
+        if self.environment == 'PROD':
+            datasets.append((f"{self.hlq}.BACKUP.PROD.COPY2", "Production backup copy", False))
+        return datasets
+
+    @staticmethod
+    def list_level(hlq: str) -> Tuple[set, List[str]]:
+        """Catalog entry names and raw output lines of one LISTCAT LEVEL(...) ALL"""
+        output = DatasetUtilities.execute_mvs_command(f"LISTCAT LEVEL('{hlq}') ALL") or ''
+        # The command returns its output whole; the lines are kept for the report anyway
+        lines = output.splitlines()
+        names = {entry.name for entry in parse_listcat(lines)}
+        return names, lines
+
+    def check_job_outputs(self) -> List[Message]:
+        messages = [('INFO', '=== Validating Job Outputs ===')]
+        expected = self.expected_datasets()
+        # One catalog request per high level qualifier
+        levels = {}
+        for name, _, _ in expected:
+            qualifier = name.split('.', 1)[0]
+            if qualifier not in levels:
+                levels[qualifier] = self.list_level(qualifier)
+
+        for name, description, required in expected:
+            if name in levels[name.split('.', 1)[0]][0]:
+                messages.append(('INFO', f"Dataset exists: {name} ({description})"))
+            elif required:
+                messages.append(('ERROR', f"Required dataset missing: {name} ({description})"))
+            else:
+                messages.append(('WARNING', f"Optional dataset missing: {name} ({description})"))
+
+        _, lines = levels.get(self.hlq) or self.list_level(self.hlq)
+        for line in lines:
+            if 'ARCHIVE' in line:
+                # `read` in the shell version strips surrounding blanks
+                messages.append(('INFO', f"Archive dataset found: {line.strip()}"))
+        return messages
+
+    # USS
+
+    @staticmethod
+    def check_uss_path(path: str, description: str, required: bool, kind: str) -> List[Message]:
+        if kind == 'directory':
+            if os.path.isdir(path):
+                return [('INFO', f"Directory exists: {path} ({description})")]
+        elif os.path.isfile(path):
+            messages = [('INFO', f"File exists: {path} ({description})")]
+            if os.path.getsize(path) > 0:
+                messages.append(('INFO', f"File has content: {path}"))
+            else:
+                messages.append(('WARNING', f"File is empty: {path}"))
+            return messages
+
+        if required:
+            return [('ERROR', f"{kind} missing: {path} ({description})")]
+        return [('WARNING', f"Optional {kind} missing: {path} ({description})")]
+
+    def uss_checks(self) -> List[Tuple[str, str, bool, str]]:
+        return [
+            (self.work_dir, "Main work directory", True, "directory"),
+            (self.log_dir, "Log directory", True, "directory"),
+            (self.output_dir, "Output directory", True, "directory"),
+            (self.config_dir, "Config directory", True, "directory"),
+            (f"{self.config_dir}/environment.conf", "Environment config", True, "file"),
+            (f"{self.config_dir}/workflow_status.conf", "Status config", True, "file"),
+            (f"{self.log_dir}/setup.log", "Setup log", False, "file"),
+            (f"{self.log_dir}/validation.log", "Validation log", True, "file")
+        ]
+
+    def check_python_outputs(self) -> List[Message]:
+        if not os.path.isdir(self.output_dir):
+            return []
+        outputs = sum(1 for _, _, files in os.walk(self.output_dir)
+                      for name in files if name.startswith('python_output_') and name.endswith('.txt'))
+        if outputs > 0:
+            return [('INFO', f"Found {outputs} Python output files")]
+        return [('WARNING', "No Python output files found")]
+
+    @staticmethod
+    def check_directory_permissions(path: str) -> List[Message]:
+        try:
+            mode = os.stat(path).st_mode
+        except OSError:
+            return []
+        if not stat.S_ISDIR(mode):
+            return []
+        messages = [('INFO', f"Directory permissions: {path} = {stat.filemode(mode)}")]
+        if os.access(path, os.W_OK):
+            messages.append(('INFO', f"Directory is writable: {path}"))
+        else:
+            messages.append(('WARNING', f"Directory is not writable: {path}"))
+        return messages
+
+    @staticmethod
+    def check_script_permissions(path: str) -> List[Message]:
+        try:
+            mode = os.stat(path).st_mode
+        except OSError:
+            return []
+        if not stat.S_ISREG(mode):
+            return []
+        name = os.path.basename(path)
+        messages = [('INFO', f"Script permissions: {name} = {stat.filemode(mode)}")]
+        if os.access(path, os.X_OK):
+            messages.append(('INFO', f"Script is executable: {name}"))
+        else:
+            messages.append(('WARNING', f"Script is not executable: {name}"))
+        return messages
+
+    # Status and resources
+
+    def check_workflow_status(self) -> List[Message]:
+        messages = [('INFO', '=== Validating Workflow Status ===')]
+        status_file = f"{self.config_dir}/workflow_status.conf"
+        if not os.path.isfile(status_file):
+            messages.append(('ERROR', f"Workflow status file not found: {status_file}"))
+            return messages
+
+        messages.append(('INFO', f"Reading workflow status from: {status_file}"))
+        # Includes status updates still in the journal (see config_store.py)
+        status = get_status_journal(status_file).read()
+        value = status.get('STATUS', '')
+        messages.append(('INFO', f"Workflow status: {value}"))
+        messages.append(('INFO', f"Setup complete: {status.get('SETUP_COMPLETE', '')}"))
+        messages.append(('INFO', f"Directories created: {status.get('DIRECTORIES_CREATED', '')}"))
+        if value in VALID_STATUSES:
+            messages.append(('INFO', f"Status is valid: {value}"))
+        else:
+            messages.append(('WARNING', f"Unexpected status value: {value}"))
+        return messages
+
+    def check_system_resources(self) -> List[Message]:
+        messages = [('INFO', '=== Validating System Resources ===')]
+        try:
+            lines = subprocess.run(['df', self.work_dir], capture_output=True, text=True,
+                                   timeout=30).stdout.splitlines()
+        except (OSError, subprocess.SubprocessError):
+            lines = []
+        if lines:
+            fields = lines[-1].split()
+            if len(fields) >= 4:
+                available = fields[3]
+                messages.append(('INFO', f"Filesystem: {fields[0]}"))
+                messages.append(('INFO', f"Available space: {available} blocks"))
+                if available.isdigit() and int(available) > 100000:
+                    messages.append(('INFO', "Sufficient disk space available"))
+                else:
+                    # The shell version logs this inside a pipeline subshell, so
+                    # it never reaches the counters; keep the counts identical
+                    messages.append(('WARNING', f"Low disk space: {available} blocks available", False))
+
+        try:
+            memory = subprocess.run(['ps', '-o', 'pid,vsz,rss,comm', '-p', str(os.getpid())],
+                                    capture_output=True, text=True, timeout=30).stdout.splitlines()
+            if memory:
+                messages.append(('INFO', f"Current process memory: {memory[-1].strip()}"))
+        except (OSError, subprocess.SubprocessError):
+            pass
+
+        try:
+            with open('/proc/loadavg') as f:
+                messages.append(('INFO', f"System load average: {' '.join(f.read().split()[:3])}"))
+        except OSError:
+            pass
+        return messages
+
+    # Report
+
+    def write_report(self) -> str:
+        report_file = f"{self.output_dir}/validation_report_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        lines = [
+            "========================================",
+            "    WORKFLOW VALIDATION REPORT",
+            "========================================",
+            f"Date: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            f"Work Directory: {self.work_dir}",
+            f"HLQ: {self.hlq}",
+            f"Environment: {self.environment}",
+            "",
+            "VALIDATION SUMMARY:",
+            f"  Errors: {self.errors}",
+            f"  Warnings: {self.warnings}",
+            ""
+        ]
+        if self.errors == 0:
+            lines.append("OVERALL STATUS: PASSED")
+            if self.warnings == 0:
+                lines.append("RESULT: All validations passed successfully")
+            else:
+                lines.append(f"RESULT: Passed with {self.warnings} warnings")
+        else:
+            lines.append("OVERALL STATUS: FAILED")
+            lines.append(f"RESULT: {self.errors} errors found")
+        lines.extend([
+            "",
+            "DETAILED LOG:",
+            f"See {self.log_dir}/validation.log for complete details",
+            "",
+            "========================================",
+            "    END OF VALIDATION REPORT",
+            "========================================"
+        ])
+        with open(report_file, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        return report_file
+
+    def run(self) -> int:
+        """Run every check and return the exit code of validate_results.sh"""
+        os.makedirs(self.log_dir, exist_ok=True)
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._log = open(f"{self.log_dir}/validation.log", 'a')
+        try:
+            self.log_message('INFO', '=== Starting Workflow Validation ===')
+            self.log_message('INFO', f"Work Directory: {self.work_dir}")
+            self.log_message('INFO', f"HLQ: {self.hlq}")
+            self.log_message('INFO', f"Environment: {self.environment}")
+
+            scripts = sorted(glob.glob(f"{self.work_dir}/scripts/*.sh"))
+            directories = [self.work_dir, self.log_dir, self.output_dir, self.config_dir]
+
+            # Every check is independent; submit them all, log in script order
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as executor:
+                sections = [
+                    [executor.submit(self.check_job_outputs)],
+                    [executor.submit(lambda: [('INFO', '=== Validating USS Files ===')])]
+                    + [executor.submit(self.check_uss_path, *check) for check in self.uss_checks()]
+                    + [executor.submit(self.check_python_outputs)],
+                    [executor.submit(lambda: [('INFO', '=== Validating File Permissions ===')])]
+                    + [executor.submit(self.check_directory_permissions, path) for path in directories]
+                    + [executor.submit(self.check_script_permissions, path) for path in scripts],
+                    [executor.submit(self.check_workflow_status)],
+                    [executor.submit(self.check_system_resources)]
+                ]
+                for futures in sections:
+                    for future in futures:
+                        self.emit(future.result())
+
+            self.log_message('INFO', '=== Generating Validation Report ===')
+            report_file = self.write_report()
+            self.log_message('INFO', f"Validation report created: {report_file}")
+            with open(report_file) as f:
+                sys.stdout.write(f.read())
+
+            self.log_message('INFO', '=== Workflow Validation Completed ===')
+            self.log_message('INFO', f"Final Status: Errors={self.errors}, Warnings={self.warnings}")
+        finally:
+            self._log.close()
+        return 1 if self.errors > 0 else 0
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='zOS Workflow result validation')
+    parser.add_argument('--work-dir', default=f"/u/{os.getenv('USER', '')}/workflow")
+    parser.add_argument('--hlq', default=os.getenv('USER', '').upper())
+    parser.add_argument('--environment', default='TEST')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent checks')
+    args = parser.parse_args()
+
+    try:
+        return ResultValidator(args.work_dir, args.hlq, args.environment, args.workers).run()
+    except Exception as e:
+        # validate_results.sh falls back to its shell checks on exit code 2
+        print(f"Validator error: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
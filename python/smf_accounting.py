@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+smf_accounting.py - Columnar Db2 accounting (SMF 101) CPU analytics
+
+This module answers the hsbc/SQL_SMF1 style questions (CP, zIIP and class 1
+CPU by PRIMAUTH and date) for whole days of accounting data in one local pass
+instead of one DB2PMSACCT_GENERAL query per auth ID and hour slice:
+- Loads exported accounting extracts (CSV with or without a header, or fixed
+  width records described by --layout) into columnar arrays: PRIMAUTH and
+  the interval date are dictionary encoded, CPU columns are doubles
+- Columns are built with the array module; when NumPy is available they are
+  wrapped without copying and all aggregation is vectorized (bincount over a
+  combined group key), otherwise a single pass over the arrays is used
+- Group by any of PRIMAUTH, DATE and HOUR with auth/date/hour filters
+- CP (CLASS1_CPU_NNESTED) vs zIIP (CLASS1_IIP_CPU) split and zIIP share,
+  CLASS1_CPU_TOTAL, record counts and top-N by any measure
+
+Usage:
+    python3 smf_accounting.py acct_20260304.csv --group-by primauth,hour --auth LHHNB02S
+    python3 smf_accounting.py acct.txt --layout PRIMAUTH:1:8,INTERVAL_TIME:9:26,CLASS1_CPU_NNESTED:35:12,...
+    python3 smf_accounting.py acct.csv --group-by primauth --top 20 --by ziip_cpu --json
+    python3 smf_accounting.py --benchmark 2000000
+"""
+
+import io
+import sys
+import csv
+import json
+import time
+import array
+import random
+import argparse
+import itertools
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+AUTH_COLUMN = 'PRIMAUTH'
+TIME_COLUMN = 'INTERVAL_TIME'
+CP_COLUMN = 'CLASS1_CPU_NNESTED'
+ZIIP_COLUMN = 'CLASS1_IIP_CPU'
+TOTAL_COLUMN = 'CLASS1_CPU_TOTAL'
+
+# Column order of a headerless export (the SELECT list of DB2PMSACCT_GENERAL extracts)
+DEFAULT_COLUMNS = (AUTH_COLUMN, TIME_COLUMN, CP_COLUMN, ZIIP_COLUMN, TOTAL_COLUMN)
+
+GROUP_KEYS = ('primauth', 'date', 'hour')
+
+MEASURES = ('count', 'cp_cpu', 'ziip_cpu', 'total_cpu', 'class1_total_cpu')
+
+# Above this many key combinations the NumPy path groups with unique() instead of bincount()
+BINCOUNT_LIMIT = 1 << 24
+
+
+def _number(value: str) -> float:
+    value = value.strip()
+    return float(value) if value else 0.0
+
+
+class AccountingData:
+    """Columnar accounting records"""
+
+    def __init__(self):
+        self.auth_names: List[str] = []
+        self.dates: List[str] = []
+        self._auth_codes: Dict[str, int] = {}
+        self._date_codes: Dict[str, int] = {}
+        self.auth = array.array('I')
+        self.day = array.array('I')
+        self.hour = array.array('B')
+        self.cp = array.array('d')
+        self.ziip = array.array('d')
+        self.total = array.array('d')
+
+    def __len__(self):
+        return len(self.auth)
+
+    def append(self, auth: str, timestamp: str, cp: float, ziip: float, total: float):
+        """Add one record; timestamp is Db2 (2026-03-04-10.15.00) or ISO format"""
+        auth = auth.strip()
+        code = self._auth_codes.get(auth)
+        if code is None:
+            code = self._auth_codes[auth] = len(self.auth_names)
+            self.auth_names.append(auth)
+        self.auth.append(code)
+
+        date = timestamp[:10]
+        code = self._date_codes.get(date)
+        if code is None:
+            code = self._date_codes[date] = len(self.dates)
+            self.dates.append(date)
+        self.day.append(code)
+        self.hour.append(int(timestamp[11:13] or 0))
+
+        self.cp.append(cp)
+        self.ziip.append(ziip)
+        self.total.append(total)
+
+    # Loading
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence[str]], columns: Sequence[str]) -> 'AccountingData':
+        index = {name.strip().upper(): position for position, name in enumerate(columns)}
+        missing = [name for name in (AUTH_COLUMN, TIME_COLUMN) if name not in index]
+        if missing:
+            raise ValueError(f"Accounting extract has no {', '.join(missing)} column")
+        auth_at, time_at = index[AUTH_COLUMN], index[TIME_COLUMN]
+        cp_at, ziip_at, total_at = (index.get(name) for name in (CP_COLUMN, ZIIP_COLUMN, TOTAL_COLUMN))
+
+        data = cls()
+        append = data.append
+        for row in rows:
+            if len(row) <= max(auth_at, time_at):
+                continue
+            append(row[auth_at], row[time_at].strip(),
+                   _number(row[cp_at]) if cp_at is not None else 0.0,
+                   _number(row[ziip_at]) if ziip_at is not None else 0.0,
+                   _number(row[total_at]) if total_at is not None else 0.0)
+        return data
+
+    @classmethod
+    def load_csv(cls, path: Union[str, Path], columns: Optional[Sequence[str]] = None,
+                 delimiter: str = ',', encoding: str = 'utf-8') -> 'AccountingData':
+        """CSV export; the header row is used unless columns are given"""
+        with open(path, 'r', encoding=encoding, newline='') as f:
+            reader = csv.reader(f, delimiter=delimiter)
+            if columns is None:
+                first = next(reader, [])
+                if any(value.strip().upper() == AUTH_COLUMN for value in first):
+                    columns = first
+                else:
+                    # Headerless DB2 UNLOAD DELIMITED output
+                    columns = DEFAULT_COLUMNS
+                    return cls.from_rows(itertools.chain([first], reader), columns)
+            return cls.from_rows(reader, columns)
+
+    @classmethod
+    def load_fixed(cls, path: Union[str, Path], layout: Dict[str, Tuple[int, int]],
+                   encoding: str = 'utf-8') -> 'AccountingData':
+        """Fixed width records; layout maps column -> (1-based start, length)"""
+        names = list(layout)
+        slices = [slice(start - 1, start - 1 + length) for start, length in layout.values()]
+        with open(path, 'r', encoding=encoding) as f:
+            return cls.from_rows(([line[part] for part in slices] for line in f), names)
+
+    # Aggregation
+
+    def _columns(self, engine: str):
+        if engine == 'numpy':
+            # Zero-copy views over the array buffers
+            return (np.frombuffer(self.auth, dtype=np.uint32), np.frombuffer(self.day, dtype=np.uint32),
+                    np.frombuffer(self.hour, dtype=np.uint8), np.frombuffer(self.cp, dtype=np.float64),
+                    np.frombuffer(self.ziip, dtype=np.float64), np.frombuffer(self.total, dtype=np.float64))
+        return self.auth, self.day, self.hour, self.cp, self.ziip, self.total
+
+    def _radices(self, group_by: Sequence[str]) -> List[Tuple[str, int]]:
+        sizes = {'primauth': len(self.auth_names), 'date': len(self.dates), 'hour': 24}
+        return [(key, max(1, sizes[key])) for key in group_by]
+
+    def aggregate(self, group_by: Sequence[str] = ('primauth',), auths: Optional[Iterable[str]] = None,
+                  dates: Optional[Iterable[str]] = None, hours: Optional[Tuple[int, int]] = None,
+                  engine: Optional[str] = None) -> List[Dict]:
+        """Sum the CPU measures per group; hours is an inclusive (first, last) range"""
+        for key in group_by:
+            if key not in GROUP_KEYS:
+                raise ValueError(f"Unknown group key {key}; use {', '.join(GROUP_KEYS)}")
+        engine = engine or ('numpy' if np is not None else 'array')
+        auth_filter = {self._auth_codes[name.strip()] for name in auths if name.strip() in self._auth_codes} \
+            if auths is not None else None
+        date_filter = {self._date_codes[date] for date in dates if date in self._date_codes} \
+            if dates is not None else None
+        radices = self._radices(group_by)
+
+        if engine == 'numpy':
+            sums = self._aggregate_numpy(radices, auth_filter, date_filter, hours)
+        else:
+            sums = self._aggregate_array(radices, auth_filter, date_filter, hours)
+
+        rows = []
+        for key, (count, cp, ziip, total) in sorted(sums.items()):
+            row = {}
+            for name, radix in reversed(radices):
+                key, value = divmod(key, radix)
+                row[name] = (self.auth_names[value] if name == 'primauth'
+                             else self.dates[value] if name == 'date' else value)
+            row = {name: row[name] for name in group_by}
+            row.update(count=count, cp_cpu=cp, ziip_cpu=ziip, total_cpu=cp + ziip,
+                       class1_total_cpu=total,
+                       ziip_pct=100.0 * ziip / (cp + ziip) if cp + ziip else 0.0)
+            rows.append(row)
+        return rows
+
+    def _aggregate_numpy(self, radices, auth_filter, date_filter, hours) -> Dict[int, Tuple]:
+        auth, day, hour, cp, ziip, total = self._columns('numpy')
+        columns = {'primauth': auth, 'date': day, 'hour': hour}
+
+        mask = None
+        if auth_filter is not None:
+            mask = np.isin(auth, np.fromiter(auth_filter, dtype=np.uint32, count=len(auth_filter)))
+        if date_filter is not None:
+            selected = np.isin(day, np.fromiter(date_filter, dtype=np.uint32, count=len(date_filter)))
+            mask = selected if mask is None else mask & selected
+        if hours is not None:
+            selected = (hour >= hours[0]) & (hour <= hours[1])
+            mask = selected if mask is None else mask & selected
+
+        key = np.zeros(len(auth), dtype=np.int64)
+        space = 1
+        for name, radix in radices:
+            key = key * radix + columns[name]
+            space *= radix
+        if mask is not None:
+            key, cp, ziip, total = key[mask], cp[mask], ziip[mask], total[mask]
+        if not len(key):
+            return {}
+
+        if space <= BINCOUNT_LIMIT:
+            counts = np.bincount(key, minlength=space)
+            present = np.nonzero(counts)[0]
+            inverse = None
+        else:
+            present, inverse = np.unique(key, return_inverse=True)
+            counts = np.bincount(inverse)
+        index = inverse if inverse is not None else key
+        length = space if inverse is None else len(present)
+        measures = [np.bincount(index, weights=column, minlength=length) for column in (cp, ziip, total)]
+        if inverse is None:
+            counts = counts[present]
+            measures = [column[present] for column in measures]
+        return {int(group): (int(count), float(c), float(z), float(t))
+                for group, count, c, z, t in zip(present, counts, *measures)}
+
+    def _aggregate_array(self, radices, auth_filter, date_filter, hours) -> Dict[int, Tuple]:
+        auth, day, hour, cp, ziip, total = self._columns('array')
+        sums = {}
+        get = sums.get
+        for index in range(len(auth)):
+            if auth_filter is not None and auth[index] not in auth_filter:
+                continue
+            if date_filter is not None and day[index] not in date_filter:
+                continue
+            if hours is not None and not hours[0] <= hour[index] <= hours[1]:
+                continue
+            key = 0
+            for name, radix in radices:
+                key = key * radix + (auth[index] if name == 'primauth' else day[index] if name == 'date'
+                                     else hour[index])
+            current = get(key)
+            if current is None:
+                sums[key] = [1, cp[index], ziip[index], total[index]]
+            else:
+                current[0] += 1
+                current[1] += cp[index]
+                current[2] += ziip[index]
+                current[3] += total[index]
+        return {key: tuple(value) for key, value in sums.items()}
+
+
+def top_n(rows: List[Dict], n: int, by: str = 'total_cpu') -> List[Dict]:
+    """Largest groups by a measure"""
+    return sorted(rows, key=lambda row: row[by], reverse=True)[:n]
+
+
+def summarize(rows: List[Dict]) -> Dict:
+    """CP vs zIIP split over all groups"""
+    cp = sum(row['cp_cpu'] for row in rows)
+    ziip = sum(row['ziip_cpu'] for row in rows)
+    return {'groups': len(rows), 'records': sum(row['count'] for row in rows),
+            'cp_cpu': cp, 'ziip_cpu': ziip, 'total_cpu': cp + ziip,
+            'class1_total_cpu': sum(row['class1_total_cpu'] for row in rows),
+            'ziip_pct': 100.0 * ziip / (cp + ziip) if cp + ziip else 0.0}
+
+
+def parse_layout(spec: str) -> Dict[str, Tuple[int, int]]:
+    """NAME:START:LENGTH,... (1-based start columns)"""
+    layout = {}
+    for item in spec.split(','):
+        name, start, length = item.strip().split(':')
+        layout[name.strip().upper()] = (int(start), int(length))
+    return layout
+
+
+def format_table(rows: List[Dict], group_by: Sequence[str]) -> str:
+    widths = {'primauth': 8, 'date': 10, 'hour': 4}
+    header = ' '.join(f"{key.upper():<{widths[key]}}" for key in group_by)
+    lines = [f"{header} {'COUNT':>9} {'CP_CPU':>14} {'ZIIP_CPU':>14} {'TOTAL_CPU':>14} "
+             f"{'CLASS1_TOTAL':>14} {'ZIIP%':>6}"]
+    for row in rows:
+        keys = ' '.join(f"{str(row[key]):<{widths[key]}}" for key in group_by)
+        lines.append(f"{keys} {row['count']:>9} {row['cp_cpu']:>14.6f} {row['ziip_cpu']:>14.6f} "
+                     f"{row['total_cpu']:>14.6f} {row['class1_total_cpu']:>14.6f} {row['ziip_pct']:>6.1f}")
+    return '\n'.join(lines)
+
+
+def generate_synthetic_accounting(rows: int, auths: int = 500, days: int = 2, seed: int = 101) -> AccountingData:
+    """Random accounting records for benchmarks"""
+    generator = random.Random(seed)
+    names = [f"AUTH{index:04d}" for index in range(auths)]
+    data = AccountingData()
+    for _ in range(rows):
+        cp = generator.random() * 0.5
+        ziip = generator.random() * 0.2
+        data.append(generator.choice(names),
+                    f"2026-03-{4 + generator.randrange(days):02d}-{generator.randrange(24):02d}.15.00.000000",
+                    cp, ziip, cp + ziip + generator.random() * 0.1)
+    return data
+
+
+def run_benchmark(rows: int) -> Dict:
+    started = time.perf_counter()
+    data = generate_synthetic_accounting(rows)
+    results = {'rows': rows, 'generate_seconds': time.perf_counter() - started}
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(DEFAULT_COLUMNS)
+    for index in range(min(rows, 200000)):
+        writer.writerow((data.auth_names[data.auth[index]], f"{data.dates[data.day[index]]}-"
+                         f"{data.hour[index]:02d}.15.00", data.cp[index], data.ziip[index], data.total[index]))
+    path = Path(f"/tmp/smf_accounting_benchmark_{int(time.time())}.csv")
+    path.write_text(buffer.getvalue())
+    try:
+        started = time.perf_counter()
+        loaded = AccountingData.load_csv(path)
+        elapsed = time.perf_counter() - started
+        results['csv_load_rows_per_second'] = len(loaded) / elapsed if elapsed else 0.0
+    finally:
+        path.unlink()
+
+    for engine in ('numpy', 'array'):
+        if engine == 'numpy' and np is None:
+            continue
+        started = time.perf_counter()
+        grouped = data.aggregate(('primauth', 'date', 'hour'), engine=engine)
+        results[f"{engine}_group_seconds"] = time.perf_counter() - started
+        results[f"{engine}_groups"] = len(grouped)
+    return results
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Db2 accounting (SMF 101) CPU analytics')
+    parser.add_argument('extract', nargs='?', help='Accounting extract (CSV or fixed width)')
+    parser.add_argument('--layout', help='Fixed width layout NAME:START:LENGTH,... (1-based)')
+    parser.add_argument('--columns', help='Column names of a headerless CSV (default: '
+                                          + ','.join(DEFAULT_COLUMNS) + ')')
+    parser.add_argument('--delimiter', default=',', help='CSV delimiter')
+    parser.add_argument('--encoding', default='utf-8', help='Extract encoding (e.g. cp1047)')
+    parser.add_argument('--group-by', default='primauth,date', help='Any of primauth,date,hour')
+    parser.add_argument('--auth', action='append', help='Only this PRIMAUTH (repeatable)')
+    parser.add_argument('--date', action='append', help='Only this date, YYYY-MM-DD (repeatable)')
+    parser.add_argument('--hours', help='Inclusive hour range, e.g. 8-17')
+    parser.add_argument('--top', type=int, help='Only the N largest groups')
+    parser.add_argument('--by', choices=MEASURES, default='total_cpu', help='Measure for --top')
+    parser.add_argument('--engine', choices=['numpy', 'array'], help='Force an aggregation engine')
+    parser.add_argument('--json', action='store_true', help='Print JSON')
+    parser.add_argument('--benchmark', type=int, metavar='ROWS', help='Benchmark with synthetic records')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        print(json.dumps(run_benchmark(args.benchmark), indent=2))
+        return 0
+    if not args.extract:
+        parser.error('an accounting extract is required')
+    if args.engine == 'numpy' and np is None:
+        parser.error('NumPy is not installed')
+
+    try:
+        if args.layout:
+            data = AccountingData.load_fixed(args.extract, parse_layout(args.layout), args.encoding)
+        else:
+            columns = args.columns.split(',') if args.columns else None
+            data = AccountingData.load_csv(args.extract, columns, args.delimiter, args.encoding)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: Cannot load {args.extract}: {e}", file=sys.stderr)
+        return 1
+
+    group_by = [key.strip().lower() for key in args.group_by.split(',') if key.strip()]
+    hours = tuple(int(value) for value in args.hours.split('-')) if args.hours else None
+    rows = data.aggregate(group_by, args.auth, args.date, hours, args.engine)
+    summary = summarize(rows)
+    if args.top:
+        rows = top_n(rows, args.top, args.by)
+
+    if args.json:
+        print(json.dumps({'records': len(data), 'engine': args.engine or ('numpy' if np else 'array'),
+                          'summary': summary, 'groups': rows}, indent=2))
+    else:
+        print(format_table(rows, group_by))
+        print(f"Records: {summary['records']}  CP: {summary['cp_cpu']:.6f}  zIIP: {summary['ziip_cpu']:.6f} "
+              f"({summary['ziip_pct']:.1f}%)  Class 1 total: {summary['class1_total_cpu']:.6f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
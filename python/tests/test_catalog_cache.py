@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+test_catalog_cache.py - Snapshot sharing between processes in catalog_cache.py
+
+Run from the python directory:
+    python3 -m pytest -q tests
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+PYTHON_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PYTHON_DIR))
+
+from catalog_cache import CatalogCache, entry_key, level_key
+
+
+class SnapshotMergeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.snapshot = Path(self.work_dir.name) / 'catalog_cache.json'
+        seed = CatalogCache(snapshot_file=self.snapshot)
+        seed.put(entry_key('USER.WORK.DATA'), 'NONVSAM ------- USER.WORK.DATA\n')
+        seed.put(level_key('USER'), 'NONVSAM ------- USER.WORK.DATA\n')
+        seed.put(entry_key('OTHER.DATA'), 'NONVSAM ------- OTHER.DATA\n')
+        seed.save_snapshot()
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def keys_on_disk(self):
+        return set(CatalogCache(snapshot_file=self.snapshot)._entries)
+
+    def test_invalidation_on_disk_not_resurrected(self):
+        daemon = CatalogCache(snapshot_file=self.snapshot)
+        # A workflow step invalidates the HLQ while the daemon holds the old entries
+        step = CatalogCache(ttl=float('inf'), snapshot_file=self.snapshot)
+        step.invalidate_level('USER')
+        step.save_snapshot(force=True)
+
+        daemon.put(entry_key('NEW.DATA'), 'NONVSAM ------- NEW.DATA\n')
+        daemon.save_snapshot()
+        self.assertEqual(self.keys_on_disk(), {entry_key('OTHER.DATA'), entry_key('NEW.DATA')})
+        self.assertNotIn(entry_key('USER.WORK.DATA'), daemon._entries)
+
+    def test_local_invalidation_reaches_entries_stored_elsewhere(self):
+        daemon = CatalogCache(snapshot_file=self.snapshot)
+        other = CatalogCache(snapshot_file=self.snapshot)
+        other.put(entry_key('USER.LOG.TEST'), 'NONVSAM ------- USER.LOG.TEST\n')
+        other.save_snapshot()
+
+        daemon.invalidate(['USER.LOG.TEST'])
+        daemon.save_snapshot()
+        self.assertEqual(self.keys_on_disk(), {entry_key('USER.WORK.DATA'), entry_key('OTHER.DATA')})
+
+    def test_clear_drops_disk_entries(self):
+        cache = CatalogCache(snapshot_file=self.snapshot)
+        cache.clear()
+        cache.put(entry_key('NEW.DATA'), None)
+        cache.save_snapshot()
+        self.assertEqual(self.keys_on_disk(), {entry_key('NEW.DATA')})
+
+
+if __name__ == '__main__':
+    unittest.main()
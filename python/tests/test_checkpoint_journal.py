@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+test_checkpoint_journal.py - Interrupted and resumed runs of data_processor.py
+
+Run from the python directory:
+    python3 -m pytest -q tests
+"""
+
+import sys
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+PYTHON_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PYTHON_DIR))
+
+import data_processor
+from checkpoint_journal import CheckpointJournal
+from data_processor import WorkflowDataProcessor
+from log_queue import shutdown_logging
+
+
+class CheckpointJournalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.output_dir = Path(self.work_dir.name)
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def journal(self):
+        return CheckpointJournal(self.output_dir, 'USER', 'TEST', interval=0, batch=1)
+
+    def test_partial_record_dropped_and_appended_after(self):
+        journal = self.journal()
+        journal.start('20240101_000000', {'environment': 'TEST'}, {'HLQ': 'USER'})
+        journal.record_analysis({'dataset_name': 'USER.A', 'record_count': 1}, 'fp-a')
+        journal.record_analysis({'dataset_name': 'USER.B', 'record_count': 2}, 'fp-b')
+        journal.close()
+        with open(journal.journal_file, 'ab') as f:
+            f.write(b'{"record_type":"dataset","dataset_name":"USER.C"')
+
+        resumed = self.journal()
+        self.assertTrue(resumed.load())
+        self.assertEqual(sorted(resumed.analyses), ['USER.A', 'USER.B'])
+        self.assertEqual(resumed.get('USER.B', 'fp-b')['record_count'], 2)
+        # A changed dataset is analyzed again
+        self.assertIsNone(resumed.get('USER.A', 'fp-changed'))
+        resumed.start('ignored', {}, {})
+        resumed.record_analysis({'dataset_name': 'USER.B', 'record_count': 2}, 'fp-b')
+        resumed.record_analysis({'dataset_name': 'USER.C', 'record_count': 3}, 'fp-c')
+        resumed.close()
+
+        lines = journal.journal_file.read_bytes().splitlines()
+        self.assertEqual(json.loads(lines[0])['timestamp'], '20240101_000000')
+        self.assertEqual([json.loads(line)['dataset_name'] for line in lines[1:]],
+                         ['USER.A', 'USER.B', 'USER.C'])
+
+    def test_journal_of_another_run_ignored(self):
+        journal = self.journal()
+        journal.start('20240101_000000', {}, {})
+        journal.close()
+        other = CheckpointJournal(self.output_dir, 'USER', 'PROD')
+        self.assertFalse(other.load())
+        self.assertIsNone(other.header)
+
+
+class ResumeRunTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.work_dir.name)
+        self.datasets = []
+        for number in range(4):
+            path = self.root / f"data{number}.txt"
+            path.write_text(''.join(f"record {number}.{line}\n" for line in range(number + 1)))
+            self.datasets.append(str(path))
+
+    def tearDown(self):
+        shutdown_logging('WorkflowDataProcessor')
+        self.work_dir.cleanup()
+
+    def run_processing(self, resume: bool, fail_on=None):
+        processor = WorkflowDataProcessor(self.root, 'TEST', checkpoint_interval=0, checkpoint_batch=1,
+                                          resume=resume)
+        analyzed = []
+
+        def list_datasets(hlq):
+            processor.dataset_fingerprints = {name: f"fp-{name}" for name in self.datasets}
+            return list(self.datasets)
+
+        def build(dataset_name, temp_dir, attributes=None):
+            if dataset_name == fail_on:
+                raise KeyboardInterrupt
+            analyzed.append(dataset_name)
+            return build_dataset_analysis(dataset_name, temp_dir, attributes)
+
+        build_dataset_analysis = data_processor.build_dataset_analysis
+        with mock.patch.object(processor, 'list_datasets', list_datasets), \
+                mock.patch.object(data_processor, 'build_dataset_analysis', build):
+            return processor.run_processing(), analyzed
+
+    def test_interrupted_run_resumes_where_it_stopped(self):
+        with self.assertRaises(KeyboardInterrupt):
+            self.run_processing(resume=False, fail_on=self.datasets[2])
+        journal_file = self.root / 'output' / 'processing_checkpoint.ndjson'
+        self.assertTrue(journal_file.exists())
+
+        exit_code, analyzed = self.run_processing(resume=True)
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(analyzed, self.datasets[2:])
+        self.assertFalse(journal_file.exists())
+
+        reports = list((self.root / 'output').glob('*.json'))
+        self.assertEqual(len(reports), 1)
+        report = json.loads(reports[0].read_text())
+        self.assertEqual([dataset['record_count'] for dataset in report['datasets_analysis']], [1, 2, 3, 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+test_dataset_manifest.py - Incremental processing across runs with dataset_manifest.py
+
+Run from the python directory:
+    python3 -m pytest -q tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+PYTHON_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PYTHON_DIR))
+
+import data_processor
+from data_processor import WorkflowDataProcessor
+from dataset_manifest import DatasetManifest, fingerprint_entry
+from listcat_parser import parse_listcat_text
+from log_queue import shutdown_logging
+
+LISTCAT = (
+    "NONVSAM ------- USER.WORK.DATA\n"
+    "     HISTORY\n"
+    "       DATASET-OWNER-----(NULL)     CREATION--------2024.015\n"
+    "     DSCBINFO\n"
+    "       RECFM-FB  LRECL-80  BLKSIZE-27920\n"
+    "     VOLUMES\n"
+    "       VOLSER------------{volser}     DEVTYPE------X'3010200F'\n"
+)
+
+
+def fingerprint(volser: str = 'VOL001') -> str:
+    entry, = parse_listcat_text(LISTCAT.format(volser=volser))
+    return fingerprint_entry(entry)
+
+
+class FingerprintTest(unittest.TestCase):
+
+    def test_catalog_change_changes_fingerprint(self):
+        self.assertEqual(fingerprint(), fingerprint())
+        self.assertNotEqual(fingerprint(), fingerprint('VOL002'))
+
+
+class DatasetManifestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.manifest_file = Path(self.work_dir.name) / 'dataset_manifest_USER.ndjson'
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def run_manifest(self, datasets: dict) -> DatasetManifest:
+        """One run: reuse unchanged analyses, analyze the rest"""
+        manifest = DatasetManifest(self.manifest_file, 'USER')
+        manifest.begin()
+        for name, fingerprint in datasets.items():
+            analysis = manifest.get(name, fingerprint)
+            reused = analysis is not None
+            if not reused:
+                analysis = {'dataset_name': name, 'fingerprint_seen': fingerprint}
+            manifest.record(name, fingerprint, analysis, reused)
+        manifest.commit()
+        return manifest
+
+    def test_unchanged_changed_and_removed(self):
+        self.run_manifest({'USER.A': 'a1', 'USER.B': 'b1', 'USER.C': 'c1'})
+        second = self.run_manifest({'USER.A': 'a1', 'USER.B': 'b2'})
+        self.assertEqual(second.stats, {'reused': 1, 'analyzed': 1, 'removed': 1})
+
+        third = DatasetManifest(self.manifest_file, 'USER')
+        self.assertEqual({name: fingerprint for name, (fingerprint, _) in third.index.items()},
+                         {'USER.A': 'a1', 'USER.B': 'b2'})
+        # Offsets lead back to the stored analyses
+        self.assertEqual(third.get('USER.A', 'a1')['fingerprint_seen'], 'a1')
+        self.assertEqual(third.get('USER.B', 'b2')['fingerprint_seen'], 'b2')
+        self.assertIsNone(third.get('USER.B', 'b1'))
+        self.assertIsNone(third.get('USER.C', 'c1'))
+        third.close()
+
+    def test_failed_analysis_not_cached(self):
+        manifest = DatasetManifest(self.manifest_file, 'USER')
+        manifest.begin()
+        manifest.record('USER.A', 'a1', {'dataset_name': 'USER.A', 'error': 'copy failed'}, False)
+        manifest.commit()
+        self.assertEqual(DatasetManifest(self.manifest_file, 'USER').index, {})
+
+    def test_abort_keeps_previous_manifest(self):
+        self.run_manifest({'USER.A': 'a1'})
+        before = self.manifest_file.read_bytes()
+
+        manifest = DatasetManifest(self.manifest_file, 'USER')
+        manifest.begin()
+        manifest.record('USER.B', 'b1', {'dataset_name': 'USER.B'}, False)
+        manifest.abort()
+        self.assertEqual(self.manifest_file.read_bytes(), before)
+        self.assertEqual(os.listdir(self.work_dir.name), [self.manifest_file.name])
+
+    def test_manifest_of_another_hlq_ignored(self):
+        self.run_manifest({'USER.A': 'a1'})
+        self.assertEqual(DatasetManifest(self.manifest_file, 'OTHER').index, {})
+
+
+class IncrementalRunTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.work_dir.name)
+        self.fingerprints = {'USER.A': 'a1', 'USER.B': 'b1', 'USER.C': 'c1'}
+
+    def tearDown(self):
+        shutdown_logging('WorkflowDataProcessor')
+        self.work_dir.cleanup()
+
+    def run_processing(self):
+        processor = WorkflowDataProcessor(self.root, 'TEST', incremental=True, checkpoint=False)
+        analyzed = []
+
+        def list_datasets(hlq):
+            processor.dataset_fingerprints = dict(self.fingerprints)
+            return list(self.fingerprints)
+
+        def build(dataset_name, temp_dir, attributes=None):
+            analyzed.append(dataset_name)
+            analysis = data_processor.new_dataset_analysis(dataset_name)
+            analysis['record_count'] = len(analyzed)
+            return analysis
+
+        with mock.patch.object(processor, 'list_datasets', list_datasets), \
+                mock.patch.object(data_processor, 'build_dataset_analysis', build):
+            self.assertEqual(processor.run_processing(), 0)
+        return analyzed
+
+    def test_second_run_analyzes_only_changed_datasets(self):
+        self.assertEqual(self.run_processing(), ['USER.A', 'USER.B', 'USER.C'])
+        self.fingerprints = {'USER.A': 'a1', 'USER.B': 'b2', 'USER.D': 'd1'}
+        self.assertEqual(self.run_processing(), ['USER.B', 'USER.D'])
+
+        manifest = DatasetManifest(self.root / 'output' / 'dataset_manifest_USER.ndjson', 'USER')
+        self.assertEqual(sorted(manifest.index), ['USER.A', 'USER.B', 'USER.D'])
+        manifest.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+test_processor_daemon.py - Client environment handling of processor_daemon.py
+
+Run from the python directory:
+    python3 -m pytest -q tests
+"""
+
+import io
+import os
+import sys
+import json
+import unittest
+from pathlib import Path
+from unittest import mock
+
+PYTHON_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PYTHON_DIR))
+
+import tso_session
+import data_processor
+from processor_daemon import ProcessorDaemon, job_environment
+
+
+def job_output(connection: io.BytesIO):
+    messages = [json.loads(line) for line in connection.getvalue().splitlines()]
+    stdout = ''.join(message['data'] for message in messages if message['type'] == 'stdout')
+    return stdout, messages[-1]
+
+
+class JobEnvironmentTest(unittest.TestCase):
+
+    def setUp(self):
+        self.saved_env = dict(os.environ)
+        self.saved_pool = tso_session._default_pool
+        os.environ['WORKFLOW_TSO_POOL_SIZE'] = '2'
+        os.environ['WORKFLOW_DAEMON_ONLY'] = 'daemon'
+        self.daemon = ProcessorDaemon('/nonexistent/processor.sock')
+
+    def tearDown(self):
+        os.environ.clear()
+        os.environ.update(self.saved_env)
+        tso_session._default_pool = self.saved_pool
+
+    def run_job(self, env):
+        def report(argv):
+            print(json.dumps({name: os.environ.get(name) for name in
+                              ('WORKFLOW_TSO_POOL_SIZE', 'WORKFLOW_DAEMON_ONLY', 'WORKFLOW_CLIENT_ONLY')}))
+            return 3
+
+        connection = io.BytesIO()
+        with mock.patch.object(data_processor, 'run_from_args', report):
+            self.daemon.run_job({'action': 'run', 'argv': [], 'env': env}, connection)
+        stdout, last = job_output(connection)
+        return json.loads(stdout), last
+
+    def test_client_environment_applied_and_restored(self):
+        env = {'WORKFLOW_TSO_POOL_SIZE': '2', 'WORKFLOW_CLIENT_ONLY': 'client'}
+        seen, last = self.run_job(env)
+        self.assertEqual(seen, {'WORKFLOW_TSO_POOL_SIZE': '2', 'WORKFLOW_DAEMON_ONLY': None,
+                                'WORKFLOW_CLIENT_ONLY': 'client'})
+        self.assertEqual(last, {'type': 'exit', 'code': 3})
+        self.assertEqual(os.environ['WORKFLOW_DAEMON_ONLY'], 'daemon')
+        self.assertNotIn('WORKFLOW_CLIENT_ONLY', os.environ)
+
+    def test_pool_recreated_when_settings_differ(self):
+        pool = mock.Mock()
+        tso_session._default_pool = pool
+        self.run_job({'WORKFLOW_TSO_POOL_SIZE': '2'})
+        pool.close.assert_not_called()
+        self.assertIs(tso_session._default_pool, pool)
+
+        self.run_job({'WORKFLOW_TSO_POOL_SIZE': '4'})
+        pool.close.assert_called_once_with()
+        self.assertIsNone(tso_session._default_pool)
+        self.assertEqual(self.daemon.pool_env['WORKFLOW_TSO_POOL_SIZE'], '4')
+
+    def test_job_environment_selects_workflow_settings(self):
+        os.environ['UNRELATED_SETTING'] = 'x'
+        env = job_environment()
+        self.assertEqual(env['WORKFLOW_TSO_POOL_SIZE'], '2')
+        self.assertNotIn('UNRELATED_SETTING', env)
+
+
+if __name__ == '__main__':
+    unittest.main()
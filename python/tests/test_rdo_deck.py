@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+test_rdo_deck.py - Deck parsing, snapshot diffs and diff decks of rdo_deck.py
+
+Run from the python directory:
+    python3 -m pytest -q tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+PYTHON_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PYTHON_DIR))
+
+from rdo_deck import CsdSnapshot, diff_deck, diff_snapshots
+
+BEFORE = '''\
+* WAVE 4 DB2ENTRY DEFINITIONS
+DEFINE DB2ENTRY(TX66) GROUP(UAQ1F)
+       DESCRIPTION(RCT ENTRY FOR REGION UA)
+       ACCOUNTREC(TASK) AUTHTYPE(TX) THREADLIMIT(3)                     00000100
+       THREADWAIT(POOL)
+DEFINE DB2TRAN(TX66) GROUP(UAQ1F) ENTRY(TX66) TRANSID(TX66)
+
+DEFINE DB2ENTRY(HBPA) GROUP(UAQ1G) DESCRIPTION('IT''S HBPA')
+       PROTECTNUM(3) THREADLIMIT(3)
+DEFINE DB2ENTRY(RSIR) GROUP(UAQ1G) THREADLIMIT(2)
+'''
+
+AFTER = '''\
+DEFINE DB2ENTRY(TX66) GROUP(UAQ1F)
+       THREADWAIT(POOL) THREADLIMIT(5) AUTHTYPE(TX) ACCOUNTREC(TASK)
+       DESCRIPTION(RCT ENTRY FOR REGION UA)
+DEFINE DB2TRAN(TX66) GROUP(UAQ1F) ENTRY(TX66) TRANSID(TX66)
+DEFINE DB2ENTRY(HBPA) GROUP(UAQ1G) DESCRIPTION('IT''S HBPA')
+       THREADLIMIT(3)
+DEFINE DB2ENTRY(RSEV) GROUP(UAQ1H) ACCOUNTREC(TASK) THREADLIMIT(3)
+'''
+
+
+def load(text: str) -> CsdSnapshot:
+    return CsdSnapshot.load(text.splitlines(keepends=True))
+
+
+class SnapshotTest(unittest.TestCase):
+
+    def test_load(self):
+        snapshot = load(BEFORE)
+        self.assertEqual(len(snapshot), 4)
+        tx66 = snapshot.get('UAQ1F', 'DB2ENTRY', 'TX66')
+        self.assertEqual(tx66.attributes, (('DESCRIPTION', 'RCT ENTRY FOR REGION UA'), ('ACCOUNTREC', 'TASK'),
+                                           ('AUTHTYPE', 'TX'), ('THREADLIMIT', '3'), ('THREADWAIT', 'POOL')))
+        self.assertEqual(snapshot.get('UAQ1G', 'DB2ENTRY', 'HBPA').attribute('DESCRIPTION'), "'IT''S HBPA'")
+        self.assertEqual(snapshot.warnings, [])
+
+    def test_alter_and_delete(self):
+        snapshot = load(BEFORE + 'ALTER DB2ENTRY(TX66) GROUP(UAQ1F) THREADLIMIT(4)\n'
+                        'DELETE DB2ENTRY(RSIR) GROUP(UAQ1G)\nDELETE DB2ENTRY(NONE) GROUP(UAQ1G)\n')
+        self.assertEqual(snapshot.get('UAQ1F', 'DB2ENTRY', 'TX66').attribute('THREADLIMIT'), '4')
+        self.assertIsNone(snapshot.get('UAQ1G', 'DB2ENTRY', 'RSIR'))
+        self.assertEqual(len(snapshot.warnings), 1)
+
+
+class DiffTest(unittest.TestCase):
+
+    def test_changes(self):
+        changes = diff_snapshots(load(BEFORE), load(AFTER))
+        self.assertEqual([(change.kind, change.definition.group, change.definition.name, change.attributes)
+                          for change in changes],
+                         [('changed', 'UAQ1F', 'TX66', {'THREADLIMIT': ('3', '5')}),
+                          ('changed', 'UAQ1G', 'HBPA', {'PROTECTNUM': ('3', None)}),
+                          ('removed', 'UAQ1G', 'RSIR', {}),
+                          ('added', 'UAQ1H', 'RSEV', {})])
+
+    def test_operand_order_is_not_a_change(self):
+        self.assertEqual(diff_snapshots(load(BEFORE), load(BEFORE.replace(
+            'ACCOUNTREC(TASK) AUTHTYPE(TX)', 'AUTHTYPE(TX) ACCOUNTREC(TASK)'))), [])
+
+    def test_diff_deck_round_trip(self):
+        before, after = load(BEFORE), load(AFTER)
+        deck = list(diff_deck(diff_snapshots(before, after)))
+        self.assertIn('ALTER DB2ENTRY(TX66) GROUP(UAQ1F)', deck)
+        self.assertTrue(all(len(line) <= 71 for line in deck))
+        # Applying the diff deck to the old definitions yields the new ones
+        rebuilt = CsdSnapshot.load(BEFORE.splitlines() + deck)
+        self.assertEqual(diff_snapshots(rebuilt, after), [])
+        self.assertEqual(rebuilt.warnings, [])
+        # And the deck of a snapshot against itself is empty
+        self.assertEqual(list(diff_deck(diff_snapshots(rebuilt, after))), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
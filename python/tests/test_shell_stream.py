@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+test_shell_stream.py - Streaming and concurrent shell commands in workflow_utilities.py
+
+Run from the python directory:
+    python3 -m pytest -q tests
+"""
+
+import sys
+import time
+import tempfile
+import unittest
+from pathlib import Path
+
+PYTHON_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PYTHON_DIR))
+
+from workflow_utilities import ShellStream, USSUtilities
+
+
+class ShellStreamTest(unittest.TestCase):
+
+    def test_lines_and_tail(self):
+        with ShellStream("printf 'a\\nb\\nc\\n'", tail_lines=2) as stream:
+            lines = list(stream)
+        result = stream.result()
+        self.assertEqual(lines, ['a', 'b', 'c'])
+        self.assertEqual(result['stdout'], 'b\nc')
+        self.assertEqual((result['stdout_lines'], result['stdout_bytes']), (3, 6))
+        self.assertTrue(result['truncated'])
+        self.assertTrue(result['success'])
+
+    def test_chunks_count_unterminated_last_line(self):
+        with ShellStream("printf 'first\\nsecond'", chunk_size=4, tail_lines=None) as stream:
+            text = ''.join(stream)
+        self.assertEqual(text, 'first\nsecond')
+        self.assertEqual(list(stream.stdout_tail), ['first', 'second'])
+        self.assertEqual(stream.stdout_lines, 2)
+
+    def test_stderr_kept_without_stdout(self):
+        with ShellStream("echo out; echo err >&2; exit 3") as stream:
+            self.assertEqual(list(stream), ['out'])
+        result = stream.result()
+        self.assertEqual((result['stdout'], result['stderr']), ('', 'err'))
+        self.assertEqual(result['returncode'], 3)
+        self.assertFalse(result['success'])
+
+    def test_stderr_tail_limit(self):
+        with ShellStream("for n in 1 2 3; do echo $n >&2; done", stderr_tail_lines=1) as stream:
+            list(stream)
+        self.assertEqual(stream.result()['stderr'], '3')
+
+    def test_timeout_kills_process_group(self):
+        start = time.monotonic()
+        with ShellStream("sleep 30 | cat; echo done", timeout=0.2) as stream:
+            lines = list(stream)
+        result = stream.result()
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertEqual(lines, [])
+        self.assertTrue(result['timed_out'])
+        self.assertEqual(result['stderr'], 'Command timed out')
+        self.assertFalse(result['success'])
+
+    def test_early_break_stops_command(self):
+        start = time.monotonic()
+        with ShellStream("yes", timeout=None) as stream:
+            for number, line in enumerate(stream):
+                if number == 9:
+                    break
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertEqual(stream.stdout_lines, 10)
+        self.assertNotEqual(stream.returncode, 0)
+        self.assertFalse(stream.timed_out)
+
+    def test_command_that_cannot_start(self):
+        stream = ShellStream("true", cwd='/nonexistent/directory')
+        self.assertEqual(list(stream), [])
+        self.assertFalse(stream.success)
+        self.assertIsNotNone(stream.result()['stderr'])
+
+
+class RunShellCommandsTest(unittest.TestCase):
+
+    def test_results_in_completion_order_with_index(self):
+        results = list(USSUtilities.run_shell_commands(
+            ['sleep 0.5; echo slow', 'echo fast', {'command': 'sleep 30', 'timeout': 0.2}],
+            max_concurrent=3))
+        by_index = {result['index']: result for result in results}
+        self.assertEqual(results[0]['index'], 1)
+        self.assertEqual(by_index[0]['stdout'], 'slow')
+        self.assertEqual(by_index[1]['stdout'], 'fast')
+        self.assertTrue(by_index[2]['timed_out'])
+
+    def test_deadline_starts_with_each_command(self):
+        # Run one after the other, together they take longer than the timeout
+        results = list(USSUtilities.run_shell_commands(['sleep 0.3', 'sleep 0.3'], max_concurrent=1,
+                                                       timeout=0.5))
+        self.assertEqual([result['success'] for result in results], [True, True])
+
+    def test_early_break_cancels_queued_commands(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            commands = [f"touch {work_dir}/{number}" for number in range(5)]
+            for result in USSUtilities.run_shell_commands(commands, max_concurrent=1):
+                break
+            started = sorted(path.name for path in Path(work_dir).iterdir())
+        self.assertEqual(result['index'], 0)
+        self.assertLess(len(started), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+test_smf_accounting.py - Known-answer aggregation tests for smf_accounting.py
+
+Run from the python directory:
+    python3 -m pytest -q tests
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+PYTHON_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PYTHON_DIR))
+
+import smf_accounting
+from smf_accounting import AccountingData, DEFAULT_COLUMNS
+
+ROWS = [
+    ('USER1', '2026-03-04-10.15.00.000000', '1.0', '0.5', '1.6'),
+    ('USER1', '2026-03-04-11.00.00.000000', '2.0', '0.0', '2.0'),
+    ('USER2', '2026-03-04-10.30.00.000000', '0.5', '1.5', '2.1'),
+    ('USER1', '2026-03-05T10:00:00', '1.0', '1.0', '2.0'),
+]
+
+ENGINES = ('array', 'numpy')
+
+
+def rounded(rows):
+    return [{key: round(value, 6) if isinstance(value, float) else value for key, value in row.items()}
+            for row in rows]
+
+
+class AggregateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.data = AccountingData.from_rows(ROWS, DEFAULT_COLUMNS)
+
+    def aggregate(self, **options):
+        """Same answer from every available engine"""
+        results = []
+        for engine in ENGINES:
+            if engine == 'numpy' and smf_accounting.np is None:
+                continue
+            with self.subTest(engine=engine):
+                results.append(rounded(self.data.aggregate(engine=engine, **options)))
+        for result in results[1:]:
+            self.assertEqual(result, results[0])
+        return results[0]
+
+    def test_by_primauth(self):
+        self.assertEqual(self.aggregate(), [
+            {'primauth': 'USER1', 'count': 3, 'cp_cpu': 4.0, 'ziip_cpu': 1.5, 'total_cpu': 5.5,
+             'class1_total_cpu': 5.6, 'ziip_pct': round(100 * 1.5 / 5.5, 6)},
+            {'primauth': 'USER2', 'count': 1, 'cp_cpu': 0.5, 'ziip_cpu': 1.5, 'total_cpu': 2.0,
+             'class1_total_cpu': 2.1, 'ziip_pct': 75.0},
+        ])
+
+    def test_by_date_and_hour_within_hours(self):
+        rows = self.aggregate(group_by=('date', 'hour'), hours=(10, 10))
+        self.assertEqual([(row['date'], row['hour'], row['count'], row['cp_cpu'], row['ziip_cpu'])
+                          for row in rows],
+                         [('2026-03-04', 10, 2, 1.5, 2.0), ('2026-03-05', 10, 1, 1.0, 1.0)])
+
+    def test_auth_and_date_filters(self):
+        rows = self.aggregate(group_by=('primauth', 'date'), auths=[' USER1 ', 'NOBODY'], dates=['2026-03-04'])
+        self.assertEqual([(row['primauth'], row['date'], row['count'], row['total_cpu']) for row in rows],
+                         [('USER1', '2026-03-04', 2, 3.5)])
+        self.assertEqual(self.aggregate(auths=['NOBODY']), [])
+
+    def test_unknown_group_key(self):
+        with self.assertRaises(ValueError):
+            self.data.aggregate(group_by=('plan',))
+
+    def test_headerless_csv_matches_header_csv(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            with_header = Path(work_dir) / 'header.csv'
+            headerless = Path(work_dir) / 'headerless.csv'
+            body = ''.join(','.join(row) + '\n' for row in ROWS)
+            with_header.write_text(','.join(DEFAULT_COLUMNS) + '\n' + body)
+            headerless.write_text(body)
+            expected = self.data.aggregate(engine='array')
+            self.assertEqual(AccountingData.load_csv(with_header).aggregate(engine='array'), expected)
+            self.assertEqual(AccountingData.load_csv(headerless).aggregate(engine='array'), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
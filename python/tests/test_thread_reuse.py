@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+test_thread_reuse.py - Known-answer reuse reports and flags of thread_reuse.py
+
+Run from the python directory:
+    python3 -m pytest -q tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+PYTHON_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PYTHON_DIR))
+
+from thread_reuse import ReuseAggregator, Window, build_report, parse_list
+
+COLUMNS = ('CONNECT_ID', 'TRANSID', 'PLANNAME', 'INTERVAL_TIME', 'OCCURRENCES',
+           'NEW_USER', 'RESIGNON', 'DEALLOC', 'PGM_END', 'CLASS1_CPU_TOTAL')
+
+ROWS = [
+    # Reuse reached after the rollout, CPU per record down
+    ('CICSA', 'TX66', 'PLANA', '2026-08-01-10.00.00', '100', '50', '0', '50', '0', '10.0'),
+    ('CICSA', 'TX66', 'PLANA', '2026-08-05-10.00.00', '100', '98', '2', '0', '0', '9.0'),
+    # Below target, threads still deallocated and CPU per record up 20%
+    ('CICSB', 'HBPA', 'PLANB', '2026-08-01-10.00.00', '100', '90', '0', '10', '0', '10.0'),
+    ('CICSB', 'HBPA', 'PLANB', '2026-08-05-10.00.00', '100', '90', '0', '5', '5', '12.0'),
+    # No data after the rollout
+    ('CICSC', 'RSIR', 'PLANC', '2026-08-02-10.00.00', '10', '10', '0', '0', '0', '1.0'),
+    # Outside the hour slices and outside both windows
+    ('CICSA', 'TX66', 'PLANA', '2026-08-05-14.00.00', '100', '0', '0', '100', '0', '50.0'),
+    ('CICSA', 'TX66', 'PLANA', '2026-08-20-10.00.00', '100', '0', '0', '100', '0', '50.0'),
+]
+
+
+def aggregator(**options) -> ReuseAggregator:
+    return ReuseAggregator(Window('before', '2026-08-01:2026-08-03'), Window('after', '2026-08-04:2026-08-10'),
+                           hours=[10], **options)
+
+
+class BuildReportTest(unittest.TestCase):
+
+    def report(self, **options):
+        reuse = aggregator()
+        reuse.add_rows(ROWS, COLUMNS)
+        self.assertEqual((reuse.rows_read, reuse.rows_used), (7, 5))
+        return {row['region']: row for row in build_report(reuse, **options)}
+
+    def test_flags(self):
+        report = self.report(entries={('CICSA', 'TX66'): 'DB2ETX66'})
+        self.assertEqual({region: row['flags'] for region, row in report.items()},
+                         {'CICSA': [], 'CICSB': ['BELOW_TARGET', 'DEALLOC', 'CPU_REGRESSION'],
+                          'CICSC': ['NO_DATA']})
+        self.assertEqual(report['CICSA']['db2entry'], 'DB2ETX66')
+        self.assertEqual(report['CICSB']['db2entry'], '')
+
+    def test_metrics_and_deltas(self):
+        cicsa, cicsb = self.report()['CICSA'], self.report()['CICSB']
+        self.assertEqual((cicsa['before']['pct_reuse'], cicsa['after']['pct_reuse']), (50.0, 100.0))
+        self.assertEqual(cicsa['pct_reuse_delta'], 50.0)
+        self.assertAlmostEqual(cicsa['cpu_change_pct'], -10.0)
+        self.assertEqual(cicsb['after']['dealloc_rate'], 10.0)
+        self.assertAlmostEqual(cicsb['cpu_change_pct'], 20.0)
+
+    def test_target_and_tolerance(self):
+        cicsb = self.report(target=90.0, cpu_tolerance=25.0)['CICSB']
+        self.assertEqual(cicsb['flags'], ['DEALLOC'])
+
+    def test_term_reason_rows_and_corrname(self):
+        reuse = ReuseAggregator(Window('after', '2026-08-05'))
+        columns = ('CONNECT_ID', 'CORRNAME', 'INTERVAL_TIME', 'TERM_REASON')
+        reasons = ['NEW USER', 'RESIGNON', 'SIGNON', 'DEALLOC']
+        reuse.add_rows([('CICSA', 'ENTRTX66', '2026-08-05-10.00.00', reason) for reason in reasons], columns)
+        row, = build_report(reuse)
+        self.assertEqual(row['transid'], 'TX66')
+        self.assertEqual((row['after']['records'], row['after']['pct_reuse']), (4, 75.0))
+        self.assertEqual(row['flags'], ['BELOW_TARGET', 'DEALLOC'])
+        self.assertIsNone(row['before'])
+
+
+class ParseListTest(unittest.TestCase):
+
+    def test_values(self):
+        self.assertEqual(parse_list(' TX66, HBPA,,RSIR '), ['TX66', 'HBPA', 'RSIR'])
+        self.assertIsNone(parse_list(None))
+        self.assertIsNone(parse_list(''))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+test_tso_session.py - TSO session pool tests against fake_tso.py
+
+Run from the python directory:
+    python3 -m pytest -q tests
+"""
+
+import os
+import sys
+import time
+import tempfile
+import textwrap
+import unittest
+import subprocess
+from pathlib import Path
+from unittest import mock
+
+PYTHON_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PYTHON_DIR))
+
+import tso_session
+import catalog_cache
+from tso_session import TSOSession, TSOSessionPool, TSOSessionLostError, infer_returncode
+from workflow_utilities import DatasetUtilities
+
+FAKE_TSO = [sys.executable, str(PYTHON_DIR / 'fake_tso.py')]
+
+
+def fake_tso(*options):
+    return FAKE_TSO + list(options)
+
+
+class InferReturncodeTest(unittest.TestCase):
+
+    def test_condition_code_message(self):
+        self.assertEqual(infer_returncode("IDC0001I FUNCTION COMPLETED, HIGHEST CONDITION CODE WAS 8\n"), 8)
+
+    def test_error_messages(self):
+        self.assertEqual(infer_returncode("IDC3012I ENTRY USER.X NOT FOUND\n"), 4)
+        self.assertEqual(infer_returncode("IKJ56500I COMMAND FOO NOT FOUND\n"), 12)
+
+    def test_clean_output(self):
+        self.assertEqual(infer_returncode("NONVSAM ------- USER.DATA\n"), 0)
+
+
+class SessionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = TSOSessionPool(size=1, argv=fake_tso())
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_not_found_returns_nonzero(self):
+        result = self.pool.run("LISTCAT ENT('USER.MISSING.DS') ALL")
+        self.assertEqual(result.returncode, 4)
+        self.assertIn('NOT FOUND', result.stdout)
+
+    def test_pooled_and_one_shot_agree(self):
+        one_shot = TSOSessionPool(size=0, argv=fake_tso())
+        for command in ("LISTCAT ENT('USER.MISSING.DS') ALL", "LISTCAT ENT('USER.WORK.DATA') ALL"):
+            pooled = self.pool.run(command)
+            single = one_shot.run(command)
+            self.assertEqual(pooled.returncode, single.returncode, command)
+            self.assertEqual(pooled.stdout, single.stdout, command)
+        self.assertEqual(self.pool.stats['sessions_started'], 1)
+
+    def test_timeout_evicts_session(self):
+        pool = TSOSessionPool(size=1, argv=fake_tso('--latency', '1'))
+        try:
+            with self.assertRaises(subprocess.TimeoutExpired):
+                pool.run("TIME", timeout=0.2)
+            # The timed out session is not handed out again
+            self.assertEqual(pool.run("TIME", timeout=5).returncode, 0)
+            self.assertEqual(pool.stats['sessions_started'], 2)
+        finally:
+            pool.close()
+
+    def test_idle_eviction(self):
+        self.pool.idle_timeout = 0.1
+        self.pool.run("TIME")
+        time.sleep(0.2)
+        self.pool.run("TIME")
+        self.assertEqual(self.pool.stats['sessions_started'], 2)
+        self.assertEqual(self.pool.stats['sessions_evicted'], 1)
+
+
+class ScriptedSessionTest(unittest.TestCase):
+    """Sessions backed by small scripts for failure modes fake_tso does not have"""
+
+    def script(self, body: str):
+        path = Path(self.directory.name) / 'session.py'
+        path.write_text(textwrap.dedent(body))
+        return [sys.executable, str(path)]
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_stderr_is_kept_separate(self):
+        argv = self.script('''
+            import sys, time
+            for line in sys.stdin:
+                if line.startswith('ECHO '):
+                    time.sleep(0.05)
+                    print(line[5:].strip(), flush=True)
+                elif line.strip() == 'END':
+                    break
+                else:
+                    print('out', flush=True)
+                    print('err', file=sys.stderr, flush=True)
+        ''')
+        session = TSOSession(argv)
+        try:
+            result = session.execute('CMD', timeout=5)
+        finally:
+            session.close()
+        self.assertEqual(result.stdout, 'out\n')
+        self.assertEqual(result.stderr, 'err\n')
+
+    def test_lost_session_is_not_retried(self):
+        marker = Path(self.directory.name) / 'runs'
+        argv = self.script(f'''
+            import sys
+            for line in sys.stdin:
+                if line.startswith('ECHO '):
+                    print(line[5:].strip(), flush=True)
+                elif line.strip() == 'END':
+                    break
+                else:
+                    with open({str(marker)!r}, 'a') as f:
+                        f.write('run\\n')
+                    sys.exit(1)
+        ''')
+        pool = TSOSessionPool(size=1, argv=argv)
+        try:
+            with self.assertRaises(TSOSessionLostError):
+                pool.run('CMD', timeout=5)
+        finally:
+            pool.close()
+        self.assertEqual(marker.read_text().count('run'), 1)
+
+    def test_ping_timeout_discards_session(self):
+        argv = self.script('''
+            import sys, time
+            pings = 0
+            for line in sys.stdin:
+                if line.startswith('ECHO '):
+                    token = line[5:].strip()
+                    if '_PING_' in token:
+                        pings += 1
+                        if pings == 2:
+                            time.sleep(0.5)
+                    print(token, flush=True)
+                elif line.strip() == 'END':
+                    break
+                else:
+                    print('out', flush=True)
+        ''')
+        session = TSOSession(argv)
+        try:
+            self.assertFalse(session.ping(timeout=0.1))
+            self.assertFalse(session.is_alive())
+        finally:
+            session.close()
+
+
+class DefaultPoolTest(unittest.TestCase):
+    """Plain tso has no ECHO, the default pool only uses a configured backend"""
+
+    def setUp(self):
+        self.saved = tso_session._default_pool
+        tso_session._default_pool = None
+
+    def tearDown(self):
+        if tso_session._default_pool is not None:
+            tso_session._default_pool.close()
+        tso_session._default_pool = self.saved
+
+    def default_pool(self, env):
+        with mock.patch.dict(os.environ, env, clear=True):
+            return tso_session.get_default_pool()
+
+    def test_plain_tso_runs_one_shot(self):
+        pool = self.default_pool({})
+        self.assertEqual((pool.size, pool.disabled, pool.argv), (0, True, ['tso']))
+
+    def test_session_backend_enables_pool(self):
+        pool = self.default_pool({'WORKFLOW_TSO_COMMAND': 'fake_tso --latency 0',
+                                  'WORKFLOW_TSO_SENTINEL': 'SAY {token}'})
+        self.assertEqual((pool.size, pool.disabled), (2, False))
+        self.assertEqual(pool.argv, ['fake_tso', '--latency', '0'])
+        self.assertEqual(pool.sentinel_command, 'SAY {token}')
+
+    def test_explicit_size_wins(self):
+        self.assertEqual(self.default_pool({'WORKFLOW_TSO_POOL_SIZE': '3'}).size, 3)
+
+
+class DatasetExistsTest(unittest.TestCase):
+    """check_dataset_exists must not depend on whether the pool is used"""
+
+    def setUp(self):
+        self.saved = tso_session._default_pool, catalog_cache._default_cache
+        catalog_cache._default_cache = catalog_cache.CatalogCache()
+
+    def tearDown(self):
+        if tso_session._default_pool is not None:
+            tso_session._default_pool.close()
+        tso_session._default_pool, catalog_cache._default_cache = self.saved
+
+    def check(self, size: int):
+        tso_session._default_pool = TSOSessionPool(size=size, argv=fake_tso())
+        catalog_cache._default_cache.clear()
+        return (DatasetUtilities.check_dataset_exists('USER.MISSING.DS'),
+                DatasetUtilities.get_dataset_info('USER.MISSING.DS')['exists'],
+                DatasetUtilities.check_dataset_exists('USER.WORK.DATA'))
+
+    def test_pooled(self):
+        self.assertEqual(self.check(1), (False, False, True))
+
+    def test_one_shot(self):
+        self.assertEqual(self.check(0), (False, False, True))
+
+    def test_not_found_is_not_cached(self):
+        self.check(1)
+        cache = catalog_cache._default_cache
+        self.assertEqual(cache.get(catalog_cache.entry_key('USER.MISSING.DS')), (False, None))
+        self.assertTrue(cache.get(catalog_cache.entry_key('USER.WORK.DATA'))[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+test_zosmf_client.py - zOSMF client, bulk registration, poller and spool
+tests against zosmf_standin.py
+
+Run from the python directory:
+    python3 -m pytest -q tests
+"""
+
+import sys
+import asyncio
+import tempfile
+import unittest
+import http.client
+from pathlib import Path
+from unittest import mock
+
+PYTHON_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PYTHON_DIR))
+
+from zosmf_client import ZosmfClient, ZosmfError
+from zosmf_standin import ZosmfStandin, DEFAULT_STEPS
+from bulk_register import BulkRegistration
+from workflow_poller import WorkflowPoller
+from job_spool import JobSpool
+from jcl_submit import JobSubmitter
+
+
+class StandinTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.standin = ZosmfStandin(job_queue_seconds=0.0, job_run_seconds=0.0).start()
+        self.client = ZosmfClient('127.0.0.1', self.standin.port, 'USER', 'PASS', scheme='http')
+
+    def tearDown(self):
+        self.client.logout()
+        self.client.close()
+        self.standin.stop()
+
+    def create(self, name: str) -> str:
+        return self.client.create_workflow({'workflowName': name, 'owner': 'USER',
+                                            'system': 'SYS1'})['workflowKey']
+
+
+class ZosmfClientTest(StandinTestCase):
+
+    def test_token_reused_across_requests(self):
+        self.client.login()
+        for _ in range(5):
+            self.client.info()
+        self.assertEqual(self.client.stats['logins'], 1)
+        self.assertEqual(self.standin.server.logins, 1)
+        self.assertIn('jwtToken=', self.client._cookie)
+        # Keep-alive: every request went over the same connection
+        self.assertEqual(self.client.stats['connections_opened'], 1)
+
+    def test_relogin_after_expired_token(self):
+        self.client.login()
+        self.standin.server.expire_tokens()
+        info = self.client.info()
+        self.assertEqual(info['zosmf_hostname'], 'STANDIN')
+        self.assertEqual(self.client.stats['logins'], 2)
+        self.assertIn(self.standin.server.token, self.client._cookie)
+
+    def test_duplicate_name_conflict(self):
+        self.client.login()
+        self.create('DUPLICATE_TEST')
+        with self.assertRaises(ZosmfError) as raised:
+            self.create('DUPLICATE_TEST')
+        self.assertEqual(raised.exception.status, 409)
+        self.assertEqual(len(self.client.list_workflows(workflowName='DUPLICATE_TEST')), 1)
+
+    def stale_connection(self, **errors):
+        """Queue a pooled connection that fails the next request"""
+        connection = mock.Mock(**errors)
+        self.client._idle.put(connection)
+        return connection
+
+    def test_idempotent_request_retried_after_dropped_connection(self):
+        self.client.login()
+        self.stale_connection(**{'getresponse.side_effect': http.client.RemoteDisconnected()})
+        self.assertEqual(self.client.info()['zosmf_hostname'], 'STANDIN')
+        self.assertEqual(self.client.stats['retries'], 1)
+
+    def test_sent_post_not_retried(self):
+        self.client.login()
+        self.stale_connection(**{'getresponse.side_effect': http.client.RemoteDisconnected()})
+        with self.assertRaises(http.client.RemoteDisconnected):
+            self.create('NOT_RESENT')
+        self.assertEqual(self.client.stats['retries'], 0)
+
+    def test_unsent_post_retried(self):
+        self.client.login()
+        self.stale_connection(**{'request.side_effect': BrokenPipeError()})
+        self.create('RESENT')
+        self.assertEqual(self.client.stats['retries'], 1)
+        self.assertEqual(len(self.client.list_workflows(workflowName='RESENT')), 1)
+
+    def test_unknown_workflow_is_404(self):
+        self.client.login()
+        with self.assertRaises(ZosmfError) as raised:
+            self.client.get_workflow('no-such-key')
+        self.assertEqual(raised.exception.status, 404)
+
+
+class BulkRegistrationTest(StandinTestCase):
+
+    def register(self, instances, **options):
+        with tempfile.TemporaryDirectory() as work_dir:
+            bulk = BulkRegistration(instances, 'USER', 'PASS', Path(work_dir), per_host=2, rate=0,
+                                    scheme='http', **options)
+            return asyncio.run(bulk.run())
+
+    def instances(self, count: int):
+        return [{'host': '127.0.0.1', 'port': self.standin.port, 'system': 'SYS1',
+                 'name': f"BULK_TEST_{number}", 'variables': {'HLQ': f"TEST{number}"},
+                 'properties': None} for number in range(1, count + 1)]
+
+    def test_registers_and_starts_every_instance(self):
+        results = self.register(self.instances(4))
+        self.assertEqual([result['status'] for result in results], ['STARTED'] * 4)
+        self.assertEqual(len(self.standin.server.workflows), 4)
+        # One login per host, shared by every instance
+        self.assertEqual(self.standin.server.logins, 1)
+        for result in results:
+            workflow = self.standin.server.workflows[result['workflow_key']]
+            self.assertEqual(workflow['statusName'], 'automation-in-progress')
+
+    def test_existing_instance_kept_or_replaced(self):
+        self.client.login()
+        existing_key = self.create('BULK_TEST_1')
+
+        kept = self.register(self.instances(1))
+        self.assertEqual(kept[0]['status'], 'EXISTS')
+        self.assertEqual(kept[0]['workflow_key'], existing_key)
+
+        replaced = self.register(self.instances(1), replace=True)
+        self.assertEqual(replaced[0]['status'], 'STARTED')
+        self.assertNotEqual(replaced[0]['workflow_key'], existing_key)
+        self.assertEqual(list(self.standin.server.workflows), [replaced[0]['workflow_key']])
+
+
+class WorkflowPollerTest(StandinTestCase):
+
+    def test_reports_transitions_until_complete(self):
+        self.client.login()
+        workflow_key = self.create('POLLER_TEST')
+        self.client.start_workflow(workflow_key)
+
+        poller = WorkflowPoller(self.client, min_interval=0.01, max_interval=0.05,
+                                active_interval=0.01, jitter=0)
+        poller.add(workflow_key)
+        events = list(poller.events(timeout=10))
+
+        workflow_events = [event.new for event in events if event.kind == 'workflow']
+        self.assertEqual(workflow_events[0], 'automation-in-progress')
+        self.assertEqual(workflow_events[-1], 'complete')
+        completed = [event.step for event in events if event.kind == 'step' and event.new == 'Complete']
+        self.assertEqual(completed, list(DEFAULT_STEPS))
+        self.assertEqual(poller.tracked, {})
+
+    def test_deleted_workflow_leaves_schedule(self):
+        self.client.login()
+        workflow_key = self.create('POLLER_DELETED')
+        self.client.delete_workflow(workflow_key)
+
+        poller = WorkflowPoller(self.client, min_interval=0.01, jitter=0)
+        poller.add(workflow_key)
+        self.assertEqual(list(poller.events(timeout=5)), [])
+        self.assertEqual(poller.stats['errors'], 1)
+        self.assertEqual(poller.tracked, {})
+
+
+class JobSpoolTest(StandinTestCase):
+
+    def test_repeated_ddnames_kept_apart(self):
+        self.standin.server.add_job('TESTJOB', 'JOB00001', {
+            'JES2.JESMSGLG': ['$HASP395 TESTJOB ENDED - RC=0004'],
+            'STEP1.SYSPRINT': ['STEP1 OUTPUT'],
+            'STEP2.SYSPRINT': ['STEP2 OUTPUT']
+        }, retcode='CC 0004')
+        with tempfile.TemporaryDirectory() as output_dir:
+            result = JobSpool(self.client, 'TESTJOB', 'JOB00001').download(output_dir)
+            self.assertEqual(sorted(result.files), ['1.JES2.JESMSGLG.txt', '2.STEP1.SYSPRINT.txt',
+                                                    '3.STEP2.SYSPRINT.txt'])
+            contents = {name: Path(path).read_text() for name, path in result.files.items()}
+        self.assertIn('STEP1 OUTPUT', contents['2.STEP1.SYSPRINT.txt'])
+        self.assertIn('STEP2 OUTPUT', contents['3.STEP2.SYSPRINT.txt'])
+        self.assertEqual(result.max_rc, 4)
+
+
+
+class JobSubmitterTest(StandinTestCase):
+
+    def run_jobs(self, *jobnames):
+        submitter = JobSubmitter(self.client, min_interval=0.01, max_interval=0.05)
+        jobs = [(jobname, f"//{jobname} JOB (ACCT),'TEST'\n//STEP1 EXEC PGM=IEFBR14\n")
+                for jobname in jobnames]
+        with mock.patch.object(self.client, 'list_jobs', wraps=self.client.list_jobs) as list_jobs, \
+                mock.patch.object(self.client, 'get_job', wraps=self.client.get_job) as get_job:
+            results = submitter.run(jobs, timeout=10)
+        self.assertEqual([job.status for job in results], ['OUTPUT'] * len(jobnames))
+        return list_jobs, get_job
+
+    def test_common_prefix_listed_for_own_jobs(self):
+        # A job of another user under the same prefix is not part of the list
+        self.standin.server.add_job('TESTX', 'JOB09999', {}, status='ACTIVE', retcode=None, owner='OTHER')
+        list_jobs, get_job = self.run_jobs('TESTA1', 'TESTB1')
+        self.assertTrue(list_jobs.called)
+        for call in list_jobs.call_args_list:
+            self.assertEqual((call.kwargs['owner'], call.kwargs['prefix']), ('USER', 'TEST*'))
+        get_job.assert_not_called()
+
+    def test_no_common_prefix_polls_each_job(self):
+        list_jobs, get_job = self.run_jobs('ALPHA1', 'BRAVO1')
+        list_jobs.assert_not_called()
+        self.assertEqual({call.args[0] for call in get_job.call_args_list}, {'ALPHA1', 'BRAVO1'})
+
+
+if __name__ == '__main__':
+    unittest.main()
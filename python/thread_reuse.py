@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+thread_reuse.py - CICS-Db2 thread reuse analytics for DB2ENTRY rollouts
+
+Replaces the hand-built REUSE/CICSHRTR hour-slice tables of the thread reuse
+waves (mails/thread_reuse_wave123, mails/CICS_RDO_w4):
+- Streams Db2 accounting extracts (CSV or fixed width, any number of files)
+  once, keeping only one counter row per window/region/plan/transaction
+- Termination counts come from NEW_USER/RESIGNON/DEALLOC/PGM_END columns, or
+  from a TERM_REASON column when the extract has one row per thread
+- PCT_REUSE, DEALLOC/PGM_END rate and CLASS1 CPU per occurrence for a before
+  and an after window, with CPU and reuse deltas
+- DB2ENTRY names from a REGION,TRANSID,DB2ENTRY map
+- Flags regions below the reuse target, remaining DEALLOC/PGM_END and CPU
+  regressions
+
+Usage:
+    python3 thread_reuse.py reuse_*.csv --before 2026-07-27:2026-08-02 --after 2026-08-04:2026-08-10 --hours 8,10
+    python3 thread_reuse.py reuse.csv --after 2026-11-17 --transid TX66,RSIR,HBPA --by-hour --json
+    python3 thread_reuse.py reuse.txt --layout CONNECT_ID:1:8,CORRNAME:9:12,PLANNAME:21:8,...
+"""
+
+import sys
+import csv
+import json
+import time
+import random
+import argparse
+import itertools
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from smf_accounting import parse_layout
+
+REGION_COLUMN = 'CONNECT_ID'
+CORRNAME_COLUMN = 'CORRNAME'
+TRANSID_COLUMN = 'TRANSID'
+PLAN_COLUMN = 'PLANNAME'
+TIME_COLUMN = 'INTERVAL_TIME'
+CPU_COLUMN = 'CLASS1_CPU_TOTAL'
+OCCURRENCES_COLUMN = 'OCCURRENCES'
+REASON_COLUMN = 'TERM_REASON'
+
+# Termination counter columns and the TERM_REASON values that map onto them
+REUSE_COLUMNS = ('NEW_USER', 'RESIGNON')
+DEALLOC_COLUMN = 'DEALLOC'
+PGM_END_COLUMN = 'PGM_END'
+REASON_CLASSES = {'NEW USER': 'reuse', 'NEW_USER': 'reuse', 'RESIGNON': 'reuse', 'SIGNON': 'reuse',
+                  'DEALLOC': 'dealloc', 'DEALLOCATION': 'dealloc', 'PGM END': 'pgm_end', 'PGM_END': 'pgm_end'}
+
+# Column order of a headerless export
+DEFAULT_COLUMNS = (REGION_COLUMN, CORRNAME_COLUMN, PLAN_COLUMN, TIME_COLUMN, OCCURRENCES_COLUMN,
+                   'NEW_USER', 'RESIGNON', DEALLOC_COLUMN, PGM_END_COLUMN, CPU_COLUMN)
+
+DEFAULT_TARGET = 95.0
+DEFAULT_CPU_TOLERANCE = 5.0
+
+# Counter slots
+RECORDS, REUSE, DEALLOC, PGM_END, OTHER, CPU = range(6)
+
+
+def _number(value: str) -> float:
+    value = value.strip()
+    return float(value) if value else 0.0
+
+
+def parse_list(value: Optional[str]) -> Optional[List[str]]:
+    """Comma separated option values; None when the option is not given"""
+    return [item.strip() for item in value.split(',') if item.strip()] if value else None
+
+
+class Window:
+    """Inclusive date range, YYYY-MM-DD[:YYYY-MM-DD]"""
+
+    def __init__(self, name: str, spec: str):
+        first, _, last = spec.partition(':')
+        self.name = name
+        self.first = first.strip()
+        self.last = (last or first).strip()
+
+    def __contains__(self, date: str) -> bool:
+        return self.first <= date <= self.last
+
+    def __str__(self):
+        return self.first if self.first == self.last else f"{self.first}:{self.last}"
+
+
+def load_entry_map(path: str) -> Dict[Tuple[str, str], str]:
+    """REGION,TRANSID,DB2ENTRY rows (header optional)"""
+    entries = {}
+    with open(path, 'r', newline='') as f:
+        for row in csv.reader(f):
+            if len(row) < 3 or row[0].strip().upper() == 'REGION':
+                continue
+            entries[(row[0].strip().upper(), row[1].strip().upper())] = row[2].strip().upper()
+    return entries
+
+
+class ReuseAggregator:
+    """Streaming aggregation of accounting rows into reuse counters"""
+
+    def __init__(self, before: Optional[Window] = None, after: Optional[Window] = None,
+                 hours: Optional[Iterable[int]] = None, transids: Optional[Iterable[str]] = None,
+                 regions: Optional[Iterable[str]] = None, by_hour: bool = False):
+        self.windows = [window for window in (before, after) if window is not None]
+        self.hours = frozenset(hours) if hours is not None else None
+        self.transids = frozenset(value.upper() for value in transids) if transids is not None else None
+        self.regions = frozenset(value.upper() for value in regions) if regions is not None else None
+        self.by_hour = by_hour
+        self.counters: Dict[Tuple, List[float]] = {}
+        self.rows_read = 0
+        self.rows_used = 0
+
+    def _window(self, date: str) -> Optional[str]:
+        if not self.windows:
+            return 'all'
+        for window in self.windows:
+            if date in window:
+                return window.name
+        return None
+
+    def add_rows(self, rows: Iterable[Sequence[str]], columns: Sequence[str]):
+        """Aggregate rows of one extract described by its column names"""
+        index = {name.strip().upper(): position for position, name in enumerate(columns)}
+        if REGION_COLUMN not in index or TIME_COLUMN not in index:
+            raise ValueError(f"Accounting extract needs {REGION_COLUMN} and {TIME_COLUMN} columns")
+        if TRANSID_COLUMN not in index and CORRNAME_COLUMN not in index:
+            raise ValueError(f"Accounting extract needs {TRANSID_COLUMN} or {CORRNAME_COLUMN}")
+        region_at, time_at = index[REGION_COLUMN], index[TIME_COLUMN]
+        transid_at = index.get(TRANSID_COLUMN)
+        corrname_at = index.get(CORRNAME_COLUMN)
+        plan_at = index.get(PLAN_COLUMN)
+        cpu_at = index.get(CPU_COLUMN)
+        occurrences_at = index.get(OCCURRENCES_COLUMN)
+        reason_at = index.get(REASON_COLUMN)
+        reuse_at = [index[name] for name in REUSE_COLUMNS if name in index]
+        dealloc_at = index.get(DEALLOC_COLUMN)
+        pgm_end_at = index.get(PGM_END_COLUMN)
+        width = max(index.values()) + 1
+
+        counters = self.counters
+        window_of = self._window
+        hours, transids, regions, by_hour = self.hours, self.transids, self.regions, self.by_hour
+        for row in rows:
+            self.rows_read += 1
+            if len(row) < width:
+                continue
+            timestamp = row[time_at].strip()
+            date = timestamp[:10]
+            window = window_of(date)
+            if window is None:
+                continue
+            hour = int(timestamp[11:13] or 0)
+            if hours is not None and hour not in hours:
+                continue
+            region = row[region_at].strip().upper()
+            if regions is not None and region not in regions:
+                continue
+            if transid_at is not None:
+                transid = row[transid_at].strip().upper()
+            else:
+                # CICS correlation ID: thread type (ENTR/POOL/COMD) then the transaction ID
+                transid = row[corrname_at][4:8].strip().upper()
+            if transids is not None and transid not in transids:
+                continue
+            plan = row[plan_at].strip().upper() if plan_at is not None else ''
+
+            key = (window, region, plan, transid, hour) if by_hour else (window, region, plan, transid)
+            current = counters.get(key)
+            if current is None:
+                current = counters[key] = [0.0, 0.0, 0.0, 0.0, 0.0, 0.0]
+            records = _number(row[occurrences_at]) if occurrences_at is not None else 1.0
+            current[RECORDS] += records
+            if cpu_at is not None:
+                current[CPU] += _number(row[cpu_at])
+            if reason_at is not None:
+                slot = REASON_CLASSES.get(row[reason_at].strip().upper(), 'other')
+                current[{'reuse': REUSE, 'dealloc': DEALLOC, 'pgm_end': PGM_END}.get(slot, OTHER)] += records
+            else:
+                for position in reuse_at:
+                    current[REUSE] += _number(row[position])
+                if dealloc_at is not None:
+                    current[DEALLOC] += _number(row[dealloc_at])
+                if pgm_end_at is not None:
+                    current[PGM_END] += _number(row[pgm_end_at])
+            self.rows_used += 1
+
+    def add_csv(self, path: str, columns: Optional[Sequence[str]] = None, delimiter: str = ',',
+                encoding: str = 'utf-8'):
+        with open(path, 'r', encoding=encoding, newline='') as f:
+            reader = csv.reader(f, delimiter=delimiter)
+            if columns is None:
+                first = next(reader, [])
+                if any(value.strip().upper() == REGION_COLUMN for value in first):
+                    columns = first
+                else:
+                    columns = DEFAULT_COLUMNS
+                    reader = itertools.chain([first], reader)
+            self.add_rows(reader, columns)
+
+    def add_fixed(self, path: str, layout: Dict[str, Tuple[int, int]], encoding: str = 'utf-8'):
+        slices = [slice(start - 1, start - 1 + length) for start, length in layout.values()]
+        with open(path, 'r', encoding=encoding) as f:
+            self.add_rows(([line[part] for part in slices] for line in f), list(layout))
+
+
+def _metrics(counter: Optional[List[float]]) -> Optional[Dict]:
+    if counter is None:
+        return None
+    terminations = counter[REUSE] + counter[DEALLOC] + counter[PGM_END] + counter[OTHER]
+    records = counter[RECORDS]
+    return {'records': int(records), 'reuse': int(counter[REUSE]), 'dealloc': int(counter[DEALLOC]),
+            'pgm_end': int(counter[PGM_END]),
+            'pct_reuse': 100.0 * counter[REUSE] / terminations if terminations else 0.0,
+            'dealloc_rate': 100.0 * (counter[DEALLOC] + counter[PGM_END]) / records if records else 0.0,
+            'cpu': counter[CPU], 'cpu_per_record': counter[CPU] / records if records else 0.0}
+
+
+def build_report(aggregator: ReuseAggregator, entries: Optional[Dict[Tuple[str, str], str]] = None,
+                 target: float = DEFAULT_TARGET, cpu_tolerance: float = DEFAULT_CPU_TOLERANCE) -> List[Dict]:
+    """Pair before/after counters per region/plan/transaction and flag regressions"""
+    entries = entries or {}
+    groups: Dict[Tuple, Dict[str, List[float]]] = {}
+    for key, counter in aggregator.counters.items():
+        groups.setdefault(key[1:], {})[key[0]] = counter
+
+    # The window that is judged: after when given, otherwise the only one
+    judged = 'after' if any(window.name == 'after' for window in aggregator.windows) else \
+        (aggregator.windows[0].name if aggregator.windows else 'all')
+    report = []
+    for key in sorted(groups):
+        region, plan, transid = key[:3]
+        before = _metrics(groups[key].get('before'))
+        current = _metrics(groups[key].get(judged))
+        row = {'region': region, 'db2entry': entries.get((region, transid), ''), 'plan': plan,
+               'transid': transid}
+        if aggregator.by_hour:
+            row['hour'] = key[3]
+        row.update(before=before if judged != 'before' else None, after=current, flags=[])
+
+        if current is None:
+            row['flags'].append('NO_DATA')
+        else:
+            if current['pct_reuse'] < target:
+                row['flags'].append('BELOW_TARGET')
+            if current['dealloc'] or current['pgm_end']:
+                row['flags'].append('DEALLOC')
+        if before is not None and current is not None and judged != 'before':
+            row['pct_reuse_delta'] = current['pct_reuse'] - before['pct_reuse']
+            if before['cpu_per_record']:
+                change = 100.0 * (current['cpu_per_record'] - before['cpu_per_record']) / before['cpu_per_record']
+                row['cpu_change_pct'] = change
+                if change > cpu_tolerance:
+                    row['flags'].append('CPU_REGRESSION')
+        report.append(row)
+    return report
+
+
+def format_report(report: List[Dict], by_hour: bool = False) -> str:
+    hour = f" {'HOUR':>4}" if by_hour else ''
+    lines = [f"{'REGION':<8} {'DB2ENTRY':<8} {'PLAN':<8} {'TRAN':<4}{hour} {'RECORDS':>9} {'REUSE%':>7} "
+             f"{'DEALLOC':>8} {'PGM_END':>8} {'CPU/REC':>10} {'BEFORE%':>7} {'CPU CHG%':>8}  FLAGS"]
+    for row in report:
+        after = row['after'] or {}
+        before = row['before'] or {}
+        hour = f" {row['hour']:>4}" if by_hour else ''
+        before_pct = f"{before['pct_reuse']:>7.1f}" if before else f"{'-':>7}"
+        change = f"{row['cpu_change_pct']:>+8.1f}" if 'cpu_change_pct' in row else f"{'-':>8}"
+        lines.append(f"{row['region']:<8} {row['db2entry']:<8} {row['plan']:<8} {row['transid']:<4}{hour} "
+                     f"{after.get('records', 0):>9} {after.get('pct_reuse', 0.0):>7.1f} "
+                     f"{after.get('dealloc', 0):>8} {after.get('pgm_end', 0):>8} "
+                     f"{after.get('cpu_per_record', 0.0):>10.6f} {before_pct} {change}  {','.join(row['flags'])}")
+    return '\n'.join(lines)
+
+
+def generate_synthetic_extract(path: Path, rows: int, seed: int = 66) -> Path:
+    """Hourly accounting rollups for benchmarks"""
+    generator = random.Random(seed)
+    regions = [f"LQ01CIZ{letter}" for letter in 'ABCDEFGHIJKL']
+    transids = ['TX66', 'HBPA', 'RSIR', 'RSER', 'RS7P', 'RSEV']
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(DEFAULT_COLUMNS)
+        for index in range(rows):
+            region = generator.choice(regions)
+            occurrences = generator.randint(100, 5000)
+            reused = occurrences if index % 7 else occurrences // 2
+            writer.writerow((region, f"ENTR{generator.choice(transids)}0001", f"LQ01D1{region[-2:]}",
+                             f"2026-08-{generator.randint(1, 10):02d}-{generator.randint(0, 23):02d}.00.00.000000",
+                             occurrences, reused, 0, occurrences - reused, 0, occurrences * 0.0012))
+    return path
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='CICS-Db2 thread reuse analytics')
+    parser.add_argument('extracts', nargs='*', help='Accounting extracts (CSV or fixed width)')
+    parser.add_argument('--before', help='Before window YYYY-MM-DD[:YYYY-MM-DD]')
+    parser.add_argument('--after', help='After window YYYY-MM-DD[:YYYY-MM-DD]')
+    parser.add_argument('--hours', help='Hour slices to include, e.g. 8,10')
+    parser.add_argument('--by-hour', action='store_true', help='Report each hour slice separately')
+    parser.add_argument('--transid', help='Only these transactions, e.g. TX66,HBPA,RSIR')
+    parser.add_argument('--region', help='Only these regions (CONNECT_ID)')
+    parser.add_argument('--entries', help='REGION,TRANSID,DB2ENTRY map')
+    parser.add_argument('--target', type=float, default=DEFAULT_TARGET, help='PCT_REUSE target')
+    parser.add_argument('--cpu-tolerance', type=float, default=DEFAULT_CPU_TOLERANCE,
+                        help='Allowed CPU per record increase in percent')
+    parser.add_argument('--layout', help='Fixed width layout NAME:START:LENGTH,... (1-based)')
+    parser.add_argument('--columns', help='Column names of a headerless CSV')
+    parser.add_argument('--delimiter', default=',', help='CSV delimiter')
+    parser.add_argument('--encoding', default='utf-8', help='Extract encoding (e.g. cp1047)')
+    parser.add_argument('--flagged', action='store_true', help='Only print flagged rows')
+    parser.add_argument('--json', action='store_true', help='Print JSON')
+    parser.add_argument('--strict', action='store_true', help='Exit 1 when any row is flagged')
+    parser.add_argument('--benchmark', type=int, metavar='ROWS', help='Benchmark with a synthetic extract')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        path = generate_synthetic_extract(Path(f"/tmp/thread_reuse_benchmark_{int(time.time())}.csv"),
+                                          args.benchmark)
+        try:
+            started = time.perf_counter()
+            aggregator = ReuseAggregator(Window('before', '2026-08-01:2026-08-03'),
+                                         Window('after', '2026-08-04:2026-08-10'), hours=(8, 10))
+            aggregator.add_csv(str(path))
+            report = build_report(aggregator)
+            elapsed = time.perf_counter() - started
+        finally:
+            path.unlink()
+        print(json.dumps({'rows': aggregator.rows_read, 'rows_used': aggregator.rows_used,
+                          'groups': len(report), 'seconds': elapsed,
+                          'rows_per_second': aggregator.rows_read / elapsed if elapsed else 0.0}, indent=2))
+        return 0
+    if not args.extracts:
+        parser.error('at least one accounting extract is required')
+
+    aggregator = ReuseAggregator(Window('before', args.before) if args.before else None,
+                                 Window('after', args.after) if args.after else None,
+                                 hours=[int(hour) for hour in parse_list(args.hours)] if args.hours else None,
+                                 transids=parse_list(args.transid), regions=parse_list(args.region),
+                                 by_hour=args.by_hour)
+    try:
+        for extract in args.extracts:
+            if args.layout:
+                aggregator.add_fixed(extract, parse_layout(args.layout), args.encoding)
+            else:
+                aggregator.add_csv(extract, parse_list(args.columns), args.delimiter, args.encoding)
+        entries = load_entry_map(args.entries) if args.entries else None
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 2
+
+    report = build_report(aggregator, entries, args.target, args.cpu_tolerance)
+    flagged = [row for row in report if row['flags']]
+    shown = flagged if args.flagged else report
+    if args.json:
+        print(json.dumps({'rows_read': aggregator.rows_read, 'rows_used': aggregator.rows_used,
+                          'target': args.target, 'flagged': len(flagged), 'groups': shown}, indent=2))
+    else:
+        print(format_report(shown, args.by_hour))
+        print(f"Rows: {aggregator.rows_read} read, {aggregator.rows_used} used; "
+              f"{len(flagged)} of {len(report)} groups flagged (target {args.target:.0f}%)")
+    return 1 if args.strict and flagged else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+tso_session.py - Persistent TSO session pool for zOS workflow utilities
+
+This module keeps long-lived TSO address spaces around so that repeated
+TSO commands do not pay the address space setup cost on every call:
+- TSOSession wraps one interactive `tso` process (command/response loop)
+- TSOSessionPool checks sessions out and back in, with a bounded size,
+  idle eviction and health checks
+- run_tso_command() is the drop-in replacement for subprocess.run(['tso', cmd])
+
+Session protocol:
+    Each command is written to the session's stdin as one line, followed by
+    the sentinel command (default "ECHO <token>").  Everything the session
+    prints up to the line starting with <token> is the command output; an
+    integer following the token on that line is taken as the return code.
+    The sentinel may not report a return code, so it is also derived from
+    the messages in the output (IDC0001I condition code, IDC/IKJ error
+    messages) and the higher of the two is used.  stderr is collected
+    separately.
+
+    TSO/E itself has no ECHO command (it answers IKJ56500I), so the plain
+    `tso` command cannot serve as a session backend.  Pooling is therefore
+    off unless WORKFLOW_TSO_COMMAND names an executable that follows this
+    loop, such as a REXX wrapper or the local fake `tso` used by the tests;
+    without one every command runs as a one-shot `tso` call.
+
+Environment:
+    WORKFLOW_TSO_COMMAND       - session command line (default: tso)
+    WORKFLOW_TSO_POOL_SIZE     - maximum sessions, 0 disables pooling
+                                 (default: 2 with WORKFLOW_TSO_COMMAND, else 0)
+    WORKFLOW_TSO_SENTINEL      - sentinel command, {token} is replaced (default: ECHO {token})
+    WORKFLOW_TSO_IDLE_TIMEOUT  - seconds before an idle session is evicted (default: 300)
+"""
+
+import os
+import re
+import shlex
+import queue
+import atexit
+import logging
+import threading
+import subprocess
+import time
+import uuid
+from contextlib import contextmanager
+from typing import List, Optional
+
+DEFAULT_SENTINEL_COMMAND = "ECHO {token}"
+DEFAULT_START_TIMEOUT = 10
+DEFAULT_HEALTH_CHECK_INTERVAL = 60
+
+TOKEN_PREFIX = "__TSO_"
+
+# IDCAMS reports the highest condition code of a function
+CONDITION_CODE_PATTERN = re.compile(r"\bIDC0001I\b.*CONDITION CODE WAS\s+(\d+)")
+
+# Error messages that end a command with a non-zero return code
+ERROR_MESSAGE_CODES = {
+    'IDC3012I': 4,     # entry not found
+    'IDC3009I': 8,     # catalog return code
+    'IDC1566I': 4,     # entry not listed/deleted
+    'IKJ56228I': 12,   # data set not in catalog
+    'IKJ56500I': 12,   # command not found
+    'IKJ56701I': 12,   # missing operand
+    'IKJ56702I': 12,   # invalid operand
+    'IKJ56712I': 12,   # invalid keyword
+}
+MESSAGE_PATTERN = re.compile(r"\b((?:IDC|IKJ)\d{4,5}I)\b")
+# IKJ/IDC messages with an E or S severity suffix are errors as well
+SEVERE_MESSAGE_PATTERN = re.compile(r"\b(?:IDC|IKJ)\d{4,5}[ES]\b")
+
+
+def infer_returncode(output: str) -> int:
+    """Return code implied by the TSO/IDCAMS messages in a command's output"""
+    match = CONDITION_CODE_PATTERN.search(output)
+    if match:
+        return int(match.group(1))
+    returncode = max((ERROR_MESSAGE_CODES.get(message, 0) for message in MESSAGE_PATTERN.findall(output)),
+                     default=0)
+    if SEVERE_MESSAGE_PATTERN.search(output):
+        returncode = max(returncode, 12)
+    return returncode
+
+
+class TSOSessionError(Exception):
+    """Raised when a TSO session has died or none is available"""
+
+
+class TSOSessionStartError(TSOSessionError):
+    """Raised when a new TSO session cannot be started"""
+
+
+class TSOSessionLostError(TSOSessionError):
+    """Raised when a session dies after a command was sent; the command may have run"""
+
+
+class TSOSession:
+    """One long-lived interactive TSO process"""
+
+    def __init__(self, argv: List[str], sentinel_command: str = DEFAULT_SENTINEL_COMMAND,
+                 start_timeout: int = DEFAULT_START_TIMEOUT):
+        self.argv = list(argv)
+        self.sentinel_command = sentinel_command
+        self.created = time.monotonic()
+        self.last_used = self.created
+        self.commands_run = 0
+        self._lines = queue.Queue()
+        self._errors = []
+        self._errors_lock = threading.Lock()
+
+        try:
+            self.process = subprocess.Popen(
+                self.argv,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                bufsize=1
+            )
+        except OSError as e:
+            raise TSOSessionStartError(f"Cannot start TSO session {self.argv}: {e}")
+
+        self._reader = threading.Thread(target=self._read_output, daemon=True)
+        self._reader.start()
+        self._error_reader = threading.Thread(target=self._read_errors, daemon=True)
+        self._error_reader.start()
+
+        # Make sure the session actually answers before handing it out
+        if not self.ping(start_timeout):
+            self.close()
+            raise TSOSessionStartError(f"TSO session {self.argv} did not respond within {start_timeout}s")
+
+    def _read_output(self):
+        """Forward session output lines to the line queue"""
+        for line in self.process.stdout:
+            self._lines.put(line)
+        self._lines.put(None)
+
+    def _read_errors(self):
+        """Collect session stderr lines until the next command completes"""
+        for line in self.process.stderr:
+            with self._errors_lock:
+                self._errors.append(line)
+
+    def _take_errors(self) -> str:
+        with self._errors_lock:
+            errors, self._errors = self._errors, []
+        return ''.join(errors)
+
+    def is_alive(self) -> bool:
+        """Check that the underlying process is still running"""
+        return self.process.poll() is None
+
+    def execute(self, command: str, timeout: int = 60) -> subprocess.CompletedProcess:
+        """Run one command in the session and collect its output"""
+        if not self.is_alive():
+            raise TSOSessionError("TSO session is no longer running")
+
+        token = f"{TOKEN_PREFIX}END_{uuid.uuid4().hex}__"
+        self._take_errors()
+        try:
+            self.process.stdin.write(f"{command}\n")
+            self.process.stdin.write(self.sentinel_command.format(token=token) + "\n")
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            # Part of the command may have reached the session
+            self.close()
+            raise TSOSessionLostError(f"Cannot write to TSO session: {e}")
+
+        output = []
+        returncode = 0
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                # The session state is unknown after a timeout, drop it
+                self.close()
+                raise subprocess.TimeoutExpired(['tso', command], timeout, ''.join(output))
+            try:
+                line = self._lines.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if line is None:
+                raise TSOSessionLostError("TSO session ended while running command")
+            if line.startswith(token):
+                rc_text = line[len(token):].strip()
+                if rc_text.lstrip('-').isdigit():
+                    returncode = int(rc_text)
+                break
+            if line.startswith(TOKEN_PREFIX):
+                # Late answer to an earlier sentinel, not command output
+                continue
+            output.append(line)
+
+        self.last_used = time.monotonic()
+        self.commands_run += 1
+        stdout = ''.join(output)
+        returncode = max(returncode, infer_returncode(stdout))
+        return subprocess.CompletedProcess(['tso', command], returncode, stdout, self._take_errors())
+
+    def ping(self, timeout: int = 10) -> bool:
+        """Health check: round-trip the sentinel without a command
+
+        A session that does not answer in time is closed, its late answer
+        would otherwise end up in the next command's output.
+        """
+        if not self.is_alive():
+            return False
+
+        token = f"{TOKEN_PREFIX}PING_{uuid.uuid4().hex}__"
+        try:
+            self.process.stdin.write(self.sentinel_command.format(token=token) + "\n")
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError):
+            self.close()
+            return False
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.close()
+                return False
+            try:
+                line = self._lines.get(timeout=remaining)
+            except queue.Empty:
+                self.close()
+                return False
+            if line is None:
+                return False
+            if line.startswith(token):
+                return True
+
+    def close(self):
+        """Terminate the session"""
+        if self.process.poll() is None:
+            try:
+                self.process.stdin.write("END\n")
+                self.process.stdin.flush()
+                self.process.stdin.close()
+                self.process.wait(timeout=5)
+            except Exception:
+                self.process.kill()
+                self.process.wait()
+
+
+class TSOSessionPool:
+    """Pool of reusable TSO sessions"""
+
+    def __init__(self, size: int = 2, idle_timeout: int = 300,
+                 argv: Optional[List[str]] = None,
+                 sentinel_command: str = DEFAULT_SENTINEL_COMMAND,
+                 health_check_interval: int = DEFAULT_HEALTH_CHECK_INTERVAL,
+                 start_timeout: int = DEFAULT_START_TIMEOUT):
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.argv = list(argv) if argv else ['tso']
+        self.sentinel_command = sentinel_command
+        self.health_check_interval = health_check_interval
+        self.start_timeout = start_timeout
+
+        self._idle = []
+        self._in_use = 0
+        self._lock = threading.Condition()
+        self._closed = False
+        # Set once a session fails to start; callers then run one-shot commands
+        self.disabled = size <= 0
+
+        self.stats = {
+            'sessions_started': 0,
+            'sessions_evicted': 0,
+            'sessions_failed': 0,
+            'checkouts': 0,
+            'reuses': 0
+        }
+
+    def _evict_idle(self) -> List[TSOSession]:
+        """Remove sessions idle longer than idle_timeout (lock held); the caller closes them"""
+        now = time.monotonic()
+        keep = []
+        evicted = []
+        for session in self._idle:
+            if now - session.last_used > self.idle_timeout or not session.is_alive():
+                evicted.append(session)
+                self.stats['sessions_evicted'] += 1
+            else:
+                keep.append(session)
+        self._idle = keep
+        return evicted
+
+    def _healthy(self, session: TSOSession) -> bool:
+        """Check a session before reuse, pinging it if it was idle a while"""
+        if not session.is_alive():
+            return False
+        if time.monotonic() - session.last_used > self.health_check_interval:
+            return session.ping()
+        return True
+
+    def acquire(self, timeout: Optional[float] = None) -> TSOSession:
+        """Check a session out of the pool, starting a new one if allowed"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            candidate = None
+            reserved = False
+            with self._lock:
+                while True:
+                    if self._closed:
+                        raise TSOSessionError("TSO session pool is closed")
+                    evicted = self._evict_idle()
+                    if self._idle:
+                        candidate = self._idle.pop()
+                        self._in_use += 1
+                        break
+                    if self._in_use < self.size:
+                        self._in_use += 1
+                        reserved = True
+                        break
+                    if evicted:
+                        break
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TSOSessionError("Timed out waiting for a TSO session")
+                    self._lock.wait(remaining)
+
+            # Closing and health checks can block, neither runs under the lock
+            for session in evicted:
+                session.close()
+            if reserved:
+                break
+            if candidate is None:
+                continue
+            if self._healthy(candidate):
+                with self._lock:
+                    self.stats['checkouts'] += 1
+                    self.stats['reuses'] += 1
+                return candidate
+            candidate.close()
+            with self._lock:
+                self._in_use -= 1
+                self.stats['sessions_evicted'] += 1
+                self._lock.notify()
+
+        # Start the new session outside the lock, it can take a while
+        try:
+            session = TSOSession(self.argv, self.sentinel_command, self.start_timeout)
+        except TSOSessionStartError:
+            with self._lock:
+                self._in_use -= 1
+                self.stats['sessions_failed'] += 1
+                self._lock.notify()
+            raise
+
+        with self._lock:
+            self.stats['sessions_started'] += 1
+            self.stats['checkouts'] += 1
+        return session
+
+    def release(self, session: TSOSession):
+        """Return a session to the pool"""
+        with self._lock:
+            self._in_use -= 1
+            if self._closed or not session.is_alive():
+                session.close()
+            else:
+                self._idle.append(session)
+            self._lock.notify()
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = None):
+        """Context manager wrapper around acquire()/release()"""
+        session = self.acquire(timeout)
+        try:
+            yield session
+        finally:
+            self.release(session)
+
+    def run(self, command: str, timeout: int = 60) -> subprocess.CompletedProcess:
+        """Run a TSO command on a pooled session, falling back to one-shot mode"""
+        if not self.disabled:
+            try:
+                session = self.acquire(timeout)
+            except TSOSessionStartError as e:
+                logging.warning(f"TSO session pool disabled, using one-shot tso: {e}")
+                self.disabled = True
+            except TSOSessionError as e:
+                logging.warning(f"No TSO session available, using one-shot tso: {e}")
+            else:
+                try:
+                    if session.is_alive():
+                        # A session lost after the command was sent is not retried,
+                        # the command may already have run
+                        return session.execute(command, timeout)
+                    logging.warning("TSO session ended before the command was sent, using one-shot tso")
+                finally:
+                    self.release(session)
+
+        return subprocess.run(
+            self.argv + [command],
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+
+    def close(self):
+        """Close all idle sessions and refuse new checkouts"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._lock.notify_all()
+        for session in idle:
+            session.close()
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_default_pool() -> TSOSessionPool:
+    """Return the process-wide TSO session pool configured from the environment"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            # Plain `tso` cannot hold a session, pool only with a configured backend
+            default_size = '2' if os.getenv('WORKFLOW_TSO_COMMAND') else '0'
+            _default_pool = TSOSessionPool(
+                size=int(os.getenv('WORKFLOW_TSO_POOL_SIZE', default_size)),
+                idle_timeout=int(os.getenv('WORKFLOW_TSO_IDLE_TIMEOUT', '300')),
+                argv=shlex.split(os.getenv('WORKFLOW_TSO_COMMAND', 'tso')),
+                sentinel_command=os.getenv('WORKFLOW_TSO_SENTINEL', DEFAULT_SENTINEL_COMMAND)
+            )
+            atexit.register(_default_pool.close)
+        return _default_pool
+
+
+def run_tso_command(command: str, timeout: int = 60) -> subprocess.CompletedProcess:
+    """Run a TSO command through the default session pool"""
+    return get_default_pool().run(command, timeout)
@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+workflow_graph.py - Workflow definition step-graph analyzer
+
+This module checks a zOSMF workflow definition in one streaming pass before
+registration and reports how its steps could be scheduled:
+- The XML is read with iterparse; finished elements are dropped, so memory
+  is bounded by the nesting depth rather than the file size
+- Leaf steps form a dependency DAG from <prereqStep>; prerequisites of a
+  parent step apply to all of its leaf steps, and a prerequisite naming a
+  parent step means all of that step's leaf steps
+- Errors: malformed XML, duplicate step names, unknown prerequisite steps,
+  dependency cycles and <variableValue>/<atCreate> of undeclared variables
+- Warnings: ${instance-X}/${global-X} references to undeclared variables
+  (zOSMF leaves them unsubstituted), missing workflowInfo elements
+- Steps are grouped into waves that could run concurrently, and the
+  critical path is computed from historical step timings (a JSON map of
+  step name to seconds, or workflow_poller.py event output), falling back
+  to the steps' <weight>
+
+Usage:
+    python3 workflow_graph.py workflow-definition.xml [--timings step_timings.json] [--json] [--strict]
+
+The exit code is 1 if errors were found (with --strict also for warnings).
+"""
+
+import re
+import sys
+import json
+import argparse
+import statistics
+import collections
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from workflow_poller import ACTIVE_STEP_STATES
+
+# ${instance-NAME}, $instance-NAME and $!{instance-NAME} (Velocity forms)
+VARIABLE_REFERENCE = re.compile(r"\$!?\{?(instance|global)-([A-Za-z_][A-Za-z0-9_]*)")
+
+REQUIRED_INFO_ELEMENTS = ('workflowInfo', 'workflowID', 'workflowDescription')
+
+
+def _local(tag: str) -> str:
+    # Definitions may declare the zOSMF workflow namespace
+    return tag.rsplit('}', 1)[-1]
+
+
+class Step:
+    """One <step>; only leaf steps do work"""
+
+    def __init__(self, name: str, parent: Optional['Step'], optional: bool):
+        self.name = name
+        self.parent = parent
+        self.optional = optional
+        self.children: List['Step'] = []
+        self.prereqs: List[str] = []
+        self.weight: Optional[float] = None
+        self.conditional = False
+
+    @property
+    def is_leaf(self) -> bool:
+        return not self.children
+
+    def ancestors(self):
+        step = self.parent
+        while step is not None:
+            yield step
+            step = step.parent
+
+    def leaves(self) -> List['Step']:
+        if self.is_leaf:
+            return [self]
+        return [leaf for child in self.children for leaf in child.leaves()]
+
+
+class Finding:
+    """An error or warning about the definition"""
+
+    def __init__(self, severity: str, message: str):
+        self.severity = severity
+        self.message = message
+
+    def to_dict(self) -> Dict:
+        return {'severity': self.severity, 'message': self.message}
+
+    def __str__(self):
+        return f"{self.severity}: {self.message}"
+
+
+class WorkflowGraph:
+    """Steps, variables and references of a workflow definition"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.steps: Dict[str, Step] = {}
+        self.variables: Dict[str, str] = {}
+        # (step name or None, scope, variable, kind); kind is 'declared' or 'text'
+        self.references: List[Tuple[Optional[str], str, str, str]] = []
+        self.findings: List[Finding] = []
+        self.elements = set()
+        self.cyclic = False
+        self.parsed = False
+
+    def error(self, message: str):
+        self.findings.append(Finding('ERROR', message))
+
+    def warning(self, message: str):
+        self.findings.append(Finding('WARNING', message))
+
+    @property
+    def errors(self) -> List[Finding]:
+        return [finding for finding in self.findings if finding.severity == 'ERROR']
+
+    # Parsing
+
+    @classmethod
+    def parse(cls, path: Union[str, Path]) -> 'WorkflowGraph':
+        graph = cls(path)
+        try:
+            graph._parse()
+        except ET.ParseError as e:
+            graph.error(f"Invalid XML: {e}")
+            return graph
+        graph.parsed = True
+        graph._check()
+        return graph
+
+    def _scan(self, text: Optional[str], step: Optional[Step]):
+        if text and '$' in text:
+            for scope, name in VARIABLE_REFERENCE.findall(text):
+                self.references.append((step.name if step else None, scope, name, 'text'))
+
+    def _parse(self):
+        stack: List[Step] = []
+        for event, element in ET.iterparse(str(self.path), events=('start', 'end')):
+            tag = _local(element.tag)
+            step = stack[-1] if stack else None
+            if event == 'start':
+                self.elements.add(tag)
+                if tag == 'step':
+                    name = element.get('name', '')
+                    new_step = Step(name, step, element.get('optional') == 'true')
+                    if name in self.steps:
+                        self.error(f"Duplicate step name: {name}")
+                    else:
+                        self.steps[name] = new_step
+                    if step is not None:
+                        step.children.append(new_step)
+                    stack.append(new_step)
+                elif tag == 'variable':
+                    self.variables[element.get('name', '')] = element.get('scope', 'instance')
+                elif tag in ('variableValue', 'atCreate'):
+                    self.references.append((step.name if step else None, element.get('scope', 'instance'),
+                                            element.get('name', ''), 'declared'))
+                elif tag == 'prereqStep' and step is not None:
+                    step.prereqs.append(element.get('name', ''))
+                elif tag == 'condition' and step is not None:
+                    step.conditional = True
+                for value in element.attrib.values():
+                    self._scan(value, step)
+                continue
+
+            # Text is complete at the end event; child tails belong to this element
+            self._scan(element.text, step)
+            for child in element:
+                self._scan(child.tail, step)
+            if tag == 'weight' and step is not None:
+                try:
+                    step.weight = float((element.text or '').strip())
+                except ValueError:
+                    self.warning(f"Step {step.name} has a non-numeric weight: {element.text}")
+            elif tag == 'step':
+                stack.pop()
+            # Drop the finished subtree; only open elements stay in memory
+            del element[:]
+            element.text = None
+
+    def _check(self):
+        for name in REQUIRED_INFO_ELEMENTS:
+            if name not in self.elements:
+                self.warning(f"Missing required element: {name}")
+        if not self.steps:
+            self.error("Workflow defines no steps")
+
+        for step in self.steps.values():
+            for prereq in step.prereqs:
+                if prereq not in self.steps:
+                    self.error(f"Step {step.name} requires unknown step {prereq}")
+
+        reported = set()
+        for step_name, scope, name, kind in self.references:
+            declared = self.variables.get(name)
+            if declared == scope or (step_name, scope, name) in reported:
+                continue
+            reported.add((step_name, scope, name))
+            where = f"step {step_name}" if step_name else 'workflow'
+            if declared is not None:
+                self.warning(f"{where} references {scope}-{name}, but {name} is declared with scope {declared}")
+            elif kind == 'declared':
+                self.error(f"{where} uses undeclared variable {name}")
+            else:
+                self.warning(f"{where} references undeclared variable {scope}-{name}")
+
+        for cycle in self.cycles():
+            self.cyclic = True
+            self.error(f"Dependency cycle among steps: {', '.join(cycle)}")
+
+    # Graph
+
+    def leaves(self) -> List[Step]:
+        return [step for step in self.steps.values() if step.is_leaf]
+
+    def dependencies(self) -> Dict[str, Set[str]]:
+        """Leaf step -> leaf steps that must complete first"""
+        dependencies = {}
+        for leaf in self.leaves():
+            required = set()
+            for step in [leaf, *leaf.ancestors()]:
+                for prereq in step.prereqs:
+                    if prereq in self.steps:
+                        required.update(item.name for item in self.steps[prereq].leaves())
+            dependencies[leaf.name] = required
+        return dependencies
+
+    def cycles(self) -> List[List[str]]:
+        """Steps of each strongly connected component that contains a cycle (iterative Tarjan)"""
+        dependencies = self.dependencies()
+        index = {}
+        lowlink = {}
+        on_stack = set()
+        stack = []
+        components = []
+        counter = 0
+        for root in dependencies:
+            if root in index:
+                continue
+            work = [(root, iter(sorted(dependencies[root])))]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, successors = work[-1]
+                for successor in successors:
+                    if successor not in index:
+                        index[successor] = lowlink[successor] = counter
+                        counter += 1
+                        stack.append(successor)
+                        on_stack.add(successor)
+                        work.append((successor, iter(sorted(dependencies[successor]))))
+                        break
+                    if successor in on_stack:
+                        lowlink[node] = min(lowlink[node], index[successor])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        if len(component) > 1 or node in dependencies[node]:
+                            components.append(component[::-1])
+        return components
+
+    def schedule(self, timings: Optional[Dict[str, float]] = None) -> Dict:
+        """Waves of concurrently runnable steps and the critical path (requires an acyclic graph)"""
+        dependencies = self.dependencies()
+        durations, sources = self._durations(timings or {})
+
+        dependents = collections.defaultdict(list)
+        remaining = {name: len(required) for name, required in dependencies.items()}
+        for name, required in dependencies.items():
+            for item in required:
+                dependents[item].append(name)
+
+        # Kahn's algorithm in document order
+        ready = collections.deque(name for name, count in remaining.items() if count == 0)
+        order = []
+        while ready:
+            name = ready.popleft()
+            order.append(name)
+            for dependent in dependents[name]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+
+        level, start, finish, previous = {}, {}, {}, {}
+        for name in order:
+            required = dependencies[name]
+            level[name] = max((level[item] + 1 for item in required), default=0)
+            critical = max(required, key=lambda item: finish[item], default=None)
+            previous[name] = critical
+            start[name] = finish[critical] if critical is not None else 0.0
+            finish[name] = start[name] + durations[name]
+
+        # Slack: how long a step can slip without delaying the whole workflow
+        makespan = max(finish.values(), default=0.0)
+        latest = {}
+        for name in reversed(order):
+            latest[name] = min((latest[item] - durations[item] for item in dependents[name]), default=makespan)
+
+        waves = collections.defaultdict(list)
+        for name in order:
+            waves[level[name]].append(name)
+
+        path = []
+        node = max(order, key=lambda item: finish[item], default=None)
+        while node is not None:
+            path.append(node)
+            node = previous[node]
+        path.reverse()
+
+        # Steps neither before nor after a step could run alongside it
+        bits = {name: 1 << position for position, name in enumerate(order)}
+        before = {}
+        for name in order:
+            before[name] = 0
+            for item in dependencies[name]:
+                before[name] |= before[item] | bits[item]
+        after = {name: 0 for name in order}
+        for name in reversed(order):
+            for item in dependencies[name]:
+                after[item] |= after[name] | bits[name]
+        everything = (1 << len(order)) - 1
+        concurrent = {name: bin(everything & ~(before[name] | after[name] | bits[name])).count('1')
+                      for name in order}
+
+        return {
+            'waves': [waves[key] for key in sorted(waves)],
+            'max_parallelism': max((len(items) for items in waves.values()), default=0),
+            'critical_path': path,
+            'critical_path_length': finish[path[-1]] if path else 0.0,
+            'sequential_length': sum(durations[name] for name in order),
+            'duration_unit': 'seconds' if timings else 'weight',
+            'steps': {name: {'start': start[name], 'finish': finish[name], 'duration': durations[name],
+                             'source': sources[name], 'slack': latest[name] - finish[name],
+                             'concurrent_with': concurrent[name]}
+                      for name in order},
+            'unscheduled': [name for name in dependencies if name not in level]
+        }
+
+    def _durations(self, timings: Dict[str, float]) -> Tuple[Dict[str, float], Dict[str, str]]:
+        durations, sources = {}, {}
+        known = [timings[step.name] for step in self.leaves() if step.name in timings]
+        fallback = statistics.median(known) if known else None
+        for step in self.leaves():
+            if step.name in timings:
+                durations[step.name], sources[step.name] = timings[step.name], 'history'
+            elif fallback is not None:
+                # Mixing seconds and weights is meaningless; assume a typical step
+                durations[step.name], sources[step.name] = fallback, 'median'
+            elif step.weight is not None:
+                durations[step.name], sources[step.name] = step.weight, 'weight'
+            else:
+                durations[step.name], sources[step.name] = 1.0, 'default'
+        return durations, sources
+
+
+def load_timings(path: Union[str, Path]) -> Dict[str, float]:
+    """Median seconds per step from a JSON map or workflow_poller.py events
+
+    A timings file that does not exist yet means no history. Unreadable files
+    raise OSError, malformed content ValueError.
+    """
+    if not Path(path).exists():
+        return {}
+    with open(path, 'r') as f:
+        text = f.read()
+    samples = collections.defaultdict(list)
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = None
+    if isinstance(data, dict):
+        for name, value in data.items():
+            samples[name].extend(value if isinstance(value, list) else [value])
+    else:
+        # One JSON event per line: time from the step becoming active to Complete
+        started = {}
+        for line in text.splitlines():
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(event, dict) or event.get('kind') != 'step':
+                continue
+            key = (event.get('workflow_key'), event.get('step'))
+            if event.get('new') in ACTIVE_STEP_STATES:
+                started.setdefault(key, event['timestamp'])
+            elif event.get('new') == 'Complete' and key in started:
+                samples[event['step']].append(event['timestamp'] - started.pop(key))
+    try:
+        return {name: statistics.median(float(value) for value in values)
+                for name, values in samples.items() if values}
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid step timings in {path}: {e}")
+
+
+def format_report(graph: WorkflowGraph, schedule: Optional[Dict]) -> str:
+    leaves = graph.leaves()
+    lines = [
+        f"Workflow definition: {graph.path}",
+        f"Steps: {len(graph.steps)} ({len(leaves)} leaf steps), variables: {len(graph.variables)}, "
+        f"variable references: {len(graph.references)}"
+    ]
+    lines.extend(str(finding) for finding in graph.findings)
+    if schedule:
+        unit = schedule['duration_unit']
+        lines.append(f"Maximum parallelism: {schedule['max_parallelism']} steps")
+        for number, wave in enumerate(schedule['waves'], 1):
+            lines.append(f"  Wave {number}: {', '.join(wave)}")
+        lines.append(f"Critical path ({schedule['critical_path_length']:.1f} {unit}, "
+                     f"sequential {schedule['sequential_length']:.1f} {unit}):")
+        for name in schedule['critical_path']:
+            step = schedule['steps'][name]
+            lines.append(f"  {name:<40} {step['start']:>9.1f} +{step['duration']:.1f} ({step['source']})")
+    lines.append(f"Result: {len(graph.errors)} errors, {len(graph.findings) - len(graph.errors)} warnings")
+    return '\n'.join(lines)
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='zOSMF workflow definition step-graph analyzer')
+    parser.add_argument('definition', help='Workflow definition XML')
+    parser.add_argument('--timings', help='Step timings: JSON {step: seconds} or workflow_poller.py output')
+    parser.add_argument('--json', action='store_true', help='Print the analysis as JSON')
+    parser.add_argument('--strict', action='store_true', help='Treat warnings as errors')
+    args = parser.parse_args()
+
+    if not Path(args.definition).is_file():
+        print(f"ERROR: Workflow definition file not found: {args.definition}", file=sys.stderr)
+        return 1
+
+    # Exit code 1 is reserved for definition errors; failures of the analyzer
+    # itself exit 2 so that register_workflow.sh falls back to its basic checks
+    try:
+        graph = WorkflowGraph.parse(args.definition)
+        timings = load_timings(args.timings) if args.timings else None
+        schedule = graph.schedule(timings) if graph.parsed and graph.steps and not graph.cyclic else None
+    except Exception as e:
+        print(f"ERROR: Step-graph analysis failed: {e}", file=sys.stderr)
+        return 2
+
+    if args.json:
+        print(json.dumps({'definition': str(graph.path), 'steps': len(graph.steps),
+                          'findings': [finding.to_dict() for finding in graph.findings],
+                          'schedule': schedule}, indent=2))
+    else:
+        print(format_report(graph, schedule))
+
+    if graph.errors or (args.strict and graph.findings):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
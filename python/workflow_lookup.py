@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+workflow_lookup.py - Fast zOSMF workflow instance lookup and cleanup
+
+This module avoids downloading the full workflow list for every lookup:
+- Server-side filtering with the workflowName/owner query parameters
+- Persistent name -> workflowKey index, confirmed with a single GET
+  before use and refreshed incrementally from filtered queries
+- Bulk deletion of stale instances by name pattern with bounded concurrency
+
+Usage:
+    python3 workflow_lookup.py --host zosmf.example.com --user USER \\
+        --index /u/user/workflow/config/workflow_index.json lookup BASELINE_WORKFLOW_TEST
+    python3 workflow_lookup.py --host zosmf.example.com --user USER \\
+        delete-stale 'BASELINE_WORKFLOW_TEST_.*' --owner USER --workers 4
+
+The password is read from ZOSMF_PASSWORD or prompted for.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import getpass
+import logging
+import argparse
+import threading
+import concurrent.futures
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from zosmf_client import ZosmfClient, ZosmfError
+
+INDEX_VERSION = 1
+
+
+class WorkflowIndex:
+    """Persistent workflowName -> workflowKey index"""
+
+    def __init__(self, index_file: Optional[Union[str, Path]] = None):
+        self.index_file = Path(index_file) if index_file else None
+        self.entries = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        """Load the index file if present"""
+        if not self.index_file or not self.index_file.exists():
+            return
+        try:
+            with open(self.index_file, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                self.entries = data.get('workflows', {})
+            else:
+                logging.warning(f"Ignoring workflow index with unknown version: {self.index_file}")
+        except Exception as e:
+            logging.warning(f"Error loading workflow index {self.index_file}: {e}")
+
+    def save(self) -> bool:
+        """Write the index atomically if it changed"""
+        if not self.index_file or not self._dirty:
+            return True
+        with self._lock:
+            data = {'version': INDEX_VERSION, 'workflows': dict(self.entries)}
+            self._dirty = False
+        tmp_file = self.index_file.with_name(f"{self.index_file.name}.{os.getpid()}.tmp")
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_file, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_file, self.index_file)
+            return True
+        except Exception as e:
+            logging.warning(f"Error saving workflow index {self.index_file}: {e}")
+            return False
+
+    def get(self, name: str) -> Optional[Dict]:
+        with self._lock:
+            return self.entries.get(name)
+
+    def update(self, workflow: Dict):
+        """Record a workflow instance returned by zOSMF"""
+        name = workflow.get('workflowName')
+        key = workflow.get('workflowKey')
+        if not name or not key:
+            return
+        entry = {
+            'workflowKey': key,
+            'owner': workflow.get('owner'),
+            'system': workflow.get('system'),
+            'updated': time.time()
+        }
+        with self._lock:
+            current = self.entries.get(name)
+            if current is None or current.get('workflowKey') != key or current.get('owner') != entry['owner']:
+                self.entries[name] = entry
+                self._dirty = True
+
+    def remove(self, name: str):
+        with self._lock:
+            if self.entries.pop(name, None) is not None:
+                self._dirty = True
+
+    def remove_key(self, workflow_key: str):
+        with self._lock:
+            for name, entry in list(self.entries.items()):
+                if entry.get('workflowKey') == workflow_key:
+                    del self.entries[name]
+                    self._dirty = True
+
+
+class WorkflowLookup:
+    """Workflow instance lookups backed by server-side filters and the index"""
+
+    def __init__(self, client: ZosmfClient, index: Optional[WorkflowIndex] = None):
+        self.client = client
+        self.index = index or WorkflowIndex()
+        self.stats = {'index_hits': 0, 'index_stale': 0, 'queries': 0}
+
+    def query(self, name_pattern: Optional[str] = None, owner: Optional[str] = None,
+              **filters) -> List[Dict]:
+        """Filtered workflow list; results refresh the index"""
+        self.stats['queries'] += 1
+        workflows = self.client.list_workflows(workflowName=name_pattern, owner=owner, **filters)
+        for workflow in workflows:
+            self.index.update(workflow)
+        return workflows
+
+    def find(self, name: str, owner: Optional[str] = None) -> Optional[Dict]:
+        """Find a workflow instance by exact name"""
+        entry = self.index.get(name)
+        if entry and (owner is None or entry.get('owner') == owner):
+            # Confirm the cached key with one cheap GET
+            try:
+                workflow = self.client.get_workflow(entry['workflowKey'])
+                if isinstance(workflow, dict) and workflow.get('workflowName') == name:
+                    self.stats['index_hits'] += 1
+                    workflow.setdefault('workflowKey', entry['workflowKey'])
+                    return workflow
+            except ZosmfError as e:
+                if e.status not in (404, 410):
+                    raise
+            self.stats['index_stale'] += 1
+            self.index.remove(name)
+
+        # workflowName is a regular expression on the server side
+        for workflow in self.query(f"^{re.escape(name)}$", owner):
+            if workflow.get('workflowName') == name:
+                return workflow
+        return None
+
+    def find_key(self, name: str, owner: Optional[str] = None) -> Optional[str]:
+        workflow = self.find(name, owner)
+        return workflow.get('workflowKey') if workflow else None
+
+    def delete(self, workflow_key: str) -> bool:
+        """Delete one workflow instance and drop it from the index"""
+        try:
+            self.client.delete_workflow(workflow_key)
+        except ZosmfError as e:
+            if e.status != 404:
+                raise
+        self.index.remove_key(workflow_key)
+        return True
+
+    def delete_matching(self, name_pattern: str, owner: Optional[str] = None,
+                        workers: int = 4, dry_run: bool = False) -> Dict:
+        """Delete all instances matching a name pattern with bounded concurrency"""
+        matcher = re.compile(name_pattern)
+        workflows = [workflow for workflow in self.query(name_pattern, owner)
+                     if matcher.fullmatch(workflow.get('workflowName', ''))]
+        result = {'matched': len(workflows), 'deleted': [], 'failed': {}}
+        if dry_run or not workflows:
+            return result
+
+        # Never run more deletes than there are pooled connections
+        workers = max(1, min(workers, self.client.pool_size))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(self.delete, workflow['workflowKey']): workflow
+                       for workflow in workflows}
+            for future in concurrent.futures.as_completed(futures):
+                name = futures[future].get('workflowName')
+                try:
+                    future.result()
+                    result['deleted'].append(name)
+                except Exception as e:
+                    result['failed'][name] = str(e)
+
+        result['deleted'].sort()
+        return result
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='zOSMF workflow lookup and cleanup')
+    parser.add_argument('--host', default='localhost', help='zOSMF host')
+    parser.add_argument('--port', type=int, default=443, help='zOSMF port')
+    parser.add_argument('--user', default=os.getenv('USER'), help='User ID for authentication')
+    parser.add_argument('--scheme', choices=['https', 'http'], default='https')
+    parser.add_argument('--insecure', action='store_true', help='Do not verify the TLS certificate')
+    parser.add_argument('--index', help='Workflow index file')
+    subparsers = parser.add_subparsers(dest='action', required=True)
+
+    lookup_parser = subparsers.add_parser('lookup', help='Find a workflow key by name')
+    lookup_parser.add_argument('name')
+    lookup_parser.add_argument('--owner')
+
+    delete_parser = subparsers.add_parser('delete-stale', help='Delete instances matching a pattern')
+    delete_parser.add_argument('pattern', help='Workflow name regular expression')
+    delete_parser.add_argument('--owner')
+    delete_parser.add_argument('--workers', type=int, default=4)
+    delete_parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s',
+                        datefmt='%Y-%m-%d %H:%M:%S')
+
+    password = os.getenv('ZOSMF_PASSWORD')
+    if password is None:
+        password = getpass.getpass(f"Enter password for user {args.user}: ")
+
+    index = WorkflowIndex(args.index)
+    with ZosmfClient(args.host, args.port, args.user, password, scheme=args.scheme,
+                     verify=not args.insecure) as client:
+        client.login()
+        lookup = WorkflowLookup(client, index)
+        if args.action == 'lookup':
+            workflow_key = lookup.find_key(args.name, args.owner)
+            index.save()
+            if workflow_key is None:
+                logging.error(f"Workflow not found: {args.name}")
+                return 1
+            print(workflow_key)
+            return 0
+
+        result = lookup.delete_matching(args.pattern, args.owner, args.workers, args.dry_run)
+        index.save()
+        print(json.dumps(result, indent=2))
+        return 1 if result['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
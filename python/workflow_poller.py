@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+workflow_poller.py - Adaptive zOSMF workflow status poller
+
+This module tracks many workflow instances and their step states over a
+single pooled zOSMF connection:
+- One GET per due instance (returnData=steps) instead of fixed-interval
+  re-runs of the validation scripts
+- Per-instance exponential backoff while nothing changes; the interval
+  resets on every transition and stays short while steps are running
+- Workflow and step transitions are emitted as WorkflowEvent objects,
+  either from the events() generator or through a callback
+- Instances leave the schedule once they reach a final state
+
+Usage:
+    python3 workflow_poller.py --host zosmf.example.com --user USER \\
+        --name 'BASELINE_WORKFLOW_TEST.*' [--key KEY ...] [--timeout 3600]
+
+The password is read from ZOSMF_PASSWORD or prompted for.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import heapq
+import random
+import getpass
+import logging
+import argparse
+from typing import Callable, Dict, Iterator, List, Optional
+
+from zosmf_client import ZosmfClient, ZosmfError
+
+# Workflow statusName values after which nothing changes any more
+FINAL_WORKFLOW_STATES = {'complete', 'canceled'}
+
+# Step states that indicate work in progress (poll at the active interval)
+ACTIVE_STEP_STATES = {'In Progress', 'Submitted'}
+
+FAILED_STEP_STATES = {'Failed'}
+
+
+class WorkflowEvent:
+    """One observed state change"""
+
+    __slots__ = ('workflow_key', 'workflow_name', 'kind', 'step', 'old', 'new', 'timestamp')
+
+    def __init__(self, workflow_key: str, workflow_name: str, kind: str,
+                 step: Optional[str], old: Optional[str], new: Optional[str]):
+        self.workflow_key = workflow_key
+        self.workflow_name = workflow_name
+        self.kind = kind
+        self.step = step
+        self.old = old
+        self.new = new
+        self.timestamp = time.time()
+
+    @property
+    def is_failure(self) -> bool:
+        return self.kind == 'step' and self.new in FAILED_STEP_STATES
+
+    def to_dict(self) -> Dict:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __repr__(self):
+        target = f"{self.workflow_name}/{self.step}" if self.step else self.workflow_name
+        return f"WorkflowEvent({self.kind} {target}: {self.old} -> {self.new})"
+
+
+def flatten_steps(steps: List[Dict], states: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Map step name -> state, including nested sub-steps"""
+    if states is None:
+        states = {}
+    for step in steps or []:
+        name = step.get('name')
+        if name:
+            states[name] = step.get('state')
+        if step.get('steps'):
+            flatten_steps(step['steps'], states)
+    return states
+
+
+class TrackedWorkflow:
+    """Last known state and polling interval of one instance"""
+
+    __slots__ = ('workflow_key', 'workflow_name', 'status', 'steps', 'interval', 'polls', 'errors')
+
+    def __init__(self, workflow_key: str, interval: float):
+        self.workflow_key = workflow_key
+        self.workflow_name = workflow_key
+        self.status = None
+        self.steps = {}
+        self.interval = interval
+        self.polls = 0
+        self.errors = 0
+
+    @property
+    def active(self) -> bool:
+        return any(state in ACTIVE_STEP_STATES for state in self.steps.values())
+
+
+class WorkflowPoller:
+    """Poll many workflow instances with adaptive per-instance intervals"""
+
+    def __init__(self, client: ZosmfClient, min_interval: float = 2.0, max_interval: float = 120.0,
+                 active_interval: float = 10.0, backoff: float = 2.0, jitter: float = 0.1):
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.active_interval = active_interval
+        self.backoff = backoff
+        self.jitter = jitter
+
+        self.tracked = {}
+        self._schedule = []
+        self.stats = {'polls': 0, 'events': 0, 'errors': 0}
+
+    def add(self, workflow_key: str, delay: float = 0.0):
+        """Start tracking a workflow instance"""
+        if workflow_key in self.tracked:
+            return
+        self.tracked[workflow_key] = TrackedWorkflow(workflow_key, self.min_interval)
+        heapq.heappush(self._schedule, (time.monotonic() + delay, workflow_key))
+
+    def remove(self, workflow_key: str):
+        """Stop tracking a workflow instance (its schedule entry is dropped lazily)"""
+        self.tracked.pop(workflow_key, None)
+
+    def _next_interval(self, tracked: TrackedWorkflow, changed: bool) -> float:
+        if changed:
+            interval = self.min_interval
+        else:
+            interval = min(tracked.interval * self.backoff, self.max_interval)
+            if tracked.active:
+                # Running steps can fail at any moment; keep detection latency low
+                interval = min(interval, self.active_interval)
+        tracked.interval = interval
+        return interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def poll(self, tracked: TrackedWorkflow) -> List[WorkflowEvent]:
+        """Fetch one instance and return its transitions since the last poll"""
+        tracked.polls += 1
+        self.stats['polls'] += 1
+        details = self.client.get_workflow(tracked.workflow_key, return_data='steps')
+        if not isinstance(details, dict):
+            raise ZosmfError(f"Unexpected workflow response: {details}")
+
+        tracked.workflow_name = details.get('workflowName', tracked.workflow_name)
+        events = []
+        status = details.get('statusName')
+        if status != tracked.status:
+            events.append(WorkflowEvent(tracked.workflow_key, tracked.workflow_name, 'workflow',
+                                        None, tracked.status, status))
+            tracked.status = status
+
+        steps = flatten_steps(details.get('steps'))
+        for name, state in steps.items():
+            old = tracked.steps.get(name)
+            if state != old:
+                events.append(WorkflowEvent(tracked.workflow_key, tracked.workflow_name, 'step',
+                                            name, old, state))
+        tracked.steps = steps
+        return events
+
+    def events(self, timeout: Optional[float] = None) -> Iterator[WorkflowEvent]:
+        """Yield transitions as they are observed until every instance is final"""
+        deadline = time.monotonic() + timeout if timeout else None
+        while self._schedule:
+            due, workflow_key = heapq.heappop(self._schedule)
+            tracked = self.tracked.get(workflow_key)
+            if tracked is None:
+                continue
+
+            now = time.monotonic()
+            if deadline is not None and due > deadline:
+                heapq.heappush(self._schedule, (due, workflow_key))
+                time.sleep(max(0.0, deadline - now))
+                return
+            if due > now:
+                time.sleep(due - now)
+
+            try:
+                events = self.poll(tracked)
+            except (ZosmfError, OSError) as e:
+                tracked.errors += 1
+                self.stats['errors'] += 1
+                logging.warning(f"Status poll failed for {tracked.workflow_name}: {e}")
+                if isinstance(e, ZosmfError) and e.status == 404:
+                    self.remove(workflow_key)
+                    continue
+                events = []
+
+            for event in events:
+                self.stats['events'] += 1
+                yield event
+
+            if tracked.status in FINAL_WORKFLOW_STATES:
+                self.remove(workflow_key)
+                continue
+            heapq.heappush(self._schedule,
+                           (time.monotonic() + self._next_interval(tracked, bool(events)), workflow_key))
+
+    def run(self, callback: Callable[[WorkflowEvent], None], timeout: Optional[float] = None):
+        """Deliver every transition to a callback"""
+        for event in self.events(timeout):
+            callback(event)
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Adaptive zOSMF workflow status poller')
+    parser.add_argument('--host', default='localhost', help='zOSMF host')
+    parser.add_argument('--port', type=int, default=443, help='zOSMF port')
+    parser.add_argument('--user', default=os.getenv('USER'), help='User ID for authentication')
+    parser.add_argument('--scheme', choices=['https', 'http'], default='https')
+    parser.add_argument('--insecure', action='store_true', help='Do not verify the TLS certificate')
+    parser.add_argument('--key', action='append', default=[], help='Workflow key to watch')
+    parser.add_argument('--name', help='Watch all instances whose name matches this regular expression')
+    parser.add_argument('--owner', help='Restrict --name to this owner')
+    parser.add_argument('--min-interval', type=float, default=2.0)
+    parser.add_argument('--max-interval', type=float, default=120.0)
+    parser.add_argument('--timeout', type=float, help='Stop after this many seconds')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s',
+                        datefmt='%Y-%m-%d %H:%M:%S')
+
+    password = os.getenv('ZOSMF_PASSWORD')
+    if password is None:
+        password = getpass.getpass(f"Enter password for user {args.user}: ")
+
+    failed = False
+    # One connection is enough: polls are issued one at a time in schedule order
+    with ZosmfClient(args.host, args.port, args.user, password, scheme=args.scheme,
+                     verify=not args.insecure, pool_size=1) as client:
+        client.login()
+        poller = WorkflowPoller(client, args.min_interval, args.max_interval)
+        keys = list(args.key)
+        if args.name:
+            keys.extend(workflow['workflowKey'] for workflow in
+                        client.list_workflows(workflowName=args.name, owner=args.owner)
+                        if re.fullmatch(args.name, workflow.get('workflowName', '')))
+        if not keys:
+            logging.error("No workflow instances to watch")
+            return 1
+
+        for workflow_key in keys:
+            poller.add(workflow_key)
+        for event in poller.events(args.timeout):
+            print(json.dumps(event.to_dict()), flush=True)
+            failed = failed or event.is_failure
+        logging.info(f"Poller finished: {poller.stats}")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+workflow_registration.py - Register the workflow with zOSMF over one REST session
+
+This script performs the REST part of register_workflow.sh on top of
+zosmf_client.ZosmfClient, so all calls share one login and a pooled
+keep-alive connection:
+- Authentication and zOSMF availability check (/zosmf/info)
+- Detection and optional deletion of an existing workflow instance
+  (server-side name filter plus the workflow_lookup key index)
+- Workflow instance creation
+- Workflow property update from workflow.properties
+- Registration validation and workflow_registration.conf output
+
+Usage:
+    python3 workflow_registration.py --host zosmf.example.com --port 443 \\
+        --user USER --work-dir /u/user/workflow [--insecure] [--replace ask|yes|no]
+
+The password is read from ZOSMF_PASSWORD or prompted for.
+"""
+
+import os
+import sys
+import getpass
+import logging
+import argparse
+import datetime
+from pathlib import Path
+from typing import Dict
+
+from zosmf_client import ZosmfClient, ZosmfError
+from workflow_lookup import WorkflowIndex, WorkflowLookup
+from workflow_utilities import ConfigurationManager
+
+WORKFLOW_NAME = 'BASELINE_WORKFLOW_TEST'
+WORKFLOW_VERSION = '1.0.0'
+WORKFLOW_DESCRIPTION = 'Baseline zOS Workflow for Testing Multiple Technologies'
+
+
+def load_properties(properties_file: Path) -> Dict[str, str]:
+    """Read key=value workflow properties, skipping comments and blank lines"""
+    properties = {}
+    with open(properties_file, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#') or '=' not in line:
+                continue
+            key, value = line.split('=', 1)
+            properties[key.strip()] = value.strip()
+    return properties
+
+
+def confirm(prompt: str) -> bool:
+    """Ask a yes/no question on the terminal"""
+    answer = input(prompt)
+    return answer in ('y', 'Y')
+
+
+class WorkflowRegistration:
+    """REST registration flow for the baseline workflow"""
+
+    def __init__(self, client: ZosmfClient, work_dir: Path, user: str, replace: str = 'ask'):
+        self.client = client
+        self.work_dir = Path(work_dir)
+        self.user = user
+        self.replace = replace
+        self.definition_file = self.work_dir / 'workflow-definition.xml'
+        self.properties_file = self.work_dir / 'config' / 'workflow.properties'
+        self.config_manager = ConfigurationManager(self.work_dir / 'config')
+        self.index = WorkflowIndex(self.work_dir / 'config' / 'workflow_index.json')
+        self.lookup = WorkflowLookup(client, self.index)
+        self.workflow_key = None
+
+    def authenticate(self) -> bool:
+        """Log in once and confirm zOSMF answers"""
+        logging.info("Authenticating with zOSMF...")
+        try:
+            self.client.login()
+            info = self.client.info()
+        except (ZosmfError, OSError) as e:
+            logging.error(f"ERROR: Authentication failed: {e}")
+            return False
+
+        if not isinstance(info, dict) or 'zosmf_version' not in info:
+            logging.error("ERROR: Authentication failed")
+            return False
+        logging.info(f"Authentication successful (zOSMF version {info['zosmf_version']})")
+        return True
+
+    def check_existing_workflow(self) -> bool:
+        """Handle an existing workflow instance with the same name"""
+        logging.info(f"Checking for existing workflow: {WORKFLOW_NAME}")
+        try:
+            existing = self.lookup.find(WORKFLOW_NAME)
+        except ZosmfError as e:
+            logging.error(f"ERROR: Failed to query existing workflows: {e}")
+            return False
+        if existing is None:
+            return True
+
+        logging.warning(f"WARNING: Workflow {WORKFLOW_NAME} already exists")
+        if self.replace == 'ask':
+            delete = confirm("Do you want to delete the existing workflow? (y/n): ")
+        else:
+            delete = self.replace == 'yes'
+
+        if not delete:
+            logging.info("Keeping existing workflow - registration aborted")
+            return False
+        return self.delete_existing_workflow(existing)
+
+    def delete_existing_workflow(self, workflow: Dict) -> bool:
+        """Delete the existing workflow instance"""
+        logging.info(f"Deleting existing workflow: {WORKFLOW_NAME}")
+        workflow_key = workflow.get('workflowKey')
+        if not workflow_key:
+            logging.warning("WARNING: Could not find workflow key for deletion")
+            return True
+        try:
+            self.lookup.delete(workflow_key)
+        except ZosmfError as e:
+            logging.error(f"ERROR: Failed to delete existing workflow: {e}")
+            return False
+        logging.info("Existing workflow deleted successfully")
+        return True
+
+    def register_workflow(self) -> bool:
+        """Create the workflow instance and save its key"""
+        logging.info("Registering workflow with zOSMF...")
+        payload = {
+            'workflowName': WORKFLOW_NAME,
+            'workflowDefinitionFile': str(self.definition_file),
+            'workflowDescription': WORKFLOW_DESCRIPTION,
+            'workflowVersion': WORKFLOW_VERSION,
+            'vendor': 'Custom Development',
+            'category': 'Testing',
+            'owner': self.user,
+            'system': self.client.host
+        }
+
+        try:
+            response = self.client.create_workflow(payload)
+        except ZosmfError as e:
+            logging.error("ERROR: Workflow registration failed")
+            logging.error(f"Response: {e.body}")
+            return False
+
+        if not isinstance(response, dict) or not response.get('workflowKey'):
+            logging.error("ERROR: Workflow registration failed")
+            logging.error(f"Response: {response}")
+            return False
+
+        self.workflow_key = response['workflowKey']
+        self.index.update({'workflowName': WORKFLOW_NAME, 'workflowKey': self.workflow_key,
+                           'owner': self.user, 'system': self.client.host})
+        logging.info("Workflow registered successfully")
+        logging.info(f"Workflow Key: {self.workflow_key}")
+
+        # Save workflow key for later use (sourced by register_workflow.sh)
+        self.config_manager.save_config_file('workflow_registration.conf', {
+            'WORKFLOW_KEY': self.workflow_key,
+            'REGISTRATION_DATE': f"'{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}'",
+            'ZOSMF_HOST': self.client.host,
+            'ZOSMF_PORT': self.client.port
+        })
+        return True
+
+    def set_workflow_properties(self) -> bool:
+        """Update workflow properties from workflow.properties"""
+        logging.info("Setting workflow properties...")
+        if not self.properties_file.exists():
+            logging.warning(f"WARNING: Workflow properties file not found: {self.properties_file}")
+            return True
+
+        try:
+            self.client.set_workflow_properties(self.workflow_key, load_properties(self.properties_file))
+        except ZosmfError as e:
+            logging.warning(f"WARNING: Failed to update workflow properties: {e}")
+            return False
+        logging.info("Workflow properties updated successfully")
+        return True
+
+    def validate_registration(self) -> bool:
+        """Read the workflow back and report its status"""
+        logging.info("Validating workflow registration...")
+        try:
+            details = self.client.get_workflow(self.workflow_key)
+        except ZosmfError as e:
+            logging.error(f"ERROR: Workflow registration validation failed: {e}")
+            return False
+
+        if not isinstance(details, dict) or details.get('workflowName') != WORKFLOW_NAME:
+            logging.error("ERROR: Workflow registration validation failed")
+            return False
+
+        logging.info("Workflow registration validated successfully")
+        logging.info(f"Workflow Status: {details.get('statusName', details.get('workflowStatus'))}")
+        return True
+
+    def run(self) -> int:
+        """Run the registration steps, returning a shell exit code"""
+        try:
+            return self._run_steps()
+        finally:
+            self.index.save()
+
+    def _run_steps(self) -> int:
+        if not self.authenticate():
+            return 1
+        if not self.check_existing_workflow():
+            return 1
+        if not self.register_workflow():
+            return 1
+        self.set_workflow_properties()
+        if not self.validate_registration():
+            return 1
+        return 0
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Register workflow with zOSMF')
+    parser.add_argument('--host', default='localhost', help='zOSMF host')
+    parser.add_argument('--port', type=int, default=443, help='zOSMF port')
+    parser.add_argument('--user', default=os.getenv('USER'), help='User ID for authentication')
+    parser.add_argument('--work-dir', required=True, help='Workflow working directory')
+    parser.add_argument('--scheme', choices=['https', 'http'], default='https')
+    parser.add_argument('--insecure', action='store_true',
+                        help='Do not verify the zOSMF TLS certificate (like curl -k)')
+    parser.add_argument('--replace', choices=['ask', 'yes', 'no'], default='ask',
+                        help='What to do with an existing workflow instance')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s',
+                        datefmt='%Y-%m-%d %H:%M:%S')
+
+    password = os.getenv('ZOSMF_PASSWORD')
+    if password is None:
+        password = getpass.getpass(f"Enter password for user {args.user}: ")
+
+    client = ZosmfClient(args.host, args.port, args.user, password,
+                         scheme=args.scheme, verify=not args.insecure)
+    with client:
+        return WorkflowRegistration(client, args.work_dir, args.user, args.replace).run()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
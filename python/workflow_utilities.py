@@ -5,6 +5,7 @@ workflow_utilities.py - Utility functions for zOS workflow operations
 This module provides utility functions for common workflow operations including:
 - Dataset operations
 - USS file manipulation
+- Streaming and batched shell command execution
 - Configuration management
 - Logging utilities
 - System integration
@@ -13,12 +14,30 @@ This module provides utility functions for common workflow operations including:
 import os
 import sys
 import json
+import time
+import codecs
+import signal
+import shutil
 import subprocess
+import threading
+import concurrent.futures
 import datetime
 import logging
+from collections import deque
 from pathlib import Path
-import re
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from tso_session import run_tso_command
+from catalog_cache import get_default_cache, entry_key, level_key
+from listcat_parser import parse_listcat_text, unique_names
+from metrics import span, count, observe, timed
+from log_queue import configure_logger, shutdown_logging
+from config_store import FILE_CACHE, get_status_journal, write_atomic, format_conf
+
+LISTED_ENTRY_TYPES = {'NONVSAM', 'CLUSTER', 'AIX', 'PATH', 'GDG'}
+
+# cp -B drops the RDWs of variable-length records; Co:Z fromdsn keeps them
+RDW_COPY_COMMAND = 'fromdsn'
 
 class DatasetUtilities:
     """Utilities for dataset operations"""
@@ -26,33 +45,63 @@ class DatasetUtilities:
     @staticmethod
     def execute_mvs_command(command: str, timeout: int = 60) -> Optional[str]:
         """Execute MVS command and return output"""
+        verb = command.split(None, 1)[0].upper() if command.strip() else ''
+        count('tso_calls_total', command=verb)
         try:
-            result = subprocess.run(
-                ['tso', command],
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
+            with span('tso_command', command=verb):
+                result = run_tso_command(command, timeout=timeout)
             
             if result.returncode == 0:
+                count('tso_output_bytes_total', len(result.stdout), command=verb)
                 return result.stdout
             else:
+                count('tso_failures_total', command=verb)
                 logging.error(f"MVS command failed: {command}")
                 logging.error(f"Error: {result.stderr}")
                 return None
                 
         except subprocess.TimeoutExpired:
+            count('tso_failures_total', command=verb)
             logging.error(f"MVS command timed out: {command}")
             return None
         except Exception as e:
+            count('tso_failures_total', command=verb)
             logging.error(f"Error executing MVS command: {e}")
             return None
     
+    @staticmethod
+    def cached_listcat(key: str, command: str) -> Optional[str]:
+        """Execute LISTCAT command through the catalog cache"""
+        cache = get_default_cache()
+        found, output = cache.get(key)
+        if found:
+            count('catalog_cache_hits_total')
+            return output
+        count('catalog_cache_misses_total')
+        
+        output = DatasetUtilities.execute_mvs_command(command)
+        # Failed lookups are not cached: a timeout must not hide a dataset and a
+        # NOT FOUND answer must not outlive the job that creates the dataset
+        if output is not None and 'NOT FOUND' not in output:
+            cache.put(key, output)
+        return output
+    
+    @staticmethod
+    def invalidate_catalog(dataset_names: List[str]) -> int:
+        """Invalidate cached catalog entries after datasets are created or deleted"""
+        return get_default_cache().invalidate(dataset_names)
+    
+    @staticmethod
+    def catalog_cache_stats() -> Dict:
+        """Get catalog cache hit/miss counters"""
+        return get_default_cache().get_stats()
+    
     @staticmethod
     def check_dataset_exists(dataset_name: str) -> bool:
         """Check if dataset exists"""
-        command = f"LISTCAT ENT('{dataset_name}')"
-        output = DatasetUtilities.execute_mvs_command(command)
+        # The ALL form answers existence too and is reused by get_dataset_info
+        command = f"LISTCAT ENT('{dataset_name}') ALL"
+        output = DatasetUtilities.cached_listcat(entry_key(dataset_name), command)
         return output is not None and dataset_name in output
     
     @staticmethod
@@ -75,25 +124,24 @@ class DatasetUtilities:
             
             # Get detailed info using LISTCAT
             command = f"LISTCAT ENT('{dataset_name}') ALL"
-            output = DatasetUtilities.execute_mvs_command(command)
+            output = DatasetUtilities.cached_listcat(entry_key(dataset_name), command)
             
             if output:
-                # Parse output for dataset attributes
-                # This is a simplified parser - extend as needed
-                lines = output.split('\n')
-                for line in lines:
-                    if 'NONVSAM' in line:
-                        info['type'] = 'NONVSAM'
-                    elif 'VSAM' in line:
-                        info['type'] = 'VSAM'
-                    elif 'RECFM' in line:
-                        match = re.search(r'RECFM-([A-Z]+)', line)
-                        if match:
-                            info['record_format'] = match.group(1)
-                    elif 'LRECL' in line:
-                        match = re.search(r'LRECL-(\d+)', line)
-                        if match:
-                            info['record_length'] = int(match.group(1))
+                with span('listcat_parse'):
+                    entries = list(parse_listcat_text(output))
+                entry = next((e for e in entries if e.name == dataset_name), None)
+                if entry is not None:
+                    # VSAM record and space attributes live on the DATA component
+                    data = next((e for e in entries if e.type == 'DATA' and e.parent == entry.name), entry)
+                    info['type'] = 'VSAM' if entry.is_vsam else entry.type
+                    info['organization'] = entry.organization
+                    info['record_format'] = entry.recfm
+                    info['record_length'] = data.lrecl
+                    info['block_size'] = data.blksize
+                    info['space_allocated'] = data.allocated_bytes
+                    info['space_used'] = data.used_bytes
+                    info['creation_date'] = entry.created
+                    info['expiration_date'] = entry.expires
         
         return info
     
@@ -101,20 +149,238 @@ class DatasetUtilities:
     def list_datasets_by_pattern(pattern: str) -> List[str]:
         """List datasets matching pattern"""
         command = f"LISTCAT LEVEL('{pattern}') ALL"
-        output = DatasetUtilities.execute_mvs_command(command)
+        output = DatasetUtilities.cached_listcat(level_key(pattern), command)
+        
+        if not output:
+            return []
+        
+        # VSAM components and aliases are not datasets of their own
+        with span('listcat_parse'):
+            return sorted(unique_names(parse_listcat_text(output), types=LISTED_ENTRY_TYPES))
+    
+    @staticmethod
+    def can_copy_with_rdw() -> bool:
+        """Check whether variable-length datasets can be copied with their RDWs"""
+        return shutil.which(RDW_COPY_COMMAND) is not None
+    
+    @staticmethod
+    def copy_dataset_to_file(dataset_name: str, target: Union[str, Path], binary: bool = True,
+                             timeout: int = 600, rdw: bool = False) -> bool:
+        """Copy a sequential dataset to a USS file
         
-        datasets = []
-        if output:
-            lines = output.split('\n')
-            for line in lines:
-                # Extract dataset names from LISTCAT output
-                match = re.search(r'([A-Z0-9.]+)', line)
-                if match and '.' in match.group(1):
-                    dataset = match.group(1)
-                    if dataset not in datasets:
-                        datasets.append(dataset)
+        binary keeps fixed records intact; rdw copies variable-length records
+        in binary with each record prefixed by its RDW (needs fromdsn).
+        """
+        if rdw:
+            command = [RDW_COPY_COMMAND, '-b', '-l', 'rdw', f"//'{dataset_name}'"]
+        else:
+            command = ['cp']
+            if binary:
+                command.append('-B')
+            command.extend([f"//'{dataset_name}'", str(target)])
         
-        return sorted(datasets)
+        try:
+            with span('dataset_copy'):
+                if rdw:
+                    with open(target, 'wb') as f:
+                        result = subprocess.run(command, stdout=f, stderr=subprocess.PIPE,
+                                                text=True, timeout=timeout)
+                else:
+                    result = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+            if result.returncode == 0:
+                count('dataset_copy_bytes_total', os.path.getsize(target))
+                return True
+            count('dataset_copy_failures_total')
+            logging.error(f"Dataset copy failed: {dataset_name} -> {target}")
+            logging.error(f"Error: {result.stderr}")
+            return False
+        except subprocess.TimeoutExpired:
+            count('dataset_copy_failures_total')
+            logging.error(f"Dataset copy timed out: {dataset_name}")
+            return False
+        except Exception as e:
+            count('dataset_copy_failures_total')
+            logging.error(f"Error copying dataset {dataset_name}: {e}")
+            return False
+
+class ShellStream:
+    """Running shell command whose stdout is consumed as it arrives
+
+    Iterating yields decoded lines (or chunks of up to chunk_size bytes).
+    Only the last tail_lines lines of stdout and the last stderr_tail_lines
+    lines of stderr are kept (None keeps all, 0 none). The process group is
+    killed when the timeout expires or when the stream is closed before the
+    command finished.
+    """
+
+    def __init__(self, command: str, cwd: Optional[str] = None, timeout: Optional[float] = 60,
+                 chunk_size: Optional[int] = None, tail_lines: Optional[int] = 0,
+                 merge_stderr: bool = False, encoding: str = 'utf-8',
+                 stderr_tail_lines: Optional[int] = 100):
+        self.command = command
+        self.chunk_size = chunk_size
+        self.encoding = encoding
+        self.stdout_tail = deque(maxlen=tail_lines)
+        # Error output stays available for diagnostics even when stdout is not kept
+        self.stderr_tail = deque(maxlen=stderr_tail_lines)
+        self.stdout_lines = 0
+        self.stdout_bytes = 0
+        self.returncode: Optional[int] = None
+        self.timed_out = False
+        self.error: Optional[str] = None
+        self.started = time.monotonic()
+        self.duration = 0.0
+        self._partial = ''
+        self._eof = False
+        self._closed = False
+        count('shell_commands_total')
+        try:
+            self._process = subprocess.Popen(
+                command, shell=True, cwd=cwd, stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT if merge_stderr else subprocess.PIPE,
+                start_new_session=True)
+        except Exception as e:
+            self._process = None
+            self.error = str(e)
+            self._finish()
+            return
+        self._stderr_reader = None
+        if not merge_stderr:
+            self._stderr_reader = threading.Thread(target=self._drain_stderr, daemon=True)
+            self._stderr_reader.start()
+        self._watchdog = None
+        if timeout is not None:
+            self._watchdog = threading.Timer(timeout, self._expire)
+            self._watchdog.daemon = True
+            self._watchdog.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __iter__(self) -> Iterator[str]:
+        if self._process is None:
+            return
+        try:
+            if self.chunk_size:
+                yield from self._chunks()
+            else:
+                yield from self._lines()
+            self._eof = True
+        finally:
+            self.close()
+
+    def _lines(self) -> Iterator[str]:
+        stdout, tail, encoding = self._process.stdout, self.stdout_tail, self.encoding
+        for raw in iter(stdout.readline, b''):
+            self.stdout_bytes += len(raw)
+            self.stdout_lines += 1
+            line = raw.decode(encoding, errors='replace').rstrip('\r\n')
+            if tail.maxlen != 0:
+                tail.append(line)
+            yield line
+
+    def _chunks(self) -> Iterator[str]:
+        decoder = codecs.getincrementaldecoder(self.encoding)(errors='replace')
+        stdout = self._process.stdout
+        while True:
+            raw = stdout.read1(self.chunk_size)
+            if not raw:
+                break
+            self.stdout_bytes += len(raw)
+            text = decoder.decode(raw)
+            self._keep_tail(text)
+            if text:
+                yield text
+        text = decoder.decode(b'', final=True)
+        self._keep_tail(text)
+        if self._partial:
+            self.stdout_lines += 1
+            if self.stdout_tail.maxlen != 0:
+                self.stdout_tail.append(self._partial)
+            self._partial = ''
+        if text:
+            yield text
+
+    def _keep_tail(self, text: str):
+        if not text:
+            return
+        lines = (self._partial + text).split('\n')
+        self._partial = lines.pop()
+        self.stdout_lines += len(lines)
+        if self.stdout_tail.maxlen != 0:
+            self.stdout_tail.extend(lines)
+
+    def _drain_stderr(self):
+        for raw in iter(self._process.stderr.readline, b''):
+            self.stderr_tail.append(raw.decode(self.encoding, errors='replace').rstrip('\r\n'))
+
+    def _expire(self):
+        if self._process.poll() is None:
+            self.timed_out = True
+            self._kill()
+
+    def _kill(self):
+        try:
+            os.killpg(self._process.pid, signal.SIGKILL)
+        except (OSError, AttributeError):
+            self._process.kill()
+
+    def close(self):
+        """Stop reading; kills the command if it is still running"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._process is not None:
+            if not self._eof and self._process.poll() is None:
+                # Closed before the end of the output: stop the command instead of waiting
+                self._kill()
+            # After end of output the watchdog still bounds the wait
+            self.returncode = self._process.wait()
+            if self._watchdog is not None:
+                self._watchdog.cancel()
+            if self._stderr_reader is not None:
+                self._stderr_reader.join()
+            self._process.stdout.close()
+            if self._process.stderr is not None:
+                self._process.stderr.close()
+        self._finish()
+
+    def _finish(self):
+        self._closed = True
+        self.duration = time.monotonic() - self.started
+        observe('shell_command_seconds', self.duration)
+        count('shell_output_bytes_total', self.stdout_bytes)
+        if not self.success:
+            count('shell_command_failures_total')
+
+    @property
+    def success(self) -> bool:
+        return self.returncode == 0 and not self.timed_out and self.error is None
+
+    def result(self) -> Dict:
+        """execute_shell_command style result; stdout/stderr hold the tails"""
+        if self.timed_out:
+            stderr = 'Command timed out'
+        elif self.error is not None:
+            stderr = self.error
+        else:
+            stderr = '\n'.join(self.stderr_tail)
+        return {
+            'command': self.command,
+            'returncode': self.returncode,
+            'stdout': '\n'.join(self.stdout_tail),
+            'stderr': stderr,
+            'success': self.success,
+            'timed_out': self.timed_out,
+            'stdout_lines': self.stdout_lines,
+            'stdout_bytes': self.stdout_bytes,
+            'truncated': self.stdout_tail.maxlen is not None and self.stdout_lines > len(self.stdout_tail),
+            'duration': self.duration
+        }
 
 class USSUtilities:
     """Utilities for USS operations"""
@@ -134,8 +400,11 @@ class USSUtilities:
         """Safely read file content"""
         try:
             with open(file_path, 'r', encoding=encoding) as f:
-                return f.read()
+                content = f.read()
+            count('uss_bytes_read_total', len(content))
+            return content
         except Exception as e:
+            count('uss_failures_total', operation='read')
             logging.error(f"Error reading file {file_path}: {e}")
             return None
     
@@ -145,8 +414,10 @@ class USSUtilities:
         try:
             with open(file_path, 'w', encoding=encoding) as f:
                 f.write(content)
+            count('uss_bytes_written_total', len(content))
             return True
         except Exception as e:
+            count('uss_failures_total', operation='write')
             logging.error(f"Error writing file {file_path}: {e}")
             return False
     
@@ -185,15 +456,17 @@ class USSUtilities:
             'success': False
         }
         
+        count('shell_commands_total')
         try:
-            proc_result = subprocess.run(
-                command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                cwd=cwd,
-                timeout=timeout
-            )
+            with span('shell_command'):
+                proc_result = subprocess.run(
+                    command,
+                    shell=True,
+                    capture_output=True,
+                    text=True,
+                    cwd=cwd,
+                    timeout=timeout
+                )
             
             result['returncode'] = proc_result.returncode
             result['stdout'] = proc_result.stdout
@@ -205,69 +478,131 @@ class USSUtilities:
         except Exception as e:
             result['stderr'] = str(e)
         
+        if not result['success']:
+            count('shell_command_failures_total')
         return result
 
+    @staticmethod
+    def stream_shell_command(command: str, cwd: Optional[str] = None, timeout: Optional[float] = 60,
+                             chunk_size: Optional[int] = None, tail_lines: Optional[int] = 0,
+                             merge_stderr: bool = False,
+                             stderr_tail_lines: Optional[int] = 100) -> ShellStream:
+        """Start a shell command whose output is iterated as it arrives
+
+        Example:
+            with USSUtilities.stream_shell_command('find /u/work -type f', tail_lines=20) as stream:
+                for line in stream:
+                    ...
+            result = stream.result()
+        """
+        return ShellStream(command, cwd=cwd, timeout=timeout, chunk_size=chunk_size,
+                           tail_lines=tail_lines, merge_stderr=merge_stderr,
+                           stderr_tail_lines=stderr_tail_lines)
+
+    @staticmethod
+    def run_shell_commands(commands: Iterable[Union[str, Dict]], max_concurrent: int = 4,
+                           timeout: Optional[float] = 60, cwd: Optional[str] = None,
+                           tail_lines: Optional[int] = 1000) -> Iterator[Dict]:
+        """Run commands with at most max_concurrent at a time, yielding results as they complete
+
+        A command is a string or a dict with 'command' and optional 'timeout'
+        and 'cwd'; the deadline starts when the command starts. Each result is
+        a ShellStream.result() with the command's 'index' in the input, keeping
+        up to tail_lines lines of both stdout and stderr.
+        """
+        def run(index: int, spec: Union[str, Dict]) -> Dict:
+            if isinstance(spec, str):
+                spec = {'command': spec}
+            stream = ShellStream(spec['command'], cwd=spec.get('cwd', cwd), timeout=spec.get('timeout', timeout),
+                                 tail_lines=tail_lines, stderr_tail_lines=tail_lines)
+            for _ in stream:
+                pass
+            stream.close()
+            result = stream.result()
+            result['index'] = index
+            return result
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, max_concurrent)) as executor:
+            futures = [executor.submit(run, index, spec) for index, spec in enumerate(commands)]
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
 class ConfigurationManager:
     """Configuration management utilities"""
     
+    STATUS_FILE = 'workflow_status.conf'
+    
     def __init__(self, config_dir: Union[str, Path]):
         self.config_dir = Path(config_dir)
         self.config_dir.mkdir(parents=True, exist_ok=True)
         self.config = {}
+        self.status_journal = get_status_journal(self.config_dir / self.STATUS_FILE)
     
+    @timed('config_load')
     def load_config_file(self, filename: str) -> Dict:
-        """Load configuration from file"""
+        """Load configuration from file (parsed files are cached until they change)"""
         config_file = self.config_dir / filename
         config = {}
         
         if config_file.exists():
             try:
-                if filename.endswith('.json'):
-                    with open(config_file, 'r') as f:
-                        config = json.load(f)
+                misses = FILE_CACHE.stats['misses']
+                config = FILE_CACHE.load(config_file)
+                if FILE_CACHE.stats['misses'] != misses:
+                    logging.info(f"Loaded configuration from {config_file}")
                 else:
-                    # Handle .conf format (key=value)
-                    with open(config_file, 'r') as f:
-                        for line in f:
-                            line = line.strip()
-                            if line and not line.startswith('#') and '=' in line:
-                                key, value = line.split('=', 1)
-                                config[key.strip()] = value.strip()
-                
-                logging.info(f"Loaded configuration from {config_file}")
+                    count('config_cache_hits_total')
+            except FileNotFoundError:
+                pass
             except Exception as e:
+                count('config_failures_total', operation='load')
                 logging.error(f"Error loading configuration from {config_file}: {e}")
         
         return config
     
+    @timed('config_save')
     def save_config_file(self, filename: str, config: Dict) -> bool:
-        """Save configuration to file"""
+        """Save configuration to file (atomically replaced)"""
         config_file = self.config_dir / filename
         
         try:
-            if filename.endswith('.json'):
-                with open(config_file, 'w') as f:
-                    json.dump(config, f, indent=2)
+            if filename == self.STATUS_FILE:
+                # Status updates are journaled; replace both under the status lock
+                self.status_journal.reset(config)
+            elif filename.endswith('.json'):
+                write_atomic(config_file, json.dumps(config, indent=2))
             else:
                 # Handle .conf format (key=value)
-                with open(config_file, 'w') as f:
-                    f.write(f"# Configuration file generated on {datetime.datetime.now()}\n")
-                    for key, value in config.items():
-                        f.write(f"{key}={value}\n")
+                write_atomic(config_file, format_conf(config))
+            FILE_CACHE.invalidate(config_file)
             
             logging.info(f"Saved configuration to {config_file}")
             return True
         except Exception as e:
+            count('config_failures_total', operation='save')
             logging.error(f"Error saving configuration to {config_file}: {e}")
             return False
     
+    def get_workflow_status(self) -> Dict:
+        """Get workflow status including journaled updates"""
+        try:
+            return self.status_journal.read()
+        except Exception as e:
+            count('config_failures_total', operation='status_read')
+            logging.error(f"Error reading workflow status: {e}")
+            return self.load_config_file(self.STATUS_FILE)
+    
     def get_workflow_config(self) -> Dict:
         """Get complete workflow configuration"""
         config = {}
         
         # Load different configuration files
         env_config = self.load_config_file('environment.conf')
-        status_config = self.load_config_file('workflow_status.conf')
+        status_config = self.get_workflow_status()
         
         config.update(env_config)
         config.update(status_config)
@@ -275,57 +610,47 @@ class ConfigurationManager:
         return config
     
     def update_workflow_status(self, status_updates: Dict) -> bool:
-        """Update workflow status"""
-        status_file = 'workflow_status.conf'
-        current_status = self.load_config_file(status_file)
-        
+        """Update workflow status (appended to the status journal under a file lock)"""
         # Add timestamp
         status_updates['LAST_UPDATE'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
-        # Merge updates
-        current_status.update(status_updates)
-        
-        return self.save_config_file(status_file, current_status)
+        try:
+            with span('status_update'):
+                self.status_journal.update(status_updates)
+            return True
+        except Exception as e:
+            count('config_failures_total', operation='status_update')
+            logging.error(f"Error updating workflow status: {e}")
+            return False
+    
+    def compact_workflow_status(self) -> int:
+        """Merge journaled status updates into workflow_status.conf"""
+        return self.status_journal.compact()
 
 class WorkflowLogger:
     """Enhanced logging utilities for workflows"""
     
-    def __init__(self, log_dir: Union[str, Path], name: str = 'workflow'):
+    def __init__(self, log_dir: Union[str, Path], name: str = 'workflow',
+                 json_format: Optional[bool] = None):
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(parents=True, exist_ok=True)
         self.name = name
+        self.json_format = json_format
         self.logger = None
         self.setup_logger()
     
     def setup_logger(self):
-        """Setup logger with file and console handlers"""
-        self.logger = logging.getLogger(self.name)
-        self.logger.setLevel(logging.INFO)
-        
-        # Clear existing handlers
-        self.logger.handlers.clear()
-        
-        # File handler with rotation
+        """Setup logger with queued file and console handlers"""
+        # File handler with rotation, written by a background listener
         timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
-        log_file = self.log_dir / f"{self.name}_{timestamp}.log"
+        self.log_file = self.log_dir / f"{self.name}_{timestamp}.log"
         
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(logging.INFO)
-        
-        # Console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        
-        # Formatter
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
-        
-        # Add handlers
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        # Repeated setup replaces the handlers instead of adding to them
+        self.logger = configure_logger(self.name, self.log_file, json_format=self.json_format)
+    
+    def close(self):
+        """Flush and close the log file"""
+        shutdown_logging(self.name)
     
     def info(self, message: str):
         """Log info message"""
@@ -430,7 +755,6 @@ def test_utilities():
     print(f"  Test file info: {file_info}")
     
     # Cleanup
-    import shutil
     shutil.rmtree(test_dir, ignore_errors=True)
 
 if __name__ == '__main__':
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+zosmf_client.py - zOSMF REST client for workflow operations
+
+This module replaces one-off curl calls with a reusable client:
+- Keep-alive HTTP(S) connections held in a bounded pool
+- Single login to /zosmf/services/authenticate; the returned JWT/LTPA
+  token cookie is reused for every request (basic auth fallback)
+- Automatic re-login when the token expires
+- Workflow REST endpoints (list, get, create, delete, properties, start)
+- Jobs REST endpoints (job status, spool file list) and stream() for
+  reading large responses in chunks without buffering them
+- Synchronous ZosmfClient and asyncio AsyncZosmfClient APIs
+
+Usage:
+    with ZosmfClient('zosmf.example.com', 443, 'USER', password) as client:
+        info = client.info()
+        workflows = client.list_workflows()
+
+    async with AsyncZosmfClient('zosmf.example.com', 443, 'USER', password) as client:
+        info = await client.info()
+"""
+
+import ssl
+import json
+import queue
+import base64
+import asyncio
+import logging
+import threading
+import http.client
+import concurrent.futures
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode, quote
+from typing import Dict, Iterator, List, Optional
+
+WORKFLOWS_PATH = '/zosmf/workflow/rest/1.0/workflows'
+AUTH_PATH = '/zosmf/services/authenticate'
+INFO_PATH = '/zosmf/info'
+JOBS_PATH = '/zosmf/restjobs/jobs'
+
+TOKEN_COOKIES = ('jwtToken', 'LtpaToken2')
+
+# Errors after which a pooled connection is dropped and the request retried once
+CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    BrokenPipeError
+)
+
+# Methods that are safe to resend after the request may have reached zOSMF;
+# others (create, submit, start) are only retried when sending failed
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'DELETE')
+
+
+class ZosmfError(Exception):
+    """Raised when zOSMF returns an unexpected HTTP status"""
+
+    def __init__(self, message: str, status: Optional[int] = None, body=None):
+        super().__init__(message)
+        self.status = status
+        self.body = body
+
+
+class ZosmfClient:
+    """Synchronous zOSMF REST client with pooled connections and token reuse"""
+
+    def __init__(self, host: str, port: int = 443, user: Optional[str] = None,
+                 password: Optional[str] = None, scheme: str = 'https',
+                 verify: bool = True, pool_size: int = 4, timeout: int = 60):
+        self.host = host
+        self.port = int(port)
+        self.user = user
+        self.password = password
+        self.scheme = scheme
+        self.verify = verify
+        self.pool_size = pool_size
+        self.timeout = timeout
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._auth_lock = threading.Lock()
+        self._cookie = None
+        self._ssl_context = None
+
+        self.stats = {
+            'requests': 0,
+            'connections_opened': 0,
+            'logins': 0,
+            'retries': 0
+        }
+
+    # Connection pool
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        """Open a new keep-alive connection"""
+        self.stats['connections_opened'] += 1
+        if self.scheme == 'http':
+            return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+        if self._ssl_context is None:
+            context = ssl.create_default_context()
+            if not self.verify:
+                # Equivalent of curl -k for self-signed zOSMF certificates
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+            self._ssl_context = context
+        return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout,
+                                           context=self._ssl_context)
+
+    def _acquire(self) -> http.client.HTTPConnection:
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._new_connection()
+
+    def _release(self, connection: Optional[http.client.HTTPConnection]):
+        if connection is not None:
+            self._idle.put(connection)
+        self._slots.release()
+
+    def close(self):
+        """Close all idle connections"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.logout()
+        self.close()
+
+    # Authentication
+
+    def _basic_auth(self) -> str:
+        credentials = f"{self.user}:{self.password}".encode('utf-8')
+        return 'Basic ' + base64.b64encode(credentials).decode('ascii')
+
+    def _auth_headers(self) -> Dict[str, str]:
+        if self._cookie:
+            return {'Cookie': self._cookie}
+        if self.user is not None:
+            return {'Authorization': self._basic_auth()}
+        return {}
+
+    def login(self) -> bool:
+        """Authenticate once and keep the token cookie for later requests"""
+        with self._auth_lock:
+            self.stats['logins'] += 1
+            self._cookie = None
+            status, headers, body = self._send('POST', AUTH_PATH,
+                                               headers={'Authorization': self._basic_auth()})
+            if status in (200, 204):
+                cookies = SimpleCookie()
+                for name, value in headers:
+                    if name.lower() == 'set-cookie':
+                        cookies.load(value)
+                tokens = [f"{name}={cookies[name].value}" for name in TOKEN_COOKIES if name in cookies]
+                if tokens:
+                    self._cookie = '; '.join(tokens)
+                    logging.info(f"Authenticated with zOSMF at {self.host}:{self.port} (token reuse)")
+                else:
+                    logging.info("zOSMF returned no session token, using basic authentication")
+                return True
+
+            if status in (404, 405):
+                # Older zOSMF without the authenticate service: stay on basic auth
+                logging.info("zOSMF authenticate service unavailable, using basic authentication")
+                return True
+
+            if status == 401:
+                raise ZosmfError("zOSMF authentication failed", status, body)
+            raise ZosmfError(f"Unexpected zOSMF login response: HTTP {status}", status, body)
+
+    def logout(self):
+        """Invalidate the session token"""
+        if self._cookie:
+            try:
+                self._send('DELETE', AUTH_PATH, headers={'Cookie': self._cookie})
+            except Exception as e:
+                logging.debug(f"zOSMF logout failed: {e}")
+            self._cookie = None
+
+    # Requests
+
+    def _send(self, method: str, path: str, body: Optional[bytes] = None,
+              headers: Optional[Dict[str, str]] = None):
+        """Send one request over a pooled connection, returning (status, headers, body)"""
+        request_headers = {
+            'Accept': 'application/json',
+            'Connection': 'keep-alive',
+            # Required by zOSMF for state changing requests
+            'X-CSRF-ZOSMF-HEADER': 'true'
+        }
+        if body is not None:
+            request_headers['Content-Type'] = 'application/json'
+        if headers:
+            request_headers.update(headers)
+
+        for attempt in range(2):
+            connection = self._acquire()
+            sent = False
+            try:
+                connection.request(method, path, body=body, headers=request_headers)
+                sent = True
+                response = connection.getresponse()
+                # The body must be fully read before the connection can be reused
+                data = response.read()
+                self.stats['requests'] += 1
+                if response.will_close:
+                    connection.close()
+                    connection = None
+                return response.status, response.getheaders(), data
+            except CONNECTION_ERRORS:
+                # Server closed an idle keep-alive connection; retry on a fresh one
+                # unless a non-idempotent request may already have been processed
+                connection.close()
+                connection = None
+                if attempt or (sent and method not in IDEMPOTENT_METHODS):
+                    raise
+                self.stats['retries'] += 1
+            except Exception:
+                connection.close()
+                connection = None
+                raise
+            finally:
+                self._release(connection)
+
+    def request(self, method: str, path: str, payload=None, params: Optional[Dict] = None,
+                expected=(200, 201, 202, 204), data: Optional[bytes] = None,
+                headers: Optional[Dict[str, str]] = None):
+        """Send an authenticated request and decode the JSON response
+
+        `payload` is sent as JSON; `data` is sent as is (set Content-Type in `headers`).
+        """
+        if params:
+            query = {key: value for key, value in params.items() if value is not None}
+            if query:
+                path = f"{path}?{urlencode(query)}"
+        body = json.dumps(payload).encode('utf-8') if payload is not None else data
+
+        def send():
+            request_headers = self._auth_headers()
+            if headers:
+                request_headers.update(headers)
+            return self._send(method, path, body, request_headers)
+
+        status, response_headers, data = send()
+        if status == 401 and self.user is not None:
+            # Token expired: log in again and retry once
+            self.login()
+            status, response_headers, data = send()
+
+        if status not in expected:
+            raise ZosmfError(f"{method} {path} failed: HTTP {status}", status, data.decode('utf-8', 'replace'))
+
+        if not data:
+            return None
+        try:
+            return json.loads(data)
+        except ValueError:
+            return data.decode('utf-8', 'replace')
+
+    def stream(self, method: str, path: str, headers: Optional[Dict[str, str]] = None,
+               chunk_size: int = 64 * 1024, expected=(200,)) -> Iterator[bytes]:
+        """Send an authenticated request and yield the response body in chunks
+
+        The pooled connection is held until the body is exhausted; a consumer
+        that stops early closes it instead of returning it to the pool.
+        """
+        request_headers = {'Connection': 'keep-alive'}
+        if headers:
+            request_headers.update(headers)
+
+        for attempt in range(3):
+            request_headers.update(self._auth_headers())
+            connection = self._acquire()
+            sent = False
+            try:
+                connection.request(method, path, headers=request_headers)
+                sent = True
+                response = connection.getresponse()
+            except CONNECTION_ERRORS:
+                connection.close()
+                self._release(None)
+                if attempt or (sent and method not in IDEMPOTENT_METHODS):
+                    raise
+                self.stats['retries'] += 1
+                continue
+            except Exception:
+                connection.close()
+                self._release(None)
+                raise
+            self.stats['requests'] += 1
+
+            if response.status == 401 and self.user is not None and attempt == 0:
+                # Token expired: log in again and retry once
+                response.read()
+                self._release(connection)
+                self.login()
+                continue
+            if response.status not in expected:
+                data = response.read()
+                self._release(connection)
+                raise ZosmfError(f"{method} {path} failed: HTTP {response.status}", response.status,
+                                 data.decode('utf-8', 'replace'))
+
+            complete = False
+            try:
+                while True:
+                    chunk = response.read(chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+                complete = True
+            finally:
+                if not complete or response.will_close:
+                    connection.close()
+                    connection = None
+                self._release(connection)
+            return
+
+    # zOSMF endpoints
+
+    def info(self) -> Dict:
+        """GET /zosmf/info"""
+        return self.request('GET', INFO_PATH)
+
+    def list_workflows(self, **filters) -> List[Dict]:
+        """List workflow instances, optionally filtered (workflowName, owner, system, ...)"""
+        result = self.request('GET', WORKFLOWS_PATH, params=filters or None)
+        if isinstance(result, dict):
+            return result.get('workflows', [])
+        return result or []
+
+    def get_workflow(self, workflow_key: str, return_data: Optional[str] = None) -> Dict:
+        """Get workflow instance properties (return_data: 'steps', 'variables' or both)"""
+        return self.request('GET', f"{WORKFLOWS_PATH}/{quote(workflow_key)}",
+                            params={'returnData': return_data})
+
+    def create_workflow(self, payload: Dict) -> Dict:
+        """Create a workflow instance"""
+        return self.request('POST', WORKFLOWS_PATH, payload)
+
+    def delete_workflow(self, workflow_key: str):
+        """Delete a workflow instance"""
+        return self.request('DELETE', f"{WORKFLOWS_PATH}/{quote(workflow_key)}")
+
+    def set_workflow_properties(self, workflow_key: str, properties: Dict):
+        """Update workflow instance properties"""
+        return self.request('PUT', f"{WORKFLOWS_PATH}/{quote(workflow_key)}/properties", properties)
+
+    def start_workflow(self, workflow_key: str, options: Optional[Dict] = None):
+        """Start automated steps of a workflow instance"""
+        return self.request('PUT', f"{WORKFLOWS_PATH}/{quote(workflow_key)}/operations/start",
+                            options or {})
+
+    def list_jobs(self, **filters) -> List[Dict]:
+        """List jobs (owner, prefix, jobid, status, max-jobs)"""
+        return self.request('GET', JOBS_PATH, params=filters or None) or []
+
+    def get_job(self, jobname: str, jobid: str) -> Dict:
+        """Job status; 'retcode' is set once the job has ended"""
+        return self.request('GET', f"{JOBS_PATH}/{quote(jobname)}/{quote(jobid)}")
+
+    def submit_job(self, jcl: str, job_class: Optional[str] = None) -> Dict:
+        """Submit JCL text through the internal reader; returns jobname, jobid and status"""
+        headers = {'Content-Type': 'text/plain', 'X-IBM-Intrdr-Mode': 'TEXT',
+                   'X-IBM-Intrdr-Recfm': 'F', 'X-IBM-Intrdr-Lrecl': '80'}
+        if job_class:
+            headers['X-IBM-Intrdr-Class'] = job_class
+        return self.request('PUT', JOBS_PATH, data=jcl.encode('utf-8'), headers=headers)
+
+    def list_spool_files(self, jobname: str, jobid: str) -> List[Dict]:
+        """Spool files of a job (id, ddname, stepname, procstep, record-count, ...)"""
+        return self.request('GET', f"{JOBS_PATH}/{quote(jobname)}/{quote(jobid)}/files") or []
+
+
+class AsyncZosmfClient:
+    """asyncio facade over ZosmfClient; calls run on a bounded worker pool"""
+
+    def __init__(self, host: str, port: int = 443, user: Optional[str] = None,
+                 password: Optional[str] = None, scheme: str = 'https',
+                 verify: bool = True, pool_size: int = 4, timeout: int = 60):
+        self.client = ZosmfClient(host, port, user, password, scheme, verify, pool_size, timeout)
+        # One thread per pooled connection, so requests never wait on each other's sockets
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=pool_size,
+                                                               thread_name_prefix='zosmf')
+
+    async def _call(self, function, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: function(*args, **kwargs))
+
+    async def login(self) -> bool:
+        return await self._call(self.client.login)
+
+    async def logout(self):
+        return await self._call(self.client.logout)
+
+    async def request(self, method: str, path: str, payload=None, params: Optional[Dict] = None,
+                      expected=(200, 201, 202, 204)):
+        return await self._call(self.client.request, method, path, payload, params, expected)
+
+    async def info(self) -> Dict:
+        return await self._call(self.client.info)
+
+    async def list_workflows(self, **filters) -> List[Dict]:
+        return await self._call(self.client.list_workflows, **filters)
+
+    async def get_workflow(self, workflow_key: str, return_data: Optional[str] = None) -> Dict:
+        return await self._call(self.client.get_workflow, workflow_key, return_data)
+
+    async def create_workflow(self, payload: Dict) -> Dict:
+        return await self._call(self.client.create_workflow, payload)
+
+    async def delete_workflow(self, workflow_key: str):
+        return await self._call(self.client.delete_workflow, workflow_key)
+
+    async def set_workflow_properties(self, workflow_key: str, properties: Dict):
+        return await self._call(self.client.set_workflow_properties, workflow_key, properties)
+
+    async def start_workflow(self, workflow_key: str, options: Optional[Dict] = None):
+        return await self._call(self.client.start_workflow, workflow_key, options)
+
+    async def close(self):
+        await self.logout()
+        self.client.close()
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+zosmf_standin.py - Local zOSMF REST stand-in for benchmarks
+
+This module serves the subset of the zOSMF REST API used by the workflow
+tools, keeping all state in memory:
+- /zosmf/services/authenticate (POST/DELETE) with a jwtToken cookie,
+  basic authentication accepted as well; expire_tokens() invalidates
+  issued tokens so clients have to log in again
+- /zosmf/info
+- Workflow list (workflowName regex, owner, system filters), create (409 on
+  a duplicate name), get (returnData=steps), delete, properties, start
+- Started workflows complete one step per GET, so pollers see transitions
+- Jobs: list, status, spool file list and spool records with
+  X-IBM-Record-Range ("start,count" or "start-end"); jobs and records are
+  added through add_job()/append_records(), so running jobs can be tailed
+- JCL submission (PUT, text/plain): jobs wait `job_queue_seconds` in INPUT,
+  run for `job_run_seconds` and end with CC 0000, reporting exec-data times
+- Configurable per-request latency; HTTP/1.1 keep-alive
+
+Usage:
+    python3 zosmf_standin.py --port 18443 [--latency 0.01]
+
+    with ZosmfStandin(latency=0.005) as standin:
+        client = ZosmfClient('127.0.0.1', standin.port, 'USER', 'PASS', scheme='http')
+"""
+
+import re
+import sys
+import json
+import time
+import uuid
+import datetime
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, unquote
+from typing import Dict, List, Optional
+
+from zosmf_client import WORKFLOWS_PATH, AUTH_PATH, INFO_PATH, JOBS_PATH
+
+STANDIN_TOKEN = 'standin-token'
+
+DEFAULT_STEPS = ('allocate_datasets', 'copy_members', 'run_validation')
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """Request handler; state lives on the server object"""
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; avoid Nagle/delayed ACK stalls
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        logging.debug(format, *args)
+
+    def _reply(self, status: int, payload=None, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if body:
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _reply_text(self, text: str):
+        body = text.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; charset=UTF-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _payload(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        data = self.rfile.read(length) if length else b''
+        if (self.headers.get('Content-Type') or '').startswith('text/plain'):
+            return data.decode('utf-8')
+        return json.loads(data) if data else None
+
+    def _authenticated(self) -> bool:
+        return (f"jwtToken={self.server.token}" in (self.headers.get('Cookie') or '')
+                or (self.headers.get('Authorization') or '').startswith('Basic '))
+
+    def _dispatch(self, method: str):
+        url = urlparse(self.path)
+        payload = self._payload()
+        self.server.count_request()
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        if url.path == AUTH_PATH:
+            if method == 'POST':
+                if not (self.headers.get('Authorization') or '').startswith('Basic '):
+                    return self._reply(401, {'message': 'authentication required'})
+                self.server.count_login()
+                return self._reply(204, headers={
+                    'Set-Cookie': f"jwtToken={self.server.token}; Path=/; Secure; HttpOnly"})
+            return self._reply(204)
+
+        if not self._authenticated():
+            return self._reply(401, {'message': 'authentication required'})
+
+        if url.path == INFO_PATH and method == 'GET':
+            return self._reply(200, {'zosmf_version': '29', 'zosmf_hostname': 'STANDIN',
+                                     'zosmf_full_version': '29.0'})
+
+        if url.path == WORKFLOWS_PATH:
+            if method == 'GET':
+                filters = {key: values[0] for key, values in parse_qs(url.query).items()}
+                return self._reply(200, {'workflows': self.server.list_workflows(filters)})
+            if method == 'POST':
+                status, result = self.server.create_workflow(payload or {})
+                return self._reply(status, result)
+
+        if url.path.startswith(WORKFLOWS_PATH + '/'):
+            parts = [unquote(part) for part in url.path[len(WORKFLOWS_PATH) + 1:].split('/')]
+            workflow = self.server.workflows.get(parts[0])
+            if workflow is None:
+                return self._reply(404, {'message': f"workflow {parts[0]} not found"})
+            if len(parts) == 1 and method == 'GET':
+                query = parse_qs(url.query).get('returnData', [''])[0]
+                return self._reply(200, self.server.get_workflow(workflow, 'steps' in query))
+            if len(parts) == 1 and method == 'DELETE':
+                self.server.delete_workflow(parts[0])
+                return self._reply(204)
+            if parts[1:] == ['properties'] and method == 'PUT':
+                workflow.update(payload or {})
+                return self._reply(200, {})
+            if parts[1:] == ['operations', 'start'] and method == 'PUT':
+                workflow['statusName'] = 'automation-in-progress'
+                return self._reply(202, {})
+
+        if url.path == JOBS_PATH and method == 'GET':
+            filters = {key: values[0] for key, values in parse_qs(url.query).items()}
+            return self._reply(200, self.server.list_jobs(filters))
+        if url.path == JOBS_PATH and method == 'PUT':
+            status, result = self.server.submit_job(payload if isinstance(payload, str) else '')
+            return self._reply(status, result)
+
+        if url.path.startswith(JOBS_PATH + '/') and method == 'GET':
+            parts = [unquote(part) for part in url.path[len(JOBS_PATH) + 1:].split('/')]
+            job = self.server.jobs.get(tuple(parts[:2]))
+            if job is None:
+                return self._reply(404, {'message': f"job {'/'.join(parts[:2])} not found"})
+            if len(parts) == 2:
+                return self._reply(200, self.server.job_status(job))
+            if parts[2:] == ['files']:
+                return self._reply(200, self.server.spool_files(job))
+            if len(parts) == 5 and parts[2] == 'files' and parts[4] == 'records':
+                records = self.server.spool_records(job, int(parts[3]),
+                                                    self.headers.get('X-IBM-Record-Range'))
+                if records is None:
+                    return self._reply(404, {'message': f"spool file {parts[3]} not found"})
+                return self._reply_text(''.join(record + '\n' for record in records))
+
+        return self._reply(404, {'message': f"{method} {url.path} not supported"})
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+
+class StandinServer(ThreadingHTTPServer):
+    """In-memory zOSMF workflow state"""
+
+    daemon_threads = True
+
+    def __init__(self, address, latency: float = 0.0, job_queue_seconds: float = 0.05,
+                 job_run_seconds: float = 0.1):
+        super().__init__(address, StandinHandler)
+        self.latency = latency
+        self.job_queue_seconds = job_queue_seconds
+        self.job_run_seconds = job_run_seconds
+        self.workflows = {}
+        self.jobs = {}
+        self.next_jobid = 1
+        self.requests = 0
+        self.logins = 0
+        self.token = STANDIN_TOKEN
+        self._lock = threading.Lock()
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def count_login(self):
+        with self._lock:
+            self.logins += 1
+
+    def expire_tokens(self):
+        """Invalidate every issued token, as zOSMF does when a session times out"""
+        with self._lock:
+            self.token = f"{STANDIN_TOKEN}-{uuid.uuid4().hex[:8]}"
+
+    def list_workflows(self, filters: Dict[str, str]):
+        with self._lock:
+            workflows = list(self.workflows.values())
+        name_pattern = filters.pop('workflowName', None)
+        return [self._summary(workflow) for workflow in workflows
+                if (name_pattern is None or re.fullmatch(name_pattern, workflow['workflowName']))
+                and all(workflow.get(key) == value for key, value in filters.items())]
+
+    def create_workflow(self, payload: Dict):
+        with self._lock:
+            name = payload.get('workflowName')
+            if not name:
+                return 400, {'message': 'workflowName is required'}
+            if any(workflow['workflowName'] == name for workflow in self.workflows.values()):
+                return 409, {'message': f"workflow {name} already exists"}
+            key = str(uuid.uuid4())
+            self.workflows[key] = {
+                **payload,
+                'workflowKey': key,
+                'workflowName': name,
+                'owner': payload.get('owner'),
+                'system': payload.get('system'),
+                'statusName': 'in-progress',
+                'steps': [{'name': step, 'state': 'Ready'} for step in DEFAULT_STEPS]
+            }
+        return 201, {'workflowKey': key, 'workflowDescription': payload.get('workflowDescription')}
+
+    def get_workflow(self, workflow: Dict, with_steps: bool) -> Dict:
+        with self._lock:
+            if workflow['statusName'] == 'automation-in-progress':
+                # Advance one step per poll
+                pending = [step for step in workflow['steps'] if step['state'] != 'Complete']
+                if pending:
+                    pending[0]['state'] = 'Complete'
+                if len(pending) <= 1:
+                    workflow['statusName'] = 'complete'
+            result = {key: value for key, value in workflow.items() if key != 'steps'}
+            if with_steps:
+                result['steps'] = [dict(step) for step in workflow['steps']]
+        return result
+
+    def delete_workflow(self, workflow_key: str):
+        with self._lock:
+            self.workflows.pop(workflow_key, None)
+
+    def add_job(self, jobname: str, jobid: str, spool: Dict[str, List[str]], status: str = 'OUTPUT',
+                retcode: Optional[str] = 'CC 0000', owner: str = 'USER'):
+        """Add a job; spool maps "DDNAME" or "STEP.DDNAME" to its records"""
+        files = []
+        for index, (name, records) in enumerate(spool.items(), 1):
+            stepname, _, ddname = name.rpartition('.')
+            files.append({'id': index, 'ddname': ddname, 'stepname': stepname or 'JES2',
+                          'records': list(records)})
+        with self._lock:
+            self.jobs[(jobname, jobid)] = {'jobname': jobname, 'jobid': jobid, 'owner': owner,
+                                           'status': status, 'retcode': retcode, 'files': files}
+
+    def append_records(self, jobname: str, jobid: str, ddname: str, records: List[str]):
+        """Extend a spool file of a (running) job, adding the file if needed"""
+        with self._lock:
+            files = self.jobs[(jobname, jobid)]['files']
+            spool_file = next((item for item in files if item['ddname'] == ddname), None)
+            if spool_file is None:
+                spool_file = {'id': len(files) + 1, 'ddname': ddname, 'stepname': 'STEP1', 'records': []}
+                files.append(spool_file)
+            spool_file['records'].extend(records)
+
+    def set_job_status(self, jobname: str, jobid: str, status: str, retcode: Optional[str] = None):
+        with self._lock:
+            self.jobs[(jobname, jobid)].update(status=status, retcode=retcode)
+
+    def submit_job(self, jcl: str):
+        match = re.match(r"//(\S+)\s+JOB\b", jcl)
+        if match is None:
+            return 400, {'message': 'no JOB statement'}
+        with self._lock:
+            jobid = f"JOB{self.next_jobid:05d}"
+            self.next_jobid += 1
+            jobname = match.group(1)
+            self.jobs[(jobname, jobid)] = {
+                'jobname': jobname, 'jobid': jobid, 'owner': 'USER', 'status': 'INPUT',
+                'retcode': None, 'submitted': time.time(),
+                'files': [{'id': 1, 'ddname': 'JESJCL', 'stepname': 'JES2', 'records': jcl.splitlines()}]
+            }
+        return 201, {'jobname': jobname, 'jobid': jobid, 'owner': 'USER', 'status': 'INPUT', 'retcode': None}
+
+    def _advance_job(self, job: Dict):
+        """Move submitted jobs through INPUT -> ACTIVE -> OUTPUT by elapsed time"""
+        submitted = job.get('submitted')
+        if submitted is None or job['status'] == 'OUTPUT':
+            return
+        started = submitted + self.job_queue_seconds
+        ended = started + self.job_run_seconds
+        now = time.time()
+        if now >= ended:
+            job.update(status='OUTPUT', retcode='CC 0000', started=started, ended=ended)
+            job['files'].append({'id': len(job['files']) + 1, 'ddname': 'JESMSGLG', 'stepname': 'JES2',
+                                 'records': [f"$HASP395 {job['jobname']} ENDED - RC=0000"]})
+        elif now >= started:
+            job.update(status='ACTIVE', started=started)
+
+    def list_jobs(self, filters: Dict[str, str]) -> List[Dict]:
+        with self._lock:
+            jobs = list(self.jobs.values())
+        prefix = filters.get('prefix', '*').rstrip('*')
+        return [self.job_status(job) for job in jobs
+                if job['jobname'].startswith(prefix)
+                and filters.get('owner', job['owner']) in (job['owner'], '*')]
+
+    def job_status(self, job: Dict) -> Dict:
+        with self._lock:
+            self._advance_job(job)
+            status = {key: job[key] for key in ('jobname', 'jobid', 'owner', 'status', 'retcode')}
+            for key, field in (('submitted', 'exec-submitted'), ('started', 'exec-started'),
+                               ('ended', 'exec-ended')):
+                if job.get(key) is not None:
+                    moment = datetime.datetime.fromtimestamp(job[key], datetime.timezone.utc)
+                    status[field] = moment.isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+            return status
+
+    def spool_files(self, job: Dict) -> List[Dict]:
+        with self._lock:
+            return [{'jobname': job['jobname'], 'jobid': job['jobid'], 'id': item['id'],
+                     'ddname': item['ddname'], 'stepname': item['stepname'],
+                     'record-count': len(item['records'])} for item in job['files']]
+
+    def spool_records(self, job: Dict, file_id: int, record_range: Optional[str]) -> Optional[List[str]]:
+        with self._lock:
+            spool_file = next((item for item in job['files'] if item['id'] == file_id), None)
+            if spool_file is None:
+                return None
+            records = spool_file['records']
+            if not record_range:
+                return list(records)
+            if ',' in record_range:
+                start, count = (int(value) for value in record_range.split(','))
+                return records[start:start + count]
+            start, end = (int(value) for value in record_range.split('-'))
+            return records[start:end + 1]
+
+    @staticmethod
+    def _summary(workflow: Dict) -> Dict:
+        return {key: workflow.get(key) for key in ('workflowKey', 'workflowName', 'owner',
+                                                   'system', 'statusName')}
+
+
+class ZosmfStandin:
+    """Run a StandinServer on a background thread"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0,
+                 job_queue_seconds: float = 0.05, job_run_seconds: float = 0.1):
+        self.server = StandinServer((host, port), latency, job_queue_seconds, job_run_seconds)
+        self.host = host
+        self.port = self.server.server_address[1]
+        self._thread = None
+
+    def start(self) -> 'ZosmfStandin':
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Local zOSMF REST stand-in')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=18443)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every request')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s',
+                        datefmt='%Y-%m-%d %H:%M:%S')
+
+    server = StandinServer((args.host, args.port), args.latency)
+    logging.info(f"zOSMF stand-in listening on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -12,6 +12,10 @@
 #   work_dir    - Working directory (default: current user's home/workflow)
 #   environment - Target environment (DEV/TEST/PROD)
 #
+# data_processor.py runs on a warm processor daemon (processor_daemon.py)
+# that is started on first use and exits after PROCESSOR_DAEMON_IDLE_TIMEOUT
+# seconds without jobs; set PROCESSOR_DAEMON=0 to start a new interpreter.
+#
 
 # Set default values
 SCRIPT_NAME="${1:-data_processor.py}"
@@ -29,6 +33,11 @@ PYTHON_HOME="/usr/lpp/IBM/cyp/v3r9/pyz"
 PYTHON_BIN="$PYTHON_HOME/bin/python3"
 PYTHON_LIB="$PYTHON_HOME/lib"
 
+# Warm processor daemon for data_processor.py
+PROCESSOR_DAEMON="${PROCESSOR_DAEMON:-1}"
+PROCESSOR_DAEMON_SOCKET="${PROCESSOR_DAEMON_SOCKET:-$WORK_DIR/temp/processor.sock}"
+PROCESSOR_DAEMON_IDLE_TIMEOUT="${PROCESSOR_DAEMON_IDLE_TIMEOUT:-600}"
+
 # Function to log messages
 log_message() {
     local timestamp=$(date '+%Y-%m-%d %H:%M:%S')
@@ -67,12 +76,14 @@ setup_python_env() {
     export WORKFLOW_ENVIRONMENT="$ENVIRONMENT"
     export WORKFLOW_LOG_DIR="$LOG_DIR"
     export WORKFLOW_OUTPUT_DIR="$OUTPUT_DIR"
+    export WORKFLOW_CATALOG_CACHE="$WORK_DIR/temp/catalog_cache.json"
     
     log_message "Python environment configured:"
     log_message "  PYTHONPATH: $PYTHONPATH"
     log_message "  LIBPATH: $LIBPATH"
     log_message "  WORKFLOW_HOME: $WORKFLOW_HOME"
     log_message "  WORKFLOW_ENVIRONMENT: $WORKFLOW_ENVIRONMENT"
+    log_message "  WORKFLOW_CATALOG_CACHE: $WORKFLOW_CATALOG_CACHE"
 }
 
 # Function to execute Python script
@@ -94,12 +105,30 @@ execute_python_script() {
     # Execute the Python script
     log_message "Starting Python script execution..."
     
-    $PYTHON_BIN "$script_path" \
-        --work-dir "$WORK_DIR" \
-        --environment "$ENVIRONMENT" \
-        --log-dir "$LOG_DIR" \
-        --output-dir "$OUTPUT_DIR" \
-        > "$output_file" 2> "$error_file"
+    if [ "$SCRIPT_NAME" = "data_processor.py" ] && [ "$PROCESSOR_DAEMON" = "1" ] && \
+       [ -f "$PYTHON_DIR/processor_daemon.py" ]; then
+        # Thin client: the job runs on the warm daemon (started if needed),
+        # or in-process when the daemon is not available
+        log_message "Using processor daemon: $PROCESSOR_DAEMON_SOCKET"
+        mkdir -p "$(dirname "$PROCESSOR_DAEMON_SOCKET")"
+        $PYTHON_BIN "$PYTHON_DIR/processor_daemon.py" run \
+            --socket "$PROCESSOR_DAEMON_SOCKET" \
+            --idle-timeout "$PROCESSOR_DAEMON_IDLE_TIMEOUT" \
+            --log-file "$LOG_DIR/processor_daemon.log" \
+            --start -- \
+            --work-dir "$WORK_DIR" \
+            --environment "$ENVIRONMENT" \
+            --log-dir "$LOG_DIR" \
+            --output-dir "$OUTPUT_DIR" \
+            > "$output_file" 2> "$error_file"
+    else
+        $PYTHON_BIN "$script_path" \
+            --work-dir "$WORK_DIR" \
+            --environment "$ENVIRONMENT" \
+            --log-dir "$LOG_DIR" \
+            --output-dir "$OUTPUT_DIR" \
+            > "$output_file" 2> "$error_file"
+    fi
     
     local exit_code=$?
     
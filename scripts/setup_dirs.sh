@@ -108,20 +108,34 @@ REXX_PATH=/usr/lpp/IBM/zosmf/bin
 EOF
 
 # Create workflow status file
-cat > "$WORK_DIR/config/workflow_status.conf" << EOF
+# Status updates are journaled in workflow_status.conf.journal; a journal
+# left by an earlier run would be replayed over the new file, so the reset
+# goes through config_store.py, which replaces both under the status lock
+STATUS_FILE="$WORK_DIR/config/workflow_status.conf"
+SETUP_TIME=$(date '+%Y-%m-%d %H:%M:%S')
+PYTHON_BIN="${PYTHON_BIN:-/usr/lpp/IBM/cyp/v3r9/pyz/bin/python3}"
+if [ -x "$PYTHON_BIN" ] && [ -f "$WORK_DIR/python/config_store.py" ] && \
+   "$PYTHON_BIN" "$WORK_DIR/python/config_store.py" reset "$STATUS_FILE" \
+       STATUS=INITIALIZED SETUP_COMPLETE=YES "SETUP_DATE=$SETUP_TIME" "LAST_UPDATE=$SETUP_TIME" \
+       DIRECTORIES_CREATED=YES PERMISSIONS_SET=YES CONFIG_FILES_CREATED=YES; then
+    log_message "Workflow status reset through config_store.py"
+else
+    rm -f "$STATUS_FILE.journal"
+    cat > "$STATUS_FILE" << EOF
 # Workflow Status Configuration
 STATUS=INITIALIZED
 SETUP_COMPLETE=YES
-SETUP_DATE=$(date '+%Y-%m-%d %H:%M:%S')
-LAST_UPDATE=$(date '+%Y-%m-%d %H:%M:%S')
+SETUP_DATE=$SETUP_TIME
+LAST_UPDATE=$SETUP_TIME
 DIRECTORIES_CREATED=YES
 PERMISSIONS_SET=YES
 CONFIG_FILES_CREATED=YES
 EOF
+fi
 
 # Set permissions on configuration files
 chmod 644 "$WORK_DIR/config/environment.conf"
-chmod 644 "$WORK_DIR/config/workflow_status.conf"
+chmod 644 "$STATUS_FILE"
 
 # Create a simple validation script
 cat > "$WORK_DIR/scripts/validate_setup.sh" << 'EOF'
@@ -12,6 +12,10 @@
 #   hlq         - High level qualifier for datasets
 #   environment - Target environment (DEV/TEST/PROD)
 #
+# When Python is available the checks are run by python/result_validator.py,
+# which resolves all datasets with one LISTCAT per HLQ and runs the USS
+# checks in parallel; set VALIDATOR_PYTHON=0 to use the shell checks below.
+#
 
 # Set default values
 WORK_DIR="${1:-/u/$(whoami)/workflow}"
@@ -23,6 +27,9 @@ LOG_DIR="$WORK_DIR/logs"
 OUTPUT_DIR="$WORK_DIR/output"
 BACKUP_DIR="$WORK_DIR/backup"
 CONFIG_DIR="$WORK_DIR/config"
+PYTHON_DIR="$WORK_DIR/python"
+PYTHON_BIN="${PYTHON_BIN:-/usr/lpp/IBM/cyp/v3r9/pyz/bin/python3}"
+VALIDATOR_PYTHON="${VALIDATOR_PYTHON:-1}"
 
 # Validation results
 VALIDATION_ERRORS=0
@@ -296,8 +303,27 @@ generate_validation_report() {
     cat "$report_file"
 }
 
+# Function to run the batched Python validator; returns 2 if unavailable
+run_python_validator() {
+    if [ "$VALIDATOR_PYTHON" != "1" ] || [ ! -f "$PYTHON_DIR/result_validator.py" ]; then
+        return 2
+    fi
+    if [ ! -x "$PYTHON_BIN" ]; then
+        PYTHON_BIN=$(command -v python3) || return 2
+    fi
+
+    "$PYTHON_BIN" "$PYTHON_DIR/result_validator.py" \
+        --work-dir "$WORK_DIR" --hlq "$HLQ" --environment "$ENVIRONMENT"
+}
+
 # Main execution
 main() {
+    run_python_validator
+    rc=$?
+    if [ $rc -eq 0 ] || [ $rc -eq 1 ]; then
+        exit $rc
+    fi
+
     log_message "INFO" "=== Starting Workflow Validation ==="
     log_message "INFO" "Work Directory: $WORK_DIR"
     log_message "INFO" "HLQ: $HLQ"
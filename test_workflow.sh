@@ -354,7 +354,26 @@ test_performance() {
             log_test "WARN" "Script execution performance slow: $duration seconds"
         fi
     fi
-    
+
+    # Benchmark suite (fake TSO / zOSMF stand-ins), compared against a baseline if present
+    benchmark_script="$WORK_DIR/python/benchmark_suite.py"
+    if [ -f "$benchmark_script" ]; then
+        benchmark_results="$OUTPUT_DIR/benchmark_results_$(date '+%Y%m%d_%H%M%S').json"
+        benchmark_baseline="${BENCHMARK_BASELINE:-$OUTPUT_DIR/benchmark_baseline.json}"
+        benchmark_args="--quick --output $benchmark_results"
+        if [ -f "$benchmark_baseline" ]; then
+            benchmark_args="$benchmark_args --compare $benchmark_baseline"
+        fi
+
+        if python3 "$benchmark_script" $benchmark_args >> "$TEST_LOG" 2>&1; then
+            log_test "PASS" "Benchmark suite completed: $benchmark_results"
+        elif [ -f "$benchmark_results" ]; then
+            log_test "WARN" "Benchmark regressions against $benchmark_baseline (see $TEST_LOG)"
+        else
+            log_test "FAIL" "Benchmark suite failed (see $TEST_LOG)"
+        fi
+    fi
+
     # Cleanup performance test files
     rm -f "$test_data_file" 2>/dev/null
 }